@@ -42,34 +42,37 @@ Usage:
 """
 
 # Python modules
-import OpenEXR
 import sys
 import os
 import traceback
 import code
-from PyQt6 import QtWidgets
 import logging
 
 # Wizard modules
-from wizard.core import application
-from wizard.core import user
-from wizard.core import project
-from wizard.core import repository
-from wizard.core import tools
-from wizard.core import create_project
-from wizard.core import communicate
-from wizard.core import environment
-from wizard.core import launch
-from wizard.core import launch_batch
-from wizard.core import db_core
-from wizard.core import subtasks_library
-from wizard.core import subtask
-from wizard.core import hooks
-from wizard.core import custom_logger
-
-# Wizard gui modules
-from wizard.gui import app_utils
-from wizard.gui import gui_server
+from wizard.core import startup_tracer
+startup_tracer.start()
+
+with startup_tracer.phase('Import wizard modules'):
+    from PyQt6 import QtWidgets
+    from wizard.core import application
+    from wizard.core import user
+    from wizard.core import project
+    from wizard.core import repository
+    from wizard.core import tools
+    from wizard.core import create_project
+    from wizard.core import communicate
+    from wizard.core import environment
+    from wizard.core import launch
+    from wizard.core import launch_batch
+    from wizard.core import db_core
+    from wizard.core import subtasks_library
+    from wizard.core import subtask
+    from wizard.core import hooks
+    from wizard.core import custom_logger
+
+    # Wizard gui modules
+    from wizard.gui import app_utils
+    from wizard.gui import gui_server
 
 custom_logger.get_root_logger()
 logger = logging.getLogger(__name__)
@@ -119,21 +122,25 @@ class app():
 
         application.log_app_infos()
 
-        self.app = app_utils.get_app()
+        with startup_tracer.phase('Init application'):
+            self.app = app_utils.get_app()
 
         app_utils.set_pywizard()
-        app_utils.init_psql_dns(self)
-        app_utils.init_repository(self)
-        app_utils.init_user(self)
-        app_utils.init_project(self)
-        app_utils.init_OCIO()
-        self.stats_schedule = app_utils.init_stats()
-        self.communicate_server = communicate.communicate_server()
-        self.communicate_server.start()
-        self.softwares_server = launch.softwares_server()
-        self.softwares_server.start()
-        self.tasks_server = subtask.tasks_server()
-        self.tasks_server.start()
+        with startup_tracer.phase('Init environment'):
+            app_utils.init_psql_dns(self)
+            app_utils.init_repository(self)
+            app_utils.init_user(self)
+            app_utils.init_project(self)
+            app_utils.init_OCIO()
+            self.stats_schedule = app_utils.init_stats()
+        with startup_tracer.phase('Start servers'):
+            self.communicate_server = communicate.communicate_server()
+            self.communicate_server.start()
+            self.softwares_server = launch.softwares_server()
+            self.softwares_server.start()
+            self.tasks_server = subtask.tasks_server()
+            self.tasks_server.start()
+        startup_tracer.log_timeline()
 
         console = code.InteractiveConsole()
         console.interact(banner=None, exitmsg=None)
@@ -38,31 +38,37 @@ Functions:
     main: Entry point for the application, setting up the app instance and running the event loop.
 
 Modules Imported:
-    - Python modules: PyOpenColorIO, sys, time, PyQt6, logging
-    - Wizard core modules: application, custom_logger, version_database_modification
+    - Python modules: sys, time, PyQt6, logging
+    - Wizard core modules: startup_tracer, application, custom_logger, version_database_modification
     - Wizard GUI modules: app_utils, loading_widget, main_widget, table_viewer_widget, error_handler
+
+The main widget ( and through it every widget, OpenCV, NumPy, OCIO... ) is
+imported once the loading widget is displayed. The startup phases are
+logged by the startup tracer at the end of the initialization.
 """
 
 # Python modules
-# import PyOpenColorIO  # For OpenColorIO configuration
-import OpenEXR
 import sys  # For system-specific parameters and functions
 import time  # For measuring performance and handling time
-from PyQt6 import QtWidgets, QtCore, QtGui  # For GUI components
 import logging  # For logging messages
 
-# Wizard core modules
-from wizard.core import application  # Core application utilities
-from wizard.core import custom_logger  # Custom logging setup
-# Handles version database updates
-from wizard.core import version_database_modification
+# Startup timeline
+from wizard.core import startup_tracer
+startup_tracer.start()
+
+with startup_tracer.phase('Import base modules'):
+    from PyQt6 import QtWidgets, QtCore, QtGui  # For GUI components
+
+    # Wizard core modules
+    from wizard.core import application  # Core application utilities
+    from wizard.core import custom_logger  # Custom logging setup
+    # Handles version database updates
+    from wizard.core import version_database_modification
 
-# Wizard GUI modules
-from wizard.gui import app_utils  # GUI utility functions
-from wizard.gui import loading_widget  # Loading screen widget
-from wizard.gui import main_widget  # Main application widget
-from wizard.gui import table_viewer_widget  # Table viewer widget
-import error_handler  # Error handling utilities
+    # Wizard GUI modules
+    from wizard.gui import app_utils  # GUI utility functions
+    from wizard.gui import loading_widget  # Loading screen widget
+    import error_handler  # Error handling utilities
 
 # Initialize the root logger for the application
 custom_logger.get_root_logger()
@@ -96,17 +102,21 @@ class app():
         self.stats_schedule = None
 
         # Initialize the main application
-        self.app = app_utils.get_app()  # Create the main QApplication instance
-        # Initialize warning tooltips
-        self.warning_tooltip = app_utils.init_warning_tooltip()
+        with startup_tracer.phase('Init application'):
+            self.app = app_utils.get_app()  # Create the main QApplication instance
+            # Initialize warning tooltips
+            self.warning_tooltip = app_utils.init_warning_tooltip()
         app_utils.set_wizard_gui()  # Set up the GUI environment
-        app_utils.init_psql_dns(self, change_psql)  # Initialize PostgreSQL DNS
-        # Initialize the repository
-        app_utils.init_repository(self, change_repo)
-        app_utils.init_user(self, log_user)  # Initialize user settings
-        app_utils.init_project(self, project_manager)  # Initialize the project
-        app_utils.init_OCIO()  # Initialize OpenColorIO configuration
-        self.stats_schedule = app_utils.init_stats()  # Initialize statistics scheduler
+        with startup_tracer.phase('Init environment'):
+            # Initialize PostgreSQL DNS
+            app_utils.init_psql_dns(self, change_psql)
+            # Initialize the repository
+            app_utils.init_repository(self, change_repo)
+            app_utils.init_user(self, log_user)  # Initialize user settings
+            # Initialize the project
+            app_utils.init_project(self, project_manager)
+            app_utils.init_OCIO()  # Initialize OpenColorIO configuration
+            self.stats_schedule = app_utils.init_stats()  # Initialize statistics scheduler
 
         # Main GUI application setup
         start_time = time.perf_counter()  # Start measuring application load time
@@ -116,20 +126,31 @@ class app():
         QtWidgets.QApplication.processEvents()  # Process pending GUI events
 
         # Perform version database modifications
-        version_database_modification.main()
+        with startup_tracer.phase('Database modifications'):
+            version_database_modification.main()
+
+        # Import the widgets while the loading widget is displayed
+        with startup_tracer.phase('Import widgets'):
+            from wizard.gui import main_widget  # Main application widget
+            if table_viewer:
+                from wizard.gui import table_viewer_widget  # Table viewer widget
 
         # Initialize the table viewer if requested
         if table_viewer:
             self.table_viewer = table_viewer_widget.table_viewer_widget()
 
         # Set up the main application widget
-        self.main_widget = main_widget.main_widget()
-        self.main_widget.stop_threads.connect(
-            self.stats_schedule.stop)  # Connect thread stopping
-        self.main_widget.refresh()  # Refresh the main widget
-        self.main_widget.init_floating_windows()  # Initialize floating windows
-        QtWidgets.QApplication.processEvents()  # Process pending GUI events
-        self.main_widget.init_contexts()  # Initialize application contexts
+        with startup_tracer.phase('Build main widget'):
+            self.main_widget = main_widget.main_widget()
+            self.main_widget.stop_threads.connect(
+                self.stats_schedule.stop)  # Connect thread stopping
+        with startup_tracer.phase('First refresh'):
+            self.main_widget.refresh()  # Refresh the main widget
+        with startup_tracer.phase('Init floating windows'):
+            self.main_widget.init_floating_windows()  # Initialize floating windows
+            QtWidgets.QApplication.processEvents()  # Process pending GUI events
+        with startup_tracer.phase('Init contexts'):
+            self.main_widget.init_contexts()  # Initialize application contexts
         self.loading_widget.close()  # Close the loading widget
         self.main_widget.whatsnew()  # Display "What's New" information
         # Check if the build is the latest
@@ -137,6 +158,7 @@ class app():
         logger.info(
             # Log the startup time
             f"Wizard start time : {str(round((time.perf_counter()-start_time), 1))}s")
+        startup_tracer.log_timeline()  # Log the startup phases
 
     def quit(self):
         # Restore standard output and error streams
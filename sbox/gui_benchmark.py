@@ -0,0 +1,343 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# This file is part of Wizard
+
+# MIT License
+
+# Copyright (c) 2021 Leo brunel
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Headless benchmark of the GUI refreshes on a synthetic project.
+
+This script generates a synthetic project on a local PostgreSQL server and
+measures the refreshes of the main widgets and the search index, so the
+regressions in the GUI hot paths are caught before a release.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python sbox/gui_benchmark.py --password <psql password>
+        [--assets 250] [--stages 5] [--json results.json]
+        [--baseline previous.json --tolerance 0.25]
+
+The repository and the project are created on the first run and reused
+afterwards, use a new `--project` name to benchmark other sizes. The
+project files are only created in a temporary folder, the rows are
+inserted with the core `project` functions without creating the
+assets folders.
+
+For each benchmark, the script reports:
+    - The refresh time ( min, median and max of `--repeat` runs ), the
+      search index is invalidated before every run as in `main_widget.refresh()`.
+    - The number of SQL queries of a refresh.
+    - The python memory peak of a refresh, measured with tracemalloc on a
+      separate run since tracing slows down the execution.
+
+With `--baseline`, the script exits with the code 1 if a median time or a
+queries count is above the baseline by more than the tolerance.
+"""
+
+# Python modules
+import os
+import sys
+import gc
+import json
+import time
+import random
+import argparse
+import statistics
+import tempfile
+import tracemalloc
+import logging
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6 import QtWidgets
+
+# Wizard modules
+from wizard.core import environment
+from wizard.core import repository
+from wizard.core import project
+from wizard.core import create_project
+from wizard.core import db_core
+from wizard.core import db_utils
+from wizard.core import search_index
+from wizard.core import custom_logger
+from wizard.vars import assets_vars
+
+custom_logger.get_root_logger()
+logger = logging.getLogger(__name__)
+
+_searches_ = ['modeling', 'char&rig', 'anim+light', 'todo']
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the GUI refreshes on a synthetic project')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', default='5432')
+    parser.add_argument('--user', default='postgres')
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--repository', default='benchmark')
+    parser.add_argument('--project', default='benchmark')
+    parser.add_argument('--categories', type=int, default=4,
+                        help='Categories per domain ( assets and sequences )')
+    parser.add_argument('--assets', type=int, default=250,
+                        help='Assets per category')
+    parser.add_argument('--stages', type=int, default=5,
+                        help='Stages per asset')
+    parser.add_argument('--variants', type=int, default=1,
+                        help='Variants per stage')
+    parser.add_argument('--work-versions', type=int, default=5,
+                        help='Work versions per work environment')
+    parser.add_argument('--exports', type=int, default=1,
+                        help='Exports per stage')
+    parser.add_argument('--export-versions', type=int, default=3,
+                        help='Export versions per export')
+    parser.add_argument('--references', type=int, default=4,
+                        help='References per work environment')
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--main-widget', action='store_true',
+                        help='Also benchmark main_widget.refresh(), this starts the wizard servers')
+    parser.add_argument('--json', help='Write the results to a json file')
+    parser.add_argument('--baseline', help='A previous json results file')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    return parser.parse_args()
+
+
+def init_environment(args):
+    environment.set_gui(1)
+    environment.set_psql_dns(
+        f"host={args.host} port={args.port} user={args.user} password={args.password}")
+    environment.set_repository(args.repository)
+    if not repository.is_repository_database(args.repository):
+        logger.info(f"Creating the {args.repository} repository")
+        repository.create_repository_database()
+        repository.create_admin_user(args.password, 'admin@benchmark.local')
+    db_core.db_access_singleton().set_repository(environment.get_repository())
+    environment.build_user_env(repository.get_user_row_by_name('admin'))
+
+    if args.project in repository.get_projects_names_list():
+        project_path = repository.get_project_row_by_name(
+            args.project)['project_path']
+        environment.build_project_env(args.project, project_path)
+        db_core.db_access_singleton().set_project(args.project)
+        return
+    project_path = os.path.join(
+        tempfile.gettempdir(), f"wizard_benchmark_{args.project}")
+    if not create_project.create_project(args.project, project_path, args.password):
+        logger.error("Can't create the benchmark project")
+        sys.exit(1)
+    db_core.db_access_singleton().set_project(args.project)
+    project.add_user(repository.get_user_row_by_name('admin', 'id'))
+    generate_project(args)
+
+
+def generate_project(args):
+    # Inserts the rows with the core functions, without any file
+    random.seed(0)
+    start_time = time.perf_counter()
+    softwares_ids = dict((software, project.get_software_data_by_name(software, 'id'))
+                         for software in project.get_softwares_names_list())
+    export_version_ids = []
+    work_env_ids = []
+    for domain_id, domain in [(assets_vars._assets_id_, assets_vars._assets_),
+                              (assets_vars._sequences_id_, assets_vars._sequences_)]:
+        category_ids = project.get_domain_childs(domain_id, 'id')
+        for index in range(len(category_ids), args.categories):
+            category_ids.append(project.add_category(
+                f"{domain}_{index}", domain_id))
+        stages = assets_vars._stages_rules_dic_[domain]
+        for category_id in category_ids:
+            for asset_index in range(args.assets):
+                asset_id = project.add_asset(
+                    f"asset_{category_id}_{asset_index}", category_id)
+                for stage in stages[:args.stages]:
+                    stage_id = project.add_stage(stage, asset_id)
+                    for variant_index in range(args.variants):
+                        variant_id = project.add_variant(
+                            f"variant_{variant_index}", stage_id, 'benchmark')
+                        if variant_index == 0:
+                            project.set_stage_data(
+                                stage_id, 'default_variant_id', variant_id)
+                        software = list(assets_vars._ext_dic_[stage].keys())[0]
+                        work_env_id = project.add_work_env(
+                            software, softwares_ids[software], variant_id)
+                        project.set_variant_data(
+                            variant_id, 'default_work_env_id', work_env_id)
+                        work_env_ids.append(work_env_id)
+                        work_version_id = None
+                        for version_index in range(args.work_versions):
+                            work_version_id = project.add_version(str(version_index+1).zfill(4),
+                                                                  f"benchmark/{work_env_id}/{version_index}.ext",
+                                                                  work_env_id,
+                                                                  'benchmark version')
+                    for export_index in range(args.exports):
+                        export_id = project.add_export(
+                            f"export_{export_index}", stage_id)
+                        for version_index in range(args.export_versions):
+                            export_version_ids.append(project.add_export_version(str(version_index+1).zfill(4),
+                                                                                 [f"benchmark/{export_id}/{version_index}.abc"],
+                                                                                 export_id,
+                                                                                 work_version_id))
+            logger.info(f"Category {category_id} generated")
+    for work_env_id in work_env_ids:
+        for export_version_id in random.sample(export_version_ids, min(args.references, len(export_version_ids))):
+            project.create_reference(work_env_id, export_version_id,
+                                     f"reference_{export_version_id}")
+    for index in range(args.events):
+        project.add_event('creation', f"Benchmark event {index}",
+                          'Benchmark event', dict())
+    logger.info(
+        f"Synthetic project generated in {round(time.perf_counter()-start_time, 1)}s")
+
+
+def measure(function, repeat):
+    access = db_core.db_access_singleton()
+    durations = []
+    queries_counts = []
+    for index in range(repeat):
+        search_index.invalidate_all()
+        gc.collect()
+        queries_count = access.queries_count
+        start_time = time.perf_counter()
+        function()
+        QtWidgets.QApplication.processEvents()
+        durations.append(time.perf_counter()-start_time)
+        queries_counts.append(access.queries_count-queries_count)
+
+    search_index.invalidate_all()
+    gc.collect()
+    tracemalloc.start()
+    function()
+    QtWidgets.QApplication.processEvents()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = dict()
+    result['min'] = min(durations)
+    result['median'] = statistics.median(durations)
+    result['max'] = max(durations)
+    result['queries'] = max(queries_counts)
+    result['peak_mb'] = peak/1e6
+    return result
+
+
+def get_benchmarks(args):
+    from wizard.gui import tree_widget
+    from wizard.gui import production_table_widget
+    from wizard.gui import references_widget
+
+    benchmarks = dict()
+    widgets = []
+
+    _tree_widget = tree_widget.tree_widget()
+    widgets.append(_tree_widget)
+    benchmarks['tree_widget.refresh'] = _tree_widget.refresh
+
+    _production_table_widget = production_table_widget.production_table_widget()
+    widgets.append(_production_table_widget)
+    benchmarks['production_table_widget.refresh'] = _production_table_widget.refresh
+
+    _references_widget = references_widget.references_widget('work_env')
+    widgets.append(_references_widget)
+    work_env_ids = project.get_all_work_envs('id')
+    if work_env_ids:
+        _references_widget.change_work_env(work_env_ids[0])
+    benchmarks['references_widget.refresh'] = _references_widget.refresh
+
+    for view_name in ['tree_stages', 'production_stages', 'calendar_stages', 'reference_stages']:
+        benchmarks[f"search_index.search({view_name})"] = (
+            lambda view_name=view_name: [search_index.search(view_name, search) for search in _searches_])
+
+    if args.main_widget:
+        from wizard.gui import main_widget
+        _main_widget = main_widget.main_widget()
+        widgets.append(_main_widget)
+        benchmarks['main_widget.refresh'] = _main_widget.refresh
+
+    for widget in widgets:
+        widget.show()
+    QtWidgets.QApplication.processEvents()
+    return benchmarks, widgets
+
+
+def print_results(results):
+    print(f"{'benchmark':<48}{'min':>9}{'median':>9}{'max':>9}{'queries':>9}{'peak':>10}")
+    for name, result in results.items():
+        print(f"{name:<48}"
+              f"{result['min']:>8.3f}s{result['median']:>8.3f}s{result['max']:>8.3f}s"
+              f"{result['queries']:>9}{result['peak_mb']:>8.1f}MB")
+
+
+def check_baseline(results, baseline_file, tolerance):
+    with open(baseline_file, 'r') as f:
+        baseline = json.load(f)['results']
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline.keys():
+            continue
+        for key in ['median', 'queries']:
+            if result[key] > baseline[name][key]*(1+tolerance):
+                regressions.append(
+                    f"{name} {key} : {round(result[key], 3)} > {round(baseline[name][key], 3)} ( baseline )")
+    for regression in regressions:
+        logger.error(f"Regression : {regression}")
+    return len(regressions) == 0
+
+
+def main():
+    args = get_args()
+    app = QtWidgets.QApplication(sys.argv)
+    init_environment(args)
+
+    sizes = dict()
+    for table in ['assets', 'stages', 'variants', 'work_envs', 'versions',
+                  'export_versions', 'references_data', 'events']:
+        sizes[table] = len(db_utils.get_rows('project', table, 'id') or [])
+    logger.info(', '.join(f"{count} {table}" for table, count in sizes.items()))
+
+    benchmarks, widgets = get_benchmarks(args)
+    results = dict()
+    for name, function in benchmarks.items():
+        results[name] = measure(function, args.repeat)
+    print_results(results)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'sizes': sizes, 'results': results}, f, indent=4)
+
+    success = True
+    if args.baseline:
+        success = check_baseline(results, args.baseline, args.tolerance)
+
+    for widget in widgets:
+        if hasattr(widget, 'quit_threads'):
+            widget.quit_threads()
+        widget.close()
+    app.quit()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
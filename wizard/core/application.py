@@ -29,7 +29,7 @@
 """
 This module provides core functionalities for the Wizard application, including:
 - Retrieving version information from a YAML file.
-- Adding the 'binaries' directory to the system PATH.
+- Adding the 'binaries' and FFmpeg directories to the system PATH.
 - Logging application information such as version and license details.
 
 It also initializes a logger for logging errors and other messages.
@@ -70,6 +70,17 @@ def add_binaries_to_path():
     os.environ['PATH'] += os.pathsep + binaries_path
 
 
+def add_ffmpeg_to_path():
+    # Function to add the FFmpeg binaries to the system PATH
+    # Returns False if FFmpeg is missing
+    if not path_utils.isdir("binaries/ffmpeg/bin"):
+        logger.error("FFmpeg not found")
+        return False
+    os.environ['PATH'] += os.pathsep + \
+        path_utils.abspath("binaries/ffmpeg/bin")
+    return True
+
+
 def log_app_infos():
     # Function to log application information
     print('')  # Print an empty line for formatting
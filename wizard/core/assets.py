@@ -1801,7 +1801,8 @@ def screen_over_version(version_id):
     if not version_row:
         return
     screenshot_file, thumbnail_file = image.screenshot(version_row['screenshot_path'],
-                                                       version_row['thumbnail_path'])
+                                                       version_row['thumbnail_path'],
+                                                       asynchronous=True)
     return project.modify_version_screen(version_id, screenshot_file, thumbnail_file)
 
 
@@ -1859,10 +1860,11 @@ def add_version(work_env_id, comment="", do_screenshot=1, fresh=None, analyse_co
     thumbnail_file = path_utils.join(screenshot_dir_name,
                                      basename.replace(file_name_ext, '.thumbnail.jpg'))
 
-    # Capture screenshot and update asset preview if enabled
+    # Capture screenshot and update asset preview if enabled,
+    # the files are written in background
     if do_screenshot:
         screenshot_file, thumbnail_file = image.screenshot(
-            screenshot_file, thumbnail_file)
+            screenshot_file, thumbnail_file, asynchronous=True)
         variant_id = project.get_work_env_data(work_env_id, 'variant_id')
         stage_id = project.get_variant_data(variant_id, 'stage_id')
         asset_id = project.get_stage_data(stage_id, 'asset_id')
@@ -62,7 +62,6 @@ from wizard.core import socket_utils
 from wizard.core import assets
 from wizard.core import user
 from wizard.core import project
-from wizard.core import video
 from wizard.vars import user_vars
 from wizard.vars import ressources
 
@@ -396,6 +395,9 @@ def request_video(work_env_id):
     Returns:
         str: The file path of the requested video.
     """
+    # Imported on use, the video module loads OpenCV and OCIO
+    from wizard.core import video
+
     variant_id = project.get_work_env_data(work_env_id, 'variant_id')
     return video.request_video(variant_id)
 
@@ -427,6 +429,8 @@ def add_video(work_env_id, temp_dir, frange, version_id, focal_lengths_dic=None,
         5. Refresh the UI to reflect the changes.
         6. Return the file path of the added video.
     """
+    from wizard.core import video
+
     variant_id = project.get_work_env_data(work_env_id, 'variant_id')
     if comment is None or comment == '':
         analyse_comment = False
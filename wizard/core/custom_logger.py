@@ -34,6 +34,8 @@ It includes the following features:
     to both a file and the console, with log levels determined by command-line arguments.
 2. A utility function (`create_prefs_folder`) to ensure the existence of the user
     preferences folder required for logging.
+3. A function (`add_file_handler`) writing a logger to its own file, used by
+    the diagnostic tools like the refresh profiler.
 
 Dependencies:
 - Python's built-in `logging` module for log handling.
@@ -90,6 +92,30 @@ def get_root_logger():
     root_logger.addHandler(stream_handler)
 
 
+def add_file_handler(logger_name, file_path, propagate=False):
+    """
+    Writes the records of a logger to a dedicated file, with the root logger format.
+
+    Args:
+        logger_name (str): The name of the logger.
+        file_path (str): The log file path.
+        propagate (bool, optional): Also send the records to the root logger handlers.
+            Defaults to False, the records are only written to the file.
+
+    Returns:
+        logging.Handler: The file handler, to remove it with `logger.removeHandler()`.
+    """
+    create_prefs_folder()
+    file_logger = logging.getLogger(logger_name)
+    file_logger.setLevel(logging.DEBUG)
+    file_logger.propagate = propagate
+    file_handler = logging.FileHandler(file_path)
+    file_handler.setFormatter(logging.Formatter(
+        '%(asctime)s [%(name)-23.23s] [%(levelname)-5.5s] %(message)s'))
+    file_logger.addHandler(file_handler)
+    return file_handler
+
+
 def create_prefs_folder():
     """
     Ensures that the user preferences folder exists. If the folder does not exist,
@@ -38,15 +38,16 @@ Classes:
     db_access_singleton: A singleton class for managing database access and executing SQL commands.
 
 Functions:
+    get_thread_stats(): Returns the queries and rows counts of the current thread.
     create_connection(database=None): Establishes a connection to a PostgreSQL database.
     try_connection(DNS): Attempts to establish a connection to a PostgreSQL server.
     create_database(database): Creates a new PostgreSQL database with the specified name.
     create_table(database, cmd): Creates a table in the specified database by executing the provided SQL command.
 
 Dependencies:
-    - Python modules: time, logging
+    - Python modules: time, threading, logging
     - PostgreSQL modules: psycopg2, psycopg2.extras
-    - Wizard modules: environment
+    - Wizard modules: environment, db_records
 
 Logging:
     The module uses Python's logging library to log informational messages, warnings,
@@ -56,6 +57,7 @@ Logging:
 
 # Python modules
 import time
+import threading
 import logging
 
 # PostgreSQL python modules
@@ -65,9 +67,13 @@ from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
 # Wizard modules
 from wizard.core import environment
+from wizard.core import db_records
 
 logger = logging.getLogger(__name__)
 
+# Queries and fetched rows counts by thread, read by the refresh profiler
+_thread_stats = threading.local()
+
 
 class Singleton(type):
     """
@@ -105,6 +111,8 @@ class db_access_singleton(metaclass=Singleton):
         project_conn (object): The connection object for the project database.
         repository (str): The repository database connection string.
         repository_conn (object): The connection object for the repository database.
+        queries_count (int): The number of SQL commands executed since the start,
+                             used by the benchmarks and the profilers.
     Methods:
         set_repository(repository):
             Sets the repository connection string and resets the repository connection.
@@ -125,6 +133,7 @@ class db_access_singleton(metaclass=Singleton):
         self.project_conn = None
         self.repository = None
         self.repository_conn = None
+        self.queries_count = 0
 
     def set_repository(self, repository):
         """
@@ -157,8 +166,12 @@ class db_access_singleton(metaclass=Singleton):
             level (str): Specifies the database connection to use. 
                          Use 'repository' for the repository database or any other value for the project database.
             sql_cmd (str): The SQL command to execute.
-            as_dict (bool, optional): If set to 1 (default), fetches results as a dictionary. 
-                                      If set to 0, fetches results as a list.
+            as_dict (int, optional): The format of the fetched rows:
+                                     - 1 (default): Fetches the rows as dictionaries.
+                                     - 0: Fetches the first column values as a list.
+                                     - 2: Fetches the rows as immutable records ( see db_records ),
+                                          lighter than the dictionaries for the bulk reads.
+                                     - 3: Fetches the columns as lists, in a dictionary by column name.
             data (tuple, optional): Parameters to pass to the SQL command. Defaults to None.
             fetch (int, optional): Specifies the fetch behavior:
                                    - 2 (default): Fetch all rows.
@@ -169,6 +182,8 @@ class db_access_singleton(metaclass=Singleton):
             list[dict] | list | dict | int | None: 
                 - If `fetch` is 2 and `as_dict` is 1, returns a list of dictionaries (rows).
                 - If `fetch` is 2 and `as_dict` is 0, returns a list of values.
+                - If `fetch` is 2 and `as_dict` is 2, returns a list of records.
+                - If `fetch` is 2 and `as_dict` is 3, returns a dictionary of lists.
                 - If `fetch` is 1, returns the first row's first column value.
                 - If `fetch` is 0, returns 1 on success.
                 - Returns None if the connection fails or an error occurs.
@@ -183,6 +198,8 @@ class db_access_singleton(metaclass=Singleton):
         """
         rows = None
         retry_count = 0
+        self.queries_count += 1
+        _thread_stats.queries = getattr(_thread_stats, 'queries', 0) + 1
 
         while rows is None:
             try:
@@ -205,8 +222,9 @@ class db_access_singleton(metaclass=Singleton):
                 # If a connection is established, execute the SQL command
                 if conn:
                     rows = None
-                    # Use a dictionary cursor if as_dict is True
-                    if as_dict:
+                    # Use a dictionary cursor if as_dict is 1, the records
+                    # and the columns are built from the plain tuples
+                    if as_dict == 1:
                         cursor = conn.cursor(
                             cursor_factory=psycopg2.extras.RealDictCursor)
                     else:
@@ -221,6 +239,14 @@ class db_access_singleton(metaclass=Singleton):
                     # Fetch results based on the fetch parameter
                     if fetch == 2:
                         rows = cursor.fetchall()
+                        _thread_stats.rows = getattr(
+                            _thread_stats, 'rows', 0) + len(rows)
+                        if as_dict == 2:
+                            rows = db_records.make_records(
+                                cursor.description, rows)
+                        elif as_dict == 3:
+                            rows = db_records.make_columns(
+                                cursor.description, rows)
                         cursor.close()
                     elif fetch == 1:
                         rows = cursor.fetchone()[0]
@@ -257,6 +283,16 @@ class db_access_singleton(metaclass=Singleton):
                     f"Can't reach database, retrying ( {retry_count} )")
 
 
+def get_thread_stats():
+    """
+    Returns the counters of the SQL commands executed by the current thread.
+
+    Returns:
+        tuple: The queries count and the fetched rows count.
+    """
+    return (getattr(_thread_stats, 'queries', 0), getattr(_thread_stats, 'rows', 0))
+
+
 def create_connection(database=None):
     """
     Establishes a connection to a PostgreSQL database using the provided database name.
@@ -0,0 +1,187 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# This file is part of Wizard
+
+# MIT License
+
+# Copyright (c) 2021 Leo brunel
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+This module provides lightweight row types for the bulk database reads.
+
+`db_core` fetches the rows as `RealDictRow` objects by default, a full
+dictionary per row. For the big tables ( stages, variants, work and export
+versions ) of a large project, keeping those rows in memory costs a lot
+of space and garbage collection time.
+
+A record is a tuple subclass without instance dictionary. One record
+type is generated and cached for each set of columns ( so, in practice,
+for each table ), the column names and their positions are stored once
+on the type. Records are immutable and share the read API of the
+dictionaries, so the callers indexing `row['name']` keep working:
+
+    - `row['name']`, `row.get('name')`, `'name' in row`
+    - `row.keys()`, `row.values()`, `row.items()`, iteration over the keys
+    - `dict(row)` or `row.to_dict()` to get a modifiable dictionary
+
+Records are tuples iterating over their keys, `json.dumps()` serializes
+a record as the list of its column names, not its values. Always convert
+the records with `to_dict()` before sending or storing them.
+
+For the reads that only need some columns of many rows, `make_columns()`
+returns columnar lists instead of rows.
+
+Functions:
+    - get_record_type(columns): Returns the cached record type of a set of columns.
+    - make_records(description, rows): Converts the fetched tuples to records.
+    - make_columns(description, rows): Converts the fetched tuples to columnar lists.
+
+Dependencies:
+    - Python modules: threading
+"""
+
+# Python modules
+import threading
+
+_lock = threading.Lock()
+_record_types = dict()
+
+
+class record(tuple):
+    """
+    Base class of the generated record types.
+
+    The generated types define `_fields` ( the column names ) and `_index`
+    ( the column names by position ).
+    """
+    __slots__ = ()
+    _fields = ()
+    _index = dict()
+
+    def __getitem__(self, key):
+        if key.__class__ is str:
+            try:
+                return tuple.__getitem__(self, self._index[key])
+            except KeyError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def __iter__(self):
+        # Iterates over the keys, like a dictionary
+        return iter(self._fields)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.to_dict()})"
+
+    def __copy__(self):
+        return self
+
+    def __reduce__(self):
+        # The generated types can't be found by name, rebuild
+        # them from the columns when unpickled
+        return (_rebuild_record, (self._fields, tuple(tuple.__iter__(self))))
+
+    def get(self, key, default=None):
+        if key in self._index:
+            return tuple.__getitem__(self, self._index[key])
+        return default
+
+    def keys(self):
+        return self._fields
+
+    def values(self):
+        return tuple(tuple.__iter__(self))
+
+    def items(self):
+        return tuple(zip(self._fields, tuple.__iter__(self)))
+
+    def to_dict(self):
+        """
+        Returns a modifiable dictionary of the record.
+
+        Returns:
+            dict: The columns values by column name.
+        """
+        return dict(zip(self._fields, tuple.__iter__(self)))
+
+
+def get_record_type(columns):
+    """
+    Returns the record type of a set of columns, creating it if needed.
+
+    Args:
+        columns (tuple): The column names, in the order of the fetched values.
+
+    Returns:
+        type: The record type, a subclass of `record`.
+    """
+    columns = tuple(columns)
+    record_type = _record_types.get(columns)
+    if record_type is not None:
+        return record_type
+    with _lock:
+        if columns not in _record_types.keys():
+            _record_types[columns] = type('record', (record,), {
+                '__slots__': (),
+                '_fields': columns,
+                '_index': dict((column, index) for index, column in enumerate(columns))})
+        return _record_types[columns]
+
+
+def _rebuild_record(columns, values):
+    return get_record_type(columns)(values)
+
+
+def make_records(description, rows):
+    """
+    Converts the tuples fetched by a cursor to records.
+
+    Args:
+        description (tuple): The cursor description, giving the column names.
+        rows (list): The fetched tuples.
+
+    Returns:
+        list: The records.
+    """
+    record_type = get_record_type(column[0] for column in description)
+    return list(map(record_type, rows))
+
+
+def make_columns(description, rows):
+    """
+    Converts the tuples fetched by a cursor to columnar lists.
+
+    Args:
+        description (tuple): The cursor description, giving the column names.
+        rows (list): The fetched tuples.
+
+    Returns:
+        dict: A list of values by column name, all the lists have the same length.
+    """
+    columns = [column[0] for column in description]
+    if len(rows) == 0:
+        return dict((column, []) for column in columns)
+    return dict(zip(columns, map(list, zip(*rows))))
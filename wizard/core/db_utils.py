@@ -54,6 +54,7 @@ import logging
 
 # Wizard modules
 from wizard.core import db_core
+from wizard.core import invalidation
 
 logger = logging.getLogger(__name__)
 
@@ -105,7 +106,12 @@ def create_row(level, table, columns, datas):
     sql_cmd += ') RETURNING id;'
 
     # Execute the SQL command and return the ID of the newly inserted row
-    return execute_sql(sql_cmd, level, 0, datas, 1)
+    row_id = execute_sql(sql_cmd, level, 0, datas, 1)
+
+    # Notify the GUI that this table changed, once written
+    if row_id is not None:
+        invalidation.publish(table)
+    return row_id
 
 
 def get_rows(level, table, column='*', order='id', sort=''):
@@ -131,6 +137,46 @@ def get_rows(level, table, column='*', order='id', sort=''):
     return execute_sql(sql_cmd, level, as_dict)
 
 
+def get_records(level, table, order='id', sort=''):
+    """
+    Retrieve all the rows of a table as immutable records ( see `db_records` ).
+
+    The records use less memory than the dictionaries returned by `get_rows`
+    and support the same read access ( `row['name']` ), they are meant for
+    the bulk reads kept in memory, like the search index.
+
+    Args:
+        level (str): The database connection level or identifier.
+        table (str): The name of the table to query.
+        order (str, optional): The column to order the results by. Defaults to 'id'.
+        sort (str, optional): The sorting direction, such as 'ASC' or 'DESC'. Defaults to an empty string.
+
+    Returns:
+        list: The records, None if the query failed.
+    """
+    sql_cmd = f''' SELECT * FROM {table} ORDER BY {order} {sort}'''
+    return execute_sql(sql_cmd, level, 2)
+
+
+def get_columns(level, table, columns, order='id', sort=''):
+    """
+    Retrieve some columns of all the rows of a table as columnar lists.
+
+    Args:
+        level (str): The database connection level or identifier.
+        table (str): The name of the table to query.
+        columns (list): The columns to retrieve.
+        order (str, optional): The column to order the results by. Defaults to 'id'.
+        sort (str, optional): The sorting direction, such as 'ASC' or 'DESC'. Defaults to an empty string.
+
+    Returns:
+        dict: A list of values by column name, None if the query failed.
+              Example: {'id': [1, 2], 'name': ['modeling', 'rigging']}.
+    """
+    sql_cmd = f''' SELECT {(', ').join(columns)} FROM {table} ORDER BY {order} {sort}'''
+    return execute_sql(sql_cmd, level, 3)
+
+
 def get_row_by_column_data(level,
                            table,
                            column_tuple,
@@ -256,6 +302,119 @@ def get_last_row_by_column_data(level,
     return execute_sql(sql_cmd, level, as_dict, (column_tuple[1],))
 
 
+def get_last_rows(level, table, limit, column='*'):
+    """
+    Retrieve the last rows of a database table, using the primary key index.
+    Args:
+        level (str): The database connection level or identifier.
+        table (str): The name of the database table to query.
+        limit (int): The maximum number of rows to retrieve.
+        column (str, optional): The column(s) to retrieve. Defaults to '*', which retrieves all columns.
+    Returns:
+        list: The last `limit` rows, ordered by ascending `id`.
+    Notes:
+        - The rows are read backward from the `id` index, the cost
+            only depends on `limit`, not on the size of the table.
+    """
+
+    sql_cmd = f"SELECT {column} FROM {table} ORDER BY id DESC LIMIT %s;"
+    if column != '*':
+        as_dict = 0
+    else:
+        as_dict = 1
+    rows = execute_sql(sql_cmd, level, as_dict, (limit,))
+    if rows is None:
+        return
+    return rows[::-1]
+
+
+def get_rows_after_id(level, table, last_id, limit=None, column='*'):
+    """
+    Retrieve the rows of a database table with an `id` greater than `last_id` (keyset pagination).
+    Args:
+        level (str): The database connection level or identifier.
+        table (str): The name of the database table to query.
+        last_id (int): The cursor, only the rows with a greater `id` are retrieved.
+        limit (int, optional): The maximum number of rows to retrieve. If given,
+            the most recent rows are kept. Defaults to None (no limit).
+        column (str, optional): The column(s) to retrieve. Defaults to '*', which retrieves all columns.
+    Returns:
+        list: The matching rows, ordered by ascending `id`.
+    """
+
+    if column != '*':
+        as_dict = 0
+    else:
+        as_dict = 1
+    if limit is None:
+        sql_cmd = f"SELECT {column} FROM {table} WHERE id > %s ORDER BY id;"
+        return execute_sql(sql_cmd, level, as_dict, (last_id,))
+    sql_cmd = f"SELECT {column} FROM {table} WHERE id > %s ORDER BY id DESC LIMIT %s;"
+    rows = execute_sql(sql_cmd, level, as_dict, (last_id, limit))
+    if rows is None:
+        return
+    return rows[::-1]
+
+
+def get_rows_page_by_column_data(level,
+                                 table,
+                                 column_tuple,
+                                 limit=None,
+                                 before_id=None,
+                                 after_id=None):
+    """
+    Retrieve a page of the rows matching a column value, with the total count of the
+    matching rows, in a single query (keyset pagination).
+    Args:
+        level (str): The database connection level or identifier.
+        table (str): The name of the database table to query.
+        column_tuple (tuple): A tuple containing the column name and the value to filter by.
+                                Example: ('column_name', 'value_to_match')
+        limit (int, optional): The maximum number of rows to retrieve, the most recent
+            rows of the page are kept. Defaults to None (no limit).
+        before_id (int, optional): Only the rows with a lower `id` are retrieved. Defaults to None.
+        after_id (int, optional): Only the rows with a greater `id` are retrieved. Defaults to None.
+    Returns:
+        tuple: The page rows ordered by ascending `id` and the count of all the rows
+            matching the column value, regardless of the page. None if the query fails.
+    Notes:
+        - The count is computed by the server, comparing it with the count of
+            the previous call detects the removed rows without fetching them.
+        - The count query is always returning one row, the page is joined to it
+            so an empty page still returns the count.
+        - An index on (`column`, `id`) keeps the cost proportional to the page size.
+    """
+
+    conditions = [f"{column_tuple[0]}=%s"]
+    data = [column_tuple[1]]
+    if before_id is not None:
+        conditions.append("id < %s")
+        data.append(before_id)
+    if after_id is not None:
+        conditions.append("id > %s")
+        data.append(after_id)
+    limit_cmd = ''
+    if limit is not None:
+        limit_cmd = ' LIMIT %s'
+        data.append(limit)
+    sql_cmd = f"""SELECT page_count.rows_count, page.* FROM
+                    (SELECT count(*) AS rows_count FROM {table} WHERE {column_tuple[0]}=%s) AS page_count
+                    LEFT JOIN LATERAL
+                    (SELECT * FROM {table} WHERE {' AND '.join(conditions)} ORDER BY id DESC{limit_cmd}) AS page
+                    ON true;"""
+    rows = execute_sql(sql_cmd, level, 1, tuple([column_tuple[1]] + data))
+    if rows is None or len(rows) == 0:
+        return
+    rows_count = rows[0]['rows_count']
+    page_rows = []
+    for row in reversed(rows):
+        if row['id'] is None:
+            continue
+        del row['rows_count']
+        page_rows.append(row)
+    return page_rows, rows_count
+
+
 def check_existence_by_multiple_data(level,
                                      table,
                                      columns_tuple,
@@ -354,7 +513,7 @@ def update_data(level,
     sql_cmd = f''' UPDATE {table}'''
     sql_cmd += f''' SET {set_tuple[0]} = %s'''
     sql_cmd += f''' WHERE {where_tuple[0]} = %s'''
-    return execute_sql(sql_cmd, level, 0, (set_tuple[1], where_tuple[1]), 0)
+    return _execute_and_publish(sql_cmd, level, table, (set_tuple[1], where_tuple[1]))
 
 
 def update_multiple_data(level, table, set_values):
@@ -383,7 +542,7 @@ def update_multiple_data(level, table, set_values):
         sql_cmd += f'''UPDATE {table} SET {value[1]} = %s WHERE id = %s;'''
         all_params = all_params+(value[2],)
         all_params = all_params+(value[0],)
-    return execute_sql(sql_cmd, level, 0, all_params, 0)
+    return _execute_and_publish(sql_cmd, level, table, all_params)
 
 
 def delete_row(level, table, id, column='id'):
@@ -400,7 +559,7 @@ def delete_row(level, table, id, column='id'):
         Any: The result of the `execute_sql` function, which executes the SQL command.
     """
     sql_cmd = f'DELETE FROM {table} WHERE {column}=%s'
-    return execute_sql(sql_cmd, level, 0, (id,), 0)
+    return _execute_and_publish(sql_cmd, level, table, (id,))
 
 
 def delete_rows(level, table):
@@ -415,7 +574,16 @@ def delete_rows(level, table):
         Any: The result of the `execute_sql` function, which executes the SQL command.
     """
     sql_cmd = f'DELETE FROM {table}'
-    return execute_sql(sql_cmd, level, 0, None, 0)
+    return _execute_and_publish(sql_cmd, level, table, None)
+
+
+def _execute_and_publish(sql_cmd, level, table, data):
+    # The table is published after the write, a concurrent
+    # reader can't reload the old rows and clear the change
+    result = execute_sql(sql_cmd, level, 0, data, 0)
+    if result is not None:
+        invalidation.publish(table)
+    return result
 
 
 def check_database_existence(database):
@@ -496,7 +664,8 @@ def execute_sql(sql, level, as_dict, data=None, fetch=2):
     Args:
         sql (str): The SQL query to be executed.
         level (str): The access level or context for the SQL execution.
-        as_dict (bool): Whether to return the results as a dictionary.
+        as_dict (int): The format of the results, 1 for dictionaries, 0 for a list
+                       of values, 2 for records and 3 for columns ( see `db_core` ).
         data (Optional[dict]): The data to be passed as parameters to the SQL query. Defaults to None.
         fetch (int): The fetch mode for the query results. 
                      0 = No fetch, 1 = Fetch one row, 2 = Fetch all rows. Defaults to 2.
@@ -34,25 +34,48 @@ The functions include:
 - Extracting the first frame of a video.
 - Getting the total frame count of a video.
 - Constructing file paths for temporary and concatenated video files.
-- Concatenating video segments with specified in/out points.
+- Concatenating video segments with specified in/out points, the trimmed
+  segments and the concatenations are cached in the temporary directory.
+
+- Encoding raw frames piped to an FFmpeg subprocess ( see `pipe_encoder` ).
 
 These utilities are designed to support the 'wizard' application's video management features.
 """
 
 # Python modules
 import os
+import shutil
+import hashlib
 import subprocess
+import threading
 import ffmpeg
 import logging
 import tempfile
-import cv2
 
 # Wizard core modules
 from wizard.core import path_utils
 from wizard.core import tools
+from wizard.core import video_probe
+from wizard.core import previews
 
 logger = logging.getLogger(__name__)
 
+# Default settings of the pipe encoder, a crf of 18
+# is visually lossless with libx264, 0 threads lets
+# FFmpeg use all the cores
+encoder_settings = dict()
+encoder_settings['codec'] = 'libx264'
+encoder_settings['crf'] = 18
+encoder_settings['preset'] = 'medium'
+encoder_settings['threads'] = 0
+
+# Maximum size of the trimmed segments and concatenations
+# cached in the temporary directory, in bytes
+cache_max_size = 5 * 1024**3
+_cache_lock = threading.Lock()
+# The last concatenated video of each player
+_players_files = dict()
+
 
 def merge_videos(input_files, output_file):
     """
@@ -136,14 +159,19 @@ def get_frames_count(video_file):
     Returns:
         float: The total number of frames in the video. Returns 0 if the video
         file cannot be opened or the frame count cannot be determined.
+
+    Note:
+        - The frames count is read from the video probes cache ( see `video_probe` ).
     """
-    cap = cv2.VideoCapture(video_file)
-    return cap.get(cv2.CAP_PROP_FRAME_COUNT)
+    probe_dic = video_probe.probe(video_file)
+    if probe_dic is None:
+        return 0
+    return probe_dic['frames_count']
 
 
 def extract_first_frame(video_file, temp_dir):
     """
-    Extracts the first frame of a video file and saves it as a PNG image.
+    Extracts the middle frame of a video file and saves it as a PNG image.
 
     Args:
         video_file (str): The path to the video file from which the frame will be extracted.
@@ -153,30 +181,39 @@ def extract_first_frame(video_file, temp_dir):
         str: The full path to the saved PNG image.
 
     Note:
-        - The function captures the first frame of the video and saves it as a PNG file
-          in the specified temporary directory.
+        - The up to date still generated by the previews service ( see `previews` )
+          is returned directly when it exists.
+        - Otherwise the frame is read from the video probes cache ( see `video_probe` ),
+          the video is only opened if it changed since the last extraction.
         - The output file is named using the base name of the video file with a `.png` extension.
     """
-    cap = cv2.VideoCapture(video_file)
-    cap.set(cv2.CAP_PROP_POS_FRAMES, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)/2))
-    ret, frame = cap.read()
+    still_file = previews.get_still(video_file)
+    if still_file is not None:
+        return still_file
     destination_file = path_utils.join(
         temp_dir, f"{path_utils.basename(video_file)}.png")
-    cv2.imwrite(destination_file, frame)
+    thumbnail_bytes = video_probe.get_thumbnail_bytes(video_file)
+    if thumbnail_bytes is not None:
+        with open(destination_file, 'wb') as file:
+            file.write(thumbnail_bytes)
     return destination_file
 
 
 def get_concat_video_file(temp_dir, player_id):
     """
-    Constructs the file path for a concatenated video file.
+    Returns the file path of the last concatenated video of a player.
 
     Args:
         temp_dir (str): The directory where the temporary video file is stored.
-        player_id (str): The identifier for the player, used to name the video file.
+        player_id (str): The identifier for the player.
 
     Returns:
-        str: The full file path of the concatenated video file, named as '{player_id}.mp4'.
+        str: The cached concatenated video of the player if any ( see `concatenate_videos` ),
+            otherwise the legacy '{player_id}.mp4' path.
     """
+    with _cache_lock:
+        if player_id in _players_files.keys():
+            return _players_files[player_id]
     return path_utils.join(temp_dir, f'{player_id}.mp4')
 
 
@@ -184,9 +221,15 @@ def concatenate_videos(temp_dir, player_id, videos_dic, fps=24):
     """
     Concatenates multiple video files into a single video using FFmpeg.
 
+    The trimmed segments and the concatenations are cached in the temporary
+    directory. A segment is identified by its source file ( path, modification
+    time and size ), in point, out point and frame rate, a concatenation by its
+    ordered segments. Playing again a playlist, or changing the in/out points of
+    one clip, only trims the changed clips and concatenates the segments.
+
     Args:
         temp_dir (str): The temporary directory where intermediate files will be stored.
-        player_id (str): A unique identifier for the player, used to name intermediate and output files.
+        player_id (str): A unique identifier for the player, used to name intermediate files.
         videos_dic (dict): A dictionary containing video metadata. Each key represents a video, and the value is a 
             dictionary with the following keys:
                 - 'original_file' (str): The path to the original video file.
@@ -197,39 +240,298 @@ def concatenate_videos(temp_dir, player_id, videos_dic, fps=24):
     Returns:
         str: The path to the concatenated output video file, or None if no files were provided for concatenation.
 
-    Raises:
-        subprocess.SubprocessError: If the FFmpeg command fails during execution.
-
     Notes:
-        - This function generates a temporary text file listing the video files and their in/out points for FFmpeg.
-        - The FFmpeg command is executed with the `-f concat` option to concatenate the videos.
-        - The output video is created without audio (`-an`) and uses the `-preset ultrafast` setting for speed.
-    """
-    # Create a temporary text file to list the video files and their in/out points
-    concat_txt_file = path_utils.join(temp_dir, f'{player_id}.txt')
-    files = []
-    with open(concat_txt_file, 'w') as file:
-        # Write each video's file path and in/out points to the text file
-        for video in videos_dic.keys():
-            file.write(f"file '{videos_dic[video]['original_file']}'\n")
-            file.write(f"inpoint {videos_dic[video]['inpoint']/fps}\n")
-            file.write(f"outpoint {videos_dic[video]['outpoint']/fps}\n")
-            files.append(videos_dic[video]['original_file'])
+        - The videos are stream copied ( `-c copy` ), without audio ( `-an` ).
+        - The cached files are content addressed, a file played by a player is never overwritten.
+        - The cache size is bounded, the least recently used files are removed
+          first ( see `evict_cache` ).
+    """
+    segments_files = []
+    for video in videos_dic.keys():
+        segment_file = get_segment_file(temp_dir,
+                                        videos_dic[video]['original_file'],
+                                        videos_dic[video]['inpoint'],
+                                        videos_dic[video]['outpoint'],
+                                        fps)
+        if segment_file is None:
+            continue
+        segments_files.append(segment_file)
 
     # If no files are provided, log a debug message and return
-    if len(files) == 0:
+    if len(segments_files) == 0:
         logger.debug("No files to concat.")
         return
 
-    # Construct the output video file path
-    output_video_file = get_concat_video_file(temp_dir, player_id)
+    if len(segments_files) == 1:
+        output_video_file = segments_files[0]
+    else:
+        key = _hash_key(segments_files + [fps])
+        output_video_file = path_utils.join(
+            _get_cache_dir(temp_dir, 'concats'), f"{key}.mp4")
+        if not _touch_cached_file(output_video_file):
+            concat_txt_file = path_utils.join(temp_dir, f'{player_id}.txt')
+            with open(concat_txt_file, 'w') as file:
+                for segment_file in segments_files:
+                    file.write(f"file '{segment_file}'\n")
+            if not _run_concat(concat_txt_file, output_video_file, fps):
+                return
+
+    with _cache_lock:
+        _players_files[player_id] = output_video_file
+    evict_cache(temp_dir)
+    return output_video_file
+
+
+def get_segment_file(temp_dir, original_file, inpoint, outpoint, fps=24):
+    """
+    Returns the cached trimmed segment of a video, creates it if needed.
+
+    Args:
+        temp_dir (str): The temporary directory of the cache.
+        original_file (str): The path to the original video file.
+        inpoint (float): The starting point (in frames) of the segment.
+        outpoint (float): The ending point (in frames) of the segment.
+        fps (int, optional): The frame rate of the video. Defaults to 24.
+
+    Returns:
+        str: The path to the segment file, None if the original file
+            is missing or if the segment can't be created.
+    """
+    if not path_utils.isfile(original_file):
+        logger.warning(f"{original_file} not found")
+        return
+    file_stat = os.stat(original_file)
+    key = _hash_key([path_utils.abspath(original_file), file_stat.st_mtime,
+                     file_stat.st_size, inpoint, outpoint, fps])
+    segment_file = path_utils.join(
+        _get_cache_dir(temp_dir, 'segments'), f"{key}.mp4")
+    if _touch_cached_file(segment_file):
+        return segment_file
+
+    segment_txt_file = path_utils.join(
+        _get_cache_dir(temp_dir, 'segments'), f"{key}_{threading.get_ident()}.txt")
+    with open(segment_txt_file, 'w') as file:
+        file.write(f"file '{original_file}'\n")
+        file.write(f"inpoint {inpoint/fps}\n")
+        file.write(f"outpoint {outpoint/fps}\n")
+    success = _run_concat(segment_txt_file, segment_file, fps)
+    os.remove(segment_txt_file)
+    if not success:
+        return
+    return segment_file
+
+
+def evict_cache(temp_dir, max_size=None):
+    """
+    Removes the least recently used segments and concatenations until
+    the cache is smaller than the maximum size.
+
+    The last concatenated video of each player is never removed.
+
+    Args:
+        temp_dir (str): The temporary directory of the cache.
+        max_size (int, optional): The maximum size of the cache in bytes.
+            Defaults to `cache_max_size`.
+    """
+    if max_size is None:
+        max_size = cache_max_size
+    with _cache_lock:
+        protected_files = set(_players_files.values())
+    cached_files = []
+    total_size = 0
+    for cache_name in ['segments', 'concats']:
+        cache_dir = _get_cache_dir(temp_dir, cache_name)
+        for file_name in os.listdir(cache_dir):
+            if not file_name.endswith('.mp4') or file_name.endswith('.tmp.mp4'):
+                continue
+            file = path_utils.join(cache_dir, file_name)
+            try:
+                file_stat = os.stat(file)
+            except OSError:
+                continue
+            total_size += file_stat.st_size
+            if file not in protected_files:
+                cached_files.append((file_stat.st_mtime, file_stat.st_size, file))
+    if total_size <= max_size:
+        return
+    for mtime, size, file in sorted(cached_files):
+        try:
+            os.remove(file)
+        except OSError:
+            # The file may be used by a player
+            continue
+        total_size -= size
+        logger.debug(f"{file} removed from videos cache")
+        if total_size <= max_size:
+            return
+
+
+def clear_player_files(temp_dir, player_id):
+    """
+    Removes the temporary files of a player, its cached videos
+    are kept until they are evicted.
+
+    Args:
+        temp_dir (str): The temporary directory.
+        player_id (str): The identifier for the player.
+    """
+    with _cache_lock:
+        if player_id in _players_files.keys():
+            del _players_files[player_id]
+    for file in [path_utils.join(temp_dir, f'{player_id}.txt'),
+                 path_utils.join(temp_dir, f'{player_id}.mp4')]:
+        if path_utils.isfile(file):
+            try:
+                os.remove(file)
+            except OSError:
+                logger.debug(f"Can't remove {file}")
+
+
+def _hash_key(values):
+    return hashlib.sha1(repr(values).encode('utf8')).hexdigest()
 
-    # Build the FFmpeg command to concatenate the videos
-    command = f"ffmpeg -y -f concat -safe 0 -i {concat_txt_file} -preset ultrafast -c copy -an -r {fps} {output_video_file}"
 
-    # Execute the FFmpeg command and capture the output
+def _get_cache_dir(temp_dir, cache_name):
+    cache_dir = path_utils.join(temp_dir, cache_name)
+    if not path_utils.isdir(cache_dir):
+        path_utils.makedirs(cache_dir)
+    return cache_dir
+
+
+def _touch_cached_file(file):
+    # Updates the modification time used as last access time by the eviction
+    if not path_utils.isfile(file):
+        return False
+    try:
+        os.utime(file)
+    except OSError:
+        pass
+    return True
+
+
+def _run_concat(concat_txt_file, output_video_file, fps):
+    # Writes to a temporary file then renames it, an
+    # interrupted FFmpeg never leaves a partial cached file
+    temp_output_file = f"{path_utils.splitext(output_video_file)[0]}_{threading.get_ident()}.tmp.mp4"
+    command = ['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', concat_txt_file,
+               '-c', 'copy', '-an', '-r', str(fps), temp_output_file]
     res = subprocess.run(command, stderr=subprocess.PIPE,
                          stdout=subprocess.PIPE)
+    if res.returncode != 0 or not path_utils.isfile(temp_output_file):
+        logger.error(
+            f"Can't create {output_video_file} : {res.stderr.decode('utf8', errors='replace')}")
+        if path_utils.isfile(temp_output_file):
+            os.remove(temp_output_file)
+        return False
+    os.replace(temp_output_file, output_video_file)
+    return True
 
-    # Return the path to the concatenated video file
-    return output_video_file
+
+def is_ffmpeg_available():
+    """
+    Checks if the FFmpeg executable can be found in the PATH.
+
+    Returns:
+        bool: True if FFmpeg is available.
+    """
+    return shutil.which('ffmpeg') is not None
+
+
+class pipe_encoder:
+    """
+    Encodes raw RGB frames written to the stdin of an FFmpeg subprocess.
+
+    The frames are never written to disk before encoding and FFmpeg
+    encodes them with several threads while the next frames are prepared.
+
+    Args:
+        output_file (str): The path of the video file to write.
+        width (int): The width of the frames.
+        height (int): The height of the frames.
+        frame_rate (float): The frame rate of the video.
+        codec (str, optional): The FFmpeg video codec. Defaults to the `encoder_settings` codec.
+        crf (int, optional): The constant rate factor, None to use the codec default.
+            Defaults to the `encoder_settings` crf.
+        preset (str, optional): The codec preset, None to use the codec default.
+            Defaults to the `encoder_settings` preset.
+        threads (int, optional): The number of encoding threads, 0 for automatic.
+            Defaults to the `encoder_settings` threads.
+
+    Notes:
+        - The frames are padded to even dimensions, required by the yuv420p pixel format.
+        - FFmpeg errors are collected by a thread so the subprocess never blocks on its stderr.
+    """
+
+    def __init__(self, output_file, width, height, frame_rate, codec=None, crf=None, preset=None, threads=None):
+        self.output_file = output_file
+        self.frame_size = width * height * 3
+        settings = dict(encoder_settings)
+        for key, value in [('codec', codec), ('crf', crf), ('preset', preset), ('threads', threads)]:
+            if value is not None:
+                settings[key] = value
+
+        command = ['ffmpeg', '-y', '-loglevel', 'error',
+                   '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                   '-s', f"{width}x{height}", '-r', str(frame_rate),
+                   '-i', '-', '-an',
+                   '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+                   '-c:v', settings['codec']]
+        if settings['crf'] is not None:
+            command += ['-crf', str(settings['crf'])]
+        if settings['preset'] is not None:
+            command += ['-preset', settings['preset']]
+        command += ['-threads', str(settings['threads']),
+                    '-pix_fmt', 'yuv420p', output_file]
+        logger.debug(' '.join(command))
+
+        self.process = subprocess.Popen(command,
+                                        stdin=subprocess.PIPE,
+                                        stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.PIPE)
+        self.errors = []
+        self.errors_thread = threading.Thread(
+            target=self.read_errors, daemon=True)
+        self.errors_thread.start()
+
+    def read_errors(self):
+        for line in self.process.stderr:
+            self.errors.append(line.decode('utf8', errors='replace').strip())
+
+    def write(self, frame):
+        """
+        Writes one frame to the encoder.
+
+        Args:
+            frame (numpy.ndarray or bytes): The RGB frame, uint8 values of shape (height, width, 3).
+
+        Raises:
+            IOError: If the frame doesn't have the encoder size or FFmpeg stopped.
+        """
+        data = frame if isinstance(frame, bytes) else frame.tobytes()
+        if len(data) != self.frame_size:
+            raise IOError(
+                f"Frame size mismatch, {len(data)} bytes instead of {self.frame_size}")
+        try:
+            self.process.stdin.write(data)
+        except (BrokenPipeError, OSError):
+            self.errors_thread.join(timeout=1)
+            raise IOError(f"FFmpeg stopped : {' '.join(self.errors)}")
+
+    def close(self):
+        """
+        Closes the encoder and waits for FFmpeg to finish the video.
+
+        Returns:
+            bool: True if the video was successfully encoded.
+        """
+        try:
+            self.process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        returncode = self.process.wait()
+        self.errors_thread.join(timeout=1)
+        if returncode != 0:
+            logger.error(
+                f"FFmpeg failed to encode {self.output_file} : {' '.join(self.errors)}")
+            return False
+        return True
@@ -31,9 +31,12 @@ This module provides a collection of utility functions for image processing and
 It includes functionalities such as resizing, cropping, converting images to different formats,
 generating random images, and handling screenshots. The module leverages the Pillow library
 for image manipulation and PyQt6 for capturing screenshots.
+PyQt6 is only imported by the screenshot functions, the module
+can be used by the headless tools without loading Qt.
 
 Key functionalities:
-- Screenshot capturing and thumbnail generation.
+- Screenshot capturing and thumbnail generation, optionally encoded
+  and written by a background worker.
 - Image resizing and cropping while maintaining aspect ratios.
 - Conversion between different image formats (e.g., bytes, strings, PIL images).
 - Random image generation with customizable text and background colors.
@@ -46,33 +49,82 @@ Dependencies:
 """
 
 # Python modules
-from PyQt6 import QtGui, QtCore
 from PIL import Image, ImageCms, ImageFont, ImageDraw
 import io
 import base64
 import random
 import colorsys
 import os
+import queue
+import threading
+import atexit
+import logging
 
 # Wizard modules
 from wizard.core import tools
 from wizard.core import path_utils
 
+logger = logging.getLogger(__name__)
 
-def screenshot(file, thumbnail_file):
+_screenshots_queue = queue.Queue()
+_screenshots_lock = threading.Lock()
+_screenshots_done = threading.Condition()
+_screenshots_worker = None
+_screenshots_listeners = []
+_reserved_files = set()
+
+
+def screenshot(file, thumbnail_file, asynchronous=False, callback=None):
     """
     Captures a screenshot of the current screen, resizes it, and saves both the 
     full-sized image and a thumbnail version to the specified file paths.
     Args:
         file (str): The file path where the full-sized screenshot will be saved.
         thumbnail_file (str): The file path where the thumbnail image will be saved.
+        asynchronous (bool, optional): Only grabs the screen on the calling thread,
+            the resizing, compression and writing are done by a background worker. Defaults to False.
+        callback (function, optional): Called by the worker with the screenshot file, the thumbnail
+            file and a success boolean once the files are written. Defaults to None.
     Returns:
         tuple: A tuple containing the paths of the saved full-sized image and thumbnail image.
     Notes:
         - The full-sized image is resized to a maximum width of 1000 pixels while maintaining aspect ratio.
         - The thumbnail image is resized to a fixed width of 200 pixels while maintaining aspect ratio.
         - The images are saved in PNG and JPEG formats respectively.
+        - In asynchronous mode the returned paths are reserved but the files may
+          not be written yet, use `flush_screenshots` to wait for them.
+    """
+    # Capture the raw buffer of the screen
+    screen_buffer = grab_screen()
+
+    if not asynchronous:
+        save_file = tools.get_filename_without_override(file)
+        save_thumbnail_file = tools.get_filename_without_override(
+            thumbnail_file)
+        write_screenshot(screen_buffer, save_file, save_thumbnail_file)
+        return save_file, save_thumbnail_file
+
+    # Reserve the file names until the worker writes the files
+    with _screenshots_lock:
+        save_file = _reserve_filename(file)
+        save_thumbnail_file = _reserve_filename(thumbnail_file)
+    _get_screenshots_worker()
+    _screenshots_queue.put((screen_buffer, save_file,
+                           save_thumbnail_file, callback))
+    return save_file, save_thumbnail_file
+
+
+def grab_screen():
+    """
+    Grabs the screen where the cursor is currently located.
+
+    Only the capture is done, the buffer is not encoded.
+
+    Returns:
+        tuple: The raw RGBA bytes, the width, the height and the bytes per line of the capture.
     """
+    from PyQt6 import QtGui
+
     # Get the screen where the cursor is currently located
     screen = QtGui.QGuiApplication.screenAt(QtGui.QCursor().pos())
 
@@ -88,8 +140,29 @@ def screenshot(file, thumbnail_file):
         0, x=x, y=y, width=width, height=height
     )
 
-    # Convert the captured pixmap to a PIL image
-    base_image = pixmap_to_PIL(pixmap)
+    # Copy the pixels, the QImage can't leave the calling thread
+    qimage = pixmap.toImage().convertToFormat(
+        QtGui.QImage.Format.Format_RGBA8888)
+    bits = qimage.constBits()
+    bits.setsize(qimage.sizeInBytes())
+    return bytes(bits), qimage.width(), qimage.height(), qimage.bytesPerLine()
+
+
+def write_screenshot(screen_buffer, file, thumbnail_file):
+    """
+    Resizes and writes a screen capture and its thumbnail.
+
+    The files are written under a temporary name and renamed
+    once complete, a reader never gets a partial image.
+
+    Args:
+        screen_buffer (tuple): The capture returned by `grab_screen`.
+        file (str): The file path of the full-sized image.
+        thumbnail_file (str): The file path of the thumbnail image.
+    """
+    raw, width, height, bytes_per_line = screen_buffer
+    base_image = Image.frombuffer('RGBA', (width, height), raw,
+                                  'raw', 'RGBA', bytes_per_line, 1).convert('RGB')
 
     # Resize the base image to a maximum width of 1000 pixels while maintaining aspect ratio
     image = resize_image(base_image, 1000)
@@ -97,20 +170,96 @@ def screenshot(file, thumbnail_file):
     # Create a thumbnail by resizing the base image to a fixed width of 200 pixels
     thumbnail, null, null = resize_image_with_fixed_width(base_image, 200)
 
-    # Generate a unique file name for the full-sized image
-    save_file = tools.get_filename_without_override(file)
-
-    # Generate a unique file name for the thumbnail image
-    save_thumbnail_file = tools.get_filename_without_override(thumbnail_file)
-
     # Save the full-sized image in PNG format
-    image.save(save_file, format="PNG")
+    image.save(f"{file}.tmp", format="PNG")
+    os.replace(f"{file}.tmp", file)
 
     # Save the thumbnail image in JPEG format
-    thumbnail.save(save_thumbnail_file, format="JPEG")
+    thumbnail.save(f"{thumbnail_file}.tmp", format="JPEG")
+    os.replace(f"{thumbnail_file}.tmp", thumbnail_file)
 
-    # Return the file paths of the saved full-sized image and thumbnail
-    return save_file, save_thumbnail_file
+
+def flush_screenshots(timeout=None):
+    """
+    Waits for the asynchronous screenshots to be written.
+
+    Called at exit, the pending screenshots are never lost.
+
+    Args:
+        timeout (float, optional): The maximum time to wait in seconds. Defaults to None ( no limit ).
+
+    Returns:
+        bool: True if all the screenshots are written.
+    """
+    with _screenshots_done:
+        return _screenshots_done.wait_for(lambda: _screenshots_queue.unfinished_tasks == 0,
+                                          timeout=timeout)
+
+
+def add_screenshot_listener(listener):
+    """
+    Registers a function called by the worker with the screenshot file and
+    the thumbnail file each time an asynchronous screenshot is written.
+
+    Args:
+        listener (function): A function taking the two file paths.
+    """
+    with _screenshots_lock:
+        if listener not in _screenshots_listeners:
+            _screenshots_listeners.append(listener)
+
+
+def _reserve_filename(file):
+    # Same naming as tools.get_filename_without_override, the
+    # files not written yet by the worker are also avoided
+    folder = path_utils.dirname(file)
+    filename, extension = os.path.splitext(os.path.basename(file))
+    index = 1
+    while file in _reserved_files or path_utils.isfile(file):
+        file = path_utils.join(folder, f"{filename}_{index}{extension}")
+        index += 1
+    _reserved_files.add(file)
+    return file
+
+
+def _get_screenshots_worker():
+    global _screenshots_worker
+    with _screenshots_lock:
+        if _screenshots_worker is None:
+            _screenshots_worker = threading.Thread(target=_screenshots_loop,
+                                                   daemon=True)
+            _screenshots_worker.start()
+            atexit.register(flush_screenshots)
+    return _screenshots_worker
+
+
+def _screenshots_loop():
+    while True:
+        screen_buffer, file, thumbnail_file, callback = _screenshots_queue.get()
+        success = True
+        try:
+            write_screenshot(screen_buffer, file, thumbnail_file)
+        except Exception as e:
+            logger.error(f"Can't write the screenshot {file} : {e}")
+            success = False
+        with _screenshots_lock:
+            _reserved_files.discard(file)
+            _reserved_files.discard(thumbnail_file)
+            listeners = list(_screenshots_listeners)
+        if success:
+            for listener in listeners:
+                try:
+                    listener(file, thumbnail_file)
+                except Exception as e:
+                    logger.debug(e)
+        if callback is not None:
+            try:
+                callback(file, thumbnail_file, success)
+            except Exception as e:
+                logger.error(e)
+        with _screenshots_done:
+            _screenshots_queue.task_done()
+            _screenshots_done.notify_all()
 
 
 def pixmap_to_PIL(pixmap):
@@ -126,6 +275,8 @@ def pixmap_to_PIL(pixmap):
     Returns:
         PIL.Image.Image: The resulting PIL.Image object.
     """
+    from PyQt6 import QtCore
+
     buffer = QtCore.QBuffer()
     buffer.open(QtCore.QIODevice.OpenModeFlag.ReadWrite)
     pixmap.save(buffer, "PNG")
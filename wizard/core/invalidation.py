@@ -0,0 +1,111 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# This file is part of Wizard
+
+# MIT License
+
+# Copyright (c) 2021 Leo brunel
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+This module keeps track of the database tables modified by the current
+process so the GUI can refresh only the widgets displaying them.
+
+Every write going through `db_utils` publishes the name of the modified
+table here. When `gui_server.refresh_ui()` is called, the pending changes
+are popped and sent along with the refresh signal. The GUI then dispatches
+them to the widgets subscribed to those tables instead of refreshing
+everything.
+
+In-process caches ( see `search_index` ) can register a listener to be
+notified as soon as a table is published.
+
+Functions:
+    - publish(table): Records a modification of the given table.
+    - pop_changes(): Returns and clears the tables modified since the last call.
+    - get_changes(): Returns the tables modified since the last pop, without clearing them.
+    - add_listener(listener): Registers a function called with the tables published.
+
+Dependencies:
+    - Python modules: threading, logging
+"""
+
+# Python modules
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_changed_tables = set()
+_listeners = []
+
+
+def publish(table):
+    """
+    Records a modification of the given table.
+
+    Args:
+        table (str): The name of the modified database table.
+    """
+    with _lock:
+        _changed_tables.add(table)
+        listeners = list(_listeners)
+    for listener in listeners:
+        listener([table])
+
+
+def pop_changes():
+    """
+    Returns the tables modified since the last call and clears them.
+
+    Returns:
+        list: The sorted list of modified table names.
+    """
+    with _lock:
+        changes = sorted(_changed_tables)
+        _changed_tables.clear()
+    return changes
+
+
+def get_changes():
+    """
+    Returns the tables modified since the last pop, without clearing them.
+
+    Returns:
+        list: The sorted list of modified table names.
+    """
+    with _lock:
+        return sorted(_changed_tables)
+
+
+def add_listener(listener):
+    """
+    Registers a function called with the list of tables each time a table is published.
+
+    Args:
+        listener (function): A function taking a list of table names.
+    """
+    with _lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
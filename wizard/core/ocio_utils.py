@@ -35,6 +35,7 @@ PNG image formats. It includes functions for:
 - Saving NumPy arrays as PNG images.
 - Applying color transformations using OCIO configurations.
 - Retrieving available color spaces from an OCIO configuration.
+- Reading EXR files as 8 bits arrays for the video encoders.
 
 The module is designed to integrate with the Wizard project and relies on 
 external libraries such as PyOpenColorIO, OpenEXR, and NumPy.
@@ -42,10 +43,11 @@ external libraries such as PyOpenColorIO, OpenEXR, and NumPy.
 
 # Python modules
 import os
+import threading
+import concurrent.futures
 import PyOpenColorIO as OCIO
 import OpenEXR
 import Imath
-import os
 import numpy as np
 from PIL import Image
 
@@ -93,38 +95,21 @@ def _find_channel_name(header_channels, short_name):
                     return name
         return None
 
-def exr_to_rgba_array(file_path, channel=None):
+def _resolve_channel_names(header_channels, channel=None):
     """
-    Converts an OpenEXR file to a 4-channel RGBA numpy array.
+    Finds the R, G, B and A channel names of an EXR header for the given channel group.
+
     Args:
-        file_path (str): The file path to the OpenEXR file.
+        header_channels (dict): The 'channels' of the EXR header.
+        channel (str, optional): The channel group, 'RGB', 'RGBA', a layer prefix
+            or None to find any R, G, B channels. Defaults to None.
+
     Returns:
-        numpy.ndarray: A 3D numpy array of shape (height, width, 4) containing 
-        the RGBA data. Each channel (R, G, B, A) is represented as a float32 
-        value. If the EXR file does not contain an alpha channel, the alpha 
-        values will default to 1.0.
+        tuple: The R, G, B and A channel names, the A name is None if absent.
+
     Raises:
-        OpenEXR.InputFileError: If the file cannot be opened or read.
-        ValueError: If the EXR file contains invalid or corrupted data.
-    Notes:
-        - The function assumes the EXR file uses float32 pixel data.
-        - The alpha channel is optional in the EXR file. If absent, the alpha 
-          values are set to 1.0 by default.
+        ValueError: If the R, G or B channel can't be found.
     """
-    # Open the EXR file
-    exr_file = OpenEXR.InputFile(file_path)
-
-    # Get the image size (resolution)
-    header = exr_file.header()
-    dw = header['dataWindow']
-    width = dw.max.x - dw.min.x + 1
-    height = dw.max.y - dw.min.y + 1
-
-    # Define the channel type for R, G, B, and A (float)
-    FLOAT = Imath.PixelType(Imath.PixelType.FLOAT)
-
-    header_channels = header['channels']
-
     # Find actual channel names for R, G, B based on channel parameter
     if channel:
         # Special handling for basic RGB/RGBA channel groups
@@ -172,31 +157,90 @@ def exr_to_rgba_array(file_path, channel=None):
                 "Could not find R/G/B channels in EXR header. Available channels: {}".format(available)
             )
 
-    # Read the found channels
-    r_channel = exr_file.channel(r_name, FLOAT)
-    g_channel = exr_file.channel(g_name, FLOAT)
-    b_channel = exr_file.channel(b_name, FLOAT)
+    return r_name, g_name, b_name, a_name
+
+
+# The resolved channel names by header channels and channel group,
+# the frames of a sequence share the same header
+_channel_names_cache = dict()
+
+
+def _get_channel_names(header_channels, channel=None):
+    key = (tuple(sorted(header_channels.keys())), channel)
+    if key not in _channel_names_cache.keys():
+        _channel_names_cache[key] = _resolve_channel_names(
+            header_channels, channel)
+    return _channel_names_cache[key]
+
+
+# The float buffers the EXR files are read into, one by thread,
+# reused from one frame to the next
+_buffers = threading.local()
+
+
+def _read_in_thread_buffer(file_path, channel=None):
+    img = exr_to_rgba_array(file_path, channel=channel,
+                            out=getattr(_buffers, 'img', None))
+    _buffers.img = img
+    return img
+
+
+def exr_to_rgba_array(file_path, channel=None, out=None):
+    """
+    Converts an OpenEXR file to a 4-channel RGBA numpy array.
+    Args:
+        file_path (str): The file path to the OpenEXR file.
+        channel (str, optional): The channel group to read ( see `_resolve_channel_names` ).
+        out (numpy.ndarray, optional): A float32 array of shape (height, width, 4)
+            to read the pixels into, it is reused if it has the image shape.
+            Defaults to None, a new array is allocated.
+    Returns:
+        numpy.ndarray: A 3D numpy array of shape (height, width, 4) containing 
+        the RGBA data. Each channel (R, G, B, A) is represented as a float32 
+        value. If the EXR file does not contain an alpha channel, the alpha 
+        values will default to 1.0.
+    Raises:
+        OpenEXR.InputFileError: If the file cannot be opened or read.
+        ValueError: If the EXR file contains invalid or corrupted data.
+    Notes:
+        - The function assumes the EXR file uses float32 pixel data.
+        - The alpha channel is optional in the EXR file. If absent, the alpha 
+          values are set to 1.0 by default.
+        - The channels are read in one call and copied in the
+          interleaved array, no intermediate array is stacked.
+    """
+    # Open the EXR file
+    exr_file = OpenEXR.InputFile(file_path)
+
+    # Get the image size (resolution)
+    header = exr_file.header()
+    dw = header['dataWindow']
+    width = dw.max.x - dw.min.x + 1
+    height = dw.max.y - dw.min.y + 1
 
-    # Read alpha channel if it exists
+    # Define the channel type for R, G, B, and A (float)
+    FLOAT = Imath.PixelType(Imath.PixelType.FLOAT)
+
+    r_name, g_name, b_name, a_name = _get_channel_names(
+        header['channels'], channel)
+    names = [r_name, g_name, b_name]
     if a_name:
-        a_channel = exr_file.channel(a_name, FLOAT)
-        has_alpha = True
-    else:
-        # Default alpha is 1.0 if absent
-        a_channel = np.full((width * height), 1.0, dtype=np.float32)
-        has_alpha = False
+        names.append(a_name)
 
-    # Convert the strings to numpy arrays and reshape them to 2D arrays
-    r = np.frombuffer(r_channel, dtype=np.float32).reshape(height, width)
-    g = np.frombuffer(g_channel, dtype=np.float32).reshape(height, width)
-    b = np.frombuffer(b_channel, dtype=np.float32).reshape(height, width)
-    a = np.frombuffer(a_channel, dtype=np.float32).reshape(
-        height, width) if has_alpha else np.ones((height, width), dtype=np.float32)
+    if out is None or out.shape != (height, width, 4) or out.dtype != np.float32:
+        out = np.empty((height, width, 4), dtype=np.float32)
 
-    # Stack the channels into a single RGBA array
-    rgba_array = np.stack([r, g, b, a], axis=-1)
+    # Copy the channels in the interleaved array
+    for index, channel_data in enumerate(exr_file.channels(names, FLOAT)):
+        out[:, :, index] = np.frombuffer(
+            channel_data, dtype=np.float32).reshape(height, width)
+    if not a_name:
+        # Default alpha is 1.0 if absent
+        out[:, :, 3] = 1.0
+    exr_file.close()
+
+    return out
 
-    return rgba_array
 
 def list_exr_channels(file_path):
     """
@@ -290,39 +334,15 @@ def convert_exr_to_png_with_color_transform(files, output_dir, ics, ocs, channel
                                 the current OCIO configuration will be used.
     Returns:
         int: Returns 1 on successful conversion of all files.
-    Raises:
-        Exception: If an error occurs during the color transformation or file processing.
     Notes:
-        - This function uses OpenColorIO to perform the color transformation.
-        - The `exr_to_rgba_array` function is expected to convert an EXR file to an RGBA array.
-        - The `save_as_png` function is expected to save an RGBA array as a PNG file.
-        - The `project.get_OCIO()` function is used to retrieve the OCIO configuration file
-          if not explicitly provided.
+        - The CPU processor is cached by configuration and color spaces
+          ( see `get_color_processor` ).
+        - The files are converted by a pool of threads ( see `convert_exr_files` ).
     """
-    try:
-        OCIO_config_file = project.get_OCIO()
-        if OCIO_config_file:
-            config = OCIO.Config.CreateFromFile(OCIO_config_file)
-        else:
-            config = OCIO.GetCurrentConfig()
-        OCIO.SetCurrentConfig(config)
-        processor = config.getProcessor(OCIO.ColorSpaceTransform(
-            src=ics,
-            dst=ocs
-        ))
-        cpu = processor.getDefaultCPUProcessor()
-
-        # Apply the color transform to the existing RGBA pixel data
-        for file in files:
-            img = exr_to_rgba_array(file, channel=channel)
-            cpu.applyRGBA(img)
-            file_path = path_utils.join(
-                output_dir, f"{path_utils.basename(path_utils.splitext(file)[0])}.png")
-            save_as_png(img, file_path)
-        return 1
-
-    except Exception as e:
-        print("OpenColorIO Error: ", e)
+    cpu_processor = get_color_processor(ics, ocs, OCIO_config_file)
+    if cpu_processor is None:
+        return
+    return convert_exr_files(files, output_dir, channel=channel, cpu_processor=cpu_processor)
 
 
 def convert_exr_to_png(files, output_dir):
@@ -337,17 +357,54 @@ def convert_exr_to_png(files, output_dir):
         int: Returns 1 upon successful completion of the conversion process.
 
     Notes:
-        - This function assumes the existence of helper functions `exr_to_rgba_array`, 
-          `path_utils.join`, `path_utils.basename`, `path_utils.splitext`, and `save_as_png`.
         - The output PNG files will have the same base name as the input EXR files.
+        - The files are converted by a pool of threads ( see `convert_exr_files` ).
+    """
+    return convert_exr_files(files, output_dir)
+
+
+def convert_exr_files(files, output_dir, channel=None, cpu_processor=None, max_workers=None):
+    """
+    Converts EXR files to PNG files with a pool of threads.
+
+    Each file is decoded, transformed and encoded by one worker. The
+    EXR decoding, the OCIO transform, the numpy conversion and the PNG
+    compression release the GIL, so the threads run on several cores.
+    Each worker reads the pixels in its own reusable float buffer.
+
+    Args:
+        files (list of str): A list of file paths to the EXR files to be converted.
+        output_dir (str): The directory where the converted PNG files will be saved.
+        channel (str, optional): The channel group to read. Defaults to None.
+        cpu_processor (PyOpenColorIO.CPUProcessor, optional): The color transformation
+            to apply. Defaults to None.
+        max_workers (int, optional): The number of threads. Defaults to the number of CPU cores.
+
+    Returns:
+        int: Returns 1 if all the files were converted, None otherwise.
     """
-    for file in files:
-        logger.info(f"Converting EXR to PNG: {file}")
-        img = exr_to_rgba_array(file)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    def convert(file):
+        img = _read_in_thread_buffer(file, channel)
+        if cpu_processor is not None:
+            cpu_processor.applyRGBA(img)
         file_path = path_utils.join(
             output_dir, f"{path_utils.basename(path_utils.splitext(file)[0])}.png")
         save_as_png(img, file_path)
-    return 1
+        return file
+
+    success = 1
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(convert, file) for file in files]
+        for future in futures:
+            try:
+                logger.info(f"Converted EXR to PNG: {future.result()}")
+            except Exception as e:
+                logger.error(f"Can't convert EXR to PNG : {e}")
+                success = None
+    return success
 
 
 def exr_to_png(files, output_dir, ics=None, ocs=None, channel=None):
@@ -381,6 +438,72 @@ def exr_to_png(files, output_dir, ics=None, ocs=None, channel=None):
                                                    OCIO_config_file=OCIO_config_file)
 
 
+# The CPU processors by ( configuration file, input color space, output color space ),
+# building a processor parses the configuration and compiles the transform
+_processors_lock = threading.Lock()
+_processors = dict()
+
+
+def get_color_processor(ics, ocs, OCIO_config_file=None):
+    """
+    Returns the OpenColorIO CPU processor transforming the input color space to the output color space.
+
+    The processors are cached, they are built once by configuration
+    file and color spaces. A CPU processor can be shared between threads.
+
+    Args:
+        ics (str): The input color space name.
+        ocs (str): The output color space name.
+        OCIO_config_file (str, optional): The OCIO configuration file.
+            Defaults to the project OCIO configuration.
+
+    Returns:
+        PyOpenColorIO.CPUProcessor: The CPU processor, None if there is no
+            OCIO configuration or if the processor can't be built.
+    """
+    if OCIO_config_file is None:
+        OCIO_config_file = project.get_OCIO()
+    if not OCIO_config_file:
+        return
+    key = (OCIO_config_file, ics, ocs)
+    with _processors_lock:
+        if key in _processors.keys():
+            return _processors[key]
+        try:
+            config = OCIO.Config.CreateFromFile(OCIO_config_file)
+            processor = config.getProcessor(OCIO.ColorSpaceTransform(
+                src=ics,
+                dst=ocs
+            ))
+            _processors[key] = processor.getDefaultCPUProcessor()
+        except Exception as e:
+            logger.error(f"OpenColorIO Error: {e}")
+            return
+        return _processors[key]
+
+
+def exr_to_rgba8_array(file_path, channel=None, cpu_processor=None):
+    """
+    Reads an EXR file as an 8 bits RGBA array, optionally applying a color transformation.
+
+    This is used to feed the EXR frames directly to a video encoder,
+    without writing intermediate PNG files.
+
+    Args:
+        file_path (str): The file path to the OpenEXR file.
+        channel (str, optional): The channel group to read ( see `exr_to_rgba_array` ). Defaults to None.
+        cpu_processor (PyOpenColorIO.CPUProcessor, optional): The color transformation
+            to apply ( see `get_color_processor` ). Defaults to None.
+
+    Returns:
+        numpy.ndarray: A uint8 array of shape (height, width, 4).
+    """
+    img = _read_in_thread_buffer(file_path, channel)
+    if cpu_processor is not None:
+        cpu_processor.applyRGBA(img)
+    return (np.clip(img, 0.0, 1.0) * 255).astype(np.uint8)
+
+
 def get_OCIO_available_color_spaces():
     """
     Retrieves a list of available color spaces from the current or specified 
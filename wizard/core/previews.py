@@ -0,0 +1,471 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# This file is part of Wizard
+
+# MIT License
+
+# Copyright (c) 2021 Leo brunel
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+This module generates the previews of the videos and images sequences in batch.
+
+A preview job produces:
+    - the missing thumbnail referenced by a 'videos' or 'work_versions' row,
+    - a still of the middle frame,
+    - optionally a contact sheet of evenly spaced frames.
+
+The stills and contact sheets of the videos are written alongside each
+video, in a 'previews' folder, one of each by video. They are up to date
+if they are newer than their video, an unchanged video is never processed
+twice and the same source referenced by several jobs is processed once by
+batch. The files are written under a temporary name and renamed once
+complete. The video manager reads the stills as the clips thumbnails
+( see `ffmpeg_utils.extract_first_frame` ) and the video browser shows the
+contact sheets.
+
+The jobs are run by a pool of threads ( OpenCV and PIL release the GIL
+while decoding and encoding ). The batch can be started from the GUI or
+as a subtask ( see `subtasks_library.prewarm_previews` ) to pre-warm a
+whole project.
+
+Functions:
+    - get_source_key(files): Returns the hash identifying a source.
+    - get_still_file(video_file): Returns the path of the still of a video.
+    - get_contact_sheet_file(video_file): Returns the path of the contact sheet of a video.
+    - get_still(video_file): Returns the up to date still of a video.
+    - get_contact_sheet(video_file): Returns the up to date contact sheet of a video.
+    - video_previews(job): Generates the previews of a video.
+    - sequence_previews(job): Generates the previews of an images sequence.
+    - generate_previews(jobs, max_workers=None, print_progress=False): Runs a batch of jobs.
+    - get_project_jobs(contact_sheets=False): Returns the jobs of all the project videos and work versions.
+    - prewarm_project(contact_sheets=False, max_workers=None, print_progress=False): Generates the missing previews of the project.
+
+Dependencies:
+    - Python modules: os, hashlib, threading, concurrent.futures, logging
+    - External modules: cv2, PIL
+    - Wizard core modules: path_utils, project, image, video_probe
+"""
+
+# Python modules
+import os
+import hashlib
+import threading
+import concurrent.futures
+import logging
+import cv2
+from PIL import Image
+
+# Wizard modules
+from wizard.core import path_utils
+from wizard.core import project
+from wizard.core import image
+from wizard.core import video_probe
+
+logger = logging.getLogger(__name__)
+
+_thumbnail_width = 200
+_still_max_width = 960
+_sheet_frames = 12
+_sheet_columns = 4
+_sheet_tile_width = 320
+_previews_dir_name = 'previews'
+
+
+def get_source_key(files):
+    """
+    Returns the hash identifying a source, a video file or the files of an images sequence.
+
+    Args:
+        files (list): The source files.
+
+    Returns:
+        str: The hash of the files paths, modification times and sizes.
+    """
+    key_data = []
+    for file in files:
+        file_stat = os.stat(file)
+        key_data.append((path_utils.abspath(file),
+                        file_stat.st_mtime, file_stat.st_size))
+    return hashlib.sha1(repr(key_data).encode('utf8')).hexdigest()
+
+
+def get_still_file(video_file):
+    """
+    Returns the path of the still of a video, the file may not exist.
+
+    Args:
+        video_file (str): The video file.
+
+    Returns:
+        str: The still file.
+    """
+    video_name = path_utils.splitext(path_utils.basename(video_file))[0]
+    return path_utils.join(path_utils.dirname(video_file), _previews_dir_name,
+                           f"{video_name}_still.png")
+
+
+def get_contact_sheet_file(video_file):
+    """
+    Returns the path of the contact sheet of a video, the file may not exist.
+
+    Args:
+        video_file (str): The video file.
+
+    Returns:
+        str: The contact sheet file.
+    """
+    video_name = path_utils.splitext(path_utils.basename(video_file))[0]
+    return path_utils.join(path_utils.dirname(video_file), _previews_dir_name,
+                           f"{video_name}_sheet.jpg")
+
+
+def get_still(video_file):
+    """
+    Returns the still of a video if it is up to date.
+
+    Args:
+        video_file (str): The video file.
+
+    Returns:
+        str: The still file, None if it doesn't exist or is older than the video.
+    """
+    return _get_up_to_date_file(get_still_file(video_file), [video_file])
+
+
+def get_contact_sheet(video_file):
+    """
+    Returns the contact sheet of a video if it is up to date.
+
+    Args:
+        video_file (str): The video file.
+
+    Returns:
+        str: The contact sheet file, None if it doesn't exist or is older than the video.
+    """
+    return _get_up_to_date_file(get_contact_sheet_file(video_file), [video_file])
+
+
+def _get_up_to_date_file(file, source_files):
+    if not file:
+        return
+    try:
+        file_mtime = os.stat(file).st_mtime
+        sources_mtime = max(os.stat(source_file).st_mtime
+                            for source_file in source_files)
+    except (OSError, ValueError):
+        return
+    if file_mtime < sources_mtime:
+        return
+    return file
+
+
+def _save_image(pil_image, file, image_format, **kwargs):
+    # Written under a temporary name then renamed, an
+    # interrupted job never leaves a partial preview
+    folder = path_utils.dirname(file)
+    if not path_utils.isdir(folder):
+        path_utils.makedirs(folder)
+    temp_file = f"{path_utils.splitext(file)[0]}_{threading.get_ident()}.tmp"
+    try:
+        pil_image.save(temp_file, format=image_format, **kwargs)
+        os.replace(temp_file, file)
+    finally:
+        if path_utils.isfile(temp_file):
+            os.remove(temp_file)
+
+
+def _resize_to_width(pil_image, width):
+    if pil_image.width <= width:
+        return pil_image
+    return pil_image.resize((width, int(pil_image.height*width/pil_image.width)),
+                            Image.Resampling.LANCZOS)
+
+
+def _save_thumbnail(pil_image, thumbnail_file):
+    thumbnail, null, null = image.resize_image_with_fixed_width(
+        pil_image, _thumbnail_width)
+    _save_image(thumbnail.convert('RGB'), thumbnail_file,
+                image_format=_get_format(thumbnail_file))
+
+
+def _get_format(file):
+    extension = path_utils.splitext(file)[-1].lower()
+    if extension in ['.jpg', '.jpeg']:
+        return 'JPEG'
+    return 'PNG'
+
+
+def _build_contact_sheet(pil_images, contact_sheet_file):
+    tiles = [_resize_to_width(pil_image.convert('RGB'), _sheet_tile_width)
+             for pil_image in pil_images]
+    tile_height = max(tile.height for tile in tiles)
+    columns = min(_sheet_columns, len(tiles))
+    rows = (len(tiles) + columns - 1) // columns
+    sheet = Image.new('RGB', (columns*_sheet_tile_width,
+                      rows*tile_height), (30, 30, 30))
+    for index, tile in enumerate(tiles):
+        sheet.paste(tile, ((index % columns)*_sheet_tile_width,
+                           (index // columns)*tile_height))
+    _save_image(sheet, contact_sheet_file, 'JPEG', quality=85)
+
+
+def _get_sheet_indexes(frames_count):
+    frames_count = int(frames_count)
+    if frames_count <= 0:
+        return []
+    count = min(_sheet_frames, frames_count)
+    return sorted(set(int((index + 0.5) * frames_count / count) for index in range(count)))
+
+
+def _read_video_frame(cap, frame_index):
+    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+    ret, frame = cap.read()
+    if not ret:
+        return
+    return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+
+def _get_needs(job, source_files):
+    # The outputs to generate, the others exist and are up to date
+    thumbnail_file = job.get('thumbnail_file')
+    still_file = job.get('still_file')
+    contact_sheet_file = job.get('contact_sheet_file')
+    need_thumbnail = bool(thumbnail_file) and not path_utils.isfile(
+        thumbnail_file)
+    need_still = bool(still_file) and _get_up_to_date_file(
+        still_file, source_files) is None
+    need_sheet = bool(contact_sheet_file) and _get_up_to_date_file(
+        contact_sheet_file, source_files) is None
+    return need_thumbnail, need_still, need_sheet
+
+
+def _get_results(job):
+    results = dict(thumbnail=None, still=None, contact_sheet=None)
+    for result_key, job_key in [('thumbnail', 'thumbnail_file'),
+                                ('still', 'still_file'),
+                                ('contact_sheet', 'contact_sheet_file')]:
+        if job.get(job_key) and path_utils.isfile(job[job_key]):
+            results[result_key] = job[job_key]
+    return results
+
+
+def video_previews(job):
+    """
+    Generates the previews of a video.
+
+    Args:
+        job (dict): The job, see `generate_previews`.
+
+    Returns:
+        dict: The 'thumbnail', 'still' and 'contact_sheet' files, None for the
+            files not generated.
+    """
+    video_file = job['source']
+    need_thumbnail, need_still, need_sheet = _get_needs(job, [video_file])
+    if not (need_thumbnail or need_still or need_sheet):
+        return _get_results(job)
+
+    probe_dic = video_probe.probe(video_file)
+    if probe_dic is None or not probe_dic['frames_count']:
+        logger.warning(f"Can't read {video_file}")
+        return _get_results(job)
+
+    cap = None
+    try:
+        if need_thumbnail or need_still:
+            cap = cv2.VideoCapture(video_file)
+            still = _read_video_frame(cap, int(probe_dic['frames_count']/2))
+            if still is not None:
+                if need_thumbnail:
+                    _save_thumbnail(still, job['thumbnail_file'])
+                if need_still:
+                    _save_image(_resize_to_width(still, _still_max_width),
+                                job['still_file'], 'PNG')
+        if need_sheet:
+            if cap is None:
+                cap = cv2.VideoCapture(video_file)
+            frames = [_read_video_frame(cap, frame_index)
+                      for frame_index in _get_sheet_indexes(probe_dic['frames_count'])]
+            frames = [frame for frame in frames if frame is not None]
+            if len(frames) > 0:
+                _build_contact_sheet(frames, job['contact_sheet_file'])
+    finally:
+        if cap is not None:
+            cap.release()
+    return _get_results(job)
+
+
+def sequence_previews(job):
+    """
+    Generates the previews of an images sequence, or of a single image.
+
+    Args:
+        job (dict): The job, see `generate_previews`.
+
+    Returns:
+        dict: The 'thumbnail', 'still' and 'contact_sheet' files, None for the
+            files not generated.
+    """
+    files_list = sorted(job['source'])
+    if len(files_list) == 0:
+        return _get_results(job)
+    need_thumbnail, need_still, need_sheet = _get_needs(job, files_list)
+
+    if need_thumbnail or need_still:
+        still = Image.open(files_list[int(len(files_list)/2)])
+        if need_thumbnail:
+            _save_thumbnail(still, job['thumbnail_file'])
+        if need_still:
+            _save_image(_resize_to_width(still.convert('RGB'), _still_max_width),
+                        job['still_file'], 'PNG')
+    if need_sheet:
+        _build_contact_sheet([Image.open(files_list[index]) for index in _get_sheet_indexes(len(files_list))],
+                             job['contact_sheet_file'])
+    return _get_results(job)
+
+
+def generate_previews(jobs, max_workers=None, print_progress=False):
+    """
+    Runs a batch of preview jobs with a pool of threads.
+
+    A job is a dictionary with the keys:
+        - 'type': 'video' or 'sequence'.
+        - 'source': The video file, or the list of image files of the sequence.
+        - 'thumbnail_file' ( optional ): The thumbnail to generate if missing.
+        - 'still_file' ( optional ): The still to generate if missing or outdated.
+        - 'contact_sheet_file' ( optional ): The contact sheet to generate if missing or outdated.
+
+    The jobs with the same source and outputs are merged.
+
+    Args:
+        jobs (list): The jobs.
+        max_workers (int, optional): The number of threads. Defaults to the number of CPU cores.
+        print_progress (bool, optional): Prints the progress for the subtask manager. Defaults to False.
+
+    Returns:
+        list: The results of the jobs, in order ( see `video_previews` ), None for the failed jobs.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    unique_jobs = dict()
+    jobs_keys = []
+    for job in jobs:
+        files = [job['source']] if job['type'] == 'video' else job['source']
+        try:
+            source_key = get_source_key(files)
+        except OSError:
+            logger.warning(
+                f"Preview source not found : {files[0] if files else job['source']}")
+            jobs_keys.append(None)
+            continue
+        job_key = (source_key, job.get('thumbnail_file'),
+                   job.get('still_file'), job.get('contact_sheet_file'))
+        if job_key not in unique_jobs.keys():
+            unique_jobs[job_key] = job
+        jobs_keys.append(job_key)
+
+    results_dic = dict()
+    if len(unique_jobs) > 0:
+        percent_step = 100.0/len(unique_jobs)
+        percent = 0.0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = dict()
+            for job_key, job in unique_jobs.items():
+                if job['type'] == 'video':
+                    futures[executor.submit(video_previews, job)] = job_key
+                else:
+                    futures[executor.submit(sequence_previews, job)] = job_key
+            for future in concurrent.futures.as_completed(futures.keys()):
+                job_key = futures[future]
+                try:
+                    results_dic[job_key] = future.result()
+                except Exception as e:
+                    logger.error(
+                        f"Can't generate the previews of {unique_jobs[job_key]['source']} : {e}")
+                    results_dic[job_key] = None
+                percent += percent_step
+                if print_progress:
+                    print(f"wizard_task_percent:{percent}")
+
+    return [results_dic.get(job_key) for job_key in jobs_keys]
+
+
+def get_project_jobs(contact_sheets=False):
+    """
+    Returns the preview jobs of all the project videos and work versions.
+
+    The videos get their missing thumbnail, a still and optionally a contact
+    sheet. The work versions only get their missing thumbnail, rebuilt from
+    their screenshot.
+
+    Args:
+        contact_sheets (bool, optional): Generates the contact sheets of the videos. Defaults to False.
+
+    Returns:
+        list: The jobs ( see `generate_previews` ).
+    """
+    jobs = []
+    for video_row in project.get_all_videos() or []:
+        if not path_utils.isfile(video_row['file_path']):
+            continue
+        job = dict()
+        job['type'] = 'video'
+        job['source'] = video_row['file_path']
+        job['thumbnail_file'] = video_row['thumbnail_path']
+        job['still_file'] = get_still_file(video_row['file_path'])
+        if contact_sheets:
+            job['contact_sheet_file'] = get_contact_sheet_file(
+                video_row['file_path'])
+        jobs.append(job)
+    for version_row in project.get_all_work_versions() or []:
+        if not version_row['thumbnail_path'] or not version_row['screenshot_path']:
+            continue
+        if path_utils.isfile(version_row['thumbnail_path']) or not path_utils.isfile(version_row['screenshot_path']):
+            continue
+        job = dict()
+        job['type'] = 'sequence'
+        job['source'] = [version_row['screenshot_path']]
+        job['thumbnail_file'] = version_row['thumbnail_path']
+        jobs.append(job)
+    return jobs
+
+
+def prewarm_project(contact_sheets=False, max_workers=None, print_progress=False):
+    """
+    Generates the missing previews of all the project videos and work versions.
+
+    Args:
+        contact_sheets (bool, optional): Generates the contact sheets of the videos. Defaults to False.
+        max_workers (int, optional): The number of threads. Defaults to the number of CPU cores.
+        print_progress (bool, optional): Prints the progress for the subtask manager. Defaults to False.
+
+    Returns:
+        int: The number of jobs run.
+    """
+    jobs = get_project_jobs(contact_sheets)
+    logger.info(f"Generating the previews of {len(jobs)} files")
+    generate_previews(jobs, max_workers=max_workers,
+                      print_progress=print_progress)
+    logger.info("Previews generated")
+    return len(jobs)
@@ -1649,6 +1649,34 @@ def get_asset_tracking_events(stage_id, column='*'):
     return asset_tracking_events_rows
 
 
+def get_asset_tracking_timeline(stage_id, limit=None, before_id=None, after_id=None):
+    """
+    Retrieve a page of the asset tracking events of a stage and the stage events count in one query.
+
+    The events are paginated by id, use `limit` to get the most recent events,
+    `before_id` to get older events and `after_id` to only get the events
+    created since the last call.
+
+    Args:
+        stage_id (int): The ID of the stage for which to retrieve asset tracking events.
+        limit (int, optional): The maximum number of events to retrieve, the most
+            recent events of the page are kept. Defaults to None (no limit).
+        before_id (int, optional): Only the events with a lower ID are retrieved. Defaults to None.
+        after_id (int, optional): Only the events with a greater ID are retrieved. Defaults to None.
+
+    Returns:
+        tuple: The events rows ordered by ascending ID and the count of all the stage events.
+            An events count lower than the known events count means some events were removed.
+        None: If the query fails.
+    """
+    return db_utils.get_rows_page_by_column_data('project',
+                                                 'asset_tracking_events',
+                                                 ('stage_id', stage_id),
+                                                 limit=limit,
+                                                 before_id=before_id,
+                                                 after_id=after_id)
+
+
 def get_all_progress_events(column='*'):
     """
     Retrieve all progress events from the 'progress_events' table in the database.
@@ -5014,6 +5042,50 @@ def get_all_events(column='*'):
     return events_rows
 
 
+def get_latest_events(limit, column='*'):
+    """
+    Retrieve the most recent events from the 'events' table in the 'project' database.
+
+    Args:
+        limit (int): The maximum number of events to retrieve.
+        column (str): The column(s) to retrieve from the 'events' table. 
+                      Defaults to '*' to select all columns.
+
+    Returns:
+        list: A list of the `limit` most recent events, ordered by ascending id.
+    """
+    events_rows = db_utils.get_last_rows('project',
+                                         'events',
+                                         limit,
+                                         column)
+    return events_rows
+
+
+def get_events_after(last_id, limit=None, column='*'):
+    """
+    Retrieve the events created after a given event from the 'events' table in the 'project' database.
+
+    The events are filtered on their id ( keyset pagination ), so the query
+    cost doesn't depend on the size of the 'events' table.
+
+    Args:
+        last_id (int): The id of the last known event.
+        limit (int, optional): The maximum number of events to retrieve, the most
+                               recent ones are kept. Defaults to None (no limit).
+        column (str): The column(s) to retrieve from the 'events' table. 
+                      Defaults to '*' to select all columns.
+
+    Returns:
+        list: A list of the events with an id greater than `last_id`, ordered by ascending id.
+    """
+    events_rows = db_utils.get_rows_after_id('project',
+                                             'events',
+                                             last_id,
+                                             limit,
+                                             column)
+    return events_rows
+
+
 def add_shelf_separator():
     """
     Creates a new shelf separator entry in the 'shelf_scripts' table of the 'project' database.
@@ -6926,6 +6998,9 @@ def create_asset_tracking_events_table(database):
                                         stage_id integer NOT NULL,
                                         FOREIGN KEY (stage_id) REFERENCES stages (id)
                                     );"""
+    if not db_utils.create_table(database, sql_cmd):
+        return
+    sql_cmd = """CREATE INDEX IF NOT EXISTS asset_tracking_events_stage_id_index ON asset_tracking_events (stage_id, id);"""
     if not db_utils.create_table(database, sql_cmd):
         return
     logger.info("Asset tracking events table created")
@@ -7498,6 +7573,9 @@ def create_events_table(database):
                                         additional_message text,
                                         image_path text
                                     );"""
+    if not db_utils.create_table(database, sql_cmd):
+        return
+    sql_cmd = """CREATE INDEX IF NOT EXISTS events_creation_time_index ON events (creation_time);"""
     if not db_utils.create_table(database, sql_cmd):
         return
     logger.info("Events table created")
@@ -0,0 +1,335 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# This file is part of Wizard
+
+# MIT License
+
+# Copyright (c) 2021 Leo brunel
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+This module is an opt-in live profiler of the GUI refreshes.
+
+When enabled, every profiled block ( the refresh bus refreshes, the main
+widget refreshes and the search index queries of the search threads )
+records a sample with:
+    - The wall time.
+    - The number of SQL queries and fetched rows, counted by `db_core`
+      for the current thread.
+    - The number of items in the widget views after the block, when an
+      items counter is given and the items counting is enabled. Walking
+      the views is slow, it is done after the timer stops and only on
+      request.
+
+The samples are aggregated by name ( count, mean, p95, max, total ) on a
+rolling history, so the worst offenders and the durations histograms can
+be displayed by the refresh profiler widget. Every sample is written to
+the refresh profiler log file, the slow ones are also logged as warnings
+so they appear in the logging widget. A report can be dumped as json to
+be attached to a bug.
+
+The profiler is disabled by default and costs a single check per profiled
+block. Enable it with the 'wizard_refresh_profiler' environment variable
+set to 1, from the refresh profiler widget, or from the console:
+
+    from wizard.core import refresh_profiler
+    refresh_profiler.enable()
+    refresh_profiler.dump_report()
+
+Functions:
+    - enable(): Starts recording the samples.
+    - disable(): Stops recording the samples.
+    - is_enabled(): Returns True if the profiler records the samples.
+    - set_count_items(count_items): Enables or disables the items counting.
+    - is_counting_items(): Returns True if the items are counted.
+    - profile(name, items_counter=None): Context manager recording a sample.
+    - get_stats(): Returns the aggregated stats by name, worst offenders first.
+    - get_histogram(name, bins=10): Returns the rolling durations histogram of a name.
+    - get_samples(): Returns the last recorded samples.
+    - reset(): Clears the recorded samples and stats.
+    - dump_report(file_path=None): Writes a json report and returns its path.
+
+Dependencies:
+    - Python modules: collections, contextlib, datetime, json, os, threading, time, logging
+    - Wizard modules: db_core, custom_logger, path_utils, user_vars, env_vars
+"""
+
+# Python modules
+import collections
+import contextlib
+import datetime
+import json
+import os
+import threading
+import time
+import logging
+
+# Wizard modules
+from wizard.core import db_core
+from wizard.core import custom_logger
+from wizard.core import path_utils
+from wizard.vars import user_vars
+from wizard.vars import env_vars
+
+logger = logging.getLogger(__name__)
+samples_logger = logging.getLogger(f"{__name__}.samples")
+
+_history_size = 200
+_samples_size = 500
+_slow_threshold = 0.5
+
+_lock = threading.Lock()
+_enabled = False
+_count_items = False
+_file_handler = None
+_stats = dict()
+_samples = collections.deque(maxlen=_samples_size)
+
+
+def enable():
+    """
+    Starts recording the samples, they are also written to the
+    refresh profiler log file.
+    """
+    global _enabled
+    global _file_handler
+    if _enabled:
+        return
+    if _file_handler is None:
+        _file_handler = custom_logger.add_file_handler(
+            samples_logger.name, user_vars._refresh_profiler_log_)
+    _enabled = True
+    logger.info("Refresh profiler enabled")
+
+
+def disable():
+    """
+    Stops recording the samples, the recorded stats are kept.
+    """
+    global _enabled
+    if not _enabled:
+        return
+    _enabled = False
+    logger.info("Refresh profiler disabled")
+
+
+def is_enabled():
+    """
+    Returns True if the profiler records the samples.
+
+    Returns:
+        bool: The profiler state.
+    """
+    return _enabled
+
+
+def set_count_items(count_items):
+    """
+    Enables or disables the counting of the items of the profiled widgets.
+
+    Args:
+        count_items (bool): True to count the items.
+    """
+    global _count_items
+    _count_items = bool(count_items)
+
+
+def is_counting_items():
+    """
+    Returns True if the items of the profiled widgets are counted.
+
+    Returns:
+        bool: The items counting state.
+    """
+    return _count_items
+
+
+@contextlib.contextmanager
+def profile(name, items_counter=None):
+    """
+    Records a sample of the wrapped block, if the profiler is enabled.
+
+    Args:
+        name (str): The sample name, for example 'tree_widget.refresh'.
+        items_counter (callable, optional): A function returning the number of
+            items of the profiled widget, called after the block if the items
+            counting is enabled.
+    """
+    if not _enabled:
+        yield
+        return
+    queries_count, rows_count = db_core.get_thread_stats()
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start_time
+        new_queries_count, new_rows_count = db_core.get_thread_stats()
+        sample = dict()
+        sample['name'] = name
+        sample['time'] = time.time()
+        sample['duration'] = duration
+        sample['queries'] = new_queries_count - queries_count
+        sample['rows'] = new_rows_count - rows_count
+        # Counted once the timer is stopped
+        sample['items'] = items_counter() if (
+            items_counter and _count_items) else 0
+        sample['thread'] = threading.current_thread().name
+        _add_sample(sample)
+
+
+def _add_sample(sample):
+    with _lock:
+        _samples.append(sample)
+        if sample['name'] not in _stats.keys():
+            stats = dict()
+            stats['count'] = 0
+            stats['total'] = 0.0
+            stats['max'] = 0.0
+            stats['queries'] = 0
+            stats['rows'] = 0
+            stats['items'] = 0
+            stats['durations'] = collections.deque(maxlen=_history_size)
+            _stats[sample['name']] = stats
+        stats = _stats[sample['name']]
+        stats['count'] += 1
+        stats['total'] += sample['duration']
+        stats['max'] = max(stats['max'], sample['duration'])
+        stats['queries'] += sample['queries']
+        stats['rows'] += sample['rows']
+        stats['items'] += sample['items']
+        stats['durations'].append(sample['duration'])
+    message = (f"{sample['name']} : {round(sample['duration'], 3)}s, "
+               f"{sample['queries']} queries, {sample['rows']} rows, {sample['items']} items")
+    samples_logger.debug(message)
+    if sample['duration'] > _slow_threshold:
+        logger.warning(f"Slow refresh, {message}")
+
+
+def get_stats():
+    """
+    Returns the aggregated stats of the recorded samples.
+
+    Returns:
+        list: A dictionary by sample name ( name, count, mean, p95, max, total,
+            queries, rows, items ), sorted by total time, worst offenders first.
+            The queries, rows and items are means by sample, the p95 is
+            computed on the rolling history.
+    """
+    stats_list = []
+    with _lock:
+        for name, stats in _stats.items():
+            durations = sorted(stats['durations'])
+            stats_dic = dict()
+            stats_dic['name'] = name
+            stats_dic['count'] = stats['count']
+            stats_dic['mean'] = stats['total'] / stats['count']
+            stats_dic['p95'] = durations[min(
+                len(durations)-1, int(len(durations)*0.95))]
+            stats_dic['max'] = stats['max']
+            stats_dic['total'] = stats['total']
+            stats_dic['queries'] = stats['queries'] / stats['count']
+            stats_dic['rows'] = stats['rows'] / stats['count']
+            stats_dic['items'] = stats['items'] / stats['count']
+            stats_list.append(stats_dic)
+    return sorted(stats_list, key=lambda stats_dic: stats_dic['total'], reverse=True)
+
+
+def get_histogram(name, bins=10):
+    """
+    Returns the histogram of the rolling durations of a sample name.
+
+    Args:
+        name (str): The sample name.
+        bins (int, optional): The number of bins. Defaults to 10.
+
+    Returns:
+        tuple: The bins upper bounds in seconds and the samples count of each bin,
+            two empty lists if the name has no samples.
+    """
+    with _lock:
+        if name not in _stats.keys():
+            return [], []
+        durations = list(_stats[name]['durations'])
+    bin_size = max(durations) / bins or 1.0
+    counts = [0] * bins
+    for duration in durations:
+        counts[min(bins-1, int(duration/bin_size))] += 1
+    bounds = [bin_size*(index+1) for index in range(bins)]
+    return bounds, counts
+
+
+def get_samples():
+    """
+    Returns the last recorded samples.
+
+    Returns:
+        list: The samples dictionaries ( name, time, duration, queries, rows,
+            items, thread ), oldest first.
+    """
+    with _lock:
+        return list(_samples)
+
+
+def reset():
+    """
+    Clears the recorded samples and stats.
+    """
+    with _lock:
+        _stats.clear()
+        _samples.clear()
+
+
+def dump_report(file_path=None):
+    """
+    Writes a json report of the recorded stats, histograms and samples.
+
+    Args:
+        file_path (str, optional): The report file path. Defaults to a
+            timestamped file in the user refresh profiler reports folder.
+
+    Returns:
+        str: The report file path.
+    """
+    if file_path is None:
+        if not path_utils.isdir(user_vars._refresh_profiler_reports_path_):
+            path_utils.makedirs(user_vars._refresh_profiler_reports_path_)
+        file_name = f"refresh_profiler_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        file_path = path_utils.join(
+            user_vars._refresh_profiler_reports_path_, file_name)
+    stats_list = get_stats()
+    report = dict()
+    report['time'] = time.time()
+    report['user'] = os.environ.get(env_vars._username_env_)
+    report['project'] = os.environ.get(env_vars._project_name_env_)
+    report['stats'] = stats_list
+    report['histograms'] = dict((stats_dic['name'], get_histogram(stats_dic['name']))
+                                for stats_dic in stats_list)
+    report['samples'] = get_samples()
+    with open(file_path, 'w') as f:
+        json.dump(report, f, indent=4)
+    logger.info(f"Refresh profiler report written to {file_path}")
+    return file_path
+
+
+if os.environ.get(env_vars._refresh_profiler_) == '1':
+    enable()
@@ -812,6 +812,51 @@ def get_user_names_list():
     return db_utils.get_rows('repository', 'users', 'user_name')
 
 
+def get_users_pictures_hashes():
+    """
+    Retrieve the user names and the hash of their profile picture from the 'users' table in the 'repository' database.
+
+    The hash is computed by PostgreSQL, the pictures themselves are not
+    transferred. The users are ordered like in `get_users_list()`.
+
+    Returns:
+        list: A list of rows with the 'user_name' and 'picture_hash' keys.
+    """
+    sql_cmd = "SELECT user_name, md5(profile_picture) AS picture_hash FROM users ORDER BY level DESC, total_xp DESC;"
+    return db_utils.execute_sql(sql_cmd, 'repository', 1)
+
+
+def get_users_pictures(user_names):
+    """
+    Retrieve the profile pictures of the given users from the 'users' table in the 'repository' database.
+
+    Args:
+        user_names (list): The names of the users.
+
+    Returns:
+        list: A list of rows with the 'user_name' and 'profile_picture' keys.
+    """
+    sql_cmd = "SELECT user_name, profile_picture FROM users WHERE user_name = ANY(%s);"
+    return db_utils.execute_sql(sql_cmd, 'repository', 1, (list(user_names),))
+
+
+def get_users_names_by_ids(user_ids):
+    """
+    Retrieve the names of the given users from the 'users' table in the 'repository' database.
+
+    Args:
+        user_ids (list): The IDs of the users.
+
+    Returns:
+        dict: The user names by user ID, the unknown IDs are missing.
+    """
+    sql_cmd = "SELECT id, user_name FROM users WHERE id = ANY(%s);"
+    users_rows = db_utils.execute_sql(sql_cmd, 'repository', 1, (list(user_ids),))
+    if users_rows is None:
+        return dict()
+    return dict((user_row['id'], user_row['user_name']) for user_row in users_rows)
+
+
 def get_user_row_by_name(name, column='*'):
     """
     Retrieve a user row from the 'users' table in the 'repository' database 
@@ -0,0 +1,382 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# This file is part of Wizard
+
+# MIT License
+
+# Copyright (c) 2021 Leo brunel
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+This module holds an in-memory search index of the project, shared by
+all the search widgets and their search threads.
+
+The rows of the searched tables are loaded once and kept in memory.
+Each "view" builds a normalized ( upper case ) text document per row,
+splits it into tokens and indexes the tokens by trigrams. A keyword is
+matched against the vocabulary instead of every row:
+the trigrams narrow the candidate tokens, the tokens give the row ids.
+Keywords containing spaces fall back to a scan of the prebuilt
+documents, rows are never copied.
+
+The tables are marked as stale when they are published to
+`invalidation` ( local writes ) or when `invalidate()` is called
+( team changes received by the GUI ). A stale table is reloaded on the
+next query and only the rows that changed are re-indexed.
+
+Search syntax, shared by every search bar:
+    - 'a&b' : rows matching both keywords
+    - 'a+b' : rows matching one of the keywords sets
+
+Functions:
+    - search(view_name, search_data, or_separator='+'): Returns the ids of the matching rows.
+    - get_rows(table): Returns the cached rows of a table, by id.
+    - get_id_set(name): Returns a precomputed set of ids.
+    - invalidate(tables): Marks tables as stale.
+    - invalidate_all(): Marks every loaded table as stale.
+    - match_rows(rows, search_data, skip_columns=None, suffix='', or_separator='+'):
+        Same matching on a list of rows owned by a widget.
+
+Dependencies:
+    - Python modules: threading, logging, time
+    - Wizard core modules: project, db_utils, invalidation, refresh_profiler
+"""
+
+# Python modules
+import threading
+import logging
+import time
+
+# Wizard modules
+from wizard.core import project
+from wizard.core import db_utils
+from wizard.core import invalidation
+from wizard.core import refresh_profiler
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+_keywords_cache_size = 256
+
+# The cached rows are shared and never modified, they are
+# loaded as immutable records ( see db_records ) to save memory
+_loaders = dict()
+for _table in ['stages', 'assets', 'categories', 'assets_groups', 'groups']:
+    _loaders[_table] = (lambda table=_table: db_utils.get_records('project', table))
+
+_id_sets_loaders = dict()
+_id_sets_loaders['exported_stage_ids'] = ('export_versions',
+                                          lambda: project.get_all_export_versions('stage_id'))
+
+_tables = dict()
+_id_sets = dict()
+_stale = set()
+
+
+class search_view(object):
+    def __init__(self, table, skip_columns=None, columns=None, removed_strings=None, suffix=''):
+        self.table = table
+        self.skip_columns = set(skip_columns or [])
+        self.columns = columns
+        self.removed_strings = removed_strings or []
+        self.suffix = suffix
+        self.clear()
+
+    def clear(self):
+        self.documents = dict()
+        self.tokens = dict()
+        self.trigrams = dict()
+        self.keywords_cache = dict()
+
+    def build_document(self, row):
+        if self.columns is not None:
+            values = [str(row[column]) for column in self.columns]
+        else:
+            values = [str(row[column])
+                      for column in row if column not in self.skip_columns]
+        document = (' ').join(values)
+        for removed_string in self.removed_strings:
+            document = document.replace(removed_string, '')
+        return (document + self.suffix).upper()
+
+    def update_row(self, row_id, row):
+        # row=None removes the row from the view
+        old_document = self.documents.get(row_id)
+        document = None
+        if row is not None:
+            document = self.build_document(row)
+        if document == old_document:
+            return
+        self.keywords_cache = dict()
+        if old_document is not None:
+            for token in set(old_document.split()):
+                self.remove_token(token, row_id)
+            del self.documents[row_id]
+        if document is not None:
+            self.documents[row_id] = document
+            for token in set(document.split()):
+                self.add_token(token, row_id)
+
+    def add_token(self, token, row_id):
+        if token not in self.tokens.keys():
+            self.tokens[token] = set()
+            for trigram in get_trigrams(token):
+                self.trigrams.setdefault(trigram, set()).add(token)
+        self.tokens[token].add(row_id)
+
+    def remove_token(self, token, row_id):
+        if token not in self.tokens.keys():
+            return
+        self.tokens[token].discard(row_id)
+        if len(self.tokens[token]) > 0:
+            return
+        del self.tokens[token]
+        for trigram in get_trigrams(token):
+            if trigram in self.trigrams.keys():
+                self.trigrams[trigram].discard(token)
+                if len(self.trigrams[trigram]) == 0:
+                    del self.trigrams[trigram]
+
+    def match_keyword(self, keyword):
+        if keyword in self.keywords_cache.keys():
+            return self.keywords_cache[keyword]
+        if keyword == '':
+            row_ids = set(self.documents.keys())
+        elif len(keyword.split()) != 1 or keyword != keyword.strip():
+            # The keyword spans several tokens
+            row_ids = set(row_id for row_id, document in self.documents.items()
+                          if keyword in document)
+        else:
+            candidates = None
+            for trigram in get_trigrams(keyword):
+                tokens = self.trigrams.get(trigram, set())
+                if candidates is None:
+                    candidates = tokens
+                else:
+                    candidates = candidates & tokens
+                if len(candidates) == 0:
+                    break
+            if candidates is None:
+                # Keyword shorter than a trigram
+                candidates = self.tokens.keys()
+            row_ids = set()
+            for token in candidates:
+                if keyword in token:
+                    row_ids.update(self.tokens[token])
+        if len(self.keywords_cache) > _keywords_cache_size:
+            self.keywords_cache = dict()
+        self.keywords_cache[keyword] = row_ids
+        return row_ids
+
+
+_views = dict()
+_views['tree_stages'] = search_view('stages',
+                                    skip_columns=['id', 'creation_time', 'creation_user',
+                                                  'work_time', 'progress', 'estimated_time',
+                                                  'default_variant_id', 'asset_id', 'domain_id'])
+_views['tree_assets_groups'] = search_view('assets_groups',
+                                           skip_columns=['id', 'creation_time', 'creation_user',
+                                                         'color', 'category_id'])
+_views['production_stages'] = search_view('stages',
+                                          skip_columns=[
+                                              'id', 'creation_time', 'creation_user'],
+                                          removed_strings=['assets', 'sequences'])
+_views['calendar_stages'] = search_view('stages',
+                                        skip_columns=['id', 'creation_time', 'creation_user'])
+_views['reference_stages'] = search_view('stages', columns=['string'])
+_views['reference_groups'] = search_view('groups', columns=['name'],
+                                         suffix='groups')
+
+
+def get_trigrams(string):
+    """
+    Returns the set of the 3 characters substrings of a string.
+
+    Args:
+        string (str): The string to split.
+
+    Returns:
+        set: The trigrams, empty if the string is shorter than 3 characters.
+    """
+    return set(string[index:index+3] for index in range(len(string)-2))
+
+
+def _ensure_table(table):
+    if table in _tables.keys() and table not in _stale:
+        return
+    rows = _loaders[table]()
+    if rows is None:
+        logger.debug(f"Can't load {table} in the search index")
+        return
+    start_time = time.perf_counter()
+    rows_dic = dict((row['id'], row) for row in rows)
+    old_rows_dic = _tables.get(table, dict())
+    views = [view for view in _views.values() if view.table == table]
+    for row_id, row in rows_dic.items():
+        if old_rows_dic.get(row_id) != row:
+            for view in views:
+                view.update_row(row_id, row)
+    for row_id in set(old_rows_dic.keys()) - set(rows_dic.keys()):
+        for view in views:
+            view.update_row(row_id, None)
+    _tables[table] = rows_dic
+    _stale.discard(table)
+    logger.debug(
+        f"{table} indexed in {round(time.perf_counter()-start_time, 4)}s")
+
+
+def get_rows(table):
+    """
+    Returns the cached rows of a table.
+
+    The rows are shared immutable records ( see `db_records` ), use
+    `to_dict()` to get a modifiable copy.
+
+    Args:
+        table (str): The table name, one of the indexed tables.
+
+    Returns:
+        dict: The rows by id.
+    """
+    with _lock:
+        _ensure_table(table)
+        return _tables.get(table, dict())
+
+
+def get_id_set(name):
+    """
+    Returns a precomputed set of ids, for example 'exported_stage_ids'.
+
+    Args:
+        name (str): The name of the id set.
+
+    Returns:
+        frozenset: The ids.
+    """
+    with _lock:
+        table, loader = _id_sets_loaders[name]
+        if name not in _id_sets.keys() or (table, name) in _stale:
+            ids = loader()
+            if ids is not None:
+                _id_sets[name] = frozenset(ids)
+                _stale.discard((table, name))
+        return _id_sets.get(name, frozenset())
+
+
+def search(view_name, search_data, or_separator='+'):
+    """
+    Returns the ids of the rows matching a search.
+
+    Args:
+        view_name (str): The name of the view, for example 'tree_stages'.
+        search_data (str): The search bar content.
+        or_separator (str, optional): The keywords sets separator, None to disable it. Defaults to '+'.
+
+    Returns:
+        set: The ids of the matching rows.
+    """
+    with refresh_profiler.profile(f"search_index.search({view_name})"), _lock:
+        view = _views[view_name]
+        _ensure_table(view.table)
+        return _match(view.match_keyword, search_data, or_separator)
+
+
+def _match(match_keyword, search_data, or_separator):
+    if or_separator:
+        keywords_sets = search_data.split(or_separator)
+    else:
+        keywords_sets = [search_data]
+    result = set()
+    for keywords_set in keywords_sets:
+        if keywords_set == '':
+            continue
+        row_ids = None
+        for keyword in keywords_set.split('&'):
+            keyword_ids = match_keyword(keyword.upper())
+            if row_ids is None:
+                row_ids = set(keyword_ids)
+            else:
+                row_ids &= keyword_ids
+            if len(row_ids) == 0:
+                break
+        result |= row_ids
+    return result
+
+
+def match_rows(rows, search_data, skip_columns=None, suffix='', or_separator='+'):
+    """
+    Returns the ids of the matching rows of a list owned by a widget.
+
+    Used for the small row sets that are not worth a project wide
+    index ( versions of a work environment, references... ).
+    The rows are read, never copied or modified.
+
+    Args:
+        rows (list): The rows to search.
+        search_data (str): The search bar content.
+        skip_columns (list, optional): The columns ignored by the search.
+        suffix (str, optional): A string appended to every document.
+        or_separator (str, optional): The keywords sets separator, None to disable it. Defaults to '+'.
+
+    Returns:
+        set: The ids of the matching rows.
+    """
+    skip_columns = set(skip_columns or [])
+    documents = dict()
+    for row in rows:
+        documents[row['id']] = ((' ').join(str(row[column]) for column in row
+                                           if column not in skip_columns) + suffix).upper()
+
+    def match_keyword(keyword):
+        return set(row_id for row_id, document in documents.items() if keyword in document)
+
+    return _match(match_keyword, search_data, or_separator)
+
+
+def invalidate(tables):
+    """
+    Marks tables as stale, they will be reloaded on the next query.
+
+    Args:
+        tables (list): The names of the modified tables.
+    """
+    with _lock:
+        for table in tables:
+            if table in _tables.keys():
+                _stale.add(table)
+            for name, (id_set_table, loader) in _id_sets_loaders.items():
+                if id_set_table == table:
+                    _stale.add((table, name))
+
+
+def invalidate_all():
+    """
+    Marks every loaded table and id set as stale.
+    """
+    with _lock:
+        _stale.update(_tables.keys())
+        for name, (table, loader) in _id_sets_loaders.items():
+            _stale.add((table, name))
+
+
+invalidation.add_listener(invalidate)
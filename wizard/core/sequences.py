@@ -0,0 +1,309 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# This file is part of Wizard
+
+# MIT License
+
+# Copyright (c) 2021 Leo brunel
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+This module scans the directories of the images sequences ( renders, playblasts ).
+
+A directory is listed in one `os.scandir` pass, the files are grouped
+in sequences by name pattern and the missing, empty and truncated frames
+are detected from the listing, no file is opened.
+
+The results are cached by directory modification time, a directory is
+only listed again when files are added, removed or renamed. A file
+rewritten in place doesn't change the modification time of its
+directory, the empty and truncated frames of a cached listing are
+checked again on each call, a frame finished in place is caught
+without listing the whole directory.
+
+A sequence is a dictionary with the keys:
+    - 'name': The pattern of the sequence, the frame number replaced by '#' ( e.g. 'shot.####.exr' ).
+    - 'prefix', 'suffix': The file names parts around the frame number.
+    - 'extension': The extension, without dot.
+    - 'padding': The number of digits of the frame numbers.
+    - 'first', 'last': The frame range.
+    - 'frames': The frame numbers, sorted.
+    - 'files': The files paths, in frames order.
+    - 'size': The total size in bytes.
+    - 'missing': The frames missing in the range.
+    - 'empty': The zero-byte frames.
+    - 'truncated': The frames much smaller than the median frame size of the sequence.
+
+Functions:
+    - scan_directory(directory, use_cache=True): Lists a directory and groups its files in sequences.
+    - get_sequences(directory, extensions=None, use_cache=True): Returns the sequences of a directory.
+    - get_main_sequence(directory, extensions=None, use_cache=True): Returns the longest sequence of a directory.
+    - get_issues_count(sequence): Returns the number of missing, empty and truncated frames.
+    - describe_issues(sequence): Returns a readable description of the frames issues.
+    - format_frames(frames): Returns the frames as compact ranges.
+    - clear_cache(): Clears the cached listings.
+
+Dependencies:
+    - Python modules: os, re, threading, collections, logging
+    - Wizard core modules: path_utils
+"""
+
+# Python modules
+import os
+import re
+import threading
+from collections import OrderedDict
+import logging
+
+# Wizard modules
+from wizard.core import path_utils
+
+logger = logging.getLogger(__name__)
+
+# The frame number is the last digits group before the extension
+_frame_pattern = re.compile(r'^(.*?)(\d+)(\.[^.\d][^.]*)$')
+_truncated_ratio = 0.2
+_cache_size = 512
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def scan_directory(directory, use_cache=True):
+    """
+    Lists a directory and groups its files in sequences.
+
+    Args:
+        directory (str): The directory to scan.
+        use_cache (bool, optional): Returns the cached listing if the directory
+            didn't change. Defaults to True.
+
+    Returns:
+        dict: The 'files' ( dictionary of the file names and sizes ), the 'sequences'
+            ( list of sequences, see the module documentation ) and the 'others'
+            ( file names not part of a sequence ). None if the directory doesn't exist.
+    """
+    directory = path_utils.clean_path(directory)
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return
+    if use_cache:
+        with _cache_lock:
+            cached = _cache.get(directory)
+        if cached is not None and cached[0] == mtime and not _flagged_frames_changed(cached[1]):
+            with _cache_lock:
+                if directory in _cache.keys():
+                    _cache.move_to_end(directory)
+            return cached[1]
+
+    files = dict()
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        files[entry.name] = entry.stat().st_size
+                except OSError:
+                    # Removed during the scan
+                    continue
+    except OSError:
+        return
+
+    listing = dict()
+    listing['files'] = files
+    listing['sequences'], listing['others'] = _group_files(directory, files)
+
+    with _cache_lock:
+        _cache[directory] = (mtime, listing)
+        _cache.move_to_end(directory)
+        while len(_cache) > _cache_size:
+            _cache.popitem(last=False)
+    return listing
+
+
+def get_sequences(directory, extensions=None, use_cache=True):
+    """
+    Returns the sequences of a directory.
+
+    Args:
+        directory (str): The directory to scan.
+        extensions (list, optional): The extensions of the sequences to return,
+            without dot. Defaults to None ( all the sequences ).
+        use_cache (bool, optional): Uses the cached listing if the directory didn't change. Defaults to True.
+
+    Returns:
+        list: The sequences, the longest first. An empty list if the directory doesn't exist.
+    """
+    listing = scan_directory(directory, use_cache=use_cache)
+    if listing is None:
+        return []
+    sequences = listing['sequences']
+    if extensions is not None:
+        extensions = [extension.lower() for extension in extensions]
+        sequences = [sequence for sequence in sequences
+                     if sequence['extension'].lower() in extensions]
+    return sorted(sequences, key=lambda sequence: len(sequence['frames']), reverse=True)
+
+
+def get_main_sequence(directory, extensions=None, use_cache=True):
+    """
+    Returns the longest sequence of a directory.
+
+    Args:
+        directory (str): The directory to scan.
+        extensions (list, optional): The accepted extensions, without dot. Defaults to None.
+        use_cache (bool, optional): Uses the cached listing if the directory didn't change. Defaults to True.
+
+    Returns:
+        dict: The sequence, None if no sequence is found.
+    """
+    sequences = get_sequences(directory, extensions, use_cache)
+    if len(sequences) == 0:
+        return
+    return sequences[0]
+
+
+def get_issues_count(sequence):
+    """
+    Returns the number of missing, empty and truncated frames of a sequence.
+
+    Args:
+        sequence (dict): The sequence.
+
+    Returns:
+        int: The number of frames with an issue.
+    """
+    return len(sequence['missing']) + len(sequence['empty']) + len(sequence['truncated'])
+
+
+def describe_issues(sequence):
+    """
+    Returns a readable description of the frames issues of a sequence.
+
+    Args:
+        sequence (dict): The sequence.
+
+    Returns:
+        str: The description, an empty string if the sequence is complete.
+    """
+    issues = []
+    if sequence['missing']:
+        issues.append(
+            f"{len(sequence['missing'])} missing ({format_frames(sequence['missing'])})")
+    if sequence['empty']:
+        issues.append(
+            f"{len(sequence['empty'])} empty ({format_frames(sequence['empty'])})")
+    if sequence['truncated']:
+        issues.append(
+            f"{len(sequence['truncated'])} truncated ({format_frames(sequence['truncated'])})")
+    if not issues:
+        return ''
+    return f"{sequence['name']} [{sequence['first']}-{sequence['last']}] : {', '.join(issues)}"
+
+
+def format_frames(frames):
+    """
+    Returns frame numbers as compact ranges.
+
+    Args:
+        frames (list): The frame numbers.
+
+    Returns:
+        str: The ranges, e.g. '1001-1004, 1010'.
+    """
+    ranges = []
+    for frame in sorted(frames):
+        if ranges and frame == ranges[-1][1] + 1:
+            ranges[-1][1] = frame
+        else:
+            ranges.append([frame, frame])
+    return ', '.join(str(first) if first == last else f"{first}-{last}"
+                     for first, last in ranges)
+
+
+def clear_cache():
+    """
+    Clears the cached listings.
+    """
+    with _cache_lock:
+        _cache.clear()
+
+
+def _flagged_frames_changed(listing):
+    # The empty and truncated frames may be
+    # finished in place by a render
+    for sequence in listing['sequences']:
+        flagged_frames = set(sequence['empty']) | set(sequence['truncated'])
+        if not flagged_frames:
+            continue
+        for frame, file in zip(sequence['frames'], sequence['files']):
+            if frame not in flagged_frames:
+                continue
+            try:
+                size = os.stat(file).st_size
+            except OSError:
+                return True
+            if size != listing['files'].get(path_utils.basename(file)):
+                return True
+    return False
+
+
+def _group_files(directory, files):
+    groups = dict()
+    others = []
+    for name, size in files.items():
+        match = _frame_pattern.match(name)
+        if match is None:
+            others.append(name)
+            continue
+        prefix, digits, suffix = match.groups()
+        group = groups.setdefault((prefix, suffix), [])
+        group.append((int(digits), len(digits), name, size))
+
+    sequences = []
+    for (prefix, suffix), frames in groups.items():
+        frames.sort()
+        padding = min(frame[1] for frame in frames)
+        sizes = sorted(frame[3] for frame in frames if frame[3] > 0)
+        median_size = sizes[int(len(sizes)/2)] if sizes else 0
+
+        sequence = dict()
+        sequence['name'] = f"{prefix}{'#'*padding}{suffix}"
+        sequence['prefix'] = prefix
+        sequence['suffix'] = suffix
+        sequence['extension'] = suffix[1:]
+        sequence['padding'] = padding
+        sequence['first'] = frames[0][0]
+        sequence['last'] = frames[-1][0]
+        sequence['frames'] = [frame[0] for frame in frames]
+        sequence['files'] = [path_utils.join(directory, frame[2])
+                             for frame in frames]
+        sequence['size'] = sum(frame[3] for frame in frames)
+        existing = set(sequence['frames'])
+        sequence['missing'] = [frame for frame in range(sequence['first'], sequence['last']+1)
+                               if frame not in existing]
+        sequence['empty'] = [frame[0] for frame in frames if frame[3] == 0]
+        sequence['truncated'] = [frame[0] for frame in frames
+                                 if 0 < frame[3] < median_size*_truncated_ratio]
+        sequences.append(sequence)
+    return sequences, sorted(others)
@@ -0,0 +1,205 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# This file is part of Wizard
+
+# MIT License
+
+# Copyright (c) 2021 Leo brunel
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+This module records the startup timeline of the Wizard entry points
+( app.py, PyWizard.py and wizard_cmd.py ).
+
+Each entry point wraps its import and initialization steps in phases,
+the timeline is logged once the application is ready. Phases can be
+nested, a phase duration includes its children.
+
+When the 'wizard_startup_trace' environment variable is set to 1, the
+modules imports are also traced and the slowest ones are logged with
+the timeline. The import tracing has a small cost and is disabled by
+default.
+
+Usage:
+    from wizard.core import startup_tracer
+    startup_tracer.start()
+    with startup_tracer.phase('Import main widget'):
+        from wizard.gui import main_widget
+    startup_tracer.log_timeline()
+
+Functions:
+    - start(trace_imports=None): Resets the timeline and optionally traces the imports.
+    - phase(name): Context manager recording a phase duration.
+    - mark(name): Records an instant event.
+    - get_timeline(): Returns the recorded events.
+    - log_timeline(): Logs the timeline and the slowest imports.
+
+Dependencies:
+    - Python modules: builtins, contextlib, os, sys, time, logging
+    - Wizard modules: env_vars
+"""
+
+# Python modules
+import builtins
+import contextlib
+import os
+import sys
+import time
+import logging
+
+# Wizard modules
+from wizard.vars import env_vars
+
+logger = logging.getLogger(__name__)
+
+_imports_threshold = 0.01
+_max_logged_imports = 15
+
+_origin = time.perf_counter()
+_events = []
+_imports = dict()
+_depth = 0
+_original_import = None
+
+
+def start(trace_imports=None):
+    """
+    Resets the timeline origin, must be called as early as possible
+    by the entry point.
+
+    Args:
+        trace_imports (bool, optional): Trace the modules imports.
+            Defaults to None, the 'wizard_startup_trace' environment variable is used.
+    """
+    global _origin
+    global _depth
+    _origin = time.perf_counter()
+    _depth = 0
+    _events.clear()
+    _imports.clear()
+    if trace_imports is None:
+        trace_imports = os.environ.get(env_vars._startup_trace_) == '1'
+    if trace_imports:
+        _install_import_hook()
+
+
+@contextlib.contextmanager
+def phase(name):
+    """
+    Records the duration of the wrapped block.
+
+    Args:
+        name (str): The phase name.
+    """
+    global _depth
+    event = dict()
+    event['name'] = name
+    event['start'] = time.perf_counter() - _origin
+    event['duration'] = None
+    event['depth'] = _depth
+    _events.append(event)
+    _depth += 1
+    try:
+        yield event
+    finally:
+        _depth -= 1
+        event['duration'] = time.perf_counter() - _origin - event['start']
+
+
+def mark(name):
+    """
+    Records an instant event.
+
+    Args:
+        name (str): The event name.
+    """
+    event = dict()
+    event['name'] = name
+    event['start'] = time.perf_counter() - _origin
+    event['duration'] = None
+    event['depth'] = _depth
+    _events.append(event)
+
+
+def get_timeline():
+    """
+    Returns the recorded events.
+
+    Returns:
+        list: The events dictionaries ( name, start, duration, depth ),
+            times are in seconds from the timeline origin.
+    """
+    return list(_events)
+
+
+def log_timeline():
+    """
+    Logs the timeline and, if traced, the slowest imports.
+    The import hook is removed.
+    """
+    _remove_import_hook()
+    lines = ['Startup timeline :']
+    for event in _events:
+        indent = '  ' * event['depth']
+        if event['duration'] is None:
+            lines.append(
+                f"{round(event['start']*1000):>7}ms {indent}- {event['name']}")
+        else:
+            lines.append(
+                f"{round(event['start']*1000):>7}ms {indent}{event['name']} : {round(event['duration']*1000)}ms")
+    if len(_imports) > 0:
+        lines.append('Slowest imports :')
+        slowest = sorted(_imports.items(), key=lambda item: item[1],
+                         reverse=True)[:_max_logged_imports]
+        for module_name, duration in slowest:
+            lines.append(f"{round(duration*1000):>7}ms {module_name}")
+    logger.info(('\n').join(lines))
+
+
+def _install_import_hook():
+    global _original_import
+    if _original_import is not None:
+        return
+    _original_import = builtins.__import__
+
+    def traced_import(name, globals=None, locals=None, fromlist=(), level=0):
+        if level != 0 or name in sys.modules:
+            return _original_import(name, globals, locals, fromlist, level)
+        start_time = time.perf_counter()
+        try:
+            return _original_import(name, globals, locals, fromlist, level)
+        finally:
+            duration = time.perf_counter() - start_time
+            # Cumulative time, the nested imports are included
+            if duration > _imports_threshold:
+                _imports[name] = duration
+
+    builtins.__import__ = traced_import
+
+
+def _remove_import_hook():
+    global _original_import
+    if _original_import is None:
+        return
+    builtins.__import__ = _original_import
+    _original_import = None
@@ -58,21 +58,27 @@ from wizard.core import tools
 logger = logging.getLogger(__name__)
 
 
-def get_all_progresses(to_round=1):
+def get_all_progresses(to_round=1, stages_rows=None):
     """
     Calculate the progress of assets, categories, and domains based on stages.
 
     Args:
         to_round (int): Number of decimal places to round the progress values.
+        stages_rows (list, optional): The stages rows if already fetched by the caller.
 
     Returns:
         tuple: A tuple containing dictionaries for assets, categories, and domains progresses.
     """
 
     # Retrieve all stages and calculate the total number of frames
-    stages_rows = project.get_all_stages()
+    if stages_rows is None:
+        stages_rows = project.get_all_stages()
     all_frames = get_all_frames()
 
+    # Fetch assets and domains once instead of once per stage
+    assets_rows = {asset_row['id']: asset_row for asset_row in project.get_all_assets()}
+    domains_rows = {domain_row['id']: domain_row for domain_row in project.get_domains()}
+
     # Initialize dictionaries to store progress lists and final progress values
     assets_progresses_lists = dict()
     assets_progresses = dict()
@@ -92,18 +98,18 @@ def get_all_progresses(to_round=1):
             assets_progresses_lists[asset_id] = []
 
         # Retrieve asset data and calculate the number of frames
-        asset_row = project.get_asset_data(asset_id)
+        asset_row = assets_rows[asset_id]
         frames_number = asset_row['outframe'] - asset_row['inframe']
 
         # Add the stage progress to the asset's progress list
-        if project.get_domain_data(stage_row['domain_id'])['name'] == assets_vars._sequences_:
+        if domains_rows[stage_row['domain_id']]['name'] == assets_vars._sequences_:
             assets_progresses_lists[asset_id].append(
                 (stage_row['progress'], frames_number / all_frames))
         else:
             assets_progresses_lists[asset_id].append((stage_row['progress'], 1))
 
         # Retrieve domain data for the stage
-        domain_row = project.get_domain_data(stage_row['domain_id'])
+        domain_row = domains_rows[stage_row['domain_id']]
 
         # Initialize progress list for the category if not already present
         if asset_row['category_id'] not in categories_progresses_lists.keys():
@@ -510,3 +510,28 @@ def create_video_from_render(export_version_id, ics, ocs, channel, frame_rate, c
     task.start()
     logger.info(
         'Render to video started as subtask, open the subtask manager to get more informations')
+
+
+def prewarm_previews(contact_sheets=False, print_stdout=False):
+    """
+    Starts a subtask generating the missing previews of the whole project.
+
+    Args:
+        contact_sheets (bool, optional): Whether to generate the contact sheets of the videos. Defaults to False.
+        print_stdout (bool, optional): Whether to print the subtask's standard output. Defaults to False.
+
+    This function creates a Python command string that generates the missing thumbnails,
+    the mid-frame stills and optionally the contact sheets of the project videos and
+    work versions using `previews.prewarm_project`. The task is executed as a subtask,
+    and the user is notified that the generation has started.
+    """
+    command = "# coding: utf-8\n"
+    command += "from wizard.core import previews\n"
+    command += "print('wizard_task_name:Previews pre-warming')\n"
+    command += "print('wizard_task_percent:0')\n"
+    command += f"previews.prewarm_project(contact_sheets={contact_sheets}, print_progress=True)\n"
+    command += "print('wizard_task_status:done')\n"
+    task = subtask.subtask(pycmd=command, print_stdout=print_stdout)
+    task.start()
+    logger.info(
+        'Previews pre-warming started as subtask, open the subtask manager to get more informations')
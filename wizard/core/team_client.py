@@ -38,7 +38,7 @@ Classes:
 
 Functions:
     - try_connection(DNS): Attempts to establish a connection to the specified DNS using a test signal.
-    - refresh_team(DNS): Sends a signal to refresh the team information for the specified DNS.
+    - refresh_team(DNS, tables=None): Sends a signal to refresh the team information for the specified DNS.
     - send_prank(DNS, prank_data): Sends a prank signal to the specified DNS with the provided prank data.
 
 Dependencies:
@@ -62,6 +62,7 @@ import logging
 # Wizard modules
 from wizard.core import socket_utils
 from wizard.core import environment
+from wizard.core import invalidation
 
 logger = logging.getLogger(__name__)
 
@@ -107,6 +108,7 @@ class team_client(QThread):
 
     team_connection_status_signal = pyqtSignal(bool)
     refresh_signal = pyqtSignal(int)
+    invalidate_signal = pyqtSignal(list)
     prank_signal = pyqtSignal(object)
     new_user_signal = pyqtSignal(str)
     remove_user_signal = pyqtSignal(str)
@@ -180,13 +182,17 @@ class team_client(QThread):
             self.conn.close()
             self.conn = None
 
-    def refresh_team(self):
+    def refresh_team(self, tables=None):
         """
         Refreshes the team information by sending a signal with the relevant details.
 
         This method constructs a signal dictionary containing the type of signal 
-        ('refresh_team') and the current project name. It then sends this signal 
-        using the `send_signal` method.
+        ('refresh_team'), the current project name and the modified tables. It
+        then sends this signal using the `send_signal` method.
+
+        Args:
+            tables (list, optional): The modified database tables. If empty or None,
+                                     the team members will perform a full refresh.
 
         Returns:
             None
@@ -194,6 +200,7 @@ class team_client(QThread):
         signal_dic = dict()
         signal_dic['type'] = 'refresh_team'
         signal_dic['project'] = environment.get_project_name()
+        signal_dic['tables'] = tables or []
         self.send_signal(signal_dic)
 
     def send_signal(self, signal_dic):
@@ -264,7 +271,8 @@ class team_client(QThread):
             data (dict): A dictionary containing signal data. Expected keys include:
                 - 'project' (str): The project name associated with the signal.
                 - 'type' (str): The type of signal. Possible values are:
-                    - 'refresh_team': Emits a signal to refresh the team.
+                    - 'refresh_team': Emits a signal to refresh the team. If the data
+                      contains modified 'tables', only those are invalidated.
                     - 'new_user': Emits a signal for adding a new user, with 'user_name' key in data.
                     - 'remove_user': Emits a signal for removing a user, with 'user_name' key in data.
                     - 'prank': Emits a prank signal if the 'destination_user' matches the current user.
@@ -278,7 +286,10 @@ class team_client(QThread):
             if data['project'] != environment.get_project_name():
                 return
             if data['type'] == 'refresh_team':
-                self.refresh_signal.emit(1)
+                if data.get('tables'):
+                    self.invalidate_signal.emit(data['tables'])
+                else:
+                    self.refresh_signal.emit(1)
             elif data['type'] == 'new_user':
                 self.new_user_signal.emit(data['user_name'])
             elif data['type'] == 'remove_user':
@@ -306,12 +317,14 @@ def try_connection(DNS):
     return socket_utils.send_bottle(DNS, signal_dic, timeout=1)
 
 
-def refresh_team(DNS):
+def refresh_team(DNS, tables=None):
     """
     Sends a signal to refresh the team information for the specified DNS.
 
     Args:
         DNS (str): The domain name or address of the target server.
+        tables (list, optional): The modified database tables. Defaults to the
+                                 tables modified by the current process.
 
     Returns:
         Any: The response from the `socket_utils.send_bottle` function.
@@ -322,9 +335,12 @@ def refresh_team(DNS):
         - This function relies on `environment.get_project_name()` and 
           `socket_utils.send_bottle()` for its operation.
     """
+    if tables is None:
+        tables = invalidation.pop_changes()
     signal_dic = dict()
     signal_dic['type'] = 'refresh_team'
     signal_dic['project'] = environment.get_project_name()
+    signal_dic['tables'] = tables
     return socket_utils.send_bottle(DNS, signal_dic)
 
 
@@ -41,6 +41,8 @@ def main():
     add_OCIO_project_settings()
     add_render_nodes_number_project_settings()
     add_mean_render_time_project_settings()
+    add_events_creation_time_index()
+    add_asset_tracking_events_stage_id_index()
 
 
 def add_rendering_extensions():
@@ -72,3 +74,13 @@ def add_render_nodes_number_project_settings():
 def add_mean_render_time_project_settings():
     sql_cmd = """ALTER TABLE settings ADD COLUMN IF NOT EXISTS mean_render_time integer DEFAULT 1800;"""
     db_utils.create_table(environment.get_project_name(), sql_cmd)
+
+
+def add_events_creation_time_index():
+    sql_cmd = """CREATE INDEX IF NOT EXISTS events_creation_time_index ON events (creation_time);"""
+    db_utils.create_table(environment.get_project_name(), sql_cmd)
+
+
+def add_asset_tracking_events_stage_id_index():
+    sql_cmd = """CREATE INDEX IF NOT EXISTS asset_tracking_events_stage_id_index ON asset_tracking_events (stage_id, id);"""
+    db_utils.create_table(environment.get_project_name(), sql_cmd)
@@ -34,6 +34,9 @@ import numpy as np
 import shutil
 from PIL import Image, ImageFont, ImageDraw
 import re
+import queue
+import threading
+import traceback
 
 # Wizard modules
 from wizard.core import assets
@@ -43,15 +46,31 @@ from wizard.core import environment
 from wizard.core import image
 from wizard.core import tools
 from wizard.core import ocio_utils
+from wizard.core import ffmpeg_utils
+from wizard.core import sequences
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of frames waiting between two stages
+# of the frames pipeline ( see stream_frames )
+_queue_size = 8
+_end_of_stream = object()
+# PIL and cv2 release the GIL while compositing and
+# converting the frames, threads are enough to use the cores
+_overlay_workers = max(1, min(16, (os.cpu_count() or 1) - 2))
+
 
 def add_video(variant_id, images_directory, frange, string_asset, focal_lengths_dic=None, comment='', analyse_comment=None, frame_rate=None, overlay=True):
-    temp_video_file, to_thumbnail = merge_video(
+    video_files = merge_video(
         images_directory, frange, string_asset, focal_lengths_dic, frame_rate, overlay=overlay)
-    if not temp_video_file:
+    if not video_files:
         return
+    temp_video_file, to_thumbnail = video_files
+    return publish_video(variant_id, temp_video_file, to_thumbnail, images_directory,
+                         comment=comment, analyse_comment=analyse_comment)
+
+
+def publish_video(variant_id, temp_video_file, to_thumbnail, temp_directory, comment='', analyse_comment=None):
     video_id = assets.add_video(
         variant_id, comment=comment, analyse_comment=analyse_comment)
     video_row = project.get_video_data(video_id)
@@ -61,7 +80,7 @@ def add_video(variant_id, images_directory, frange, string_asset, focal_lengths_
     shutil.copyfile(temp_video_file, video_path)
     image.resize_preview(to_thumbnail, thumbnail_path)
     if path_utils.isfile(video_path):
-        path_utils.rmtree(images_directory)
+        path_utils.rmtree(temp_directory)
     return video_path
 
 
@@ -74,58 +93,207 @@ def request_video(variant_id):
 
 
 def merge_video(images_directory, frange, string_asset, focal_lengths_dic=None, frame_rate=None, overlay=True):
-    temp_video_file = path_utils.join(images_directory, "temp.mp4")
-
     files_list = []
     if not path_utils.isdir(images_directory):
         logger.warning(f"{images_directory} not found, can't create video")
         return
-    for image_file in path_utils.listdir(images_directory):
-        if image_file.endswith('.png'):
-            files_list.append(path_utils.join(images_directory, image_file))
+    sequence = sequences.get_main_sequence(images_directory, ['png'])
+    if sequence is not None:
+        null, files_list = usable_frames(sequence)
     if files_list == []:
         logger.warning(f"{images_directory} is empty, can't create video.")
         return
+    return encode_video(files_list, images_directory, frange, string_asset,
+                        focal_lengths_dic, frame_rate, overlay=overlay)
+
+
+def encode_video(files_list, output_directory, frange, string_asset, focal_lengths_dic=None, frame_rate=None, overlay=True, read_function=None, encoder_settings=None, frame_numbers=None):
+    # read_function(file) returns a PIL image,
+    # defaults to reading the file with PIL.
+    # frame_numbers are the numbers of the files, for
+    # sequences with gaps, defaults to the frames
+    # following frange[0]
+    temp_video_file = path_utils.join(output_directory, "temp.mp4")
+    to_thumbnail = path_utils.join(output_directory, 'thumbnail.png')
 
     if not frame_rate:
         frame_rate = project.get_frame_rate()
-    img_array, size = merge_with_overlay(
-        files_list, frange, frame_rate, string_asset, focal_lengths_dic, overlay=overlay)
-
-    out = cv2.VideoWriter(
-        temp_video_file, cv2.VideoWriter_fourcc(*"X264"), frame_rate, size)
-    logger.info("Adding video overlay")
-    for i in range(len(img_array)):
-        out.write(img_array[i])
-        if int(len(img_array)/2) == i:
-            to_thumbnail = path_utils.join(images_directory, 'thumbnail.png')
-            cv2.imwrite(to_thumbnail, img_array[i])
-    logger.info("Writing video")
-    out.release()
+
+    if overlay:
+        renderer = overlay_renderer(string_asset, frange, frame_rate)
+    else:
+        renderer = None
+
+    def process_frame(index, pil_image):
+        if frame_numbers is not None:
+            frame_number = frame_numbers[index]
+        else:
+            frame_number = frange[0] + index
+        if renderer is not None:
+            focal_len = 'Focal not found'
+            if focal_lengths_dic and str(frame_number) in focal_lengths_dic.keys():
+                focal_len = focal_lengths_dic[str(frame_number)]
+            pil_image = renderer.render(pil_image, frame_number, focal_len)
+        else:
+            pil_image = pil_image.convert('RGB')
+        return np.asarray(pil_image)
+
+    logger.info("Adding video overlay and writing video")
+    writer = video_writer(temp_video_file, frame_rate,
+                          thumbnail_index=int(len(files_list)/2),
+                          thumbnail_file=to_thumbnail,
+                          encoder_settings=encoder_settings)
+    success = stream_frames(files_list, process_frame, writer.write,
+                            read_function=read_function,
+                            workers=_overlay_workers)
+    if not writer.release() or not success:
+        return
 
     if path_utils.isfile(temp_video_file):
         return temp_video_file, to_thumbnail
 
 
-def merge_with_overlay(files_list, frange, frame_rate, string_asset, focal_lengths_dic=None, overlay=True):
-    img_array = []
-    for file in files_list:
-        frame_number = frange[0] + files_list.index(file)
-        focal_len = 'Focal not found'
-        if focal_lengths_dic:
-            if str(frame_number) in focal_lengths_dic.keys():
-                focal_len = focal_lengths_dic[str(frame_number)]
-        if overlay:
-            pil_img = add_overlay(file, string_asset,
-                                  frame_number, frange, frame_rate, focal_len)
+def stream_frames(files_list, process_function, write_function, read_function=None, workers=1, queue_size=_queue_size):
+    # Reader, processing and writer stages connected by bounded queues,
+    # the memory used doesn't depend on the number of frames.
+    # The frames are processed by a pool of threads and written
+    # in order, the frames processed ahead wait in a reorder buffer
+    read_queue = queue.Queue(maxsize=queue_size)
+    write_queue = queue.Queue(maxsize=queue_size)
+    # Bounds the frames in the pipeline, reorder buffer included
+    frames_slots = threading.Semaphore(queue_size*2 + workers)
+    stop_event = threading.Event()
+    errors = []
+
+    def acquire(semaphore):
+        while not stop_event.is_set():
+            if semaphore.acquire(timeout=0.1):
+                return True
+        return False
+
+    def put(target_queue, item):
+        while not stop_event.is_set():
+            try:
+                target_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(source_queue):
+        while not stop_event.is_set():
+            try:
+                return source_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _end_of_stream
+
+    def fail():
+        errors.append(traceback.format_exc())
+        stop_event.set()
+
+    def read():
+        try:
+            for index, file in enumerate(files_list):
+                if not acquire(frames_slots):
+                    return
+                if read_function is not None:
+                    pil_image = read_function(file)
+                else:
+                    pil_image = Image.open(file)
+                    pil_image.load()
+                if not put(read_queue, (index, pil_image)):
+                    return
+            for worker in range(workers):
+                put(read_queue, _end_of_stream)
+        except Exception:
+            fail()
+
+    def process():
+        try:
+            while True:
+                item = get(read_queue)
+                if item is _end_of_stream:
+                    return
+                index, pil_image = item
+                if not put(write_queue, (index, process_function(index, pil_image))):
+                    return
+        except Exception:
+            fail()
+
+    def write():
+        try:
+            reorder_buffer = dict()
+            next_index = 0
+            while next_index < len(files_list):
+                item = get(write_queue)
+                if item is _end_of_stream:
+                    return
+                reorder_buffer[item[0]] = item[1]
+                while next_index in reorder_buffer.keys():
+                    write_function(next_index, reorder_buffer.pop(next_index))
+                    frames_slots.release()
+                    next_index += 1
+        except Exception:
+            fail()
+
+    threads = [threading.Thread(target=read, daemon=True),
+               threading.Thread(target=write, daemon=True)]
+    for worker in range(workers):
+        threads.append(threading.Thread(target=process, daemon=True))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for error in errors:
+        logger.error(error)
+    return len(errors) == 0
+
+
+class video_writer:
+    # Writes the RGB frames, the video is opened on the first
+    # frame with its size. The frames are piped to FFmpeg,
+    # or written with cv2 when FFmpeg is not available
+    def __init__(self, video_file, frame_rate, thumbnail_index=None, thumbnail_file=None, encoder_settings=None):
+        self.video_file = video_file
+        self.frame_rate = frame_rate
+        self.thumbnail_index = thumbnail_index
+        self.thumbnail_file = thumbnail_file
+        self.encoder_settings = encoder_settings or dict()
+        self.use_ffmpeg = ffmpeg_utils.is_ffmpeg_available()
+        self.encoder = None
+        self.out = None
+
+    def open(self, width, height):
+        if self.use_ffmpeg:
+            self.encoder = ffmpeg_utils.pipe_encoder(self.video_file, width, height,
+                                                     self.frame_rate, **self.encoder_settings)
         else:
-            pil_img = Image.open(file)
-        img = np.asarray(pil_img)
-        img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-        height, width, layers = img.shape
-        size = (width, height)
-        img_array.append(img)
-    return img_array, size
+            logger.info("FFmpeg not found, writing video with OpenCV")
+            self.out = cv2.VideoWriter(self.video_file, cv2.VideoWriter_fourcc(
+                *"X264"), self.frame_rate, (width, height))
+
+    def write(self, index, img):
+        if self.encoder is None and self.out is None:
+            height, width = img.shape[:2]
+            self.open(width, height)
+        if self.encoder is not None:
+            self.encoder.write(img)
+        else:
+            self.out.write(cv2.cvtColor(img, cv2.COLOR_RGB2BGR))
+        if index == self.thumbnail_index:
+            Image.fromarray(img).save(self.thumbnail_file)
+
+    def release(self):
+        success = True
+        if self.encoder is not None:
+            success = self.encoder.close()
+            self.encoder = None
+        if self.out is not None:
+            self.out.release()
+            self.out = None
+        return success
 
 
 def merge_only(files_list):
@@ -138,50 +306,94 @@ def merge_only(files_list):
     return img_array, size
 
 
+class overlay_renderer:
+    # Builds the static overlay layers once by frame size,
+    # only the frame text is drawn per frame.
+    # The frames can be rendered from several threads,
+    # each thread has its own font
+    def __init__(self, string_asset, frange, frame_rate):
+        self.string_asset = string_asset
+        self.frange = frange
+        self.frame_rate = frame_rate
+        self.user_text = environment.get_user()
+        self.layers = None
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def get_font(self, font_size):
+        fonts = getattr(self.local, 'fonts', None)
+        if fonts is None:
+            fonts = self.local.fonts = dict()
+        if font_size not in fonts.keys():
+            fonts[font_size] = ImageFont.truetype('cour.ttf', font_size)
+        return fonts[font_size]
+
+    def get_layers(self, size):
+        layers = self.layers
+        if layers is not None and layers['size'] == size:
+            return layers
+        with self.lock:
+            if self.layers is None or self.layers['size'] != size:
+                self.layers = self.build(size)
+            return self.layers
+
+    def build(self, size):
+        im_width, im_height = size
+        margin_percent = int((im_height*1)/100)
+        font_size = int((im_width*1)/100)
+        font = self.get_font(font_size)
+
+        bg_image = Image.new('RGBA', size, (70, 70, 70, 255))
+        over_image = Image.new('RGBA', size, (255, 255, 255, 0))
+        draw = ImageDraw.Draw(over_image)
+        font_height = font.getbbox(self.string_asset)[3]
+        rectangle_xy = [0, im_height -
+                        (margin_percent*2+font_height), im_width, im_height]
+        draw.rectangle(rectangle_xy, fill=(0, 0, 0, 120), outline=None)
+        # Draw string asset
+        string_asset_position = (
+            margin_percent, im_height - (font_height + margin_percent))
+        draw.text(string_asset_position, self.string_asset,
+                  font=font, fill="white")
+        # Draw user text
+        font_width = font.getbbox(self.user_text)[2]
+        font_height = font.getbbox(self.user_text)[3]
+        user_text_position = (im_width - font_width - margin_percent,
+                              im_height - (font_height + margin_percent))
+        draw.text(user_text_position, self.user_text,
+                  font=font, fill="white")
+
+        layers = dict()
+        layers['size'] = size
+        layers['margin_percent'] = margin_percent
+        layers['font_size'] = font_size
+        layers['bg_image'] = bg_image
+        layers['over_image'] = over_image
+        return layers
+
+    def render(self, pil_image, frame_number, focal_len):
+        pil_image = pil_image.convert('RGBA')
+        layers = self.get_layers(pil_image.size)
+        im_width, im_height = layers['size']
+        font = self.get_font(layers['font_size'])
+
+        out = Image.alpha_composite(layers['bg_image'], pil_image)
+        out = Image.alpha_composite(out, layers['over_image'])
+        # Draw frame text
+        draw = ImageDraw.Draw(out)
+        frame_text = f"[{self.frange[0]}-{self.frange[1]}] - f{frame_number} - {self.frame_rate}fps - focal : {focal_len}"
+        font_width = font.getbbox(frame_text)[2]
+        font_height = font.getbbox(frame_text)[3]
+        frame_text_position = (im_width/2 - font_width/2,
+                               im_height - (font_height + layers['margin_percent']))
+        draw.text(frame_text_position, frame_text,
+                  font=font, fill="white")
+        return out.convert('RGB')
+
+
 def add_overlay(file, string_asset, frame_number, frange, frame_rate, focal_len):
-    pil_image = Image.open(file)
-    pil_image = pil_image.convert('RGBA')
-
-    bg_image = Image.new('RGBA', pil_image.size, (70, 70, 70, 255))
-
-    over_image = Image.new('RGBA', pil_image.size, (255, 255, 255, 0))
-    draw = ImageDraw.Draw(over_image)
-    # Draw overlay
-    im_width, im_height = pil_image.size
-    margin_percent = int((im_height*1)/100)
-    font_size = int((im_width*1)/100)
-    font = ImageFont.truetype('cour.ttf', font_size)
-    # font_width, font_height = font.getsize(string_asset)
-    font_width = font.getbbox(string_asset)[2]
-    font_height = font.getbbox(string_asset)[3]
-    rectangle_xy = [0, im_height -
-                    (margin_percent*2+font_height), im_width, im_height]
-    draw.rectangle(rectangle_xy, fill=(0, 0, 0, 120), outline=None)
-    # Draw string asset
-    string_asset_position = (
-        margin_percent, im_height - (font_height + margin_percent))
-    draw.text(string_asset_position, string_asset, font=font, fill="white")
-    # Draw frame text
-    frame_text = f"[{frange[0]}-{frange[1]}] - f{frame_number} - {frame_rate}fps - focal : {focal_len}"
-    # font_width, font_height = font.getsize(frame_text)
-    font_width = font.getbbox(frame_text)[2]
-    font_height = font.getbbox(frame_text)[3]
-    frame_text_position = (im_width/2 - font_width/2,
-                           im_height - (font_height + margin_percent))
-    draw.text(frame_text_position, frame_text, font=font, fill="white")
-    # Draw user text
-    user_text = environment.get_user()
-    # font_width, font_height = font.getsize(user_text)
-    font_width = font.getbbox(user_text)[2]
-    font_height = font.getbbox(user_text)[3]
-    user_text_position = (im_width - font_width - margin_percent,
-                          im_height - (font_height + margin_percent))
-    draw.text(user_text_position, user_text, font=font, fill="white")
-
-    out = Image.alpha_composite(bg_image, pil_image)
-    out = Image.alpha_composite(out, over_image)
-    out = out.convert('RGB')
-    return out
+    renderer = overlay_renderer(string_asset, frange, frame_rate)
+    return renderer.render(Image.open(file), frame_number, focal_len)
 
 
 def video_from_render(export_version_id, ics, ocs, channel, frame_rate, comment='', overlay=True):
@@ -191,35 +403,58 @@ def video_from_render(export_version_id, ics, ocs, channel, frame_rate, comment=
     stage_id = project.get_export_data(export_id, 'stage_id')
     variant_id = project.get_stage_data(stage_id, 'default_variant_id')
 
-    all_files = path_utils.listdir(directory)
-    if len(all_files) == 0:
+    render_sequences = sequences.get_sequences(directory, ['exr', 'png'])
+    if len(render_sequences) == 0:
         logger.warning(f'No files found in {directory}')
         return
 
-    files_dic = dict()
-    for file in path_utils.listdir(directory):
-        extension = path_utils.splitext(file)[-1].replace('.', '')
-        if extension not in files_dic.keys():
-            files_dic[extension] = []
-        files_dic[extension].append(path_utils.join(directory, file))
-
-    for extension in files_dic.keys():
-        if extension in ['exr', 'png']:
-            temp_dir = tools.temp_dir()
-            ocio_utils.exr_to_png(files=files_dic[extension],
-                                  output_dir=temp_dir,
-                                  ics=ics,
-                                  ocs=ocs, 
-                                  channel=channel)
-            string_asset = assets.instance_to_string(
-                ('export_version', export_version_id))
-
-            frame_range = [find_frame_number(files_dic[extension][0]), find_frame_number(
-                files_dic[extension][0])+len(files_dic[extension])-1]
-
-            add_video(variant_id, temp_dir, frame_range, string_asset,
-                      comment=comment, frame_rate=frame_rate, overlay=overlay)
-            break
+    # The frames are read and encoded directly, without
+    # writing intermediate PNG files
+    sequence = render_sequences[0]
+    frame_numbers, files_list = usable_frames(sequence)
+    if len(files_list) == 0:
+        logger.warning(f'No valid frames found in {directory}')
+        return
+    if sequence['extension'].lower() == 'exr':
+        cpu_processor = ocio_utils.get_color_processor(ics, ocs)
+
+        def read_function(file):
+            return Image.fromarray(ocio_utils.exr_to_rgba8_array(
+                file, channel=channel, cpu_processor=cpu_processor), 'RGBA')
+    else:
+        read_function = None
+
+    temp_dir = tools.temp_dir()
+    string_asset = assets.instance_to_string(
+        ('export_version', export_version_id))
+
+    frame_range = [sequence['first'], sequence['last']]
+
+    video_files = encode_video(files_list, temp_dir, frame_range, string_asset,
+                               frame_rate=frame_rate, overlay=overlay,
+                               read_function=read_function,
+                               frame_numbers=frame_numbers)
+    if not video_files:
+        return
+    temp_video_file, to_thumbnail = video_files
+    return publish_video(variant_id, temp_video_file, to_thumbnail, temp_dir,
+                         comment=comment)
+
+
+def usable_frames(sequence):
+    # The missing, empty and truncated frames are reported and
+    # the empty ones skipped, returns the frames and the files
+    if sequences.get_issues_count(sequence):
+        logger.warning(sequences.describe_issues(sequence))
+    empty_frames = set(sequence['empty'])
+    frames = []
+    files = []
+    for frame, file in zip(sequence['frames'], sequence['files']):
+        if frame in empty_frames:
+            continue
+        frames.append(frame)
+        files.append(file)
+    return frames, files
 
 
 def find_frame_number(filename):
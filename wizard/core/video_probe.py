@@ -0,0 +1,272 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# This file is part of Wizard
+
+# MIT License
+
+# Copyright (c) 2021 Leo brunel
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+This module probes the video files and caches their metadata.
+
+Opening a video with OpenCV to read its frames count or a thumbnail
+is slow, the video manager used to do it each time a video was added
+to the player. The metadata ( frames count, fps, resolution, codec,
+duration ) and a thumbnail of the middle frame are probed once and
+stored in a local SQLite database of the user folder. A cached probe
+is valid while the video path, modification time and size are unchanged.
+
+Functions:
+    - probe(video_file): Returns the metadata of a video.
+    - get_cached_probe(video_file): Returns the metadata of a video only if it is cached.
+    - probe_many(video_files, max_workers=None): Probes videos with a pool of threads.
+    - get_thumbnail_bytes(video_file): Returns the thumbnail of a video as PNG bytes.
+    - clear(): Removes all the cached probes.
+
+Dependencies:
+    - Python modules: os, sqlite3, threading, concurrent.futures, logging
+    - External modules: cv2
+    - Wizard core modules: path_utils
+    - Wizard vars modules: user_vars
+"""
+
+# Python modules
+import os
+import sqlite3
+import threading
+import concurrent.futures
+import logging
+import cv2
+
+# Wizard modules
+from wizard.core import path_utils
+from wizard.vars import user_vars
+
+logger = logging.getLogger(__name__)
+
+# Maximum width of the cached thumbnails
+_thumbnail_width = 640
+
+_lock = threading.RLock()
+_connection = None
+# The probes already read, by path
+_probes = dict()
+
+_columns = ['path', 'mtime', 'size', 'frames_count', 'fps', 'width',
+            'height', 'codec', 'duration', 'thumbnail']
+
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        if not path_utils.isdir(user_vars._user_path_):
+            path_utils.makedirs(user_vars._user_path_)
+        _connection = sqlite3.connect(user_vars._video_probe_cache_file_,
+                                      check_same_thread=False)
+        _connection.execute("""CREATE TABLE IF NOT EXISTS probes (
+                                    path text PRIMARY KEY,
+                                    mtime real NOT NULL,
+                                    size integer NOT NULL,
+                                    frames_count real,
+                                    fps real,
+                                    width integer,
+                                    height integer,
+                                    codec text,
+                                    duration real,
+                                    thumbnail blob
+                                );""")
+        _connection.commit()
+    return _connection
+
+
+def _get_file_key(video_file):
+    file_stat = os.stat(video_file)
+    return path_utils.abspath(video_file), file_stat.st_mtime, file_stat.st_size
+
+
+def _get_cached_probe(path, mtime, size):
+    with _lock:
+        probe_dic = _probes.get(path)
+        if probe_dic is not None and probe_dic['mtime'] == mtime and probe_dic['size'] == size:
+            return probe_dic
+        try:
+            row = _get_connection().execute(f"SELECT {', '.join(_columns)} FROM probes WHERE path=?",
+                                            (path,)).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"Can't read the video probes cache : {e}")
+            return
+        if row is None:
+            return
+        probe_dic = dict(zip(_columns, row))
+        if probe_dic['mtime'] != mtime or probe_dic['size'] != size:
+            return
+        _probes[path] = probe_dic
+        return probe_dic
+
+
+def _store_probe(probe_dic):
+    with _lock:
+        _probes[probe_dic['path']] = probe_dic
+        try:
+            connection = _get_connection()
+            connection.execute(f"INSERT OR REPLACE INTO probes ({', '.join(_columns)}) VALUES ({', '.join(['?']*len(_columns))})",
+                               tuple(probe_dic[column] for column in _columns))
+            connection.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Can't write the video probes cache : {e}")
+
+
+def _read_video(path, mtime, size):
+    cap = cv2.VideoCapture(path)
+    try:
+        probe_dic = dict()
+        probe_dic['path'] = path
+        probe_dic['mtime'] = mtime
+        probe_dic['size'] = size
+        probe_dic['frames_count'] = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        probe_dic['fps'] = cap.get(cv2.CAP_PROP_FPS)
+        probe_dic['width'] = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        probe_dic['height'] = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+        probe_dic['codec'] = ''.join(
+            [chr((fourcc >> (8 * index)) & 0xFF) for index in range(4)]).strip('\x00')
+        probe_dic['duration'] = (probe_dic['frames_count'] / probe_dic['fps']
+                                 if probe_dic['fps'] else 0)
+        probe_dic['thumbnail'] = None
+
+        # Thumbnail of the middle frame
+        cap.set(cv2.CAP_PROP_POS_FRAMES, int(probe_dic['frames_count']/2))
+        ret, frame = cap.read()
+        if ret:
+            height, width = frame.shape[:2]
+            if width > _thumbnail_width:
+                frame = cv2.resize(frame, (_thumbnail_width, int(height*_thumbnail_width/width)),
+                                   interpolation=cv2.INTER_AREA)
+            success, png_buffer = cv2.imencode('.png', frame)
+            if success:
+                probe_dic['thumbnail'] = png_buffer.tobytes()
+        return probe_dic
+    finally:
+        cap.release()
+
+
+def probe(video_file):
+    """
+    Returns the metadata of a video, the video is only opened if it isn't cached.
+
+    Args:
+        video_file (str): The path to the video file.
+
+    Returns:
+        dict: The metadata, with the 'path', 'mtime', 'size', 'frames_count', 'fps',
+            'width', 'height', 'codec', 'duration' and 'thumbnail' ( PNG bytes or None ) keys.
+            None if the file doesn't exist.
+    """
+    if not path_utils.isfile(video_file):
+        logger.warning(f"{video_file} not found")
+        return
+    path, mtime, size = _get_file_key(video_file)
+    probe_dic = _get_cached_probe(path, mtime, size)
+    if probe_dic is not None:
+        return probe_dic
+    logger.debug(f"Probing {path}")
+    probe_dic = _read_video(path, mtime, size)
+    _store_probe(probe_dic)
+    return probe_dic
+
+
+def get_cached_probe(video_file):
+    """
+    Returns the metadata of a video only if it is cached, the video is never
+    opened. Safe to call from the GUI thread.
+
+    Args:
+        video_file (str): The path to the video file.
+
+    Returns:
+        dict: The metadata ( see `probe` ), None if the video isn't cached,
+            changed since it was probed or doesn't exist.
+    """
+    try:
+        path, mtime, size = _get_file_key(video_file)
+    except OSError:
+        return
+    return _get_cached_probe(path, mtime, size)
+
+
+def probe_many(video_files, max_workers=None):
+    """
+    Probes several videos with a pool of threads, only the videos
+    that are not cached are opened.
+
+    Args:
+        video_files (list): The paths to the video files.
+        max_workers (int, optional): The number of threads. Defaults to the number of CPU cores.
+
+    Returns:
+        dict: The metadata by video file ( see `probe` ), None for the missing files.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    video_files = list(dict.fromkeys(video_files))
+    probes_dic = dict()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = dict((video_file, executor.submit(probe, video_file))
+                       for video_file in video_files)
+        for video_file, future in futures.items():
+            try:
+                probes_dic[video_file] = future.result()
+            except Exception as e:
+                logger.error(f"Can't probe {video_file} : {e}")
+                probes_dic[video_file] = None
+    return probes_dic
+
+
+def get_thumbnail_bytes(video_file):
+    """
+    Returns the thumbnail of the middle frame of a video.
+
+    Args:
+        video_file (str): The path to the video file.
+
+    Returns:
+        bytes: The PNG encoded thumbnail, None if it can't be read.
+    """
+    probe_dic = probe(video_file)
+    if probe_dic is None:
+        return
+    return probe_dic['thumbnail']
+
+
+def clear():
+    """
+    Removes all the cached probes.
+    """
+    with _lock:
+        _probes.clear()
+        try:
+            connection = _get_connection()
+            connection.execute("DELETE FROM probes")
+            connection.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Can't clear the video probes cache : {e}")
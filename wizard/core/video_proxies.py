@@ -0,0 +1,389 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# This file is part of Wizard
+
+# MIT License
+
+# Copyright (c) 2021 Leo brunel
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+This module transcodes the review videos to lower resolution proxies.
+
+The proxies are written alongside each video, in a 'proxies' folder, so
+a video is transcoded once for the whole team. When the video folder is
+not writable the proxy is written in a local folder of the user instead.
+The proxies are encoded with short GOPs and without B-frames, the frames
+are decoded fast and the player seeks almost only on key frames, which
+keeps the scrubbing smooth on small workstations.
+
+The proxies are transcoded by a local queue ( see `transcode_queue` ) with
+priorities, a maximum number of concurrent transcodes and deduplication of
+the requests. A proxy is up to date if it is newer than its video.
+
+Functions:
+    - get_proxy_file(video_file, tier): Returns the up to date proxy of a video.
+    - pick_tier(video_files, width, height): Returns the tier matching a player size.
+    - get_playback_files(video_files, width, height, priority=high_priority): Returns the files to play.
+    - transcode(video_file, tier): Transcodes the proxy of a video.
+    - get_queue(): Returns the transcode queue of the application.
+
+Dependencies:
+    - Python modules: os, subprocess, threading, heapq, itertools, hashlib, collections, logging
+    - Wizard core modules: path_utils, video_probe
+    - Wizard vars modules: user_vars
+"""
+
+# Python modules
+import os
+import subprocess
+import threading
+import heapq
+import itertools
+import hashlib
+from collections import OrderedDict
+import logging
+
+# Wizard modules
+from wizard.core import path_utils
+from wizard.core import video_probe
+from wizard.vars import user_vars
+
+logger = logging.getLogger(__name__)
+
+# The resolution divisor of each tier, from the largest to the smallest
+tiers = OrderedDict()
+tiers['half'] = 2
+tiers['quarter'] = 4
+
+high_priority = 0
+normal_priority = 1
+low_priority = 2
+
+# The transcodes already use several threads each
+max_workers = 2
+
+proxy_settings = dict()
+proxy_settings['codec'] = 'libx264'
+proxy_settings['crf'] = 22
+proxy_settings['preset'] = 'veryfast'
+# A key frame every 6 frames and no B-frames
+proxy_settings['gop'] = 6
+proxy_settings['tune'] = 'fastdecode'
+
+_proxies_dir_name = 'proxies'
+_queue = None
+
+
+def get_proxy_file(video_file, tier):
+    """
+    Returns the up to date proxy of a video.
+
+    Args:
+        video_file (str): The path of the original video.
+        tier (str): The proxy tier ( see `tiers` ).
+
+    Returns:
+        str: The proxy file, None if the proxy doesn't exist or is older than the video.
+    """
+    try:
+        video_mtime = os.stat(video_file).st_mtime
+    except OSError:
+        return
+    for proxy_file in _get_proxy_candidates(video_file, tier):
+        try:
+            if os.stat(proxy_file).st_mtime >= video_mtime:
+                return proxy_file
+        except OSError:
+            continue
+
+
+def pick_tier(video_files, width, height):
+    """
+    Returns the smallest tier still larger than a player.
+
+    Only the cached probes are read ( see `video_probe.get_cached_probe` ),
+    the videos are never opened, the function can be called from the GUI
+    thread. The originals are played until all the videos are probed.
+
+    Args:
+        video_files (list): The videos played together.
+        width (int): The width of the player in pixels.
+        height (int): The height of the player in pixels.
+
+    Returns:
+        str: The tier, None if the originals should be played.
+    """
+    video_width = 0
+    video_height = 0
+    for video_file in video_files:
+        probe_dic = video_probe.get_cached_probe(video_file)
+        if probe_dic is None:
+            return
+        video_width = max(video_width, probe_dic['width'])
+        video_height = max(video_height, probe_dic['height'])
+    picked_tier = None
+    for tier, divisor in tiers.items():
+        if video_width/divisor < width or video_height/divisor < height:
+            break
+        picked_tier = tier
+    return picked_tier
+
+
+def get_playback_files(video_files, width, height, priority=high_priority):
+    """
+    Returns the files to play in a player, the proxies of the tier matching the
+    player size if they are all available, otherwise the original videos.
+
+    The missing proxies are requested to the transcode queue. A playlist
+    is played from a single tier, the videos are concatenated without
+    re-encoding and must have the same resolution.
+
+    Args:
+        video_files (list): The original videos.
+        width (int): The width of the player in pixels.
+        height (int): The height of the player in pixels.
+        priority (int, optional): The priority of the missing proxies. Defaults to `high_priority`.
+
+    Returns:
+        dict: The file to play of each original video.
+    """
+    playback_files = dict((video_file, video_file)
+                          for video_file in video_files)
+    tier = pick_tier(video_files, width, height)
+    if tier is None:
+        return playback_files
+    proxies_files = dict()
+    for video_file in video_files:
+        proxy_file = get_proxy_file(video_file, tier)
+        if proxy_file is None:
+            get_queue().request(video_file, [tier], priority)
+        proxies_files[video_file] = proxy_file
+    if None in proxies_files.values():
+        return playback_files
+    return proxies_files
+
+
+def transcode(video_file, tier):
+    """
+    Transcodes the proxy of a video with FFmpeg.
+
+    The proxy is written to a temporary file then renamed, an
+    interrupted transcode never leaves a partial proxy.
+
+    Args:
+        video_file (str): The path of the original video.
+        tier (str): The proxy tier ( see `tiers` ).
+
+    Returns:
+        str: The proxy file, None if the transcode failed.
+    """
+    proxy_file = None
+    for candidate in _get_proxy_candidates(video_file, tier):
+        try:
+            path_utils.makedirs(path_utils.dirname(candidate))
+        except OSError:
+            continue
+        if os.access(path_utils.dirname(candidate), os.W_OK):
+            proxy_file = candidate
+            break
+    if proxy_file is None:
+        logger.error(f"Can't write the {tier} proxy of {video_file}")
+        return
+
+    divisor = tiers[tier]
+    temp_proxy_file = f"{path_utils.splitext(proxy_file)[0]}_{threading.get_ident()}.tmp.mp4"
+    command = ['ffmpeg', '-y', '-i', video_file, '-an',
+               '-vf', f"scale=trunc(iw/{divisor*2})*2:trunc(ih/{divisor*2})*2",
+               '-c:v', proxy_settings['codec'],
+               '-preset', proxy_settings['preset'],
+               '-crf', str(proxy_settings['crf']),
+               '-g', str(proxy_settings['gop']),
+               '-keyint_min', str(proxy_settings['gop']),
+               '-bf', '0']
+    if proxy_settings['tune']:
+        command += ['-tune', proxy_settings['tune']]
+    command += ['-pix_fmt', 'yuv420p', '-movflags', '+faststart',
+                temp_proxy_file]
+    logger.debug(f"Transcoding the {tier} proxy of {video_file}")
+    res = subprocess.run(command, stderr=subprocess.PIPE,
+                         stdout=subprocess.PIPE)
+    if res.returncode != 0 or not path_utils.isfile(temp_proxy_file):
+        logger.error(
+            f"Can't transcode {proxy_file} : {res.stderr.decode('utf8', errors='replace')}")
+        if path_utils.isfile(temp_proxy_file):
+            os.remove(temp_proxy_file)
+        return
+    os.replace(temp_proxy_file, proxy_file)
+    return proxy_file
+
+
+class transcode_queue:
+    """
+    Transcodes the requested proxies with a pool of threads.
+
+    The requests are processed by priority, then in request order. A proxy
+    already queued or transcoding is not requested twice, requesting it again
+    with a higher priority moves it up the queue.
+
+    Args:
+        workers (int, optional): The maximum number of concurrent transcodes. Defaults to `max_workers`.
+
+    Notes:
+        - The threads are started on the first request and never block the exit of the application.
+        - The listeners are called by the transcoding threads with the
+          video file, the tier and the proxy file ( None if the transcode failed ).
+    """
+
+    def __init__(self, workers=None):
+        self.workers_count = workers or max_workers
+        self.heap = []
+        self.jobs = dict()
+        self.active = set()
+        self.listeners = []
+        self.threads = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+
+    def request(self, video_file, tiers_list=None, priority=normal_priority):
+        """
+        Requests the proxies of a video.
+
+        Args:
+            video_file (str): The path of the original video.
+            tiers_list (list, optional): The tiers to transcode. Defaults to all the tiers.
+            priority (int, optional): The priority, `high_priority` first. Defaults to `normal_priority`.
+
+        Returns:
+            int: The number of proxies queued.
+        """
+        if tiers_list is None:
+            tiers_list = list(tiers.keys())
+        queued = 0
+        for tier in tiers_list:
+            if get_proxy_file(video_file, tier) is not None:
+                continue
+            key = (path_utils.abspath(video_file), tier)
+            with self.condition:
+                if key in self.active:
+                    continue
+                if key in self.jobs.keys():
+                    if priority >= self.jobs[key][0]:
+                        continue
+                    # The old entry is skipped by the workers
+                    self.jobs[key][-1] = True
+                job = [priority, next(self.counter), video_file, tier, False]
+                self.jobs[key] = job
+                heapq.heappush(self.heap, job)
+                self.start_workers()
+                self.condition.notify()
+            queued += 1
+        return queued
+
+    def pending_count(self):
+        """
+        Returns the number of proxies queued or transcoding.
+
+        Returns:
+            int: The number of proxies.
+        """
+        with self.condition:
+            return len(self.jobs) + len(self.active)
+
+    def add_listener(self, listener):
+        """
+        Registers a function called each time a transcode ends.
+
+        Args:
+            listener (function): A function taking the video file, the tier and the proxy file.
+        """
+        with self.condition:
+            if listener not in self.listeners:
+                self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Unregisters a function registered with `add_listener`.
+
+        Args:
+            listener (function): The function.
+        """
+        with self.condition:
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+
+    def start_workers(self):
+        # Called with the condition acquired
+        while len(self.threads) < self.workers_count:
+            thread = threading.Thread(target=self.work, daemon=True)
+            self.threads.append(thread)
+            thread.start()
+
+    def work(self):
+        while True:
+            with self.condition:
+                while len(self.heap) == 0:
+                    self.condition.wait()
+                priority, order, video_file, tier, cancelled = heapq.heappop(
+                    self.heap)
+                if cancelled:
+                    continue
+                key = (path_utils.abspath(video_file), tier)
+                del self.jobs[key]
+                self.active.add(key)
+            proxy_file = None
+            try:
+                if path_utils.isfile(video_file):
+                    proxy_file = transcode(video_file, tier)
+            except Exception as e:
+                logger.error(f"Can't transcode the {tier} proxy of {video_file} : {e}")
+            with self.condition:
+                self.active.discard(key)
+                listeners = list(self.listeners)
+            for listener in listeners:
+                try:
+                    listener(video_file, tier, proxy_file)
+                except Exception as e:
+                    logger.debug(e)
+
+
+def get_queue():
+    """
+    Returns the transcode queue of the application.
+
+    Returns:
+        transcode_queue: The queue.
+    """
+    global _queue
+    if _queue is None:
+        _queue = transcode_queue()
+    return _queue
+
+
+def _get_proxy_candidates(video_file, tier):
+    # Alongside the video, then in the user folder
+    video_name = path_utils.splitext(path_utils.basename(video_file))[0]
+    key = hashlib.sha1(path_utils.abspath(
+        video_file).encode('utf8')).hexdigest()
+    return [path_utils.join(path_utils.dirname(video_file), _proxies_dir_name,
+                            f"{video_name}_{tier}.mp4"),
+            path_utils.join(user_vars._video_proxies_path_, f"{key}_{tier}.mp4")]
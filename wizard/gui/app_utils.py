@@ -11,6 +11,7 @@ import subprocess
 import traceback
 
 # Wizard core modules
+from wizard.core import application
 from wizard.core import user
 from wizard.core import db_core
 from wizard.core import db_utils
@@ -38,11 +39,8 @@ logger = logging.getLogger(__name__)
 def get_app():
     os.environ["QT_SCALE_FACTOR"] = user.user().get_app_scale()
 
-    if not path_utils.isdir("binaries/ffmpeg/bin"):
-        logger.error("FFmpeg not found")
+    if not application.add_ffmpeg_to_path():
         sys.exit()
-    os.environ['PATH'] += os.pathsep + \
-        path_utils.abspath("binaries/ffmpeg/bin")
 
     if not path_utils.isfile("binaries/mpv-2.dll"):
         logger.error("MPV not found")
@@ -87,11 +85,6 @@ def set_wizard_gui():
     environment.set_gui(1)
 
 
-def set_wizard_cmd():
-    print('Wizard CMD')
-    environment.set_gui(0)
-
-
 def set_pywizard():
     print('PyWizard')
     print('Enter Ctrl+Z to quit...')
@@ -6,17 +6,17 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtCore import pyqtSignal
 import time
-import copy
 import logging
 import traceback
 
 # Wizard modules
 from wizard.gui import gui_utils
+from wizard.gui import avatars
 
 # Wizard gui modules
 from wizard.vars import ressources
-from wizard.core import image
 from wizard.core import repository
+from wizard.core import search_index
 
 logger = logging.getLogger(__name__)
 
@@ -173,11 +173,7 @@ class custom_item(QtWidgets.QTreeWidgetItem):
         self.fill_ui()
 
     def init_icons(self):
-        user_icon = QtGui.QIcon()
-        pm = gui_utils.mask_image(image.convert_str_data_to_image_bytes(
-            self.user_row['profile_picture']), 'png', 30)
-        user_icon.addPixmap(pm)
-        self.setIcon(0, user_icon)
+        self.setIcon(0, avatars.get_icon(self.user_row['user_name'], 30))
         self.setIcon(2, self.icons_dic['life'])
         self.setIcon(3, self.icons_dic['coins'])
         self.setIcon(4, self.icons_dic['level'])
@@ -208,39 +204,22 @@ class search_thread(QtCore.QThread):
     def update_search(self, user_rows, search_data):
         self.running = False
         self.search_data = search_data
-        self.user_rows = copy.deepcopy(user_rows)
+        # The rows are only read, no copy needed
+        self.user_rows = list(user_rows or [])
         self.running = True
         self.start()
 
     def run(self):
         try:
-            keywords = self.search_data.split('&')
+            skip_columns = ['id', 'pass', 'email', 'profile_picture', 'xp', 'total_xp', 'work_time', 'comments_count', 'deaths', 'administrator', 'artefacts', 'keeped_artefacts', 'coins']
+            matching_ids = search_index.match_rows(self.user_rows,
+                                                   self.search_data,
+                                                   skip_columns=skip_columns,
+                                                   or_separator=None)
             for user_row in self.user_rows:
-
-                user_id = user_row['id']
-                del user_row['id']
-                del user_row['pass']
-                del user_row['email']
-                del user_row['profile_picture']
-                del user_row['xp']
-                del user_row['total_xp']
-                del user_row['work_time']
-                del user_row['comments_count']
-                del user_row['deaths']
-                del user_row['administrator']
-                del user_row['artefacts']
-                del user_row['keeped_artefacts']
-                del user_row['coins']
-
-                values = list(user_row.values())
-                data_list = []
-                for data_block in values:
-                    data_list.append(str(data_block))
-                data = (' ').join(data_list)
-
-                if all(keyword.upper() in data.upper() for keyword in keywords):
-                    self.show_id_signal.emit(user_id)
+                if user_row['id'] in matching_ids:
+                    self.show_id_signal.emit(user_row['id'])
                 else:
-                    self.hide_id_signal.emit(user_id)
+                    self.hide_id_signal.emit(user_row['id'])
         except:
             logger.info(str(traceback.format_exc()))
@@ -6,6 +6,7 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
 import time
 import datetime
+import collections
 
 # Wizard modules
 from wizard.core import tools
@@ -13,7 +14,7 @@ from wizard.core import user
 from wizard.core import repository
 from wizard.core import assets
 from wizard.core import project
-from wizard.core import image
+from wizard.core import search_index
 from wizard.vars import ressources
 from wizard.vars import assets_vars
 from wizard.vars import user_vars
@@ -21,6 +22,7 @@ from wizard.vars import user_vars
 # Wizard gui modules
 from wizard.gui import gui_server
 from wizard.gui import gui_utils
+from wizard.gui import avatars
 from wizard.gui import comment_widget
 from wizard.gui import tag_label
 from wizard.gui import calendar_utils
@@ -36,6 +38,10 @@ class asset_tracking_widget(QtWidgets.QFrame):
         self.stage_row = None
         self.users_ids = dict()
         self.tracking_event_ids = dict()
+        # The events of the last displayed stages, only the
+        # new events are queried when refreshing or switching
+        self.timelines = collections.OrderedDict()
+        self.timelines_cache_size = 50
 
         self.apply_assignment_modification = None
         self.apply_state_modification = None
@@ -45,16 +51,17 @@ class asset_tracking_widget(QtWidgets.QFrame):
         self.connect_functions()
 
     def refresh_users_dic(self):
-        users_ids = project.get_users_ids_list()
+        users_ids = [user_id for user_id in project.get_users_ids_list()
+                     if user_id not in self.users_ids.keys()]
+        if len(users_ids) == 0:
+            return
+        users_names = repository.get_users_names_by_ids(users_ids)
         for user_id in users_ids:
-            if user_id not in self.users_ids.keys():
-                user_row = repository.get_user_data(user_id)
-                self.users_ids[user_id] = user_row['user_name']
-                icon = QtGui.QIcon()
-                pm = gui_utils.mask_image(image.convert_str_data_to_image_bytes(
-                    user_row['profile_picture']), 'png', 18)
-                icon.addPixmap(pm)
-                self.assignment_comboBox.addItem(icon, self.users_ids[user_id])
+            if user_id not in users_names.keys():
+                continue
+            self.users_ids[user_id] = users_names[user_id]
+            icon = avatars.get_icon(self.users_ids[user_id], 18)
+            self.assignment_comboBox.addItem(icon, self.users_ids[user_id])
 
     def edit_estimation(self):
         if self.stage_row is None:
@@ -285,7 +292,7 @@ class asset_tracking_widget(QtWidgets.QFrame):
     def refresh(self):
         start_time = time.perf_counter()
         if self.stage_id is not None:
-            self.stage_row = project.get_stage_data(self.stage_id)
+            self.stage_row = search_index.get_rows('stages').get(self.stage_id)
         else:
             self.stage_row = None
         self.refresh_tracking_events()
@@ -347,9 +354,9 @@ class asset_tracking_widget(QtWidgets.QFrame):
         project_tracking_events_ids = []
         if self.stage_id is not None:
             event_number = self.event_count_spinBox.value()
-            tracking_event_rows = project.get_asset_tracking_events(
-                self.stage_id)
-            for tracking_event_row in tracking_event_rows[-event_number:]:
+            tracking_event_rows = self.get_timeline(
+                self.stage_id, event_number)
+            for tracking_event_row in tracking_event_rows:
                 project_tracking_events_ids.append(tracking_event_row['id'])
                 if tracking_event_row['id'] not in self.tracking_event_ids.keys():
                     widget = tracking_event_widget(tracking_event_row)
@@ -369,6 +376,44 @@ class asset_tracking_widget(QtWidgets.QFrame):
         if self.stage_id is not None:
             self.remove_useless_events(event_number)
 
+    def get_timeline(self, stage_id, event_number):
+        timeline = self.timelines.pop(stage_id, None)
+        if timeline is not None:
+            last_id = timeline['rows'][-1]['id'] if len(timeline['rows']) > 0 else 0
+            result = project.get_asset_tracking_timeline(
+                stage_id, after_id=last_id)
+            if result is None:
+                return []
+            rows, events_count = result
+            if timeline['events_count'] + len(rows) != events_count:
+                # Some events were removed
+                timeline = None
+            else:
+                timeline['rows'] += rows
+                timeline['events_count'] = events_count
+        if timeline is None:
+            result = project.get_asset_tracking_timeline(
+                stage_id, limit=event_number)
+            if result is None:
+                return []
+            rows, events_count = result
+            timeline = dict(rows=rows, events_count=events_count)
+
+        # Older events page when the events count is increased
+        missing_count = min(event_number, timeline['events_count']) - len(timeline['rows'])
+        if missing_count > 0 and len(timeline['rows']) > 0:
+            result = project.get_asset_tracking_timeline(stage_id,
+                                                         limit=missing_count,
+                                                         before_id=timeline['rows'][0]['id'])
+            if result is not None:
+                timeline['rows'] = result[0] + timeline['rows']
+        timeline['rows'] = timeline['rows'][-event_number:]
+
+        self.timelines[stage_id] = timeline
+        while len(self.timelines) > self.timelines_cache_size:
+            self.timelines.popitem(last=False)
+        return timeline['rows']
+
     def remove_useless_events(self, event_number):
         tracking_event_ids_list_to_remove = list(
             self.tracking_event_ids.keys())[:-event_number]
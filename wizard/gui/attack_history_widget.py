@@ -9,13 +9,12 @@ import time
 # Wizard modules
 from wizard.core import tools
 from wizard.core import repository
-from wizard.core import image
 from wizard.vars import ressources
 from wizard.vars import game_vars
 
 # Wizard gui modules
 from wizard.gui import gui_server
-from wizard.gui import gui_utils
+from wizard.gui import avatars
 
 
 class attack_history_widget(QtWidgets.QFrame):
@@ -50,12 +49,8 @@ class attack_history_widget(QtWidgets.QFrame):
             del self.attack_ids[attack_id]
 
     def refresh_users_dic(self):
-        users_rows = repository.get_users_list()
-        for user_row in users_rows:
-            if user_row['user_name'] not in self.users_images_dic.keys():
-                pm = gui_utils.mask_image(image.convert_str_data_to_image_bytes(
-                    user_row['profile_picture']), 'png', 24)
-                self.users_images_dic[user_row['user_name']] = pm
+        for user_name in avatars.get_user_names():
+            self.users_images_dic[user_name] = avatars.get_pixmap(user_name, 24)
 
     def build_ui(self):
         self.setObjectName('dark_widget')
@@ -0,0 +1,119 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# Application wide cache of the users profile pictures.
+
+# The pictures are stored as encoded strings in the
+# repository 'users' table. They are downloaded and decoded
+# once, then masked once per requested size.
+# refresh() only queries the pictures hashes and downloads
+# the pictures that changed.
+
+# Python modules
+from PyQt6 import QtGui
+import logging
+
+# Wizard modules
+from wizard.core import repository
+from wizard.core import image
+
+# Wizard gui modules
+from wizard.gui import gui_utils
+
+logger = logging.getLogger(__name__)
+
+
+class avatars_cache(object):
+    def __init__(self):
+        self.hashes = dict()
+        self.images_bytes = dict()
+        self.pixmaps = dict()
+        self.icons = dict()
+        self.missing_user_names = set()
+        self.refreshed = False
+
+    def refresh(self):
+        hashes_rows = repository.get_users_pictures_hashes()
+        if hashes_rows is None:
+            return
+        hashes = dict()
+        for hash_row in hashes_rows:
+            hashes[hash_row['user_name']] = hash_row['picture_hash']
+
+        changed_user_names = [user_name for user_name, picture_hash in hashes.items()
+                              if self.hashes.get(user_name) != picture_hash]
+        if len(changed_user_names) > 0:
+            logger.debug(
+                f"Loading profile pictures : {', '.join(changed_user_names)}")
+            for picture_row in repository.get_users_pictures(changed_user_names) or []:
+                self.images_bytes[picture_row['user_name']] = image.convert_str_data_to_image_bytes(
+                    picture_row['profile_picture'])
+        for user_name in set(self.images_bytes.keys()) - set(hashes.keys()):
+            del self.images_bytes[user_name]
+        self.hashes = hashes
+
+        # Drop the masked pictures of the outdated hashes
+        self.pixmaps = dict((key, pixmap) for key, pixmap in self.pixmaps.items()
+                            if self.hashes.get(key[0]) == key[1])
+        self.icons = dict((key, icon) for key, icon in self.icons.items()
+                          if self.hashes.get(key[0]) == key[1])
+        self.missing_user_names = set()
+        self.refreshed = True
+
+    def get_user_names(self):
+        if not self.refreshed:
+            self.refresh()
+        return list(self.hashes.keys())
+
+    def get_pixmap(self, user_name, size=30, custom_radius=None):
+        if not self.refreshed or (user_name not in self.images_bytes.keys()
+                                  and user_name not in self.missing_user_names):
+            # Unknown user, maybe created since the last refresh
+            self.refresh()
+        if user_name not in self.images_bytes.keys():
+            self.missing_user_names.add(user_name)
+            return QtGui.QPixmap()
+        key = (user_name, self.hashes[user_name], size, custom_radius)
+        if key not in self.pixmaps.keys():
+            self.pixmaps[key] = gui_utils.mask_image(
+                self.images_bytes[user_name], 'png', size, custom_radius)
+        return self.pixmaps[key]
+
+    def get_icon(self, user_name, size=30, custom_radius=None):
+        pixmap = self.get_pixmap(user_name, size, custom_radius)
+        key = (user_name, self.hashes.get(user_name), size, custom_radius)
+        if key not in self.icons.keys():
+            icon = QtGui.QIcon()
+            icon.addPixmap(pixmap)
+            self.icons[key] = icon
+        return self.icons[key]
+
+
+_cache = avatars_cache()
+
+
+def get_cache():
+    return _cache
+
+
+def refresh():
+    _cache.refresh()
+
+
+def get_user_names():
+    return _cache.get_user_names()
+
+
+def get_pixmap(user_name, size=30, custom_radius=None):
+    return _cache.get_pixmap(user_name, size, custom_radius)
+
+
+def get_icon(user_name, size=30, custom_radius=None):
+    return _cache.get_icon(user_name, size, custom_radius)
+
+
+def fill_pixmaps(pixmaps_dic, size=30, custom_radius=None):
+    # Updated in place, the dict may be shared
+    for user_name in get_user_names():
+        pixmaps_dic[user_name] = get_pixmap(user_name, size, custom_radius)
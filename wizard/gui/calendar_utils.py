@@ -68,6 +68,11 @@ class custom_graphic_item(QtWidgets.QGraphicsItem):
     def boundingRect(self):
         return QtCore.QRectF(self.x, self.y, self.width, self.height)
 
+    def scene_rect(self):
+        # Valid even when the item is not in the scene
+        pos = self.pos()
+        return QtCore.QRectF(pos.x()+self.x, pos.y()+self.y, self.width, self.height)
+
     def paint(self, painter, option, widget):
         color = QtGui.QColor('transparent')
         pen = QtGui.QPen(QtGui.QColor('transparent'), 1,
@@ -588,6 +593,17 @@ class calendar_viewport(QtWidgets.QGraphicsView):
         self.y_pos = 0
         self.items = []
         self.frames = []
+
+        # Only the items intersecting the culling rect are in the scene,
+        # the culling rect is the visible rect extended by the margin
+        # ( in viewport sizes ), it is recomputed when the visible
+        # rect leaves it
+        self.culling_margin = 1.0
+        self.culling_rect = None
+        self.materialized_items = set()
+        self.culling_timer = QtCore.QTimer(self)
+        self.culling_timer.setSingleShot(True)
+        self.culling_timer.timeout.connect(self.update_culling)
         self.scene.zoom_factor = self.zoom_factor
         self.start_selection_drag = None
         self.movement = False
@@ -612,6 +628,29 @@ class calendar_viewport(QtWidgets.QGraphicsView):
         self.deadline = deadline
         self.scene.set_deadline(deadline)
 
+    def invalidate_culling(self):
+        # Coalesce the culling updates of a refresh
+        self.culling_rect = None
+        self.culling_timer.start(0)
+
+    def update_culling(self):
+        visible_rect = self.mapToScene(
+            self.viewport().rect()).boundingRect()
+        if self.culling_rect is not None and self.culling_rect.contains(visible_rect):
+            return
+        margin_x = visible_rect.width()*self.culling_margin
+        margin_y = visible_rect.height()*self.culling_margin
+        self.culling_rect = visible_rect.adjusted(
+            -margin_x, -margin_y, margin_x, margin_y)
+        for item in self.items:
+            materialize = item.isVisible() and self.culling_rect.intersects(item.scene_rect())
+            if materialize and item not in self.materialized_items:
+                self.scene.addItem(item)
+                self.materialized_items.add(item)
+            elif not materialize and item in self.materialized_items:
+                self.scene.removeItem(item)
+                self.materialized_items.remove(item)
+
     def update_infos(self):
         selection_list = []
         visible_list = []
@@ -645,6 +684,7 @@ class calendar_viewport(QtWidgets.QGraphicsView):
         super().resizeEvent(event)
         self.viewport_helper.move(
             0, self.height()-self.viewport_helper.height())
+        self.invalidate_culling()
 
     def set_column_width(self, column_width):
         for item in self.items:
@@ -652,6 +692,7 @@ class calendar_viewport(QtWidgets.QGraphicsView):
         self.column_width = column_width
         self.scene.set_column_width(column_width)
         self.column_width_update.emit(column_width)
+        self.invalidate_culling()
         self.update()
 
     def set_row_height(self, row_height):
@@ -662,6 +703,7 @@ class calendar_viewport(QtWidgets.QGraphicsView):
         self.row_height = row_height
         self.scene.set_row_height(row_height)
         self.row_height_update.emit(row_height)
+        self.invalidate_culling()
         self.update()
 
     def movement_on_selection(self, delta):
@@ -686,12 +728,13 @@ class calendar_viewport(QtWidgets.QGraphicsView):
                 item.stop_movement()
         if not self.movement:
             return
+        self.invalidate_culling()
         self.movement_stopped.emit(1)
         self.movement = False
 
     def add_item(self, graphic_item):
+        # The item is added to the scene by update_culling()
         self.items.append(graphic_item)
-        self.scene.addItem(graphic_item)
         graphic_item.set_column_width(self.column_width)
         graphic_item.set_row_height(self.row_height)
         graphic_item.signal_manager.movement.connect(
@@ -704,6 +747,7 @@ class calendar_viewport(QtWidgets.QGraphicsView):
             self.stop_movement_on_selection)
         graphic_item.signal_manager.select.connect(self.update_selection)
         graphic_item.setPos(QtCore.QPointF(graphic_item.pos().x(), 0))
+        self.invalidate_culling()
 
     def add_space(self, number=1):
         self.y_pos += number*self.row_height
@@ -717,6 +761,7 @@ class calendar_viewport(QtWidgets.QGraphicsView):
                 continue
             item.setPos(item.pos().x(), self.y_pos)
             self.add_space(1)
+        self.invalidate_culling()
 
     def add_frame(self, graphic_item):
         self.frames.append(graphic_item)
@@ -726,6 +771,8 @@ class calendar_viewport(QtWidgets.QGraphicsView):
     def remove_item(self, graphic_item):
         if graphic_item in self.items:
             self.items.remove(graphic_item)
+        if graphic_item in self.materialized_items:
+            self.materialized_items.remove(graphic_item)
             self.scene.removeItem(graphic_item)
 
     def remove_frame(self, graphic_item):
@@ -760,9 +807,9 @@ class calendar_viewport(QtWidgets.QGraphicsView):
             frame_scene_rect = QtCore.QRectF(
                 frame.pos().x(), frame.pos().y(), frame.width, frame.height)
             for item in self.items:
-                item_scene_rect = QtCore.QRectF(
-                    item.pos().x(), item.pos().y(), item.width, item.height)
-                if not item_scene_rect.intersects(frame_scene_rect):
+                if not item.isVisible():
+                    continue
+                if not item.scene_rect().intersects(frame_scene_rect):
                     continue
                 if item in items:
                     continue
@@ -781,6 +828,7 @@ class calendar_viewport(QtWidgets.QGraphicsView):
     def update_scene_rect(self, rect):
         self.setSceneRect(rect)
         self.scene_rect_update.emit(rect)
+        self.update_culling()
 
     def wheelEvent(self, event):
         if event.modifiers() & QtCore.Qt.KeyboardModifier.ShiftModifier:
@@ -829,9 +877,9 @@ class calendar_viewport(QtWidgets.QGraphicsView):
                 items_intersected = []
                 frames_intersected = []
                 for item in self.items:
-                    item_scene_rect = QtCore.QRectF(
-                        item.pos().x(), item.pos().y(), item.width, item.height)
-                    if rect.intersects(item_scene_rect):
+                    if not item.isVisible():
+                        continue
+                    if rect.intersects(item.scene_rect()):
                         items_intersected.append(item)
                 for frame in self.frames:
                     frame_scene_rect = QtCore.QRectF(
@@ -867,9 +915,9 @@ class calendar_viewport(QtWidgets.QGraphicsView):
                 selected_items.append(item)
         if len(selected_items) == 0:
             return
-        bounding_rect = selected_items[0].sceneBoundingRect()
+        bounding_rect = selected_items[0].scene_rect()
         for item in selected_items[1:]:
-            bounding_rect = bounding_rect.united(item.sceneBoundingRect())
+            bounding_rect = bounding_rect.united(item.scene_rect())
         self.focus_on_rect(bounding_rect)
 
     def zoom_column_width(self, event):
@@ -1103,6 +1151,7 @@ class calendar_item(custom_graphic_item):
 
     def cache_scene_painting(self):
         self.margin = 4
+        self.simplified_height = 14
         self.qt_bg_color = QtGui.QColor(self.bg_color)
         self.qt_handle_color = QtGui.QColor('white')
         self.qt_handle_color.setAlpha(120)
@@ -1110,6 +1159,11 @@ class calendar_item(custom_graphic_item):
         self.pen = QtGui.QPen(QtGui.QColor('transparent'), 0)
         self.text_pen = QtGui.QPen(QtGui.QColor('white'), 1)
 
+    def is_simplified(self, option, painter):
+        # Below this on screen height, the item is drawn as a plain bar
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        return lod*self.row_height < self.simplified_height
+
     def paint(self, painter, option, widget):
         painter.setPen(self.pen)
 
@@ -1121,6 +1175,9 @@ class calendar_item(custom_graphic_item):
 
         rect = QtCore.QRectF(self.x+self.margin, self.y+self.margin,
                              self.width-self.margin*2, self.height-self.margin*2)
+        if self.is_simplified(option, painter):
+            painter.fillRect(rect, color)
+            return
         self.brush.setColor(color)
         painter.setBrush(self.brush)
         painter.drawRoundedRect(rect, self.row_height/10, self.row_height/10)
@@ -1133,8 +1190,6 @@ class calendar_item(custom_graphic_item):
             painter.drawRoundedRect(
                 rect, self.handle_size/4, self.handle_size/4)
 
-        self.scene().update()
-
 
 class frame_item(custom_graphic_item):
     def __init__(self, bg_color, frame_label):
@@ -298,7 +298,7 @@ class championship_widget(QtWidgets.QWidget):
     def connect_functions(self):
         self.tabs_widget.currentChanged.connect(self.tab_changed)
         self.refresh_thread.refresh_signal.connect(self.refresh)
-        self.refresh_thread.refresh_signal.connect(gui_server.refresh_ui)
+        self.refresh_thread.refresh_signal.connect(lambda: gui_server.refresh_ui())
         self.participation_checkbox.stateChanged.connect(
             self.modify_championship_participation)
 
@@ -347,3 +347,54 @@ class curves_chart(QtWidgets.QFrame):
                                  (len(self.abscissa_headers)-1))+self.margin),
                              int(h-self.margin))
             header_index += 1
+
+
+class histogram_chart(QtWidgets.QFrame):
+    def __init__(self, parent=None):
+        super(histogram_chart, self).__init__(parent)
+        self.setMinimumHeight(120)
+        self.bounds = []
+        self.counts = []
+        self.color = '#7785de'
+        self.margin = 20
+
+    def set_data(self, bounds, counts):
+        self.bounds = bounds
+        self.counts = counts
+        self.update()
+
+    def clear(self):
+        self.set_data([], [])
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        w = self.width() - self.margin*2
+        h = self.height() - self.margin*2
+        painter.setPen(QtGui.QPen(QtGui.QColor('gray'), 1))
+        painter.drawLine(self.margin, self.margin+h, self.margin+w, self.margin+h)
+        if len(self.counts) == 0 or max(self.counts) == 0:
+            return
+        max_count = max(self.counts)
+        bar_width = w/len(self.counts)
+        font_metric = QtGui.QFontMetrics(QtGui.QFont())
+        for index, count in enumerate(self.counts):
+            bar_height = h*count/max_count
+            rect = QtCore.QRectF(self.margin+bar_width*index+1,
+                                 self.margin+h-bar_height,
+                                 bar_width-2,
+                                 bar_height)
+            painter.setPen(QtCore.Qt.PenStyle.NoPen)
+            painter.setBrush(QtGui.QColor(self.color))
+            painter.drawRoundedRect(rect, 2, 2)
+            if count > 0:
+                painter.setPen(QtGui.QPen(QtGui.QColor('#d7d7d7'), 1))
+                text = str(count)
+                painter.drawText(int(rect.center().x()-font_metric.horizontalAdvance(text)/2),
+                                 int(rect.top()-3), text)
+        # Upper bound of the last bin
+        painter.setPen(QtGui.QPen(QtGui.QColor('gray'), 1))
+        text = f"{self.bounds[-1]*1000:.0f} ms"
+        painter.drawText(int(self.margin+w-font_metric.horizontalAdvance(text)),
+                         int(self.margin+h+font_metric.height()), text)
+        painter.drawText(self.margin, int(self.margin+h+font_metric.height()), '0 ms')
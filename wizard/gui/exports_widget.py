@@ -7,9 +7,7 @@ from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtCore import pyqtSignal
 import json
 import time
-import os
 import traceback
-import copy
 import logging
 
 # Wizard modules
@@ -20,12 +18,15 @@ from wizard.core import tools
 from wizard.core import subtasks_library
 from wizard.core import path_utils
 from wizard.core import repository
+from wizard.core import search_index
+from wizard.core import sequences
 from wizard.vars import ressources
 from wizard.vars import assets_vars
 
 # Wizard gui modules
 from wizard.gui import gui_utils
 from wizard.gui import gui_server
+from wizard.gui import files_watcher
 from wizard.gui import confirm_widget
 from wizard.gui import manual_export_widget
 from wizard.gui import drop_files_widget
@@ -68,7 +69,7 @@ class exports_widget(QtWidgets.QWidget):
         self.export_versions_rows = None
         self.export_ids = dict()
         self.export_versions_ids = dict()
-        self.check_existence_thread = check_existence_thread()
+        self.files_existence = files_existence(self)
         self.destination_manager = None
         self.build_ui()
         self.start_timer()
@@ -357,14 +358,16 @@ class exports_widget(QtWidgets.QWidget):
         self.list_view.itemDoubleClicked.connect(self.open_folder)
         self.list_view.itemSelectionChanged.connect(self.refresh_infos)
 
-        self.check_existence_thread.missing_file_signal.connect(
+        self.files_existence.missing_file_signal.connect(
             self.missing_file)
-        self.check_existence_thread.missing_folder_signal.connect(
+        self.files_existence.missing_folder_signal.connect(
             self.missing_folder)
-        self.check_existence_thread.not_missing_file_signal.connect(
+        self.files_existence.not_missing_file_signal.connect(
             self.not_missing_file)
-        self.check_existence_thread.extension_signal.connect(
+        self.files_existence.extension_signal.connect(
             self.extension_signal)
+        self.files_existence.missing_frames_signal.connect(
+            self.missing_frames)
 
         self.search_bar.textChanged.connect(self.update_search)
         self.search_thread.show_id_signal.connect(self.show_search_version)
@@ -438,7 +441,7 @@ class exports_widget(QtWidgets.QWidget):
                                 else:
                                     self.export_versions_ids[export_version_row['id']].refresh(
                                         export_version_row)
-                            self.check_existence_thread.update_versions_rows(
+                            self.files_existence.update_versions_rows(
                                 self.export_versions_rows)
 
                     export_list_ids = list(self.export_ids.keys())
@@ -490,6 +493,12 @@ class exports_widget(QtWidgets.QWidget):
         if export_version_id in self.export_versions_ids.keys():
             self.export_versions_ids[export_version_id].set_missing(number)
 
+    def missing_frames(self, tuple_signal):
+        export_version_id, number, description = tuple_signal
+        if export_version_id in self.export_versions_ids.keys():
+            self.export_versions_ids[export_version_id].set_missing_frames(
+                number, description)
+
     def missing_folder(self, export_version_id):
         if export_version_id in self.export_versions_ids.keys():
             self.export_versions_ids[export_version_id].set_missing_folder()
@@ -667,7 +676,7 @@ class exports_widget(QtWidgets.QWidget):
         self.list_view.setVisible(1)
 
     def change_stage(self, stage_id):
-        self.check_existence_thread.running = False
+        self.files_existence.clear()
         self.export_ids = dict()
         self.export_versions_ids = dict()
         self.list_view.clear()
@@ -781,13 +790,21 @@ class custom_export_version_tree_item(QtWidgets.QTreeWidgetItem):
 
     def set_missing(self, number):
         self.setText(7, f'missing {number} files')
+        self.setToolTip(7, '')
+        self.setForeground(7, QtGui.QBrush(QtGui.QColor('#f79360')))
+
+    def set_missing_frames(self, number, description):
+        self.setText(7, f'{number} bad frames')
+        self.setToolTip(7, description)
         self.setForeground(7, QtGui.QBrush(QtGui.QColor('#f79360')))
 
     def set_missing_folder(self):
         self.setText(7, f"missing folder")
+        self.setToolTip(7, '')
         self.setForeground(7, QtGui.QBrush(QtGui.QColor('#ff4b3b')))
 
     def set_not_missing(self, number):
+        self.setToolTip(7, '')
         if number > 0:
             self.setText(7, f'{number} files')
         else:
@@ -805,61 +822,99 @@ class signal_handler(QtCore.QObject):
         super(signal_handler, self).__init__(parent)
 
 
-class check_existence_thread(QtCore.QThread):
+class files_existence(QtCore.QObject):
 
     missing_file_signal = pyqtSignal(tuple)
     missing_folder_signal = pyqtSignal(int)
     not_missing_file_signal = pyqtSignal(tuple)
     extension_signal = pyqtSignal(tuple)
+    missing_frames_signal = pyqtSignal(tuple)
 
     def __init__(self, parent=None):
-        super(check_existence_thread, self).__init__(parent)
-        self.export_versions_rows = None
-        self.running = True
-
-    def run(self):
-        try:
-            if self.export_versions_rows is not None:
-                for export_version_row in self.export_versions_rows:
-                    files_list = json.loads(export_version_row['files'])
-                    export_version_dir = assets.get_export_version_path(
-                        export_version_row['id'])
-                    if not path_utils.isdir(export_version_dir):
-                        self.missing_folder_signal.emit(
-                            export_version_row['id'])
-                        continue
-                    if files_list == []:
-                        missing_files = 0
-                        export_version_dir = assets.get_export_version_path(
-                            export_version_row['id'])
-                        files_list = os.listdir(export_version_dir)
-                        if len(files_list) > 0:
-                            self.extension_signal.emit(
-                                (export_version_row['id'], files_list[0].split('.')[-1]))
-                    else:
-                        missing_files = 0
-                        for file in files_list:
-                            if not path_utils.isfile(file):
-                                missing_files += 1
-                    if not self.running:
-                        break
-
-                    if missing_files:
-                        self.missing_file_signal.emit(
-                            (export_version_row['id'], missing_files))
-                    else:
-                        self.not_missing_file_signal.emit(
-                            (export_version_row['id'], len(files_list)))
-                    if not self.running:
-                        break
-        except:
-            logger.debug(str(traceback.format_exc()))
+        super(files_existence, self).__init__(parent)
+        self.export_versions_rows = []
+        self.directories = dict()
+        self.export_versions_dirs = dict()
+        self.watcher = files_watcher.get_watcher()
+        self.watcher.directories_changed.connect(self.directories_changed)
 
     def update_versions_rows(self, export_versions_rows):
-        self.running = False
-        self.export_versions_rows = export_versions_rows
-        self.running = True
-        self.start()
+        self.export_versions_rows = export_versions_rows or []
+        self.directories = dict()
+        self.export_versions_dirs = dict()
+        export_paths = dict()
+        for export_version_row in self.export_versions_rows:
+            export_id = export_version_row['export_id']
+            if export_id not in export_paths.keys():
+                export_paths[export_id] = assets.get_export_path(export_id)
+            if not export_paths[export_id]:
+                continue
+            export_version_dir = path_utils.join(
+                export_paths[export_id], export_version_row['name'])
+            directories = set([export_version_dir])
+            for file in json.loads(export_version_row['files']):
+                directories.add(path_utils.dirname(file))
+            self.export_versions_dirs[export_version_row['id']
+                                      ] = export_version_dir
+            self.directories[export_version_row['id']] = directories
+        all_directories = set()
+        for directories in self.directories.values():
+            all_directories |= directories
+        self.watcher.watch(self, all_directories)
+        self.check(self.export_versions_rows)
+
+    def clear(self):
+        self.export_versions_rows = []
+        self.directories = dict()
+        self.watcher.unwatch(self)
+
+    def directories_changed(self, changed_directories):
+        changed_directories = set(changed_directories)
+        self.check([export_version_row for export_version_row in self.export_versions_rows
+                    if self.directories.get(export_version_row['id'], set()) & changed_directories])
+
+    def check(self, export_versions_rows):
+        for export_version_row in export_versions_rows:
+            export_version_id = export_version_row['id']
+            if export_version_id not in self.directories.keys():
+                continue
+            if not all(self.watcher.is_scanned(directory)
+                       for directory in self.directories[export_version_id]):
+                # Checked once the directories are scanned
+                continue
+            export_version_dir = self.export_versions_dirs[export_version_id]
+            export_version_files = self.watcher.get_files(export_version_dir)
+            if export_version_files is None:
+                self.missing_folder_signal.emit(export_version_id)
+                continue
+            files_list = json.loads(export_version_row['files'])
+            missing_files = 0
+            if files_list == []:
+                files_list = sorted(export_version_files)
+                if len(files_list) > 0:
+                    self.extension_signal.emit(
+                        (export_version_id, files_list[0].split('.')[-1]))
+                # Renders, the frames are checked
+                bad_sequences = [sequence for sequence in self.watcher.get_sequences(export_version_dir)
+                                 if sequences.get_issues_count(sequence)]
+                if bad_sequences:
+                    self.missing_frames_signal.emit(
+                        (export_version_id,
+                         sum(sequences.get_issues_count(sequence)
+                             for sequence in bad_sequences),
+                         '\n'.join(sequences.describe_issues(sequence)
+                                   for sequence in bad_sequences)))
+                    continue
+            else:
+                for file in files_list:
+                    if not self.watcher.file_exists(file):
+                        missing_files += 1
+            if missing_files:
+                self.missing_file_signal.emit(
+                    (export_version_id, missing_files))
+            else:
+                self.not_missing_file_signal.emit(
+                    (export_version_id, len(files_list)))
 
 
 class search_thread(QtCore.QThread):
@@ -874,33 +929,22 @@ class search_thread(QtCore.QThread):
     def update_search(self, search_data, export_versions_rows):
         self.running = False
         self.search_data = search_data
-        self.export_versions_rows = copy.deepcopy(export_versions_rows)
+        # The rows are only read, no copy needed
+        self.export_versions_rows = list(export_versions_rows or [])
         self.running = True
         self.start()
 
     def run(self):
         try:
-            keywords = self.search_data.split('&')
+            skip_columns = ['id', 'creation_time', 'variant_id', 'stage_id', 'work_version_id', 'work_version_thumbnail_path', 'export_id']
+            matching_ids = search_index.match_rows(self.export_versions_rows,
+                                                   self.search_data,
+                                                   skip_columns=skip_columns,
+                                                   or_separator=None)
             for export_version_row in self.export_versions_rows:
-
-                export_version_id = export_version_row['id']
-                del export_version_row['id']
-                del export_version_row['creation_time']
-                del export_version_row['variant_id']
-                del export_version_row['stage_id']
-                del export_version_row['work_version_id']
-                del export_version_row['work_version_thumbnail_path']
-                del export_version_row['export_id']
-
-                values = list(export_version_row.values())
-                data_list = []
-                for data_block in values:
-                    data_list.append(str(data_block))
-                data = (' ').join(data_list)
-
-                if all(keyword.upper() in data.upper() for keyword in keywords):
-                    self.show_id_signal.emit(export_version_id)
+                if export_version_row['id'] in matching_ids:
+                    self.show_id_signal.emit(export_version_row['id'])
                 else:
-                    self.hide_id_signal.emit(export_version_id)
+                    self.hide_id_signal.emit(export_version_row['id'])
         except:
             logger.debug(str(traceback.format_exc()))
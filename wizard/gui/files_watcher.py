@@ -0,0 +1,183 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# Application wide watcher of the directories displayed
+# by the widgets ( work versions, export versions ).
+
+# The content of each watched directory is listed once
+# and cached, widgets check the existence of their files
+# against the cached listings instead of checking every file.
+# The listings are updated when QFileSystemWatcher notifies
+# a change ( inotify on Linux ) and by a slow polling,
+# the only way to catch changes made on network mounts
+# by other workstations.
+
+# The directories are scanned by wizard.core.sequences,
+# the images sequences are grouped with their missing,
+# empty and truncated frames in the same pass
+
+# Python modules
+from PyQt6 import QtCore
+from PyQt6.QtCore import pyqtSignal
+import threading
+import logging
+
+# Wizard modules
+from wizard.core import path_utils
+from wizard.core import sequences
+
+logger = logging.getLogger(__name__)
+
+_poll_interval_ = 15000
+
+
+class files_watcher(QtCore.QObject):
+
+    directories_changed = pyqtSignal(list)
+
+    def __init__(self, parent=None):
+        super(files_watcher, self).__init__(parent)
+        self.listings = dict()
+        self.sequences = dict()
+        self.owners_directories = dict()
+        self.watched_directories = set()
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.scan_thread = scan_thread()
+        self.poll_timer = QtCore.QTimer(self)
+        self.poll_timer.start(_poll_interval_)
+        self.connect_functions()
+        self.scan_thread.start()
+
+    def connect_functions(self):
+        self.watcher.directoryChanged.connect(
+            lambda directory: self.scan_thread.request([directory]))
+        self.scan_thread.scanned_signal.connect(self.update_listing)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def watch(self, owner, directories):
+        # Replaces the directories watched for this owner
+        directories = set(path_utils.clean_path(directory)
+                          for directory in directories if directory)
+        self.owners_directories[id(owner)] = directories
+        self.update_watched_directories()
+        self.scan_thread.request([directory for directory in directories
+                                  if directory not in self.listings.keys()])
+
+    def unwatch(self, owner):
+        if id(owner) in self.owners_directories.keys():
+            del self.owners_directories[id(owner)]
+        self.update_watched_directories()
+
+    def update_watched_directories(self):
+        watched_directories = set()
+        for directories in self.owners_directories.values():
+            watched_directories |= directories
+        removed_directories = self.watched_directories - watched_directories
+        for directory in removed_directories:
+            if directory in self.listings.keys():
+                del self.listings[directory]
+            self.sequences.pop(directory, None)
+        native_watched = set(self.watcher.directories())
+        to_remove = [directory for directory in removed_directories
+                     if directory in native_watched]
+        if len(to_remove) > 0:
+            self.watcher.removePaths(to_remove)
+        self.watched_directories = watched_directories
+
+    def is_scanned(self, directory):
+        return path_utils.clean_path(directory) in self.listings.keys()
+
+    def get_files(self, directory):
+        # Returns the file names of the directory,
+        # None if the directory doesn't exists
+        return self.listings.get(path_utils.clean_path(directory))
+
+    def get_sequences(self, directory):
+        # Returns the images sequences of the directory
+        return self.sequences.get(path_utils.clean_path(directory), [])
+
+    def file_exists(self, file):
+        # Returns None if the directory is not scanned yet
+        directory = path_utils.dirname(file)
+        if not self.is_scanned(directory):
+            return
+        files = self.get_files(directory)
+        return files is not None and path_utils.basename(file) in files
+
+    def update_listing(self, scan_tuple):
+        directory, files, directory_sequences = scan_tuple
+        if directory not in self.watched_directories:
+            return
+        if (directory in self.listings.keys() and self.listings[directory] == files
+                and self.sequences.get(directory) == directory_sequences):
+            return
+        self.listings[directory] = files
+        self.sequences[directory] = directory_sequences
+        if files is not None and directory not in self.watcher.directories():
+            self.watcher.addPath(directory)
+        self.directories_changed.emit([directory])
+
+    def poll(self):
+        self.scan_thread.request(list(self.watched_directories))
+
+    def stop(self):
+        self.poll_timer.stop()
+        self.scan_thread.stop()
+
+
+class scan_thread(QtCore.QThread):
+
+    scanned_signal = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super(scan_thread, self).__init__(parent)
+        self.pending_directories = []
+        self.lock = threading.Lock()
+        self.event = threading.Event()
+        self.running = True
+
+    def request(self, directories):
+        if len(directories) == 0:
+            return
+        with self.lock:
+            for directory in directories:
+                if directory not in self.pending_directories:
+                    self.pending_directories.append(directory)
+        self.event.set()
+
+    def run(self):
+        while self.running:
+            self.event.wait(1)
+            self.event.clear()
+            while self.running:
+                with self.lock:
+                    if len(self.pending_directories) == 0:
+                        break
+                    directory = self.pending_directories.pop(0)
+                # Cached by the directory modification time
+                listing = sequences.scan_directory(directory)
+                if listing is None:
+                    self.scanned_signal.emit((directory, None, []))
+                    continue
+                self.scanned_signal.emit((directory, frozenset(listing['files'].keys()),
+                                          listing['sequences']))
+
+    def stop(self):
+        self.running = False
+        self.event.set()
+
+
+_watcher = None
+
+
+def get_watcher():
+    global _watcher
+    if _watcher is None:
+        _watcher = files_watcher()
+    return _watcher
+
+
+def stop():
+    if _watcher is not None:
+        _watcher.stop()
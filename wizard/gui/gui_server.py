@@ -21,6 +21,7 @@ import logging
 from wizard.vars import ressources
 from wizard.core import environment
 from wizard.core import socket_utils
+from wizard.core import invalidation
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +42,8 @@ class streamHandler(QtCore.QObject):
 class gui_server(QThread):
 
     refresh_signal = pyqtSignal(int)
-    refresh_team_signal = pyqtSignal(int)
+    invalidate_signal = pyqtSignal(list)
+    refresh_team_signal = pyqtSignal(list)
     restart_signal = pyqtSignal(int)
     tooltip_signal = pyqtSignal(str)
     stdout_signal = pyqtSignal(tuple)
@@ -95,7 +97,10 @@ class gui_server(QThread):
         signal_dic = json.loads(signal_as_str)
 
         if signal_dic['function'] == 'refresh':
-            self.refresh_signal.emit(1)
+            if signal_dic.get('tables'):
+                self.invalidate_signal.emit(signal_dic['tables'])
+            else:
+                self.refresh_signal.emit(1)
         if signal_dic['function'] == 'restart':
             self.restart_signal.emit(1)
         elif signal_dic['function'] == 'tooltip':
@@ -114,7 +119,7 @@ class gui_server(QThread):
             self.work_version_focus_signal.emit(signal_dic['work_version_id'])
             self.raise_ui_signal.emit(1)
         elif signal_dic['function'] == 'refresh_team':
-            self.refresh_team_signal.emit(1)
+            self.refresh_team_signal.emit(signal_dic.get('tables') or [])
         elif signal_dic['function'] == 'save_popup':
             self.save_popup_signal.emit(signal_dic['version_id'])
         elif signal_dic['function'] == 'raise':
@@ -131,22 +136,31 @@ class gui_server(QThread):
         self.streamHandler.stream.connect(self.stdout_signal.emit)
 
 
-def refresh_ui():
+def refresh_ui(tables=None):
+    # Only the widgets displaying the tables modified
+    # since the last refresh will be refreshed.
+    # An empty list triggers a full refresh
+    if tables is None:
+        tables = invalidation.pop_changes()
     signal_dic = dict()
     signal_dic['function'] = 'refresh'
+    signal_dic['tables'] = tables
     send_signal(signal_dic)
 
 
 def refresh_team_ui():
-    refresh_ui()
+    tables = invalidation.pop_changes()
+    refresh_ui(tables)
     signal_dic = dict()
     signal_dic['function'] = 'refresh_team'
+    signal_dic['tables'] = tables
     send_signal(signal_dic)
 
 
 def refresh_only_team_ui():
     signal_dic = dict()
     signal_dic['function'] = 'refresh_team'
+    signal_dic['tables'] = invalidation.pop_changes()
     send_signal(signal_dic)
 
 
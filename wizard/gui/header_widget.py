@@ -37,6 +37,8 @@ class header_widget(QtWidgets.QFrame):
     show_latest_build = pyqtSignal(object)
     show_documentation = pyqtSignal(object)
     show_video_manager = pyqtSignal(object)
+    show_refresh_profiler = pyqtSignal(object)
+    prewarm_previews = pyqtSignal(bool)
     close_signal = pyqtSignal(object)
 
     def __init__(self, parent=None):
@@ -92,6 +94,8 @@ class header_widget(QtWidgets.QFrame):
             QtGui.QIcon(ressources._quote_icon_), "Quotes")
         self.table_viewer_action = self.window_action.addAction(
             QtGui.QIcon(ressources._table_viewer_icon_), "Tables editor")
+        self.refresh_profiler_action = self.window_action.addAction(
+            QtGui.QIcon(ressources._chart_icon_), "Refresh profiler")
         self.pywizard_action = self.window_action.addAction(
             QtGui.QIcon(ressources._python_icon_), "PyWizard")
 
@@ -112,6 +116,11 @@ class header_widget(QtWidgets.QFrame):
         self.project_create_action = self.project_action.addAction(
             QtGui.QIcon(ressources._create_icon_), "Create project")
         self.project_action.addSeparator()
+        self.prewarm_previews_action = self.project_action.addAction(
+            QtGui.QIcon(ressources._tool_video_), "Pre-warm previews")
+        self.prewarm_contact_sheets_action = self.project_action.addAction(
+            QtGui.QIcon(ressources._tool_video_), "Pre-warm previews and contact sheets")
+        self.project_action.addSeparator()
         self.project_preferences_action = self.project_action.addAction(
             QtGui.QIcon(ressources._settings_icon_), "Preferences")
 
@@ -142,12 +151,18 @@ class header_widget(QtWidgets.QFrame):
         self.project_create_action.triggered.connect(self.create_project)
         self.project_preferences_action.triggered.connect(
             self.show_project_preferences.emit)
+        self.prewarm_previews_action.triggered.connect(
+            lambda: self.prewarm_previews.emit(False))
+        self.prewarm_contact_sheets_action.triggered.connect(
+            lambda: self.prewarm_previews.emit(True))
         self.production_manager_action.triggered.connect(
             self.show_production_manager.emit)
         self.video_manager_action.triggered.connect(
             self.show_video_manager.emit)
         self.table_viewer_action.triggered.connect(
             self.show_tables_viewer.emit)
+        self.refresh_profiler_action.triggered.connect(
+            self.show_refresh_profiler.emit)
         self.groups_manager_action.triggered.connect(
             self.show_groups_manager.emit)
         self.batcher_action.triggered.connect(self.show_batcher.emit)
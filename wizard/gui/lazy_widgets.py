@@ -0,0 +1,152 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# Registry of the secondary windows built on first use.
+
+# The windows are only instanced when shown for the first
+# time ( or at startup if they were visible when Wizard was
+# closed ). Once alive they are subscribed to the refresh bus,
+# so they are refreshed only while visible.
+# Windows registered with a release delay are destroyed
+# after being hidden for that long, their position and
+# context are saved before.
+
+# Python modules
+from PyQt6 import QtCore
+import time
+import logging
+
+# Wizard modules
+from wizard.core import user
+
+# Wizard gui modules
+from wizard.gui import floating_widgets_layout
+
+logger = logging.getLogger(__name__)
+
+_release_check_interval_ = 60000
+
+
+class lazy_widget(object):
+    def __init__(self, name, factory, subscribe=True, tables=None, refresh_on_show=True,
+                 has_context=False, keep_pos=True, release_delay=None, on_create=None):
+        self.name = name
+        self.factory = factory
+        self.subscribe = subscribe
+        self.tables = tables
+        self.refresh_on_show = refresh_on_show
+        self.has_context = has_context
+        self.keep_pos = keep_pos
+        self.release_delay = release_delay
+        self.on_create = on_create
+        self.widget = None
+        self.hidden_time = None
+
+
+class lazy_widgets(QtCore.QObject):
+    def __init__(self, refresh_bus, parent=None):
+        super(lazy_widgets, self).__init__(parent)
+        self.refresh_bus = refresh_bus
+        self.lazy_widgets = dict()
+        self.release_timer = QtCore.QTimer(self)
+        self.release_timer.timeout.connect(self.release_hidden_widgets)
+        self.release_timer.start(_release_check_interval_)
+
+    def register(self, name, factory, subscribe=True, tables=None, refresh_on_show=True,
+                 has_context=False, keep_pos=True, release_delay=None, on_create=None):
+        # tables and refresh_on_show are the refresh bus subscription
+        # keep_pos saves and restores the window position
+        # release_delay is in seconds, None to keep the widget alive
+        # on_create receives the widget, to connect its signals
+        self.lazy_widgets[name] = lazy_widget(name, factory, subscribe, tables,
+                                              refresh_on_show, has_context, keep_pos,
+                                              release_delay, on_create)
+
+    def get(self, name):
+        lazy = self.lazy_widgets[name]
+        if lazy.widget is None:
+            self.create(lazy)
+        return lazy.widget
+
+    def get_if_alive(self, name):
+        return self.lazy_widgets[name].widget
+
+    def is_alive(self, name):
+        return self.lazy_widgets[name].widget is not None
+
+    def toggle_function(self, name):
+        return lambda: self.get(name).toggle()
+
+    def create(self, lazy):
+        start_time = time.perf_counter()
+        lazy.widget = lazy.factory()
+        lazy.hidden_time = time.time()
+        lazy.widget.installEventFilter(self)
+        if lazy.on_create:
+            lazy.on_create(lazy.widget)
+        if lazy.subscribe:
+            self.refresh_bus.subscribe(lazy.widget, lazy.tables,
+                                       refresh_on_show=lazy.refresh_on_show)
+            if lazy.refresh_on_show:
+                # The data may have changed since the widget creation
+                self.refresh_bus.mark_dirty(lazy.widget)
+        if lazy.has_context:
+            lazy.widget.get_context()
+        if lazy.keep_pos:
+            floating_widgets_layout.init_widget_pos(lazy.widget, lazy.name)
+        logger.debug(
+            f"{lazy.name} built in {round(time.perf_counter()-start_time, 3)}s")
+
+    def release(self, name):
+        lazy = self.lazy_widgets[name]
+        if lazy.widget is None:
+            return
+        self.save_widget(lazy)
+        self.refresh_bus.unsubscribe(lazy.widget)
+        lazy.widget.removeEventFilter(self)
+        lazy.widget.deleteLater()
+        lazy.widget = None
+        lazy.hidden_time = None
+        logger.debug(f"{name} released")
+
+    def release_hidden_widgets(self):
+        for lazy in list(self.lazy_widgets.values()):
+            if lazy.widget is None or lazy.release_delay is None:
+                continue
+            if lazy.hidden_time is None:
+                continue
+            if time.time() - lazy.hidden_time > lazy.release_delay:
+                self.release(lazy.name)
+
+    def init_visible_widgets(self):
+        # Rebuild the windows left open in the last session
+        for lazy in self.lazy_widgets.values():
+            if not lazy.keep_pos:
+                continue
+            pos_dic = user.user().get_widget_pos(lazy.name)
+            if pos_dic and pos_dic['visibility']:
+                self.get(lazy.name)
+
+    def save_widget(self, lazy):
+        if lazy.has_context:
+            lazy.widget.set_context()
+        if lazy.keep_pos:
+            floating_widgets_layout.save_widget_pos(lazy.widget, lazy.name)
+
+    def save_widgets(self):
+        # The windows never built keep their saved position
+        for lazy in self.lazy_widgets.values():
+            if lazy.widget is not None:
+                self.save_widget(lazy)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QtCore.QEvent.Type.Show:
+            for lazy in self.lazy_widgets.values():
+                if lazy.widget is watched:
+                    lazy.hidden_time = None
+        elif event.type() == QtCore.QEvent.Type.Hide:
+            for lazy in self.lazy_widgets.values():
+                if lazy.widget is watched:
+                    lazy.hidden_time = time.time()
+        return False
@@ -24,10 +24,17 @@ from wizard.core import team_client
 from wizard.core import path_utils
 from wizard.core import support
 from wizard.core import launch_batch
+from wizard.core import search_index
+from wizard.core import refresh_profiler
+from wizard.core import subtasks_library
 
 # Wizard gui modules
 from wizard.gui import gui_utils
 from wizard.gui import gui_server
+from wizard.gui import refresh_bus
+from wizard.gui import lazy_widgets
+from wizard.gui import files_watcher
+from wizard.gui import avatars
 from wizard.gui import tree_widget
 from wizard.gui import references_widget
 from wizard.gui import versions_widget
@@ -62,6 +69,7 @@ from wizard.gui import quotes_manager
 from wizard.gui import table_viewer_widget
 from wizard.gui import floating_widgets_layout
 from wizard.gui import batcher_widget
+from wizard.gui import refresh_profiler_widget
 from wizard.gui import pranks
 from wizard.gui.video_manager import video_manager
 
@@ -81,8 +89,6 @@ class main_widget(QtWidgets.QWidget):
         self.tree_widget = tree_widget.tree_widget(self)
         self.shelf_widget = shelf_widget.shelf_widget(self)
         self.console_widget = console_widget.console_widget()
-        self.user_preferences_widget = user_preferences_widget.user_preferences_widget()
-        self.project_preferences_widget = project_preferences_widget.project_preferences_widget()
         self.asset_tracking_widget = asset_tracking_widget.asset_tracking_widget(
             self)
         self.launcher_widget = launcher_widget.launcher_widget(self)
@@ -103,20 +109,14 @@ class main_widget(QtWidgets.QWidget):
         self.gui_server = gui_server.gui_server()
         self.communicate_server = communicate.communicate_server()
         self.softwares_server = launch.softwares_server()
-        self.softwares_widget = softwares_widget.softwares_widget()
-        self.locks_widget = locks_widget.locks_widget()
         self.championship_widget = championship_widget.championship_widget()
-        self.license_widget = license_widget.license_widget()
-        self.splash_screen_widget = splash_screen_widget.splash_screen_widget()
-        self.production_manager_widget = production_manager_widget.production_manager_widget()
-        self.groups_manager_widget = groups_manager_widget.groups_manager_widget()
-        self.quotes_manager = quotes_manager.quotes_manager()
-        self.table_viewer_widget = table_viewer_widget.table_viewer_widget()
-        self.batcher_widget = batcher_widget.batcher_widget()
-        self.video_manager = video_manager.video_manager()
         self.pranks = pranks.pranks()
+        self.refresh_bus = refresh_bus.refresh_bus(self)
+        self.lazy_widgets = lazy_widgets.lazy_widgets(self.refresh_bus, self)
 
         self.build_ui()
+        self.init_refresh_bus()
+        self.init_lazy_widgets()
         self.connect_functions()
         self.init_gui_server()
         self.init_communicate_server()
@@ -130,11 +130,11 @@ class main_widget(QtWidgets.QWidget):
         show_splash_screen = user.user().get_show_splash_screen()
 
         if current_build != last_user_build:
-            self.splash_screen_widget.show()
+            self.lazy_widgets.get('splash_screen_widget').show()
             user.user().set_user_build(current_build)
         else:
             if show_splash_screen:
-                self.splash_screen_widget.show()
+                self.lazy_widgets.get('splash_screen_widget').show()
 
     def is_latest_build(self, force=1):
         latest_build = support.get_latest_build()
@@ -174,24 +174,11 @@ class main_widget(QtWidgets.QWidget):
             self, 'main_widget', force_show=1, maximized=1)
         floating_widgets_layout.init_widget_pos(
             self.console_widget, 'console_widget')
-        floating_widgets_layout.init_widget_pos(
-            self.user_preferences_widget, 'user_preferences_widget')
-        floating_widgets_layout.init_widget_pos(
-            self.project_preferences_widget, 'project_preferences_widget')
         floating_widgets_layout.init_widget_pos(
             self.subtask_manager, 'subtask_manager')
         floating_widgets_layout.init_widget_pos(
             self.championship_widget, 'championship_widget')
-        floating_widgets_layout.init_widget_pos(
-            self.production_manager_widget, 'production_manager_widget')
-        floating_widgets_layout.init_widget_pos(
-            self.groups_manager_widget, 'groups_manager_widget')
-        floating_widgets_layout.init_widget_pos(
-            self.quotes_manager, 'quotes_manager')
-        floating_widgets_layout.init_widget_pos(
-            self.table_viewer_widget, 'table_viewer_widget')
-        floating_widgets_layout.init_widget_pos(
-            self.video_manager, 'video_manager')
+        self.lazy_widgets.init_visible_widgets()
 
     def init_contexts(self):
         logger.info("Loading user context")
@@ -202,8 +189,6 @@ class main_widget(QtWidgets.QWidget):
         self.videos_widget.get_context()
         self.asset_tracking_widget.get_context()
         self.console_widget.get_context()
-        self.production_manager_widget.get_context()
-        self.video_manager.get_context()
         self.subtask_manager.load_old_tasks()
 
     def save_widgets_pos(self):
@@ -211,24 +196,11 @@ class main_widget(QtWidgets.QWidget):
         floating_widgets_layout.save_widget_pos(self, 'main_widget')
         floating_widgets_layout.save_widget_pos(
             self.console_widget, 'console_widget')
-        floating_widgets_layout.save_widget_pos(
-            self.user_preferences_widget, 'user_preferences_widget')
-        floating_widgets_layout.save_widget_pos(
-            self.project_preferences_widget, 'project_preferences_widget')
         floating_widgets_layout.save_widget_pos(
             self.subtask_manager, 'subtask_manager')
         floating_widgets_layout.save_widget_pos(
             self.championship_widget, 'championship_widget')
-        floating_widgets_layout.save_widget_pos(
-            self.production_manager_widget, 'production_manager_widget')
-        floating_widgets_layout.save_widget_pos(
-            self.groups_manager_widget, 'groups_manager_widget')
-        floating_widgets_layout.save_widget_pos(
-            self.quotes_manager, 'quotes_manager')
-        floating_widgets_layout.save_widget_pos(
-            self.table_viewer_widget, 'table_viewer_widget')
-        floating_widgets_layout.save_widget_pos(
-            self.video_manager, 'video_manager')
+        self.lazy_widgets.save_widgets()
 
     def save_contexts(self):
         logger.info("Saving user context")
@@ -240,38 +212,42 @@ class main_widget(QtWidgets.QWidget):
         self.wall_widget.set_context()
         self.asset_tracking_widget.set_context()
         self.console_widget.set_context()
-        self.video_manager.set_context()
-        self.production_manager_widget.set_context()
 
     def connect_functions(self):
         self.header_widget.show_console.connect(self.console_widget.toggle)
         self.header_widget.show_subtask_manager.connect(
             self.subtask_manager.toggle)
         self.header_widget.show_user_preferences.connect(
-            self.user_preferences_widget.toggle)
+            self.lazy_widgets.toggle_function('user_preferences_widget'))
         self.header_widget.show_quotes_manager.connect(
-            self.quotes_manager.toggle)
+            self.lazy_widgets.toggle_function('quotes_manager'))
         self.header_widget.show_project_preferences.connect(
-            self.project_preferences_widget.toggle)
+            self.lazy_widgets.toggle_function('project_preferences_widget'))
         self.header_widget.show_production_manager.connect(
-            self.production_manager_widget.toggle)
+            self.lazy_widgets.toggle_function('production_manager_widget'))
         self.header_widget.show_groups_manager.connect(
-            self.groups_manager_widget.toggle)
-        self.header_widget.show_batcher.connect(self.batcher_widget.toggle)
+            self.lazy_widgets.toggle_function('groups_manager_widget'))
+        self.header_widget.show_batcher.connect(
+            self.lazy_widgets.toggle_function('batcher_widget'))
         self.header_widget.show_tables_viewer.connect(
-            self.table_viewer_widget.toggle)
+            self.lazy_widgets.toggle_function('table_viewer_widget'))
         self.header_widget.close_signal.connect(self.close)
         self.header_widget.show_championship.connect(
             self.championship_widget.toggle)
         self.header_widget.show_pywizard.connect(self.show_pywizard)
-        self.header_widget.show_license.connect(self.license_widget.toggle)
+        self.header_widget.show_license.connect(
+            self.lazy_widgets.toggle_function('license_widget'))
         self.header_widget.show_splash_screen.connect(
-            self.splash_screen_widget.show)
+            lambda: self.lazy_widgets.get('splash_screen_widget').show())
         self.header_widget.show_latest_build.connect(
             lambda: self.is_latest_build(force=1))
         self.header_widget.show_documentation.connect(self.show_documentation)
         self.header_widget.show_video_manager.connect(
-            self.video_manager.toggle)
+            self.lazy_widgets.toggle_function('video_manager'))
+        self.header_widget.show_refresh_profiler.connect(
+            self.lazy_widgets.toggle_function('refresh_profiler_widget'))
+        self.header_widget.prewarm_previews.connect(
+            lambda contact_sheets: subtasks_library.prewarm_previews(contact_sheets=contact_sheets))
 
         self.tree_widget.stage_changed_signal.connect(self.stage_changed)
         self.tree_widget.launch_stage_signal.connect(
@@ -288,15 +264,16 @@ class main_widget(QtWidgets.QWidget):
         self.footer_widget.show_subtask_manager.connect(
             self.subtask_manager.toggle)
         self.footer_widget.show_production_manager.connect(
-            self.production_manager_widget.toggle)
+            self.lazy_widgets.toggle_function('production_manager_widget'))
         self.footer_widget.connect_team.connect(self.init_team_client)
         self.footer_widget.show_team_widget.connect(self.team_widget.toggle)
         self.footer_widget.show_user_preferences.connect(
-            self.user_preferences_widget.toggle)
+            self.lazy_widgets.toggle_function('user_preferences_widget'))
         self.footer_widget.refresh_signal.connect(self.refresh)
         self.footer_widget.show_softwares_widget.connect(
-            self.softwares_widget.toggle)
-        self.footer_widget.show_locks_widget.connect(self.locks_widget.toggle)
+            self.lazy_widgets.toggle_function('softwares_widget'))
+        self.footer_widget.show_locks_widget.connect(
+            self.lazy_widgets.toggle_function('locks_widget'))
         self.console_widget.notification.connect(
             self.footer_widget.update_console_button)
         self.wall_widget.notification.connect(
@@ -313,12 +290,14 @@ class main_widget(QtWidgets.QWidget):
         self.team_client.team_connection_status_signal.connect(
             self.team_widget.set_team_connection)
         self.team_client.refresh_signal.connect(self.refresh)
+        self.team_client.invalidate_signal.connect(self.invalidate)
         self.team_client.prank_signal.connect(self.pranks.execute_attack)
         self.team_client.new_user_signal.connect(self.team_widget.add_user)
         self.team_client.remove_user_signal.connect(
             self.team_widget.remove_user)
 
         self.gui_server.refresh_signal.connect(self.refresh)
+        self.gui_server.invalidate_signal.connect(self.invalidate)
         self.gui_server.refresh_team_signal.connect(
             self.team_client.refresh_team)
         self.gui_server.restart_signal.connect(self.restart)
@@ -337,9 +316,9 @@ class main_widget(QtWidgets.QWidget):
         self.gui_server.popup_signal.connect(
             self.popup_wall_widget.add_custom_popup)
         self.gui_server.create_playlist_from_stages_signal.connect(
-            self.video_manager.create_playlist_from_stages)
+            lambda stages_ids_list: self.lazy_widgets.get('video_manager').create_playlist_from_stages(stages_ids_list))
         self.gui_server.show_video_signal.connect(
-            self.video_manager.show_single_video)
+            lambda video_id: self.lazy_widgets.get('video_manager').show_single_video(video_id))
 
     def show_documentation(self):
         webbrowser.open_new_tab(ressources._documentation_url_)
@@ -395,8 +374,9 @@ class main_widget(QtWidgets.QWidget):
             self.versions_widget.focus_work_version(work_version_id)
 
     def focus_on_group(self, group_id):
-        self.groups_manager_widget.toggle()
-        self.groups_manager_widget.set_group_id(group_id)
+        groups_manager = self.lazy_widgets.get('groups_manager_widget')
+        groups_manager.toggle()
+        groups_manager.set_group_id(group_id)
 
     def focus_instance(self, instance_tuple):
         instance_type = instance_tuple[0]
@@ -462,6 +442,7 @@ class main_widget(QtWidgets.QWidget):
         self.subtask_manager.tasks_server.stop()
         self.softwares_server.stop()
         self.championship_widget.refresh_thread.stop()
+        files_watcher.stop()
         time.sleep(0.5)
 
     def prepare_close(self):
@@ -493,30 +474,128 @@ class main_widget(QtWidgets.QWidget):
         else:
             event.ignore()
 
+    def init_refresh_bus(self):
+        # Subscription order is the refresh order
+        self.refresh_bus.subscribe(avatars.get_cache(), ['users'],
+                                   always=True)
+        self.refresh_bus.subscribe(self.tree_widget,
+                                   ['domains_data', 'categories', 'assets',
+                                    'stages', 'variants', 'assets_groups',
+                                    'users'])
+        self.refresh_bus.subscribe(self.context_widget,
+                                   ['stages', 'variants', 'work_envs',
+                                    'softwares', 'extensions'])
+        self.refresh_bus.subscribe(self.launcher_widget,
+                                   ['work_envs', 'versions'])
+        self.refresh_bus.subscribe(self.header_widget, ['users'])
+        self.refresh_bus.subscribe(self.references_widget,
+                                   ['references_data', 'referenced_groups_data',
+                                    'grouped_references_data', 'groups',
+                                    'exports', 'export_versions', 'stages',
+                                    'asset_tracking_events'],
+                                   refresh_on_show=False)
+        self.refresh_bus.subscribe(self.versions_widget,
+                                   ['versions', 'work_envs'],
+                                   refresh_on_show=False)
+        self.refresh_bus.subscribe(self.videos_widget, ['videos'],
+                                   refresh_on_show=False)
+        self.refresh_bus.subscribe(self.exports_widget,
+                                   ['exports', 'export_versions',
+                                    'references_data', 'grouped_references_data'],
+                                   refresh_on_show=False)
+        # The wall needs to refresh even when hidden to
+        # send the new events notifications
+        self.refresh_bus.subscribe(self.wall_widget,
+                                   ['events', 'users'],
+                                   always=True)
+        self.refresh_bus.subscribe(self.wall_widget.tag_groups_cache,
+                                   ['tag_groups', 'users'],
+                                   always=True)
+        self.refresh_bus.subscribe(self.asset_tracking_widget,
+                                   ['stages', 'asset_tracking_events', 'users'])
+        self.refresh_bus.subscribe(self.shelf_widget, ['shelf_scripts'])
+        self.refresh_bus.subscribe(self.championship_widget,
+                                   ['users', 'artefacts', 'attack_events'],
+                                   refresh_on_show=False)
+        self.refresh_bus.subscribe(self.subtask_manager, [])
+
+    def init_lazy_widgets(self):
+        # The secondary windows are built on first show,
+        # they subscribe to the refresh bus once built
+        self.lazy_widgets.register('user_preferences_widget',
+                                   user_preferences_widget.user_preferences_widget,
+                                   subscribe=False)
+        self.lazy_widgets.register('project_preferences_widget',
+                                   project_preferences_widget.project_preferences_widget,
+                                   refresh_on_show=False)
+        self.lazy_widgets.register('production_manager_widget',
+                                   production_manager_widget.production_manager_widget,
+                                   tables=['domains_data', 'categories', 'assets',
+                                           'assets_preview', 'stages', 'variants',
+                                           'versions', 'export_versions',
+                                           'asset_tracking_events', 'progress_events',
+                                           'settings', 'users', 'projects'],
+                                   refresh_on_show=False,
+                                   has_context=True,
+                                   release_delay=600)
+        self.lazy_widgets.register('groups_manager_widget',
+                                   groups_manager_widget.groups_manager_widget,
+                                   tables=['groups', 'grouped_references_data'],
+                                   refresh_on_show=False,
+                                   release_delay=600)
+        self.lazy_widgets.register('quotes_manager',
+                                   quotes_manager.quotes_manager,
+                                   tables=['quotes'],
+                                   refresh_on_show=False,
+                                   release_delay=600)
+        self.lazy_widgets.register('table_viewer_widget',
+                                   table_viewer_widget.table_viewer_widget,
+                                   release_delay=600)
+        self.lazy_widgets.register('batcher_widget',
+                                   batcher_widget.batcher_widget,
+                                   subscribe=False,
+                                   keep_pos=False,
+                                   release_delay=600)
+        self.lazy_widgets.register('license_widget',
+                                   license_widget.license_widget,
+                                   subscribe=False,
+                                   keep_pos=False,
+                                   release_delay=600)
+        self.lazy_widgets.register('splash_screen_widget',
+                                   splash_screen_widget.splash_screen_widget,
+                                   tables=['work_envs', 'versions'],
+                                   keep_pos=False,
+                                   release_delay=600)
+        self.lazy_widgets.register('softwares_widget',
+                                   softwares_widget.softwares_widget,
+                                   tables=['work_envs'],
+                                   keep_pos=False)
+        self.lazy_widgets.register('locks_widget',
+                                   locks_widget.locks_widget,
+                                   tables=['work_envs'],
+                                   keep_pos=False)
+        self.lazy_widgets.register('video_manager',
+                                   video_manager.video_manager,
+                                   tables=['stages', 'variants', 'videos',
+                                           'playlists', 'settings', 'users'],
+                                   has_context=True)
+        self.lazy_widgets.register('refresh_profiler_widget',
+                                   refresh_profiler_widget.refresh_profiler_widget,
+                                   subscribe=False,
+                                   release_delay=600)
+
+    def invalidate(self, tables):
+        start_time = time.perf_counter()
+        with refresh_profiler.profile('main_widget.invalidate'):
+            search_index.invalidate(tables)
+            self.refresh_bus.invalidate(tables)
+        self.footer_widget.update_refresh_time(start_time)
+
     def refresh(self):
         start_time = time.perf_counter()
-        self.tree_widget.refresh()
-        self.context_widget.refresh()
-        self.launcher_widget.refresh()
-        self.header_widget.refresh()
-        self.references_widget.refresh()
-        self.versions_widget.refresh()
-        self.videos_widget.refresh()
-        self.exports_widget.refresh()
-        self.wall_widget.refresh()
-        self.softwares_widget.refresh()
-        self.locks_widget.refresh()
-        self.asset_tracking_widget.refresh()
-        self.production_manager_widget.refresh()
-        self.table_viewer_widget.refresh()
-        self.shelf_widget.refresh()
-        self.groups_manager_widget.refresh()
-        self.project_preferences_widget.refresh()
-        self.quotes_manager.refresh()
-        self.championship_widget.refresh()
-        self.splash_screen_widget.refresh()
-        self.subtask_manager.refresh()
-        self.video_manager.refresh()
+        with refresh_profiler.profile('main_widget.refresh'):
+            search_index.invalidate_all()
+            self.refresh_bus.invalidate_all()
         self.footer_widget.update_refresh_time(start_time)
 
     def build_ui(self):
@@ -16,11 +16,11 @@ from wizard.core import environment
 from wizard.core import repository
 from wizard.core import project
 from wizard.core import tools
-from wizard.core import image
 from wizard.core import stats
 
 # Wizard gui modules
 from wizard.gui import gui_utils
+from wizard.gui import avatars
 from wizard.gui import chart_utils
 
 
@@ -386,11 +386,8 @@ class user_progress_widget(QtWidgets.QFrame):
 
     def refresh(self):
         self.stages_piechart_widget.pie_chart.clear()
-        user_row = repository.get_user_row_by_name(environment.get_user())
-        user_image = user_row['profile_picture']
-        pixmap = gui_utils.mask_image(
-            image.convert_str_data_to_image_bytes(user_image), 'png', 60)
-        self.user_image_label.setPixmap(pixmap)
+        self.user_image_label.setPixmap(
+            avatars.get_pixmap(environment.get_user(), 60))
 
         stage_rows = project.get_all_stages()
         all_progresses = []
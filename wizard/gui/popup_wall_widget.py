@@ -11,8 +11,6 @@ import logging
 
 # Wizard modules
 from wizard.core import user
-from wizard.core import repository
-from wizard.core import image
 from wizard.core import game
 from wizard.core import project
 from wizard.core import events
@@ -24,6 +22,7 @@ from wizard.vars import game_vars
 
 # Wizard gui modules
 from wizard.gui import gui_utils
+from wizard.gui import avatars
 from wizard.gui import gui_server
 from wizard.gui import tags_widget
 from wizard.gui import tag_label
@@ -377,11 +376,8 @@ class popup_event_widget(QtWidgets.QFrame):
             self.timer.start(duration*1000)
 
     def fill_ui(self):
-        profile_image = repository.get_user_row_by_name(
-            self.event_row['creation_user'], 'profile_picture')
-        pm = gui_utils.mask_image(
-            image.convert_str_data_to_image_bytes(profile_image), 'png', 30)
-        self.profile_picture.setPixmap(pm)
+        self.profile_picture.setPixmap(
+            avatars.get_pixmap(self.event_row['creation_user'], 30))
         self.user_name_label.setText(self.event_row['creation_user'])
         self.event_title_label.setText(self.event_row['title'])
         if self.event_row['message'] is not None and self.event_row['message'] != '':
@@ -691,11 +687,8 @@ class popup_custom_widget(QtWidgets.QFrame):
         if self.icon:
             self.icon_picture.setPixmap(QtGui.QIcon(self.icon).pixmap(30))
         if self.profile_picture:
-            profile_image = repository.get_user_row_by_name(
-                self.profile_picture, 'profile_picture')
-            pm = gui_utils.mask_image(
-                image.convert_str_data_to_image_bytes(profile_image), 'png', 30)
-            self.icon_picture.setPixmap(pm)
+            self.icon_picture.setPixmap(
+                avatars.get_pixmap(self.profile_picture, 30))
         self.event_title_label.setText(self.title)
         self.msg_label.setText(self.msg)
 
@@ -7,7 +7,6 @@ from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtCore import pyqtSignal
 import datetime
 import time
-import copy
 import logging
 import traceback
 
@@ -15,6 +14,7 @@ import traceback
 from wizard.gui import calendar_utils
 from wizard.gui import gui_server
 from wizard.gui import gui_utils
+from wizard.gui import avatars
 from wizard.gui import filter_sets_editor_widget
 from wizard.gui import asset_tracking_widget
 
@@ -22,9 +22,9 @@ from wizard.gui import asset_tracking_widget
 from wizard.core import user
 from wizard.core import project
 from wizard.core import assets
-from wizard.core import image
 from wizard.core import launch
 from wizard.core import repository
+from wizard.core import search_index
 from wizard.vars import ressources
 from wizard.vars import user_vars
 from wizard.vars import assets_vars
@@ -113,13 +113,7 @@ class calendar_widget(QtWidgets.QWidget):
         self.asset_tracking_widget.get_context()
 
     def refresh_users_images(self):
-        for user_row in repository.get_users_list():
-            if user_row['user_name'] in self.users_images_dic.keys():
-                    continue
-            user_image = user_row['profile_picture']
-            pixmap = gui_utils.mask_image(
-                image.convert_str_data_to_image_bytes(user_image), 'png', 30, 8)
-            self.users_images_dic[user_row['user_name']] = pixmap
+        avatars.fill_pixmaps(self.users_images_dic, 30, 8)
 
     def init_priority_images_dic(self):
         self.priority_images_dic = dict()
@@ -192,13 +186,10 @@ class calendar_widget(QtWidgets.QWidget):
         assignments_actions = dict()
         users_ids = project.get_users_ids_list()
         for user_id in users_ids:
-            user_row = repository.get_user_data(user_id)
-            icon = QtGui.QIcon()
-            pm = gui_utils.mask_image(image.convert_str_data_to_image_bytes(
-                user_row['profile_picture']), 'png', 24)
-            icon.addPixmap(pm)
+            user_name = repository.get_user_data(user_id, 'user_name')
+            icon = avatars.get_icon(user_name, 24)
             assignments_actions[user_id] = assignments_submenu.addAction(
-                icon, user_row['user_name'])
+                icon, user_name)
         priorities_submenu = menu.addMenu("Priority ")
         priorities_actions = dict()
         for priority in assets_vars._priority_list_:
@@ -422,16 +413,15 @@ class calendar_widget(QtWidgets.QWidget):
                 del self.search_threads[thread_id]
 
     def show_stage(self, stage_id):
+        # The infos are updated once by refresh_view()
         if stage_id not in self.stage_ids.keys():
             return
         self.stage_ids[stage_id].setVisible(True)
-        self.view.update_infos()
 
     def hide_stage(self, stage_id):
         if stage_id not in self.stage_ids.keys():
             return
         self.stage_ids[stage_id].setVisible(False)
-        self.view.update_infos()
 
     def show_all_stages(self):
         for stage_id in self.stage_ids.keys():
@@ -440,6 +430,7 @@ class calendar_widget(QtWidgets.QWidget):
     def refresh_view(self):
         self.update_frames_visibility()
         self.organize_items()
+        self.view.update_infos()
 
     def update_frames_visibility(self):
         for group_name in self.grouped_dic['frames'].keys():
@@ -519,10 +510,27 @@ class calendar_widget(QtWidgets.QWidget):
 
         filter_dic = self.get_current_filter_dic()
 
-        project_stages = []
+        project_stages = set()
         self.stage_rows = []
 
-        self.clear_frames()
+        # The frames are rebuilt in the tree order, reusing the existing ones
+        old_frames = self.grouped_dic['frames']
+        self.grouped_dic['frames'] = dict()
+
+        # Read the tree from the search index tables instead of
+        # querying the childs of every domain, category and asset
+        categories_by_domain = dict()
+        for category_row in search_index.get_rows('categories').values():
+            categories_by_domain.setdefault(
+                category_row['domain_id'], []).append(category_row)
+        assets_by_category = dict()
+        for asset_row in search_index.get_rows('assets').values():
+            assets_by_category.setdefault(
+                asset_row['category_id'], []).append(asset_row)
+        stages_by_asset = dict()
+        for stage_row in search_index.get_rows('stages').values():
+            stages_by_asset.setdefault(
+                stage_row['asset_id'], []).append(stage_row)
 
         domains = project.get_domains()
         for domain_row in domains:
@@ -531,16 +539,16 @@ class calendar_widget(QtWidgets.QWidget):
             # Apply filter
             if not self.is_instance_type_filter_match(filter_dic, 'domain', domain_row['name']):
                 continue
-            for category_row in project.get_domain_childs(domain_row['id']):
+            for category_row in categories_by_domain.get(domain_row['id'], []):
                 # Apply filter
                 if not self.is_instance_type_filter_match(filter_dic, 'category', category_row['name']):
                     continue
-                assets = project.get_category_childs(category_row['id'])
+                assets = assets_by_category.get(category_row['id'], [])
                 for asset_row in assets:
                     # Apply filter
                     if not self.is_instance_type_filter_match(filter_dic, 'asset', asset_row['name']):
                         continue
-                    stages = project.get_asset_childs(asset_row['id'])
+                    stages = stages_by_asset.get(asset_row['id'], [])
                     for stage_row in stages:
                         # Apply filter
                         if not self.is_instance_type_filter_match(filter_dic, 'stage', stage_row['name']):
@@ -549,13 +557,17 @@ class calendar_widget(QtWidgets.QWidget):
                         if not self.is_data_filter_match(filter_dic, stage_row):
                             continue
                         self.stage_rows.append(stage_row)
-                        project_stages.append(stage_row['id'])
+                        project_stages.add(stage_row['id'])
                         group_name = self.get_group_name(
                             domain_row, category_row, asset_row, stage_row)
 
                         if group_name not in self.grouped_dic['frames'].keys():
-                            frame = frame_item(group_name, '#1d1d23')
-                            self.view.add_frame(frame)
+                            if group_name in old_frames.keys():
+                                frame = old_frames.pop(
+                                    group_name)['frame_item']
+                            else:
+                                frame = frame_item(group_name, '#1d1d23')
+                                self.view.add_frame(frame)
                             self.grouped_dic['frames'][group_name] = dict()
                             self.grouped_dic['frames'][group_name]['frame_item'] = frame
                             self.grouped_dic['frames'][group_name]['items'] = [
@@ -579,6 +591,9 @@ class calendar_widget(QtWidgets.QWidget):
                         self.grouped_dic['frames'][group_name]['items'].append(
                             self.stage_ids[stage_row['id']])
 
+        for group_name in old_frames.keys():
+            self.view.remove_frame(old_frames[group_name]['frame_item'])
+
         stage_ids = list(self.stage_ids.keys())
         for stage_id in stage_ids:
             if stage_id not in project_stages:
@@ -589,13 +604,6 @@ class calendar_widget(QtWidgets.QWidget):
         self.asset_tracking_widget.refresh()
         self.update_refresh_time(start_time)
 
-    def clear_frames(self):
-        groups_list = list(self.grouped_dic['frames'].keys())
-        for group_name in groups_list:
-            self.remove_frame(group_name)
-        self.grouped_dic = dict()
-        self.grouped_dic['frames'] = dict()
-
     def is_instance_type_filter_match(self, filter_dic, instance_type, instance_name):
         is_match = True
         if 'include' in filter_dic.keys():
@@ -654,13 +662,6 @@ class calendar_widget(QtWidgets.QWidget):
         del self.stage_ids[stage_id]
         del item
 
-    def remove_frame(self, group_name):
-        if group_name in self.grouped_dic['frames'].keys():
-            self.view.remove_frame(
-                self.grouped_dic['frames'][group_name]['frame_item'])
-            del self.grouped_dic['frames'][group_name]['frame_item']
-            del self.grouped_dic['frames'][group_name]
-
     def update_frame_bouding_rect(self, group_name):
         visible_items = []
         for item in self.grouped_dic['frames'][group_name]['items']:
@@ -669,9 +670,9 @@ class calendar_widget(QtWidgets.QWidget):
             visible_items.append(item)
         if len(visible_items) == 0:
             return
-        bounding_rect = visible_items[0].sceneBoundingRect()
+        bounding_rect = visible_items[0].scene_rect()
         for item in visible_items[1:]:
-            bounding_rect = bounding_rect.united(item.sceneBoundingRect())
+            bounding_rect = bounding_rect.united(item.scene_rect())
         self.grouped_dic['frames'][group_name]['frame_item'].update_rect(
             bounding_rect)
 
@@ -689,10 +690,14 @@ class stage_item(calendar_utils.calendar_item):
         self.priority_images_dic = priority_images_dic
         self.stage_item_signal_manager = signal_manager()
         self.connect_functions()
-        self.cache_stage_item_painting()
+        # The fonts and rects are computed on the first paint,
+        # most of the items are never materialized
+        self.painting_cached = False
         self.update_stage_text()
 
     def update_row(self, stage_row):
+        if stage_row == self.stage_row:
+            return
         self.stage_row = stage_row
         new_date = datetime.datetime.fromtimestamp(
             float(self.stage_row['start_date']))
@@ -701,7 +706,9 @@ class stage_item(calendar_utils.calendar_item):
                 float(self.stage_row['start_date']))
             self.duration = self.stage_row['estimated_time']
             self.init_pos_and_size()
-        self.cache_stage_item_painting()
+        self.update_stage_text()
+        self.invalidate_painting()
+        self.update()
 
     def connect_functions(self):
         self.signal_manager.start_date_modified.connect(self.apply_start_date)
@@ -717,9 +724,10 @@ class stage_item(calendar_utils.calendar_item):
 
     def recalculate_pos_and_size(self):
         super().recalculate_pos_and_size()
-        self.cache_stage_item_painting()
+        self.invalidate_painting()
 
     def cache_stage_item_painting(self):
+        self.painting_cached = True
         self.stage_item_margin = 2
         rect = self.client_rect().toRect()
         x_pos = rect.width() + 15
@@ -738,9 +746,31 @@ class stage_item(calendar_utils.calendar_item):
         self.priority_pixmap_rect = QtCore.QRect(x_pos, rect.y(), rect.height(
         )-self.stage_item_margin*2, rect.height()-self.stage_item_margin*2)
         x_pos += rect.height()-self.stage_item_margin*2 + self.stage_item_margin
-        self.text_rect = QtCore.QRect(x_pos, rect.y(), 10000, rect.height())
+        text_font = QtGui.QFont()
+        text_font.setPixelSize(self.row_height)
+        text_width = QtGui.QFontMetrics(
+            text_font).horizontalAdvance(self.stage_text)
+        self.text_rect = QtCore.QRect(
+            x_pos, rect.y(), text_width+10, rect.height())
         self.stage_brush = QtGui.QBrush(QtGui.QColor())
 
+    def boundingRect(self):
+        # Includes the state, avatar and text drawn after the bar
+        if not self.painting_cached:
+            self.cache_stage_item_painting()
+        width = max(self.width, self.text_rect.right()+1-self.x)
+        return QtCore.QRectF(self.x, self.y, width, self.height)
+
+    def shape(self):
+        # Only the bar reacts to the mouse
+        path = QtGui.QPainterPath()
+        path.addRect(QtCore.QRectF(self.x, self.y, self.width, self.height))
+        return path
+
+    def invalidate_painting(self):
+        self.prepareGeometryChange()
+        self.painting_cached = False
+
     def update_stage_text(self):
         self.stage_text = self.stage_row['string'].split('/')
         self.stage_text.pop(0)
@@ -748,6 +778,11 @@ class stage_item(calendar_utils.calendar_item):
 
     def paint(self, painter, option, widget):
         super(stage_item, self).paint(painter, option, widget)
+        # No state, avatar or text at low zoom levels
+        if self.is_simplified(option, painter):
+            return
+        if not self.painting_cached:
+            self.cache_stage_item_painting()
         # Draw state rect
         self.stage_brush.setColor(QtGui.QColor(
             ressources._states_colors_[self.stage_row['state']]))
@@ -782,7 +817,7 @@ class stage_item(calendar_utils.calendar_item):
     def movement(self, delta):
         super().movement(delta)
         self.update_stage_text()
-        self.cache_stage_item_painting()
+        self.invalidate_painting()
 
 
 class frame_item(calendar_utils.frame_item):
@@ -798,6 +833,7 @@ class frame_item(calendar_utils.frame_item):
         self.prepareGeometryChange()
         self.width = rect.width()+self.margin*2
         self.height = rect.height()+self.margin*2
+        self.update()
 
 
 class search_thread(QtCore.QThread):
@@ -812,44 +848,22 @@ class search_thread(QtCore.QThread):
 
     def update_search(self, stage_rows, search_data):
         self.search_data = search_data
-        self.stage_rows = copy.deepcopy(stage_rows)
+        # Only the ids are needed, the rows are matched by the search index
+        self.stage_ids = [stage_row['id'] for stage_row in stage_rows]
         self.start()
 
     def run(self):
         try:
-            stages_to_show = []
-            stages_to_hide = []
-
-            keywords_sets = self.search_data.split('+')
-
-            for stage_row in self.stage_rows:
-
-                stage_id = stage_row['id']
-                values = []
-                for key in stage_row:
-                    if key in ['id', 'creation_time', 'creation_user']:
-                        continue
-                    values.append(stage_row[key])
-
-                data_list = []
-                for data_block in values:
-                    data_list.append(str(data_block))
-                data = (' ').join(data_list)
-
-                for keywords_set in keywords_sets:
-                    if keywords_set == '':
-                        continue
-                    keywords = keywords_set.split('&')
-                    if all(keyword.upper() in data.upper() for keyword in keywords):
-                        stages_to_show.append(stage_id)
+            stages_to_show = search_index.search(
+                'calendar_stages', self.search_data)
 
             QtWidgets.QApplication.processEvents()
             time.sleep(0.01)
-            for stage_row in self.stage_rows:
-                if stage_row['id'] in stages_to_show:
-                    self.show_stage_signal.emit(stage_row['id'])
+            for stage_id in self.stage_ids:
+                if stage_id in stages_to_show:
+                    self.show_stage_signal.emit(stage_id)
                 else:
-                    self.hide_stage_signal.emit(stage_row['id'])
+                    self.hide_stage_signal.emit(stage_id)
             self.search_ended.emit(1)
 
         except:
@@ -2,17 +2,23 @@
 # Author: Leo BRUNEL
 # Contact: contact@leobrunel.com
 
+# The production table is a model/view table :
+# the cells are painted on demand by a delegate
+# instead of holding one widget per cell, and the
+# search filters the rows/columns through a proxy model
+
 # Python modules
 from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtCore import pyqtSignal
 import time
 import logging
 import traceback
-import copy
 
 # Wizard gui modules
 from wizard.gui import gui_server
 from wizard.gui import gui_utils
+from wizard.gui import avatars
+from wizard.gui import thumbnails_cache
 from wizard.gui import tag_label
 from wizard.gui import comment_widget
 from wizard.gui import asset_tracking_widget
@@ -23,28 +29,40 @@ from wizard.core import repository
 from wizard.core import assets
 from wizard.core import project
 from wizard.core import launch
-from wizard.core import image
+from wizard.core import search_index
 from wizard.vars import ressources
 from wizard.vars import assets_vars
 from wizard.vars import user_vars
 
 logger = logging.getLogger(__name__)
 
+_cell_type_role_ = QtCore.Qt.ItemDataRole.UserRole + 1
+_asset_row_role_ = QtCore.Qt.ItemDataRole.UserRole + 2
+_category_row_role_ = QtCore.Qt.ItemDataRole.UserRole + 3
+_preview_row_role_ = QtCore.Qt.ItemDataRole.UserRole + 4
+_stage_row_role_ = QtCore.Qt.ItemDataRole.UserRole + 5
+
+_domains_tasks_ = dict()
+_domains_tasks_[assets_vars._assets_] = (["Name", "Modeling", "Rigging", "Grooming",
+                                          "Texturing", "Shading", "Rendering", "Compositing"],
+                                         ["", "modeling", "rigging", "grooming",
+                                          "texturing", "shading", 'rendering', 'compositing'])
+_domains_tasks_[assets_vars._sequences_] = (["Name", "Frame range", "Layout", "Animation",
+                                             "Cfx", "Fx", "Camera", "Lighting", "Rendering", "Compositing"],
+                                            ["", "", "layout", "animation", "cfx",
+                                             "fx", "camera", "lighting", "rendering", "compositing"])
+
 
 class production_table_widget(QtWidgets.QWidget):
     def __init__(self, parent=None):
         super(production_table_widget, self).__init__(parent)
-        self.asset_ids = dict()
-        self.stage_ids = dict()
-        self.variant_ids = dict()
-        self.update_categories = True
         self.update_assets = True
         self.domain = None
-        self.category = None
         self.domain_ids = []
-        self.category_ids = []
+        self.stage_rows = []
         self.old_thread_id = None
         self.search_threads = dict()
+        self.hovered_stage_id = None
         self.view_comment_widget = tag_label.view_comment_widget(self)
         self.show_notes = 1
         self.show_states = 1
@@ -56,13 +74,7 @@ class production_table_widget(QtWidgets.QWidget):
         self.connect_functions()
 
     def refresh_users_images(self):
-        for user_row in repository.get_users_list():
-            if user_row['user_name'] in self.users_images_dic.keys():
-                    continue
-            user_image = user_row['profile_picture']
-            pixmap = gui_utils.mask_image(
-                image.convert_str_data_to_image_bytes(user_image), 'png', 30, 8)
-            self.users_images_dic[user_row['user_name']] = pixmap
+        avatars.fill_pixmaps(self.users_images_dic, 30, 8)
 
     def set_context(self):
         context_dic = dict()
@@ -84,12 +96,36 @@ class production_table_widget(QtWidgets.QWidget):
             self.show_priorities = context_dic['show_priorities']
             self.search_bar.setText(context_dic['search_text'])
             self.update_stage_datas_visibility()
-            self.update_layout()
             self.domain_comboBox.setCurrentText(context_dic['domain'])
             self.asset_tracking_widget.get_context()
         self.asset_tracking_widget.get_context()
 
     def context_menu_requested(self, point):
+        # Right click on a cell area ( priority, state, assignment,
+        # preview or frame range ) opens the menu of this area
+        index = self.table_view.indexAt(point)
+        if index.isValid():
+            cell_type = index.data(_cell_type_role_)
+            if cell_type == 'asset':
+                self.preview_menu_requested(index.data(_preview_row_role_))
+                return
+            if cell_type == 'frame_range':
+                self.frame_range_menu_requested(index.data(_asset_row_role_))
+                return
+            if index.data(_stage_row_role_) is not None:
+                area = self.item_delegate.area_at(
+                    self.table_view.visualRect(index), point)
+                if area == 'priority':
+                    self.priority_menu_requested()
+                    return
+                if area == 'state':
+                    self.hide_state_comment()
+                    self.state_menu_requested()
+                    return
+                if area == 'assignment':
+                    self.assignment_menu_requested()
+                    return
+
         menu = gui_utils.QMenu(self)
         selection = self.get_selection()
 
@@ -129,24 +165,89 @@ class production_table_widget(QtWidgets.QWidget):
             if action == show_notes_item:
                 self.show_notes = 1-self.show_notes
                 self.update_stage_datas_visibility()
-                self.update_layout()
             if action == show_states_item:
                 self.show_states = 1-self.show_states
                 self.update_stage_datas_visibility()
-                self.update_layout()
             if action == show_assignment_item:
                 self.show_assignments = 1-self.show_assignments
                 self.update_stage_datas_visibility()
-                self.update_layout()
             if action == show_priorities_item:
                 self.show_priorities = 1-self.show_priorities
                 self.update_stage_datas_visibility()
-                self.update_layout()
             if action == create_playlist_from_selection_action:
                 self.create_playlist_from_selection()
             if action == launch_action:
                 self.launch_selection()
 
+    def priority_menu_requested(self):
+        menu = gui_utils.QMenu(self)
+        for priority in assets_vars._priority_list_:
+            menu.addAction(QtGui.QIcon(
+                ressources._priority_icons_list_[priority]), priority)
+        action = menu.exec(QtGui.QCursor().pos())
+        if action is not None:
+            self.update_priority(action.text())
+
+    def state_menu_requested(self):
+        menu = gui_utils.QMenu(self)
+        for state in assets_vars._asset_states_list_:
+            menu.addAction(QtGui.QIcon(
+                ressources._states_icons_[state]), state)
+        action = menu.exec(QtGui.QCursor().pos())
+        if action is not None:
+            self.update_state(action.text())
+
+    def assignment_menu_requested(self):
+        menu = gui_utils.QMenu(self)
+        users_ids = project.get_users_ids_list()
+        for user_id in users_ids:
+            user_name = repository.get_user_data(user_id, 'user_name')
+            icon = avatars.get_icon(user_name, 24)
+            menu.addAction(icon, user_name)
+        action = menu.exec(QtGui.QCursor().pos())
+        if action is not None:
+            self.update_assignment(action.text())
+
+    def preview_menu_requested(self, preview_row):
+        if preview_row is None:
+            return
+        menu = gui_utils.QMenu(self)
+        custom_preview_action = menu.addAction(
+            QtGui.QIcon(ressources._add_icon_), 'Add custom preview')
+        default_preview_action = menu.addAction(QtGui.QIcon(
+            ressources._refresh_icon_), 'Set preview to auto')
+        action = menu.exec(QtGui.QCursor().pos())
+        if action is not None:
+            if action == default_preview_action:
+                assets.set_asset_preview(preview_row['asset_id'], None)
+                gui_server.refresh_team_ui()
+            elif action == custom_preview_action:
+                self.set_preview(preview_row['asset_id'])
+
+    def set_preview(self, asset_id):
+        image_file, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select preview image", "",
+                                                              "All Files (*);;Images Files (*.png);;Images Files (*.jpg);;Images Files (*.jpeg)")
+        if image_file:
+            extension = image_file.split('.')[-1].upper()
+            if (extension == 'PNG') or (extension == 'JPG') or (extension == 'JPEG'):
+                assets.set_asset_preview(asset_id, image_file)
+                gui_server.refresh_team_ui()
+            else:
+                logger.warning(
+                    '{} is not a valid image file...'.format(image_file))
+
+    def frame_range_menu_requested(self, asset_row):
+        menu = gui_utils.QMenu(self)
+        edit_frame_range_action = menu.addAction(
+            QtGui.QIcon(ressources._tool_frame_range_), 'Edit frame range')
+        action = menu.exec(QtGui.QCursor().pos())
+        if action is not None:
+            if action == edit_frame_range_action:
+                self.edit_frame_range_widget = edit_frame_range_widget(
+                    asset_id=asset_row['id'])
+                self.edit_frame_range_widget.exec()
+                gui_server.refresh_ui()
+
     def launch_selection(self):
         selection = self.get_selection()
         if len(selection) != 1:
@@ -162,18 +263,17 @@ class production_table_widget(QtWidgets.QWidget):
             return
         launch.launch_work_version(work_version_id[0])
 
+    def get_selected_stage_rows(self):
+        # The proxy returns None for the stages hidden by the search
+        stage_rows = []
+        for modelIndex in self.table_view.selectionModel().selectedIndexes():
+            stage_row = modelIndex.data(_stage_row_role_)
+            if stage_row is not None:
+                stage_rows.append(stage_row)
+        return stage_rows
+
     def get_selection(self):
-        stages_ids = []
-        for modelIndex in self.table_widget.selectedIndexes():
-            widget = self.table_widget.cellWidget(
-                modelIndex.row(), modelIndex.column())
-            if widget and widget.type == 'stage':
-                if not widget.isVisible():
-                    continue
-                stage_row = widget.stage_row
-                stage_id = stage_row['id']
-                stages_ids.append(stage_id)
-        return stages_ids
+        return [stage_row['id'] for stage_row in self.get_selected_stage_rows()]
 
     def create_playlist_from_selection(self):
         selection = self.get_selection()
@@ -181,21 +281,24 @@ class production_table_widget(QtWidgets.QWidget):
             gui_server.create_playlist_from_stages(selection)
 
     def update_stage_datas_visibility(self):
-        for stage_id in self.stage_ids.keys():
-            self.stage_ids[stage_id]['widget'].update_notes_visibility(
-                self.show_notes)
-            self.stage_ids[stage_id]['widget'].update_states_visibility(
-                self.show_states)
-            self.stage_ids[stage_id]['widget'].update_assignments_visibility(
-                self.show_assignments)
-            self.stage_ids[stage_id]['widget'].update_priorities_visibility(
-                self.show_priorities)
+        self.item_delegate.show_notes = self.show_notes
+        self.item_delegate.show_states = self.show_states
+        self.item_delegate.show_assignments = self.show_assignments
+        self.item_delegate.show_priorities = self.show_priorities
+        self.update_layout()
 
     def update_layout(self):
-        QtWidgets.QApplication.processEvents()
-        self.table_widget.resizeColumnsToContents()
-        self.table_widget.resizeRowsToContents()
-        QtWidgets.QApplication.processEvents()
+        # Sizes are computed from the delegate, no need
+        # to measure every cell
+        self.table_view.verticalHeader().setDefaultSectionSize(
+            self.item_delegate.row_height())
+        header = self.table_view.horizontalHeader()
+        for column in range(self.table_proxy.columnCount()):
+            cell_type = self.table_proxy.headerData(
+                column, QtCore.Qt.Orientation.Horizontal, _cell_type_role_)
+            header.resizeSection(
+                column, self.item_delegate.column_width(cell_type))
+        self.table_view.viewport().update()
 
     def build_ui(self):
         self.resize(1400, 800)
@@ -226,20 +329,35 @@ class production_table_widget(QtWidgets.QWidget):
         self.content_widget.setObjectName('main_widget')
         self.main_layout.addWidget(self.content_widget)
 
-        self.table_widget = QtWidgets.QTableWidget()
-        self.table_widget.setObjectName('dark_widget')
-        self.table_widget.setEditTriggers(
+        self.table_model = production_table_model(self)
+        self.table_proxy = production_table_proxy(self)
+        self.table_proxy.setSourceModel(self.table_model)
+        self.item_delegate = production_table_delegate(self.users_images_dic)
+
+        self.table_view = QtWidgets.QTableView()
+        self.table_view.setObjectName('dark_widget')
+        self.table_view.setModel(self.table_proxy)
+        self.table_view.setItemDelegate(self.item_delegate)
+        self.table_view.setEditTriggers(
             QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.table_widget.setAlternatingRowColors(True)
-        self.table_widget.horizontalHeader().setSectionResizeMode(
+        self.table_view.setAlternatingRowColors(True)
+        self.table_view.setMouseTracking(True)
+        self.table_view.setVerticalScrollMode(
+            QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.table_view.setHorizontalScrollMode(
+            QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.table_view.horizontalHeader().setSectionResizeMode(
+            QtWidgets.QHeaderView.ResizeMode.Fixed)
+        self.table_view.verticalHeader().setSectionResizeMode(
             QtWidgets.QHeaderView.ResizeMode.Fixed)
-        self.table_widget.horizontalHeader().setObjectName(
+        self.table_view.horizontalHeader().setObjectName(
             'table_widget_horizontal_header_view')
-        self.table_widget.verticalHeader().setObjectName(
+        self.table_view.verticalHeader().setObjectName(
             'table_widget_vertical_header_view')
-        self.table_widget.setContextMenuPolicy(
+        self.table_view.setContextMenuPolicy(
             QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
-        self.content_widget.addWidget(self.table_widget)
+        self.table_view.viewport().installEventFilter(self)
+        self.content_widget.addWidget(self.table_view)
         self.content_widget.setCollapsible(0, False)
 
         self.asset_tracking_widget = asset_tracking_widget.asset_tracking_widget()
@@ -266,52 +384,72 @@ class production_table_widget(QtWidgets.QWidget):
         self.comment_widget = comment_widget.comment_widget()
         if self.comment_widget.exec() == QtWidgets.QDialog.DialogCode.Accepted:
             comment = self.comment_widget.comment
-        for modelIndex in self.table_widget.selectedIndexes():
-            widget = self.table_widget.cellWidget(
-                modelIndex.row(), modelIndex.column())
-            if widget and widget.type == 'stage':
-                if not widget.isVisible():
-                    continue
-                stage_row = widget.stage_row
-                stage_id = stage_row['id']
-                if stage_row['state'] != state:
-                    assets.modify_stage_state(stage_id, state, comment)
+        for stage_row in self.get_selected_stage_rows():
+            if stage_row['state'] != state:
+                assets.modify_stage_state(stage_row['id'], state, comment)
         gui_server.refresh_team_ui()
 
     def update_priority(self, priority):
-        for modelIndex in self.table_widget.selectedIndexes():
-            widget = self.table_widget.cellWidget(
-                modelIndex.row(), modelIndex.column())
-            if widget and widget.type == 'stage':
-                if not widget.isVisible():
-                    continue
-                stage_row = widget.stage_row
-                stage_id = stage_row['id']
-                if stage_row['priority'] != priority:
-                    assets.modify_stage_priority(stage_id, priority)
+        for stage_row in self.get_selected_stage_rows():
+            if stage_row['priority'] != priority:
+                assets.modify_stage_priority(stage_row['id'], priority)
         gui_server.refresh_team_ui()
 
     def update_assignment(self, assignment):
-        for modelIndex in self.table_widget.selectedIndexes():
-            widget = self.table_widget.cellWidget(
-                modelIndex.row(), modelIndex.column())
-            if widget and widget.type == 'stage':
-                if not widget.isVisible():
-                    continue
-                stage_row = widget.stage_row
-                stage_id = stage_row['id']
-                if stage_row['assignment'] != assignment:
-                    assets.modify_stage_assignment(stage_id, assignment)
+        for stage_row in self.get_selected_stage_rows():
+            if stage_row['assignment'] != assignment:
+                assets.modify_stage_assignment(stage_row['id'], assignment)
         gui_server.refresh_team_ui()
 
     def connect_functions(self):
+        thumbnails_cache.get_cache().thumbnail_ready.connect(
+            lambda thumbnail_path: self.table_view.viewport().update())
         self.domain_comboBox.currentTextChanged.connect(self.refresh_assets)
-        self.table_widget.itemSelectionChanged.connect(
+        self.table_view.selectionModel().selectionChanged.connect(
             self.change_stage_asset_tracking_widget)
         self.search_bar.textChanged.connect(self.update_search)
-        self.table_widget.customContextMenuRequested.connect(
+        self.table_view.customContextMenuRequested.connect(
             self.context_menu_requested)
 
+    def eventFilter(self, watched, event):
+        if watched is self.table_view.viewport():
+            if event.type() == QtCore.QEvent.Type.MouseMove:
+                self.update_state_comment(event.position().toPoint())
+            elif event.type() == QtCore.QEvent.Type.Leave:
+                self.hide_state_comment()
+        return super().eventFilter(watched, event)
+
+    def update_state_comment(self, point):
+        stage_row = None
+        index = self.table_view.indexAt(point)
+        if index.isValid():
+            hovered_stage_row = index.data(_stage_row_role_)
+            if hovered_stage_row is not None:
+                area = self.item_delegate.area_at(
+                    self.table_view.visualRect(index), point)
+                if area == 'state':
+                    stage_row = hovered_stage_row
+        if stage_row is None:
+            self.hide_state_comment()
+            return
+        if stage_row['id'] == self.hovered_stage_id:
+            self.view_comment_widget.move_ui()
+            return
+        self.hovered_stage_id = stage_row['id']
+        if not self.isActiveWindow():
+            return
+        tracking_events = project.get_asset_tracking_events(stage_row['id'])
+        if len(tracking_events) == 0:
+            return
+        self.view_comment_widget.show_comment(
+            stage_row['tracking_comment'], tracking_events[-1]['creation_user'])
+
+    def hide_state_comment(self):
+        if self.hovered_stage_id is None:
+            return
+        self.hovered_stage_id = None
+        self.view_comment_widget.close()
+
     def showEvent(self, event):
         self.refresh()
 
@@ -330,20 +468,15 @@ class production_table_widget(QtWidgets.QWidget):
             self.asset_tracking_widget.refresh()
 
     def change_stage_asset_tracking_widget(self):
-        if len(self.table_widget.selectedIndexes()) != 1:
-            self.asset_tracking_widget.change_stage(None)
-            return
-        modelIndex = self.table_widget.selectedIndexes()[0]
-        widget = self.table_widget.cellWidget(
-            modelIndex.row(), modelIndex.column())
-        if not widget:
+        selected_indexes = self.table_view.selectionModel().selectedIndexes()
+        if len(selected_indexes) != 1:
             self.asset_tracking_widget.change_stage(None)
             return
-        if widget.type != 'stage':
+        stage_row = selected_indexes[0].data(_stage_row_role_)
+        if stage_row is None:
             self.asset_tracking_widget.change_stage(None)
             return
-        stage_id = widget.stage_row['id']
-        self.asset_tracking_widget.change_stage(stage_id)
+        self.asset_tracking_widget.change_stage(stage_row['id'])
 
     def refresh_assets(self):
         start_time = time.perf_counter()
@@ -353,126 +486,38 @@ class production_table_widget(QtWidgets.QWidget):
 
         current_domain = self.domain_comboBox.currentText()
         if current_domain != self.domain:
-            self.show_all_stages()
-            self.show_all_assets()
-            # self.update_layout()
-            self.table_widget.clear()
-            self.asset_ids = dict()
-            self.stage_ids = dict()
             self.domain = current_domain
+            labels_names, task_list = _domains_tasks_.get(
+                self.domain, ([], []))
+            self.table_proxy.clear_search()
+            self.table_model.set_domain(labels_names, task_list)
 
-        assets_preview_rows = project.get_all_assets_preview()
-        assets_preview = dict()
-
+        # One query for the categories and one for the assets
+        # instead of one query per category
         domain_id = project.get_domain_by_name(self.domain, 'id')
-        self.asset_rows = []
-        self.category_rows = dict()
+        category_rows = dict()
         for category_row in project.get_domain_childs(domain_id, order='name'):
-            self.category_rows[category_row['id']] = category_row
-            self.asset_rows += project.get_category_childs(category_row['id'], order='name')
+            category_rows[category_row['id']] = category_row
+        categories_order = dict(
+            (category_id, index) for index, category_id in enumerate(category_rows.keys()))
+        asset_rows = [asset_row for asset_row in project.get_all_assets()
+                      if asset_row['category_id'] in category_rows.keys()]
+        asset_rows.sort(key=lambda asset_row: (
+            categories_order[asset_row['category_id']], asset_row['name']))
 
-        for assets_preview_row in assets_preview_rows:
+        assets_preview = dict()
+        for assets_preview_row in project.get_all_assets_preview():
             assets_preview[assets_preview_row['asset_id']] = assets_preview_row
 
-        if self.domain == assets_vars._assets_:
-            labels_names = ["Name", "Modeling", "Rigging", "Grooming",
-                            "Texturing", "Shading", "Rendering", "Compositing"]
-            self.task_list = ["", "modeling", "rigging", "grooming",
-                              "texturing", "shading", 'rendering', 'compositing']
-        elif self.domain == assets_vars._sequences_:
-            labels_names = ["Name", "Frame range", "Layout", "Animation",
-                            "Cfx", "Fx", "Camera", "Lighting", "Rendering", "Compositing"]
-            self.task_list = ["", "", "layout", "animation", "cfx",
-                              "fx", "camera", "lighting", "rendering", "compositing"]
-
-        stage_ids = list(self.stage_ids.keys())
-        project_stage_ids = project.get_all_stages('id')
-        for stage_id in stage_ids:
-            if stage_id not in project_stage_ids:
-                self.remove_stage(stage_id)
-
-        project_asset_ids = [asset_row['id'] for asset_row in self.asset_rows]
-        asset_ids = list(self.asset_ids.keys())
-        for asset_id in asset_ids:
-            if asset_id not in project_asset_ids:
-                self.remove_asset(asset_id)
-
-        self.table_widget.setColumnCount(len(labels_names))
-        self.table_widget.setHorizontalHeaderLabels(labels_names)
-        self.table_widget.setRowCount(len(self.asset_rows))
-
-        for asset_row in self.asset_rows:
-            if asset_row['id'] not in self.asset_ids.keys():
-                index = self.asset_rows.index(asset_row)
-                item = QtWidgets.QTableWidgetItem()
-                item.setFlags(
-                    item.flags() ^ QtCore.Qt.ItemFlag.ItemIsSelectable)
-                self.table_widget.setItem(index, 0, item)
-                widget = asset_widget(
-                    asset_row, self.category_rows[asset_row['category_id']], assets_preview[asset_row['id']])
-                self.table_widget.setCellWidget(index, 0, widget)
-                self.asset_ids[asset_row['id']] = dict()
-                self.asset_ids[asset_row['id']]['row'] = asset_row
-                self.asset_ids[asset_row['id']]['table_row'] = index
-                self.asset_ids[asset_row['id']
-                               ]['preview_row'] = assets_preview[asset_row['id']]
-                self.asset_ids[asset_row['id']]['widget'] = widget
-                if self.domain == assets_vars._sequences_:
-                    item = QtWidgets.QTableWidgetItem()
-                    item.setFlags(
-                        item.flags() ^ QtCore.Qt.ItemFlag.ItemIsSelectable)
-                    self.table_widget.setItem(index, 1, item)
-                    frange_widget = frame_range_widget(asset_row)
-                    self.table_widget.setCellWidget(index, 1, frange_widget)
-                    self.asset_ids[asset_row['id']
-                                   ]['frame_range_widget'] = frange_widget
-            else:
-                if assets_preview[asset_row['id']] != self.asset_ids[asset_row['id']]['preview_row']:
-                    self.asset_ids[asset_row['id']]['widget'].refresh(
-                        asset_row, assets_preview[asset_row['id']])
-                    self.asset_ids[asset_row['id']]['row'] = asset_row
-                    self.asset_ids[asset_row['id']
-                                   ]['preview_row'] = assets_preview[asset_row['id']]
-                if self.domain == assets_vars._sequences_:
-                    self.asset_ids[asset_row['id']
-                                    ]['frame_range_widget'].refresh(asset_row)
+        self.item_delegate.clear_cache()
+        self.table_model.update_assets(
+            asset_rows, category_rows, assets_preview)
 
-        self.update_layout()
+        asset_ids = set(asset_row['id'] for asset_row in asset_rows)
+        self.stage_rows = [stage_row for stage_row in project.get_all_stages()
+                           if stage_row['asset_id'] in asset_ids]
+        self.table_model.update_stages(self.stage_rows)
 
-        stage_rows = project.get_all_stages()
-        self.stage_rows = []
-
-        for stage_row in stage_rows:
-            if stage_row['asset_id'] in self.asset_ids.keys():
-                self.stage_rows.append(stage_row)
-                if stage_row['id'] not in self.stage_ids.keys():
-                    row_index = self.get_asset_coord(
-                        stage_row['asset_id']).row()
-                    self.stage_ids[stage_row['id']] = dict()
-                    self.stage_ids[stage_row['id']]['row'] = stage_row
-                    self.stage_ids[stage_row['id']]['widget'] = stage_widget(
-                        stage_row, self.users_images_dic)
-                    self.table_widget.setCellWidget(row_index, self.task_list.index(
-                        stage_row['name']), self.stage_ids[stage_row['id']]['widget'])
-                    self.stage_ids[stage_row['id']]['widget'].show_comment_signal.connect(
-                        self.view_comment_widget.show_comment)
-                    self.stage_ids[stage_row['id']]['widget'].hide_comment_signal.connect(
-                        self.view_comment_widget.close)
-                    self.stage_ids[stage_row['id']]['widget'].move_comment.connect(
-                        self.view_comment_widget.move_ui)
-                    self.stage_ids[stage_row['id']]['widget'].state_signal.connect(
-                        self.update_state)
-                    self.stage_ids[stage_row['id']]['widget'].priority_signal.connect(
-                        self.update_priority)
-                    self.stage_ids[stage_row['id']]['widget'].assignment_signal.connect(
-                        self.update_assignment)
-                else:
-                    if stage_row != self.stage_ids[stage_row['id']]['row']:
-                        self.stage_ids[stage_row['id']
-                                       ]['widget'].refresh(stage_row)
-                        self.stage_ids[stage_row['id']]['row'] = stage_row
-
-        self.update_stage_datas_visibility()
         self.update_layout()
         self.update_search()
 
@@ -482,87 +527,32 @@ class production_table_widget(QtWidgets.QWidget):
         refresh_time = str(round((time.perf_counter()-start_time), 3))
         self.refresh_label.setText(f" refresh : {refresh_time}s")
 
-    def get_asset_coord(self, asset_id):
-        if asset_id in self.asset_ids.keys():
-            widget = self.asset_ids[asset_id]['widget']
-            model_index = self.table_widget.indexAt(widget.pos())
-            return model_index
-
-    def get_asset_row(self, asset_id):
-        if asset_id in self.asset_ids.keys():
-            widget = self.asset_ids[asset_id]['widget']
-            row = self.table_widget.rowAt(widget.pos().y())
-            return row
-
-    def get_stage_coord(self, stage_id):
-        if stage_id in self.stage_ids.keys():
-            widget = self.stage_ids[stage_id]['widget']
-            model_index = self.table_widget.indexAt(widget.pos())
-            return model_index
-
-    def get_stage_item(self, stage_id):
-        if stage_id in self.stage_ids.keys():
-            widget = self.stage_ids[stage_id]['widget']
-            item = self.table_widget.itemAt(widget.pos())
-            return item
-
-    def remove_stage(self, stage_id):
-        if stage_id in self.stage_ids.keys():
-            model_index = self.get_stage_coord(stage_id)
-            self.table_widget.removeCellWidget(
-                model_index.row(), model_index.column())
-            del self.stage_ids[stage_id]
-
-    def remove_asset(self, asset_id):
-        if asset_id in self.asset_ids.keys():
-            row_index = self.get_asset_coord(asset_id).row()
-            self.table_widget.removeRow(row_index)
-            del self.asset_ids[asset_id]
-
     def update_search(self):
         if not self.isVisible():
             return
         search_data = self.search_bar.text()
         self.search_start_time = time.perf_counter()
-        self.accept_item_from_thread = False
         if self.old_thread_id and self.old_thread_id in self.search_threads.keys():
-            self.search_threads[self.old_thread_id].show_stage_signal.disconnect(
-            )
-            self.search_threads[self.old_thread_id].hide_stage_signal.disconnect(
-            )
-            self.search_threads[self.old_thread_id].show_asset_signal.disconnect(
-            )
-            self.search_threads[self.old_thread_id].hide_asset_signal.disconnect(
-            )
-            self.search_threads[self.old_thread_id].hide_task_signal.disconnect(
-            )
-            self.search_threads[self.old_thread_id].show_task_signal.disconnect(
-            )
+            self.search_threads[self.old_thread_id].results_signal.disconnect()
         thread_id = time.time()
         self.search_threads[thread_id] = search_thread()
-        self.search_threads[thread_id].show_stage_signal.connect(
-            self.show_stage)
-        self.search_threads[thread_id].hide_stage_signal.connect(
-            self.hide_stage)
-        self.search_threads[thread_id].show_asset_signal.connect(
-            self.show_asset)
-        self.search_threads[thread_id].hide_asset_signal.connect(
-            self.hide_asset)
-        self.search_threads[thread_id].hide_task_signal.connect(self.hide_task)
-        self.search_threads[thread_id].show_task_signal.connect(self.show_task)
+        self.search_threads[thread_id].results_signal.connect(
+            self.apply_search_results)
         self.old_thread_id = thread_id
         if len(search_data) > 0:
-            self.accept_item_from_thread = True
             self.search_threads[thread_id].update_search(
-                self.asset_rows, self.stage_rows, self.task_list, search_data)
+                self.stage_rows, search_data)
         else:
             self.search_threads[thread_id].running = False
-            self.show_all_stages()
-            self.show_all_assets()
-            self.show_all_tasks()
+            self.table_proxy.clear_search()
             self.update_layout()
         self.clean_threads()
 
+    def apply_search_results(self, results):
+        asset_ids, stage_ids, tasks = results
+        self.table_proxy.set_search_results(asset_ids, stage_ids, tasks)
+        self.update_layout()
+
     def clean_threads(self):
         ids = list(self.search_threads.keys())
         for thread_id in ids:
@@ -570,188 +560,400 @@ class production_table_widget(QtWidgets.QWidget):
                 self.search_threads[thread_id].terminate()
                 del self.search_threads[thread_id]
 
-    def hide_stage(self, stage_id):
-        if stage_id in self.stage_ids.keys():
-            self.stage_ids[stage_id]['widget'].setVisible(False)
-
-    def show_stage(self, stage_id):
-        if stage_id in self.stage_ids.keys():
-            self.stage_ids[stage_id]['widget'].setVisible(True)
-
-    def show_all_stages(self):
-        for stage_id in self.stage_ids.keys():
-            self.show_stage(stage_id)
-        self.update_layout()
-
-    def hide_asset(self, asset_id):
-        if asset_id in self.asset_ids.keys():
-            model_index = self.get_asset_coord(asset_id)
-            self.table_widget.hideRow(self.asset_ids[asset_id]['table_row'])
-
-    def show_asset(self, asset_id):
-        if asset_id in self.asset_ids.keys():
-            self.table_widget.showRow(self.asset_ids[asset_id]['table_row'])
-
-    def show_all_assets(self):
-        for asset_id in self.asset_ids.keys():
-            self.show_asset(asset_id)
-
-    def hide_task(self, task):
-        task_index = self.task_list.index(task)
-        self.table_widget.hideColumn(task_index)
-
-    def show_task(self, task):
-        task_index = self.task_list.index(task)
-        self.table_widget.showColumn(task_index)
-
-    def show_all_tasks(self):
-        for task in self.task_list:
-            self.show_task(task)
-
 
-class asset_widget(QtWidgets.QWidget):
-    def __init__(self, asset_row, category_row, preview_row, parent=None):
-        super(asset_widget, self).__init__(parent)
+class production_table_model(QtCore.QAbstractTableModel):
+    def __init__(self, parent=None):
+        super(production_table_model, self).__init__(parent)
+        self.labels = []
+        self.task_list = []
+        self.task_columns = dict()
+        self.asset_rows = []
+        self.asset_indexes = dict()
+        self.category_rows = dict()
+        self.previews = dict()
+        self.stages = dict()
+
+    def set_domain(self, labels, task_list):
+        self.beginResetModel()
+        self.labels = labels
+        self.task_list = task_list
+        self.task_columns = dict((task, column) for column, task in enumerate(
+            task_list) if task != '')
+        self.asset_rows = []
+        self.asset_indexes = dict()
+        self.previews = dict()
+        self.stages = dict()
+        self.endResetModel()
+
+    def update_assets(self, asset_rows, category_rows, previews):
+        # Removes and inserts only the rows that changed,
+        # the model is reset only if the order changed
+        self.category_rows = category_rows
+        new_ids = [asset_row['id'] for asset_row in asset_rows]
+        old_ids = [asset_row['id'] for asset_row in self.asset_rows]
+        if new_ids != old_ids:
+            new_ids_set = set(new_ids)
+            old_ids_set = set(old_ids)
+            if len(old_ids) == 0 or \
+                    [asset_id for asset_id in old_ids if asset_id in new_ids_set] != \
+                    [asset_id for asset_id in new_ids if asset_id in old_ids_set]:
+                self.beginResetModel()
+                self.asset_rows = list(asset_rows)
+                self.previews = previews
+                self.update_asset_indexes()
+                self.endResetModel()
+                return
+            for row in reversed(range(len(self.asset_rows))):
+                if self.asset_rows[row]['id'] not in new_ids_set:
+                    self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+                    del self.asset_rows[row]
+                    self.endRemoveRows()
+            for row, asset_row in enumerate(asset_rows):
+                if asset_row['id'] not in old_ids_set:
+                    self.beginInsertRows(QtCore.QModelIndex(), row, row)
+                    self.asset_rows.insert(row, asset_row)
+                    self.endInsertRows()
+        old_previews = self.previews
+        self.previews = previews
+        for row, asset_row in enumerate(asset_rows):
+            if asset_row != self.asset_rows[row] or \
+                    previews.get(asset_row['id']) != old_previews.get(asset_row['id']):
+                self.asset_rows[row] = asset_row
+                self.dataChanged.emit(self.index(row, 0),
+                                      self.index(row, self.columnCount()-1))
+        self.update_asset_indexes()
+
+    def update_asset_indexes(self):
+        self.asset_indexes = dict((asset_row['id'], row)
+                                  for row, asset_row in enumerate(self.asset_rows))
+        for asset_id in list(self.stages.keys()):
+            if asset_id not in self.asset_indexes.keys():
+                del self.stages[asset_id]
+
+    def update_stages(self, stage_rows):
+        # Emits dataChanged only for the cells whose stage changed
+        stages = dict()
+        for stage_row in stage_rows:
+            if stage_row['asset_id'] not in self.asset_indexes.keys():
+                continue
+            if stage_row['asset_id'] not in stages.keys():
+                stages[stage_row['asset_id']] = dict()
+            stages[stage_row['asset_id']][stage_row['name']] = stage_row
+        old_stages = self.stages
+        self.stages = stages
+        for asset_id, row in self.asset_indexes.items():
+            old_asset_stages = old_stages.get(asset_id, dict())
+            asset_stages = stages.get(asset_id, dict())
+            if old_asset_stages == asset_stages:
+                continue
+            for task in set(old_asset_stages.keys()) | set(asset_stages.keys()):
+                if task not in self.task_columns.keys():
+                    continue
+                if old_asset_stages.get(task) != asset_stages.get(task):
+                    index = self.index(row, self.task_columns[task])
+                    self.dataChanged.emit(index, index)
+
+    def cell_type(self, column):
+        if column == 0:
+            return 'asset'
+        if self.task_list[column] == '':
+            return 'frame_range'
+        return 'stage'
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.asset_rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.task_list)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if orientation == QtCore.Qt.Orientation.Horizontal and section < len(self.labels):
+            if role == QtCore.Qt.ItemDataRole.DisplayRole:
+                return self.labels[section]
+            if role == _cell_type_role_:
+                return self.cell_type(section)
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if self.cell_type(index.column()) == 'stage':
+            return QtCore.Qt.ItemFlag.ItemIsEnabled | QtCore.Qt.ItemFlag.ItemIsSelectable
+        return QtCore.Qt.ItemFlag.ItemIsEnabled
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        asset_row = self.asset_rows[index.row()]
+        cell_type = self.cell_type(index.column())
+        if role == _cell_type_role_:
+            return cell_type
+        if role == _asset_row_role_:
+            return asset_row
+        if role == _category_row_role_:
+            return self.category_rows.get(asset_row['category_id'])
+        if role == _preview_row_role_:
+            return self.previews.get(asset_row['id'])
+        if role == _stage_row_role_:
+            if cell_type != 'stage':
+                return None
+            return self.stages.get(asset_row['id'], dict()).get(
+                self.task_list[index.column()])
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            if cell_type == 'asset':
+                return asset_row['name']
+            if cell_type == 'frame_range':
+                return f"{asset_row['inframe']} - {asset_row['outframe']}"
+            stage_row = self.stages.get(asset_row['id'], dict()).get(
+                self.task_list[index.column()])
+            if stage_row is not None:
+                return stage_row['state']
+        return None
+
+
+class production_table_proxy(QtCore.QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super(production_table_proxy, self).__init__(parent)
+        self.setDynamicSortFilter(False)
+        self.visible_asset_ids = None
+        self.visible_stage_ids = None
+        self.visible_tasks = None
+
+    def set_search_results(self, asset_ids, stage_ids, tasks):
+        self.visible_asset_ids = asset_ids
+        self.visible_stage_ids = stage_ids
+        self.visible_tasks = tasks
+        self.invalidateFilter()
+
+    def clear_search(self):
+        if self.visible_asset_ids is None:
+            return
+        self.visible_asset_ids = None
+        self.visible_stage_ids = None
+        self.visible_tasks = None
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.visible_asset_ids is None:
+            return True
+        asset_row = self.sourceModel().asset_rows[source_row]
+        return asset_row['id'] in self.visible_asset_ids
+
+    def filterAcceptsColumn(self, source_column, source_parent):
+        if self.visible_tasks is None:
+            return True
+        task = self.sourceModel().task_list[source_column]
+        return task == '' or task in self.visible_tasks
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        data = super().data(index, role)
+        if role == _stage_row_role_ and data is not None:
+            if self.visible_stage_ids is not None and data['id'] not in self.visible_stage_ids:
+                return None
+        return data
+
+
+class production_table_delegate(QtWidgets.QStyledItemDelegate):
+    def __init__(self, users_images_dic, parent=None):
+        super(production_table_delegate, self).__init__(parent)
+        self.users_images_dic = users_images_dic
         self.thumbnail_width = 150
-        self.type = 'asset'
-        self.asset_row = asset_row
-        self.category_row = category_row
-        self.preview_row = preview_row
-        self.build_ui()
-        self.fill_ui()
+        self.thumbnail_height = int(self.thumbnail_width/1.8)
+        self.asset_column_width = 300
+        self.frame_range_column_width = 120
+        self.show_notes = 1
+        self.show_states = 1
+        self.show_assignments = 1
+        self.show_priorities = 1
+        self.thumbnails_paths = set()
+        self.no_preview_pixmap = None
+        self.priority_pixmaps = dict()
+        self.bold_font = QtGui.QFont()
+        self.bold_font.setBold(True)
+
+    def clear_cache(self):
+        # The previews may have been overwritten
+        thumbnails_cache.get_cache().revalidate(self.thumbnails_paths)
+        self.thumbnails_paths = set()
+
+    def row_height(self):
+        return self.thumbnail_height + 6
+
+    def column_width(self, cell_type):
+        if cell_type == 'asset':
+            return self.asset_column_width
+        if cell_type == 'frame_range':
+            return self.frame_range_column_width
+        width = 4 + 3
+        if self.show_priorities:
+            width += 33
+        if self.show_states:
+            width += 63
+        if self.show_assignments:
+            width += 33
+        if self.show_notes:
+            width += 153
+        return max(width, 40)
 
-    def build_ui(self):
-        self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Fixed,
-                           QtWidgets.QSizePolicy.Policy.Expanding)
-        self.main_layout = QtWidgets.QHBoxLayout()
-        self.main_layout.setContentsMargins(0, 0, 8, 0)
-        self.setLayout(self.main_layout)
+    def stage_areas(self, rect):
+        areas = dict()
+        x = rect.x() + 4 + 3
+        top = rect.center().y() - 15
+        if self.show_priorities:
+            areas['priority'] = QtCore.QRect(x, top, 30, 30)
+            x += 33
+        if self.show_states:
+            areas['state'] = QtCore.QRect(x, top, 60, 30)
+            x += 63
+        if self.show_assignments:
+            areas['assignment'] = QtCore.QRect(x, top, 30, 30)
+            x += 33
+        if self.show_notes:
+            areas['note'] = QtCore.QRect(x, rect.y()+3, 150, rect.height()-6)
+        return areas
 
-        self.image_label = QtWidgets.QLabel()
-        self.image_label.setFixedWidth(self.thumbnail_width)
-        self.image_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-        self.image_label.setObjectName('production_manager_variant_frame')
-        self.main_layout.addWidget(self.image_label)
-
-        self.name_layout = QtWidgets.QVBoxLayout()
-        self.name_layout.setSpacing(2)
-        self.name_layout.addSpacerItem(QtWidgets.QSpacerItem(
-            0, 0, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding))
-        self.asset_name_label = QtWidgets.QLabel()
-        self.name_layout.addWidget(self.asset_name_label)
-        self.category_name_label = QtWidgets.QLabel()
-        self.category_name_label.setObjectName('gray_label')
-        self.name_layout.addWidget(self.category_name_label)
-        self.name_layout.addSpacerItem(QtWidgets.QSpacerItem(
-            0, 0, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding))
-        self.main_layout.addLayout(self.name_layout)
-
-    def fill_ui(self):
-        self.asset_name_label.setText(self.asset_row['name'])
-        self.category_name_label.setText(self.category_row['name'])
+    def area_at(self, rect, point):
+        for area_name, area in self.stage_areas(rect).items():
+            if area.contains(point):
+                return area_name
+        return None
 
+    def get_thumbnail(self, preview_row):
         image = ressources._no_preview_
-        if self.preview_row['manual_override'] is None:
-            if self.preview_row['preview_path'] is not None:
-                image = self.preview_row['preview_path']
-        else:
-            image = self.preview_row['manual_override']
-        self.image_label.setPixmap(QtGui.QIcon(image).pixmap(
-            self.thumbnail_width, int(self.thumbnail_width/1.8)))
-
-    def show_context_menu(self):
-        menu = gui_utils.QMenu(self)
-        custom_preview_action = menu.addAction(
-            QtGui.QIcon(ressources._add_icon_), 'Add custom preview')
-        default_preview_action = menu.addAction(QtGui.QIcon(
-            ressources._refresh_icon_), 'Set preview to auto')
-        action = menu.exec(QtGui.QCursor().pos())
-        if action is not None:
-            if action == default_preview_action:
-                assets.set_asset_preview(self.preview_row['asset_id'], None)
-                gui_server.refresh_team_ui()
-            elif action == custom_preview_action:
-                self.set_preview()
-
-    def set_preview(self):
-        image_file, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select preview image", "",
-                                                              "All Files (*);;Images Files (*.png);;Images Files (*.jpg);;Images Files (*.jpeg)")
-        if image_file:
-            extension = image_file.split('.')[-1].upper()
-            if (extension == 'PNG') or (extension == 'JPG') or (extension == 'JPEG'):
-                assets.set_asset_preview(
-                    self.preview_row['asset_id'], image_file)
-                gui_server.refresh_team_ui()
+        if preview_row is not None:
+            if preview_row['manual_override'] is None:
+                if preview_row['preview_path'] is not None:
+                    image = preview_row['preview_path']
             else:
-                logger.warning(
-                    '{} is not a valid image file...'.format(image_file))
-
-    def mouseReleaseEvent(self, event):
-        if event.button() == QtCore.Qt.MouseButton.RightButton:
-            self.show_context_menu()
-
-    def refresh(self, asset_row, preview_row):
-        self.asset_row = asset_row
-        self.preview_row = preview_row
-        self.fill_ui()
-
-
-class frame_range_widget(QtWidgets.QWidget):
-    def __init__(self, asset_row, parent=None):
-        super(frame_range_widget, self).__init__(parent)
-        self.asset_row = asset_row
-        self.build_ui()
-        self.fill_ui()
-
-    def build_ui(self):
-        self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding,
-                           QtWidgets.QSizePolicy.Policy.Expanding)
-        self.main_layout = QtWidgets.QVBoxLayout()
-        self.main_layout.setSpacing(2)
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
-        self.setLayout(self.main_layout)
-
-        self.main_layout.addSpacerItem(QtWidgets.QSpacerItem(
-            0, 0, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding))
-
-        self.frame_range_label = QtWidgets.QLabel()
-        self.frame_range_label.setAlignment(
-            QtCore.Qt.AlignmentFlag.AlignCenter)
-        self.main_layout.addWidget(self.frame_range_label)
-
-        self.details_label = QtWidgets.QLabel()
-        self.details_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-        self.details_label.setObjectName('gray_label')
-        self.main_layout.addWidget(self.details_label)
-
-        self.main_layout.addSpacerItem(QtWidgets.QSpacerItem(
-            0, 0, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding))
-    
-    def mouseReleaseEvent(self, event):
-        if event.button() == QtCore.Qt.MouseButton.RightButton:
-            self.show_context_menu()
-
-    def show_context_menu(self):
-        menu = gui_utils.QMenu(self)
-        edit_frame_range_action = menu.addAction(
-            QtGui.QIcon(ressources._tool_frame_range_), 'Edit frame range')
-        action = menu.exec(QtGui.QCursor().pos())
-        if action is not None:
-            if action == edit_frame_range_action:
-                self.edit_frame_range_widget = edit_frame_range_widget(
-                    asset_id=self.asset_row['id'])
-                self.edit_frame_range_widget.exec()
-                gui_server.refresh_ui()
-
-    def fill_ui(self):
-        self.frame_range_label.setText(
-            f"{self.asset_row['inframe']} - {self.asset_row['outframe']}")
-        self.details_label.setText(
-            f"{self.asset_row['outframe'] - self.asset_row['inframe']} frames")
-
-    def refresh(self, asset_row):
-        self.asset_row = asset_row
-        self.fill_ui()
+                image = preview_row['manual_override']
+        self.thumbnails_paths.add(image)
+        pixmap = thumbnails_cache.get_pixmap(
+            image, self.thumbnail_width, self.thumbnail_height)
+        if pixmap is None or pixmap.isNull():
+            # Loading or missing preview
+            return self.get_no_preview_pixmap()
+        return pixmap
+
+    def get_no_preview_pixmap(self):
+        if self.no_preview_pixmap is None:
+            self.no_preview_pixmap = QtGui.QIcon(ressources._no_preview_).pixmap(
+                self.thumbnail_width, self.thumbnail_height)
+        return self.no_preview_pixmap
+
+    def get_priority_pixmap(self, priority):
+        if priority not in self.priority_pixmaps.keys():
+            self.priority_pixmaps[priority] = QtGui.QIcon(
+                ressources._priority_icons_list_[priority]).pixmap(22)
+        return self.priority_pixmaps[priority]
+
+    def draw_centered_pixmap(self, painter, rect, pixmap):
+        size = pixmap.deviceIndependentSize().toSize()
+        target = QtCore.QRect(QtCore.QPoint(0, 0), size)
+        target.moveCenter(rect.center())
+        painter.drawPixmap(target, pixmap)
+
+    def sizeHint(self, option, index):
+        return QtCore.QSize(self.column_width(index.data(_cell_type_role_)), self.row_height())
+
+    def paint(self, painter, option, index):
+        painter.save()
+        style = QtWidgets.QApplication.style()
+        if option.widget is not None:
+            style = option.widget.style()
+        style.drawPrimitive(QtWidgets.QStyle.PrimitiveElement.PE_PanelItemViewItem,
+                            option, painter, option.widget)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, True)
+        cell_type = index.data(_cell_type_role_)
+        if cell_type == 'asset':
+            self.paint_asset(painter, option, index)
+        elif cell_type == 'frame_range':
+            self.paint_frame_range(painter, option, index)
+        else:
+            self.paint_stage(painter, option, index)
+        painter.restore()
+
+    def paint_asset(self, painter, option, index):
+        rect = option.rect
+        thumbnail_rect = QtCore.QRect(
+            rect.x(), rect.y(), self.thumbnail_width, rect.height())
+        self.draw_centered_pixmap(painter, thumbnail_rect,
+                                  self.get_thumbnail(index.data(_preview_row_role_)))
+
+        text_rect = rect.adjusted(self.thumbnail_width + 8, 0, -8, 0)
+        half_height = int(text_rect.height()/2)
+        name_rect = QtCore.QRect(text_rect.x(), text_rect.y(),
+                                 text_rect.width(), half_height - 1)
+        category_rect = QtCore.QRect(text_rect.x(), text_rect.y() + half_height + 1,
+                                     text_rect.width(), half_height - 1)
+        metrics = option.fontMetrics
+        asset_row = index.data(_asset_row_role_)
+        painter.setPen(option.palette.color(QtGui.QPalette.ColorRole.Text))
+        painter.drawText(name_rect, QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignBottom,
+                         metrics.elidedText(asset_row['name'], QtCore.Qt.TextElideMode.ElideRight, name_rect.width()))
+        category_row = index.data(_category_row_role_)
+        if category_row is not None:
+            painter.setPen(QtGui.QColor('gray'))
+            painter.drawText(category_rect, QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignTop,
+                             metrics.elidedText(category_row['name'], QtCore.Qt.TextElideMode.ElideRight, category_rect.width()))
+
+    def paint_frame_range(self, painter, option, index):
+        rect = option.rect
+        asset_row = index.data(_asset_row_role_)
+        half_height = int(rect.height()/2)
+        range_rect = QtCore.QRect(
+            rect.x(), rect.y(), rect.width(), half_height - 1)
+        details_rect = QtCore.QRect(
+            rect.x(), rect.y() + half_height + 1, rect.width(), half_height - 1)
+        painter.setPen(option.palette.color(QtGui.QPalette.ColorRole.Text))
+        painter.drawText(range_rect, QtCore.Qt.AlignmentFlag.AlignHCenter | QtCore.Qt.AlignmentFlag.AlignBottom,
+                         f"{asset_row['inframe']} - {asset_row['outframe']}")
+        painter.setPen(QtGui.QColor('gray'))
+        painter.drawText(details_rect, QtCore.Qt.AlignmentFlag.AlignHCenter | QtCore.Qt.AlignmentFlag.AlignTop,
+                         f"{asset_row['outframe'] - asset_row['inframe']} frames")
+
+    def paint_stage(self, painter, option, index):
+        stage_row = index.data(_stage_row_role_)
+        if stage_row is None:
+            return
+        rect = option.rect
+        painter.fillRect(QtCore.QRect(rect.x(), rect.y(), 4, rect.height()),
+                         QtGui.QColor(ressources._stages_colors_[stage_row['name']]))
+        painter.setPen(QtCore.Qt.PenStyle.NoPen)
+        areas = self.stage_areas(rect)
+
+        if 'priority' in areas.keys():
+            painter.setBrush(QtGui.QColor(0, 0, 0, 40))
+            painter.drawRoundedRect(areas['priority'], 4, 4)
+            self.draw_centered_pixmap(painter, areas['priority'],
+                                      self.get_priority_pixmap(stage_row['priority']))
+
+        if 'state' in areas.keys():
+            painter.setBrush(QtGui.QColor(
+                ressources._states_colors_[stage_row['state']]))
+            painter.drawRoundedRect(areas['state'], 4, 4)
+            painter.setPen(option.palette.color(QtGui.QPalette.ColorRole.Text))
+            painter.setFont(self.bold_font)
+            painter.drawText(
+                areas['state'], QtCore.Qt.AlignmentFlag.AlignCenter, stage_row['state'])
+            painter.setFont(option.font)
+
+        if 'assignment' in areas.keys():
+            pixmap = self.users_images_dic.get(stage_row['assignment'])
+            if pixmap is not None:
+                self.draw_centered_pixmap(
+                    painter, areas['assignment'], pixmap)
+
+        if 'note' in areas.keys():
+            note = stage_row['note']
+            if note is None or note == '':
+                note = 'Missing note'
+            painter.setPen(QtGui.QColor('gray'))
+            painter.setClipRect(areas['note'])
+            painter.drawText(areas['note'], QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter |
+                             QtCore.Qt.TextFlag.TextWordWrap, note)
+            painter.setClipping(False)
 
 
 class edit_frame_range_widget(QtWidgets.QDialog):
@@ -880,302 +1082,37 @@ class edit_frame_range_widget(QtWidgets.QDialog):
         self.accept_button.setAutoDefault(True)
         self.frame_layout.addWidget(self.accept_button)
 
-class stage_widget(QtWidgets.QWidget):
-
-    state_signal = pyqtSignal(str)
-    assignment_signal = pyqtSignal(str)
-    priority_signal = pyqtSignal(str)
-    show_comment_signal = pyqtSignal(str, str)
-    hide_comment_signal = pyqtSignal(int)
-    move_comment = pyqtSignal(int)
-
-    def __init__(self, stage_row, users_images_dic, parent=None):
-        super(stage_widget, self).__init__(parent)
-        self.type = 'stage'
-        self.stage_row = stage_row
-        self.users_images_dic = users_images_dic
-        self.build_ui()
-        self.fill_ui()
-        self.connect_functions()
-
-    def update_notes_visibility(self, show_notes):
-        self.note_content.setVisible(show_notes)
-
-    def update_states_visibility(self, show_states):
-        self.state_label.setVisible(show_states)
-
-    def update_assignments_visibility(self, show_assignments):
-        self.user_image_label.setVisible(show_assignments)
-
-    def update_priorities_visibility(self, show_priorities):
-        self.priority_label.setVisible(show_priorities)
-
-    def connect_functions(self):
-        self.state_label.state_signal.connect(self.state_signal.emit)
-        self.state_label.enter.connect(self.show_comment)
-        self.state_label.leave.connect(self.hide_comment)
-        self.state_label.move_event.connect(self.move_comment.emit)
-        self.user_image_label.assignment_signal.connect(
-            self.assignment_signal.emit)
-        self.priority_label.priority_signal.connect(self.priority_signal.emit)
-
-    def build_ui(self):
-        self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding,
-                           QtWidgets.QSizePolicy.Policy.Expanding)
-        self.main_layout = QtWidgets.QHBoxLayout()
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
-        self.main_layout.setSpacing(0)
-        self.setLayout(self.main_layout)
-
-        self.color_frame = QtWidgets.QFrame()
-        self.color_frame.setFixedWidth(4)
-        self.main_layout.addWidget(self.color_frame)
-
-        self.data_layout = QtWidgets.QHBoxLayout()
-        self.data_layout.setSpacing(3)
-        self.data_layout.setContentsMargins(3, 3, 3, 3)
-        self.main_layout.addLayout(self.data_layout)
-
-        self.priority_label = priority_widget()
-        self.priority_label.setSizePolicy(
-            QtWidgets.QSizePolicy.Policy.Fixed, QtWidgets.QSizePolicy.Policy.Fixed)
-        self.priority_label.setFixedSize(30, 30)
-        self.data_layout.addWidget(self.priority_label)
-
-        self.state_label = state_widget()
-        self.state_label.setSizePolicy(
-            QtWidgets.QSizePolicy.Policy.Fixed, QtWidgets.QSizePolicy.Policy.Fixed)
-        self.state_label.setFixedHeight(30)
-        self.data_layout.addWidget(self.state_label)
-
-        self.user_image_label = assignment_widget()
-        self.user_image_label.setFixedSize(QtCore.QSize(30, 30))
-        self.data_layout.addWidget(self.user_image_label)
-
-        self.note_content = gui_utils.minimum_height_textEdit(77)
-        self.note_content.setFixedWidth(150)
-        self.note_content.setReadOnly(True)
-        self.note_content.setTextInteractionFlags(
-            QtCore.Qt.TextInteractionFlag.NoTextInteraction)
-        self.note_content.setContextMenuPolicy(
-            QtCore.Qt.ContextMenuPolicy.NoContextMenu)
-        self.note_content.setObjectName('gray_label')
-        self.note_content.setStyleSheet(
-            'background-color:transparent;padding:0px;')
-        self.data_layout.addWidget(self.note_content)
-
-    def show_comment(self):
-        if self.isActiveWindow():
-            tracking_events = project.get_asset_tracking_events(
-                self.stage_row['id'])
-            if len(tracking_events) == 0:
-                return
-            user = tracking_events[-1]['creation_user']
-            self.show_comment_signal.emit(
-                self.stage_row['tracking_comment'], user)
-
-    def hide_comment(self):
-        self.hide_comment_signal.emit(1)
-
-    def fill_ui(self):
-        self.color_frame.setStyleSheet(
-            'background-color:%s;' % ressources._stages_colors_[self.stage_row['name']])
-        self.priority_label.setPixmap(QtGui.QIcon(ressources._priority_icons_list_[
-                                      self.stage_row['priority']]).pixmap(22))
-        self.state_label.setText(self.stage_row['state'])
-        self.state_label.setStyleSheet(
-            '#bold_label{background-color:%s;border-radius:4px;padding:6px;}' % ressources._states_colors_[self.stage_row['state']])
-        self.user_image_label.setPixmap(
-            self.users_images_dic[self.stage_row['assignment']])
-        if self.stage_row['note'] is None or self.stage_row['note'] == '':
-            self.note_content.setText('Missing note')
-        else:
-            self.note_content.setText(self.stage_row['note'])
-
-    def refresh(self, stage_row):
-        self.stage_row = stage_row
-        self.fill_ui()
-
-
-class priority_widget(QtWidgets.QLabel):
-
-    priority_signal = pyqtSignal(str)
-
-    def __init__(self, parent=None):
-        super(priority_widget, self).__init__(parent)
-        self.setFixedWidth(60)
-        self.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-        self.setContextMenuPolicy(
-            QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
-        self.setObjectName('priority_label')
-        self.setStyleSheet(
-            '#priority_label{border-radius:4px;background-color:rgba(0,0,0,40);}')
-
-    def mouseReleaseEvent(self, event):
-        if event.button() == QtCore.Qt.MouseButton.RightButton:
-            self.states_menu_requested()
-
-    def states_menu_requested(self):
-        menu = gui_utils.QMenu(self)
-        for priority in assets_vars._priority_list_:
-            menu.addAction(QtGui.QIcon(
-                ressources._priority_icons_list_[priority]), priority)
-        action = menu.exec(QtGui.QCursor().pos())
-        if action is not None:
-            self.priority_signal.emit(action.text())
-
-    def contextMenuEvent(self, event):
-        event.accept()
-
-
-class state_widget(QtWidgets.QLabel):
-
-    state_signal = pyqtSignal(str)
-    enter = pyqtSignal(int)
-    leave = pyqtSignal(int)
-    move_event = pyqtSignal(int)
-
-    def __init__(self, parent=None):
-        super(state_widget, self).__init__(parent)
-        self.setMouseTracking(True)
-        self.setFixedWidth(60)
-        self.setObjectName('bold_label')
-        self.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-        self.setContextMenuPolicy(
-            QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
-
-    def mouseReleaseEvent(self, event):
-        if event.button() == QtCore.Qt.MouseButton.RightButton:
-            self.states_menu_requested()
-
-    def states_menu_requested(self):
-        menu = gui_utils.QMenu(self)
-        for state in assets_vars._asset_states_list_:
-            menu.addAction(QtGui.QIcon(
-                ressources._states_icons_[state]), state)
-        action = menu.exec(QtGui.QCursor().pos())
-        if action is not None:
-            self.state_signal.emit(action.text())
-
-    def mouseMoveEvent(self, event):
-        self.move_event.emit(1)
-        super().mouseMoveEvent(event)
-
-    def enterEvent(self, event):
-        self.enter.emit(1)
-
-    def leaveEvent(self, event):
-        self.leave.emit(1)
-
-    def contextMenuEvent(self, event):
-        event.accept()
-
-
-class assignment_widget(QtWidgets.QLabel):
-
-    assignment_signal = pyqtSignal(str)
-
-    def __init__(self, parent=None):
-        super(assignment_widget, self).__init__(parent)
-        self.setContextMenuPolicy(
-            QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
-
-    def mouseReleaseEvent(self, event):
-        if event.button() == QtCore.Qt.MouseButton.RightButton:
-            self.users_menu_requested()
-
-    def users_menu_requested(self):
-        users_actions = []
-        menu = gui_utils.QMenu(self)
-        users_ids = project.get_users_ids_list()
-        for user_id in users_ids:
-            user_row = repository.get_user_data(user_id)
-            icon = QtGui.QIcon()
-            pm = gui_utils.mask_image(image.convert_str_data_to_image_bytes(
-                user_row['profile_picture']), 'png', 24)
-            icon.addPixmap(pm)
-            menu.addAction(icon, user_row['user_name'])
-        action = menu.exec(QtGui.QCursor().pos())
-        if action is not None:
-            self.assignment_signal.emit(action.text())
-
-    def contextMenuEvent(self, event):
-        event.accept()
-
 
 class search_thread(QtCore.QThread):
 
-    show_stage_signal = pyqtSignal(int)
-    hide_stage_signal = pyqtSignal(int)
-    show_asset_signal = pyqtSignal(int)
-    hide_asset_signal = pyqtSignal(int)
-    show_task_signal = pyqtSignal(str)
-    hide_task_signal = pyqtSignal(str)
+    results_signal = pyqtSignal(object)
 
     def __init__(self):
         super().__init__()
         self.running = True
 
-    def update_search(self, asset_rows, stage_rows, tasks, search_data):
+    def update_search(self, stage_rows, search_data):
+        # The rows are replaced, never modified, on refresh
+        # so a shallow copy of the list is enough
         self.search_data = search_data
-        self.asset_rows = copy.deepcopy(asset_rows)
-        self.stage_rows = copy.deepcopy(stage_rows)
-        self.tasks = copy.deepcopy(tasks)
+        self.stage_rows = list(stage_rows)
         self.start()
 
     def run(self):
         try:
-            asset_ids = []
-            stages_to_show = []
-            stages_to_hide = []
-            task_to_show = []
-
-            keywords_sets = self.search_data.split('+')
+            asset_ids = set()
+            stage_ids = set()
+            tasks = set()
 
+            matching_stage_ids = search_index.search(
+                'production_stages', self.search_data)
             for stage_row in self.stage_rows:
+                if stage_row['id'] in matching_stage_ids:
+                    stage_ids.add(stage_row['id'])
+                    tasks.add(stage_row['name'])
+                    asset_ids.add(stage_row['asset_id'])
 
-                stage_id = stage_row['id']
-                values = []
-                for key in stage_row:
-                    if key in ['id', 'creation_time', 'creation_user']:
-                        continue
-                    values.append(stage_row[key])
-
-                data_list = []
-                for data_block in values:
-                    data_list.append(str(data_block))
-                data = (' ').join(data_list)
-                data = data.replace('assets', '')
-                data = data.replace('sequences', '')
-
-                for keywords_set in keywords_sets:
-                    if keywords_set == '':
-                        continue
-                    keywords = keywords_set.split('&')
-                    if all(keyword.upper() in data.upper() for keyword in keywords):
-                        stages_to_show.append(stage_id)
-                        task_to_show.append(stage_row['name'])
-                        asset_ids.append(stage_row['asset_id'])
-
-            for asset_row in self.asset_rows:
-                if asset_row['id'] in asset_ids:
-                    self.show_asset_signal.emit(asset_row['id'])
-                else:
-                    self.hide_asset_signal.emit(asset_row['id'])
-            for task in self.tasks:
-                if task == '':
-                    continue
-                if task in set(task_to_show):
-                    self.show_task_signal.emit(task)
-                else:
-                    self.hide_task_signal.emit(task)
-            QtWidgets.QApplication.processEvents()
-            time.sleep(0.1)
-            for stage_row in self.stage_rows:
-                if stage_row['id'] in stages_to_show:
-                    self.show_stage_signal.emit(stage_row['id'])
-                else:
-                    self.hide_stage_signal.emit(stage_row['id'])
+            self.results_signal.emit((asset_ids, stage_ids, tasks))
 
         except:
             logger.info(str(traceback.format_exc()))
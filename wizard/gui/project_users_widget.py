@@ -9,7 +9,6 @@ import logging
 import json
 
 # Wizard modules
-from wizard.core import image
 from wizard.core import repository
 from wizard.core import project
 from wizard.core import environment
@@ -17,6 +16,7 @@ from wizard.vars import ressources
 
 # Wizard gui modules
 from wizard.gui import gui_utils
+from wizard.gui import avatars
 from wizard.gui import gui_server
 
 logger = logging.getLogger(__name__)
@@ -77,8 +77,8 @@ class project_users_widget(QtWidgets.QWidget):
         for user_row in all_users:
             self.all_users_ids[user_row['id']] = dict()
             self.all_users_ids[user_row['id']]['row'] = user_row
-            self.all_users_ids[user_row['id']]['pixmap'] = gui_utils.mask_image(
-                image.convert_str_data_to_image_bytes(user_row['profile_picture']), 'png', 30)
+            self.all_users_ids[user_row['id']]['pixmap'] = avatars.get_pixmap(
+                user_row['user_name'], 30)
 
         project_user_ids = []
         for user_id in project.get_users_ids_list():
@@ -258,12 +258,9 @@ class tag_group_widget(QtWidgets.QFrame):
         menu = gui_utils.QMenu(self)
         users_ids = project.get_users_ids_list()
         for user_id in users_ids:
-            user_row = repository.get_user_data(user_id)
-            icon = QtGui.QIcon()
-            pm = gui_utils.mask_image(image.convert_str_data_to_image_bytes(
-                user_row['profile_picture']), 'png', 24)
-            icon.addPixmap(pm)
-            menu.addAction(icon, user_row['user_name'])
+            user_name = repository.get_user_data(user_id, 'user_name')
+            icon = avatars.get_icon(user_name, 24)
+            menu.addAction(icon, user_name)
         action = menu.exec(QtGui.QCursor().pos())
         if action is not None:
             selected_user_name = action.text()
@@ -7,7 +7,6 @@ from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtCore import pyqtSignal
 import time
 import logging
-import copy
 import traceback
 import json
 
@@ -24,6 +23,7 @@ from wizard.core import assets
 from wizard.core import launch
 from wizard.core import path_utils
 from wizard.core import project
+from wizard.core import search_index
 from wizard.vars import ressources
 from wizard.vars import assets_vars
 
@@ -1122,57 +1122,37 @@ class search_thread(QtCore.QThread):
     def update_search(self, reference_rows, referenced_groups_rows, search_data):
         self.running = False
         self.search_data = search_data
-        self.reference_rows = copy.deepcopy(reference_rows)
-        self.referenced_groups_rows = copy.deepcopy(referenced_groups_rows)
+        # The rows are only read, no copy needed
+        self.reference_rows = list(reference_rows)
+        self.referenced_groups_rows = list(referenced_groups_rows)
         self.running = True
         self.start()
 
     def run(self):
         try:
-            keywords = self.search_data.split('&')
+            reference_ids = search_index.match_rows(self.reference_rows,
+                                                    self.search_data,
+                                                    skip_columns=['id', 'creation_time', 'count',
+                                                                  'work_env_id', 'group_id', 'export_id',
+                                                                  'export_version_id', 'auto_update'],
+                                                    or_separator=None)
             for reference_row in self.reference_rows:
-
-                reference_id = reference_row['id']
-                del reference_row['id']
-                del reference_row['creation_time']
-                del reference_row['count']
-                if 'work_env_id' in reference_row.keys():
-                    del reference_row['work_env_id']
-                if 'group_id' in reference_row.keys():
-                    del reference_row['group_id']
-                del reference_row['export_id']
-                del reference_row['export_version_id']
-                del reference_row['auto_update']
-
-                values = list(reference_row.values())
-                data_list = []
-                for data_block in values:
-                    data_list.append(str(data_block))
-                data = (' ').join(data_list)
-
-                if all(keyword.upper() in data.upper() for keyword in keywords):
-                    self.show_ref_signal.emit(reference_id)
+                if reference_row['id'] in reference_ids:
+                    self.show_ref_signal.emit(reference_row['id'])
                 else:
-                    self.hide_ref_signal.emit(reference_id)
-
+                    self.hide_ref_signal.emit(reference_row['id'])
+
+            referenced_group_ids = search_index.match_rows(self.referenced_groups_rows,
+                                                           self.search_data,
+                                                           skip_columns=[
+                                                               'id', 'creation_time', 'count'],
+                                                           suffix=' groups',
+                                                           or_separator=None)
             for referenced_group_row in self.referenced_groups_rows:
-
-                referenced_group_id = referenced_group_row['id']
-                del referenced_group_row['id']
-                del referenced_group_row['creation_time']
-                del referenced_group_row['count']
-
-                values = list(referenced_group_row.values())
-                data_list = []
-                for data_block in values:
-                    data_list.append(str(data_block))
-                data_list.append('groups')
-                data = (' ').join(data_list)
-
-                if all(keyword.upper() in data.upper() for keyword in keywords):
-                    self.show_group_signal.emit(referenced_group_id)
+                if referenced_group_row['id'] in referenced_group_ids:
+                    self.show_group_signal.emit(referenced_group_row['id'])
                 else:
-                    self.hide_group_signal.emit(referenced_group_id)
+                    self.hide_group_signal.emit(referenced_group_row['id'])
         except:
             logger.info(str(traceback.format_exc()))
 
@@ -0,0 +1,124 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# This module dispatches the database changes published
+# by the core ( see wizard.core.invalidation ) to the
+# widgets displaying them.
+
+# Each widget subscribes to the tables it displays.
+# When a table changes, visible subscribers are refreshed
+# and hidden ones are only marked as dirty, they will
+# be refreshed when shown again
+
+# The refreshes are recorded by the refresh
+# profiler when it is enabled
+
+# Python modules
+from PyQt6 import QtWidgets, QtCore
+import logging
+
+# Wizard modules
+from wizard.core import refresh_profiler
+
+logger = logging.getLogger(__name__)
+
+
+class refresh_bus(QtCore.QObject):
+    def __init__(self, parent=None):
+        super(refresh_bus, self).__init__(parent)
+        self.subscribers = dict()
+
+    def subscribe(self, widget, tables=None, refresh_function=None, always=False, refresh_on_show=True):
+        # tables=None means the widget depends on any table
+        # always=True refreshes the widget even when hidden
+        # refresh_on_show=False for widgets already refreshing
+        # themselves when shown ( toggle() functions )
+        subscriber = dict()
+        subscriber['widget'] = widget
+        subscriber['tables'] = set(tables) if tables is not None else None
+        subscriber['refresh_function'] = refresh_function or widget.refresh
+        subscriber['always'] = always
+        subscriber['refresh_on_show'] = refresh_on_show
+        subscriber['dirty'] = False
+        self.subscribers[id(widget)] = subscriber
+        if refresh_on_show and not always:
+            widget.installEventFilter(self)
+
+    def unsubscribe(self, widget):
+        if id(widget) not in self.subscribers.keys():
+            return
+        widget.removeEventFilter(self)
+        del self.subscribers[id(widget)]
+
+    def invalidate(self, tables):
+        tables = set(tables)
+        logger.debug(f"Tables changed : {', '.join(sorted(tables))}")
+        for subscriber in list(self.subscribers.values()):
+            if subscriber['tables'] is None or (subscriber['tables'] & tables):
+                self.refresh_subscriber(subscriber)
+
+    def invalidate_all(self):
+        for subscriber in list(self.subscribers.values()):
+            self.refresh_subscriber(subscriber)
+
+    def refresh_subscriber(self, subscriber):
+        if subscriber['always'] or subscriber['widget'].isVisible():
+            subscriber['dirty'] = False
+            self.call_refresh(subscriber)
+        elif subscriber['refresh_on_show']:
+            subscriber['dirty'] = True
+
+    def call_refresh(self, subscriber):
+        if not refresh_profiler.is_enabled():
+            subscriber['refresh_function']()
+            return
+        widget = subscriber['widget']
+        name = f"{type(widget).__name__}.{getattr(subscriber['refresh_function'], '__name__', 'refresh')}"
+        items_counter = None
+        if isinstance(widget, QtWidgets.QWidget):
+            items_counter = lambda: count_items(widget)
+        with refresh_profiler.profile(name, items_counter):
+            subscriber['refresh_function']()
+
+    def mark_dirty(self, widget):
+        if id(widget) not in self.subscribers.keys():
+            return
+        subscriber = self.subscribers[id(widget)]
+        if subscriber['always'] or subscriber['widget'].isVisible():
+            self.refresh_subscriber(subscriber)
+        else:
+            subscriber['dirty'] = True
+
+    def is_dirty(self, widget):
+        if id(widget) not in self.subscribers.keys():
+            return False
+        return self.subscribers[id(widget)]['dirty']
+
+    def eventFilter(self, watched, event):
+        if event.type() == QtCore.QEvent.Type.Show:
+            subscriber = self.subscribers.get(id(watched))
+            if subscriber is not None and subscriber['dirty']:
+                subscriber['dirty'] = False
+                # Wait for the show event to be processed
+                QtCore.QTimer.singleShot(
+                    0, lambda: self.call_refresh(subscriber))
+        return False
+
+
+def count_items(widget):
+    # Items of the views of a widget, for the refresh profiler
+    count = 0
+    for view in widget.findChildren(QtWidgets.QTreeWidget):
+        iterator = QtWidgets.QTreeWidgetItemIterator(view)
+        while iterator.value():
+            count += 1
+            iterator += 1
+    for view in widget.findChildren(QtWidgets.QListWidget):
+        count += view.count()
+    for view in widget.findChildren(QtWidgets.QTableWidget):
+        count += view.rowCount()*view.columnCount()
+    for view in widget.findChildren(QtWidgets.QGraphicsView):
+        if view.scene() is not None:
+            count += len(view.scene().items())
+    return count
@@ -0,0 +1,195 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# Displays the samples recorded by the refresh
+# profiler ( see wizard.core.refresh_profiler ),
+# worst offenders first
+
+# Python modules
+from PyQt6 import QtWidgets, QtCore, QtGui
+import logging
+
+# Wizard gui modules
+from wizard.gui import chart_utils
+
+# Wizard modules
+from wizard.core import refresh_profiler
+from wizard.vars import ressources
+
+logger = logging.getLogger(__name__)
+
+
+class refresh_profiler_widget(QtWidgets.QWidget):
+    def __init__(self, parent=None):
+        super(refresh_profiler_widget, self).__init__(parent)
+
+        self.setWindowIcon(QtGui.QIcon(ressources._wizard_ico_))
+        self.setWindowTitle(f"Wizard - Refresh profiler")
+
+        self.stats_items = dict()
+        self.build_ui()
+        self.connect_functions()
+        self.refresh()
+
+    def build_ui(self):
+        self.setMinimumWidth(900)
+        self.setMinimumHeight(500)
+        self.setObjectName('dark_widget')
+
+        self.main_layout = QtWidgets.QVBoxLayout()
+        self.main_layout.setContentsMargins(11, 11, 11, 11)
+        self.main_layout.setSpacing(6)
+        self.setLayout(self.main_layout)
+
+        self.header_widget = QtWidgets.QWidget()
+        self.header_layout = QtWidgets.QHBoxLayout()
+        self.header_layout.setContentsMargins(0, 0, 0, 0)
+        self.header_layout.setSpacing(6)
+        self.header_widget.setLayout(self.header_layout)
+        self.main_layout.addWidget(self.header_widget)
+
+        self.enable_checkbox = QtWidgets.QCheckBox('Record refreshes')
+        self.header_layout.addWidget(self.enable_checkbox)
+
+        self.count_items_checkbox = QtWidgets.QCheckBox('Count items')
+        self.header_layout.addWidget(self.count_items_checkbox)
+
+        self.header_layout.addSpacerItem(QtWidgets.QSpacerItem(
+            0, 0, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Fixed))
+
+        self.reset_button = QtWidgets.QPushButton('Reset')
+        self.header_layout.addWidget(self.reset_button)
+
+        self.dump_button = QtWidgets.QPushButton('Dump report')
+        self.header_layout.addWidget(self.dump_button)
+
+        self.list_view = QtWidgets.QTreeWidget()
+        self.list_view.setObjectName('tree_as_list_widget')
+        self.list_view.setColumnCount(9)
+        self.list_view.setHeaderLabels(['Name', 'Count', 'Mean (ms)', 'P95 (ms)', 'Max (ms)',
+                                        'Total (s)', 'Queries', 'Rows', 'Items'])
+        self.list_view.header().resizeSection(0, 300)
+        self.list_view.setIndentation(0)
+        self.list_view.setAlternatingRowColors(True)
+        self.list_view.setSortingEnabled(True)
+        self.list_view.sortByColumn(5, QtCore.Qt.SortOrder.DescendingOrder)
+        self.main_layout.addWidget(self.list_view)
+
+        self.histogram_label = QtWidgets.QLabel()
+        self.histogram_label.setObjectName('gray_label')
+        self.main_layout.addWidget(self.histogram_label)
+
+        self.histogram_chart = chart_utils.histogram_chart()
+        self.main_layout.addWidget(self.histogram_chart)
+
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.setInterval(1000)
+
+    def connect_functions(self):
+        self.enable_checkbox.stateChanged.connect(self.toggle_profiler)
+        self.count_items_checkbox.stateChanged.connect(self.toggle_count_items)
+        self.reset_button.clicked.connect(self.reset)
+        self.dump_button.clicked.connect(self.dump_report)
+        self.list_view.itemSelectionChanged.connect(self.refresh_histogram)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def toggle_profiler(self, state):
+        if self.enable_checkbox.isChecked():
+            refresh_profiler.enable()
+        else:
+            refresh_profiler.disable()
+
+    def toggle_count_items(self, state):
+        refresh_profiler.set_count_items(
+            self.count_items_checkbox.isChecked())
+
+    def reset(self):
+        refresh_profiler.reset()
+        self.refresh()
+
+    def dump_report(self):
+        file_path = refresh_profiler.dump_report()
+        logger.info(f"Refresh profiler report written to {file_path}")
+
+    def refresh(self):
+        self.enable_checkbox.blockSignals(True)
+        self.enable_checkbox.setChecked(refresh_profiler.is_enabled())
+        self.enable_checkbox.blockSignals(False)
+        self.count_items_checkbox.blockSignals(True)
+        self.count_items_checkbox.setChecked(
+            refresh_profiler.is_counting_items())
+        self.count_items_checkbox.blockSignals(False)
+
+        self.list_view.setSortingEnabled(False)
+        stats_list = refresh_profiler.get_stats()
+        names = set()
+        for stats_dic in stats_list:
+            name = stats_dic['name']
+            names.add(name)
+            if name not in self.stats_items.keys():
+                self.stats_items[name] = stats_item(self.list_view.invisibleRootItem())
+            self.stats_items[name].update(stats_dic)
+        for name in set(self.stats_items.keys()) - names:
+            item = self.stats_items.pop(name)
+            self.list_view.invisibleRootItem().removeChild(item)
+        self.list_view.setSortingEnabled(True)
+        self.refresh_histogram()
+
+    def refresh_histogram(self):
+        selection = self.list_view.selectedItems()
+        if len(selection) == 0:
+            self.histogram_label.setText('Select a refresh to display its durations')
+            self.histogram_chart.clear()
+            return
+        name = selection[0].text(0)
+        bounds, counts = refresh_profiler.get_histogram(name)
+        self.histogram_label.setText(f"{name} durations")
+        self.histogram_chart.set_data(bounds, counts)
+
+    def showEvent(self, event):
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def toggle(self):
+        if self.isVisible():
+            if not self.isActiveWindow():
+                self.show()
+                self.raise_()
+                self.refresh()
+            else:
+                self.hide()
+        else:
+            self.show()
+            self.raise_()
+            self.refresh()
+
+
+class stats_item(QtWidgets.QTreeWidgetItem):
+    def __init__(self, parent=None):
+        super(stats_item, self).__init__(parent)
+        self.stats_dic = None
+
+    def update(self, stats_dic):
+        self.stats_dic = stats_dic
+        self.setText(0, stats_dic['name'])
+        self.setText(1, str(stats_dic['count']))
+        self.setText(2, f"{stats_dic['mean']*1000:.1f}")
+        self.setText(3, f"{stats_dic['p95']*1000:.1f}")
+        self.setText(4, f"{stats_dic['max']*1000:.1f}")
+        self.setText(5, f"{stats_dic['total']:.2f}")
+        self.setText(6, f"{stats_dic['queries']:.1f}")
+        self.setText(7, f"{stats_dic['rows']:.0f}")
+        self.setText(8, f"{stats_dic['items']:.0f}")
+
+    def __lt__(self, other):
+        # Numeric sort on the stats columns
+        column = self.treeWidget().sortColumn()
+        if column == 0 or self.stats_dic is None or other.stats_dic is None:
+            return super().__lt__(other)
+        keys = ['name', 'count', 'mean', 'p95', 'max', 'total', 'queries', 'rows', 'items']
+        return self.stats_dic[keys[column]] < other.stats_dic[keys[column]]
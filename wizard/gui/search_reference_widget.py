@@ -11,7 +11,7 @@ import traceback
 
 # Wizard modules
 from wizard.core import user
-from wizard.core import project
+from wizard.core import search_index
 from wizard.vars import ressources
 from wizard.vars import assets_vars
 
@@ -299,34 +299,24 @@ class search_thread(QtCore.QThread):
 
     def run(self):
         try:
-            keywords = self.string.split('&')
-            all_export_versions_stage_ids = project.get_all_export_versions(
-                'stage_id')
-            # all_variants = project.get_all_variants()
-            all_stages = project.get_all_stages()
-            all_assets = project.get_all_assets()
-            all_categories = project.get_all_categories()
-            stages = dict()
-            for stage_row in all_stages:
-                stages[stage_row['id']] = stage_row
-            assets = dict()
-            for asset_row in all_assets:
-                assets[asset_row['id']] = asset_row
-            categories = dict()
-            for category_row in all_categories:
-                categories[category_row['id']] = category_row
-            for stage_row in all_stages:
-                if stage_row['id'] in all_export_versions_stage_ids:
-                    if all(keyword.upper() in stage_row['string'].upper() for keyword in keywords):
-                        asset_row = assets[stage_row['asset_id']]
-                        category_row = categories[asset_row['category_id']]
-                        self.item_signal.emit(
-                            [category_row, asset_row, stage_row])
+            exported_stage_ids = search_index.get_id_set('exported_stage_ids')
+            stages = search_index.get_rows('stages')
+            assets = search_index.get_rows('assets')
+            categories = search_index.get_rows('categories')
+            stage_ids = search_index.search(
+                'reference_stages', self.string, or_separator=None)
+            for stage_id in sorted(stage_ids & exported_stage_ids):
+                stage_row = stages[stage_id]
+                asset_row = assets[stage_row['asset_id']]
+                category_row = categories[asset_row['category_id']]
+                self.item_signal.emit(
+                    [category_row, asset_row, stage_row])
             if (self.context == 'work_env'):
-                groups_rows = project.get_groups()
-                for group_row in groups_rows:
-                    if all(keyword.upper() in group_row['name'].upper()+'GROUPS' for keyword in keywords):
-                        self.group_signal.emit(group_row)
+                groups = search_index.get_rows('groups')
+                group_ids = search_index.search(
+                    'reference_groups', self.string, or_separator=None)
+                for group_id in sorted(group_ids):
+                    self.group_signal.emit(groups[group_id])
             self.search_ended.emit(1)
             self.running = False
         except:
@@ -6,12 +6,9 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtCore import pyqtSignal
 
-# Wizard core modules
-from wizard.core import repository
-from wizard.core import image
-
 # Wizard gui modules
 from wizard.gui import gui_utils
+from wizard.gui import avatars
 
 
 class tag_label(QtWidgets.QWidget):
@@ -186,11 +183,8 @@ class view_comment_widget(QtWidgets.QWidget):
 
     def init_users_images(self):
         self.users_images_dic = dict()
-        for user_row in repository.get_users_list():
-            user_image = user_row['profile_picture']
-            pixmap = gui_utils.mask_image(
-                image.convert_str_data_to_image_bytes(user_image), 'png', 18)
-            self.users_images_dic[user_row['user_name']] = pixmap
+        for user_name in avatars.get_user_names():
+            self.users_images_dic[user_name] = avatars.get_pixmap(user_name, 18)
 
     def build_ui(self):
         self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Fixed,
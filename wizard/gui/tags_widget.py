@@ -10,11 +10,11 @@ import logging
 # Wizard core modules
 from wizard.core import repository
 from wizard.core import project
-from wizard.core import image
 from wizard.vars import ressources
 
 # Wizard gui modules
 from wizard.gui import gui_utils
+from wizard.gui import avatars
 
 logger = logging.getLogger(__name__)
 
@@ -65,13 +65,10 @@ class tags_widget(gui_utils.QMenu):
                 self.addSeparator()
                 self.actions.append(action)
             for user_id in project.get_users_ids_list():
-                user_row = repository.get_user_data(user_id)
-                if token in user_row['user_name']:
-                    icon = QtGui.QIcon()
-                    pm = gui_utils.mask_image(image.convert_str_data_to_image_bytes(
-                        user_row['profile_picture']), 'png', 24)
-                    icon.addPixmap(pm)
-                    action = self.addAction(icon, f"{user_row['user_name']}")
+                user_name = repository.get_user_data(user_id, 'user_name')
+                if token in user_name:
+                    icon = avatars.get_icon(user_name, 24)
+                    action = self.addAction(icon, f"{user_name}")
                     self.actions.append(action)
             self.addSeparator()
             for tag_group_name in project.get_all_tag_groups('name'):
@@ -7,12 +7,11 @@ from PyQt6 import QtWidgets, QtCore, QtGui
 
 # Wizard modules
 from wizard.core import environment
-from wizard.core import repository
-from wizard.core import image
 from wizard.vars import ressources
 
 # Wizard gui modules
 from wizard.gui import gui_utils
+from wizard.gui import avatars
 from wizard.gui import gui_server
 
 
@@ -179,11 +178,7 @@ class user_widget(QtWidgets.QFrame):
         self.fill_ui()
 
     def fill_ui(self):
-        profile_image = repository.get_user_row_by_name(
-            self.user_name, 'profile_picture')
-        pm = gui_utils.mask_image(
-            image.convert_str_data_to_image_bytes(profile_image), 'png', 26)
-        self.profile_picture.setPixmap(pm)
+        self.profile_picture.setPixmap(avatars.get_pixmap(self.user_name, 26))
         self.user_name_label.setText(self.user_name)
 
     def build_ui(self):
@@ -0,0 +1,227 @@
+# coding: utf-8
+# Author: Leo BRUNEL
+# Contact: contact@leobrunel.com
+
+# Application wide cache of the scaled thumbnails.
+
+# The thumbnails are stored on the project storage, reading
+# them from the GUI thread blocks the interface on network
+# mounts. get_pixmap() only returns the pixmaps already in
+# memory and requests the others to a pool of workers, the
+# widgets display a placeholder and are notified by
+# thumbnail_ready when the pixmap is available.
+
+# Two levels of cache:
+# - An LRU of the scaled pixmaps in memory
+# - A local disk cache of the scaled images, keyed by
+#   source path, modification time, size and scale,
+#   swept in background to its maximum size on creation
+
+# The screenshots written in background by wizard.core.image
+# reload the thumbnails displayed while they were missing
+
+# Python modules
+from PyQt6 import QtCore, QtGui
+from PyQt6.QtCore import pyqtSignal
+from collections import OrderedDict
+import hashlib
+import os
+import logging
+
+# Wizard modules
+from wizard.core import path_utils
+from wizard.core import image
+from wizard.vars import user_vars
+
+logger = logging.getLogger(__name__)
+
+_memory_cache_size_ = 1500
+_workers_count_ = 4
+_disk_cache_max_size_ = 500 * 1024 * 1024
+
+
+class thumbnails_cache(QtCore.QObject):
+
+    thumbnail_ready = pyqtSignal(str)
+    screenshot_written = pyqtSignal(str, str)
+
+    def __init__(self, parent=None):
+        super(thumbnails_cache, self).__init__(parent)
+        self.pixmaps = OrderedDict()
+        self.signatures = dict()
+        self.pending = set()
+        self.thread_pool = QtCore.QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(_workers_count_)
+        self.signal_handler = worker_signal_handler()
+        self.signal_handler.loaded_signal.connect(self.image_loaded)
+        # Emitted from the screenshots worker thread
+        self.screenshot_written.connect(
+            lambda file, thumbnail_file: self.revalidate([file, thumbnail_file]))
+        image.add_screenshot_listener(self.screenshot_written.emit)
+        self.thread_pool.start(evict_worker())
+
+    def get_pixmap(self, path, width, height):
+        # Returns None while the thumbnail is loading,
+        # a null pixmap if the file doesn't exists
+        if path is None:
+            return QtGui.QPixmap()
+        key = (path, width, height)
+        if key in self.pixmaps.keys():
+            self.pixmaps.move_to_end(key)
+            return self.pixmaps[key]
+        self.request(key, None)
+        return None
+
+    def revalidate(self, paths):
+        # Reloads the thumbnails whose files changed,
+        # the current pixmaps are kept until then
+        for key in list(self.pixmaps.keys()):
+            if key[0] in paths:
+                self.request(key, self.signatures.get(key))
+
+    def request(self, key, signature):
+        if key in self.pending:
+            return
+        self.pending.add(key)
+        self.thread_pool.start(load_worker(key, signature,
+                                           self.signal_handler))
+
+    def image_loaded(self, result):
+        key, signature, image, changed = result
+        self.pending.discard(key)
+        if not changed:
+            return
+        if image is None:
+            pixmap = QtGui.QPixmap()
+        else:
+            pixmap = QtGui.QPixmap.fromImage(image)
+        self.pixmaps[key] = pixmap
+        self.pixmaps.move_to_end(key)
+        self.signatures[key] = signature
+        while len(self.pixmaps) > _memory_cache_size_:
+            old_key, old_pixmap = self.pixmaps.popitem(last=False)
+            self.signatures.pop(old_key, None)
+        self.thumbnail_ready.emit(key[0])
+
+
+class worker_signal_handler(QtCore.QObject):
+
+    loaded_signal = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super(worker_signal_handler, self).__init__(parent)
+
+
+class load_worker(QtCore.QRunnable):
+    def __init__(self, key, known_signature, signal_handler):
+        super(load_worker, self).__init__()
+        self.key = key
+        self.known_signature = known_signature
+        self.signal_handler = signal_handler
+
+    def run(self):
+        path, width, height = self.key
+        try:
+            stat = os.stat(path_utils.clean_path(path))
+            signature = (stat.st_mtime, stat.st_size)
+        except OSError:
+            signature = None
+        if self.known_signature is not None and signature == self.known_signature:
+            # Unchanged file, nothing to reload
+            self.signal_handler.loaded_signal.emit(
+                (self.key, signature, None, False))
+            return
+        image = None
+        if signature is not None:
+            image = self.load_image(path, width, height, signature)
+        self.signal_handler.loaded_signal.emit(
+            (self.key, signature, image, True))
+
+    def load_image(self, path, width, height, signature):
+        cache_file = get_cache_file(path, width, height, signature)
+        if path_utils.isfile(cache_file):
+            image = QtGui.QImage(cache_file)
+            if not image.isNull():
+                touch_cache_file(cache_file)
+                return image
+        image = QtGui.QImage(path)
+        if image.isNull():
+            return
+        image = image.scaled(width, height,
+                             QtCore.Qt.AspectRatioMode.KeepAspectRatio,
+                             QtCore.Qt.TransformationMode.SmoothTransformation)
+        try:
+            path_utils.makedirs(user_vars._thumbnails_cache_path_)
+            image.save(cache_file, 'PNG')
+        except OSError:
+            logger.debug(f"Can't write {cache_file}")
+        return image
+
+
+class evict_worker(QtCore.QRunnable):
+    def __init__(self):
+        super(evict_worker, self).__init__()
+
+    def run(self):
+        evict_disk_cache()
+
+
+def get_cache_file(path, width, height, signature):
+    key_string = f"{path}|{signature[0]}|{signature[1]}|{width}x{height}"
+    file_name = hashlib.md5(key_string.encode('utf-8')).hexdigest() + '.png'
+    return path_utils.join(user_vars._thumbnails_cache_path_, file_name)
+
+
+def touch_cache_file(cache_file):
+    # The modification time orders the eviction
+    try:
+        os.utime(cache_file, None)
+    except OSError:
+        pass
+
+
+def evict_disk_cache(max_size=_disk_cache_max_size_):
+    # Removes the least recently used thumbnails until
+    # the disk cache is smaller than max_size
+    cache_dir = user_vars._thumbnails_cache_path_
+    try:
+        file_names = os.listdir(cache_dir)
+    except OSError:
+        return
+    cached_files = []
+    total_size = 0
+    for file_name in file_names:
+        if not file_name.endswith('.png'):
+            continue
+        file = path_utils.join(cache_dir, file_name)
+        try:
+            file_stat = os.stat(file)
+        except OSError:
+            continue
+        total_size += file_stat.st_size
+        cached_files.append((file_stat.st_mtime, file_stat.st_size, file))
+    if total_size <= max_size:
+        return
+    for mtime, size, file in sorted(cached_files):
+        try:
+            os.remove(file)
+        except OSError:
+            continue
+        total_size -= size
+        if total_size <= max_size:
+            break
+    logger.debug(f"Thumbnails cache swept to {total_size} bytes")
+
+
+_cache = None
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = thumbnails_cache()
+    return _cache
+
+
+def get_pixmap(path, width, height):
+    return get_cache().get_pixmap(path, width, height)
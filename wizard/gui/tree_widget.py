@@ -5,7 +5,6 @@
 # Python modules
 import time
 import os
-import copy
 import sys
 from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtCore import pyqtSignal
@@ -21,7 +20,7 @@ from wizard.core import subtasks_library
 from wizard.core import repository
 from wizard.core import tools
 from wizard.core import stats
-from wizard.core import image
+from wizard.core import search_index
 from wizard.vars import user_vars
 from wizard.vars import assets_vars
 from wizard.vars import ressources
@@ -29,10 +28,14 @@ from wizard.vars import ressources
 # Wizard gui modules
 from wizard.gui import confirm_widget
 from wizard.gui import gui_utils
+from wizard.gui import avatars
 from wizard.gui import gui_server
 
 logger = logging.getLogger(__name__)
 
+_states_role_ = QtCore.Qt.ItemDataRole.UserRole + 3
+_priorities_role_ = QtCore.Qt.ItemDataRole.UserRole + 4
+
 
 class tree_widget(QtWidgets.QFrame):
 
@@ -56,19 +59,20 @@ class tree_widget(QtWidgets.QFrame):
         self.stage_ids = dict()
         self.creation_items = []
 
+        # Stages items are only created when their asset is expanded
+        self.stage_rows = dict()
+        self.asset_stages_ids = dict()
+        self.loaded_asset_ids = set()
+        self.items_to_sort = dict()
+
         self.users_icons_dic = dict()
 
         self.build_ui()
         self.connect_functions()
 
     def refresh_users_icons_dic(self):
-        for user_row in repository.get_users_list():
-            if user_row['user_name'] not in self.users_icons_dic.keys():
-                user_icon = QtGui.QIcon()
-                pm = gui_utils.mask_image(image.convert_str_data_to_image_bytes(
-                    user_row['profile_picture']), 'png', 16)
-                user_icon.addPixmap(pm)
-                self.users_icons_dic[user_row['user_name']] = user_icon
+        for user_name in avatars.get_user_names():
+            self.users_icons_dic[user_name] = avatars.get_icon(user_name, 16)
 
     def build_ui(self):
         self.icons_dic = dict()
@@ -187,6 +191,7 @@ class tree_widget(QtWidgets.QFrame):
         self.search_thread = search_thread()
         self.search_thread.item_signal.connect(self.add_search_item)
         self.tree.itemDoubleClicked.connect(self.double_click)
+        self.tree.itemExpanded.connect(self.item_expanded)
         self.tree.itemSelectionChanged.connect(self.item_changed)
         self.tree.customContextMenuRequested.connect(
             self.context_menu_requested)
@@ -209,8 +214,11 @@ class tree_widget(QtWidgets.QFrame):
         self.set_context()
         self.domain_ids = dict()
         self.category_ids = dict()
+        self.assets_groups_ids = dict()
         self.asset_ids = dict()
         self.stage_ids = dict()
+        self.loaded_asset_ids = set()
+        self.creation_items = []
         self.tree.clear()
 
     def set_context(self):
@@ -268,9 +276,10 @@ class tree_widget(QtWidgets.QFrame):
                         self.focus_on_item(
                             self.asset_ids[context_dic['selected_instance'][1]])
                 if context_dic['selected_instance'][0] == 'stage':
-                    if context_dic['selected_instance'][1] in self.stage_ids.keys():
-                        self.focus_on_item(
-                            self.stage_ids[context_dic['selected_instance'][1]])
+                    stage_item = self.get_stage_item(
+                        context_dic['selected_instance'][1])
+                    if stage_item is not None:
+                        self.focus_on_item(stage_item)
             self.search_bar.setText(context_dic['search_string'])
             self.apply_search()
             self.creation_items_visibility = context_dic['creation_items_visibility']
@@ -294,53 +303,52 @@ class tree_widget(QtWidgets.QFrame):
 
         self.refresh_users_icons_dic()
 
-        self.project_category_ids = []
-        self.project_assets_groups_ids = []
-        self.project_asset_ids = []
-        self.project_stage_ids = []
+        project_category_ids = set()
+        project_assets_groups_ids = set()
+        project_asset_ids = set()
+        self.stage_rows = dict()
+        self.asset_stages_ids = dict()
+        self.items_to_sort = dict()
 
         for domain_row in project.get_domains():
             self.add_domain(domain_row)
         for category_row in project.get_all_categories():
             self.add_category(category_row)
-            self.project_category_ids.append(category_row['id'])
+            project_category_ids.add(category_row['id'])
         for group_row in project.get_all_assets_groups():
             self.add_assets_group(group_row)
-            self.project_assets_groups_ids.append(group_row['id'])
+            project_assets_groups_ids.add(group_row['id'])
         for asset_row in project.get_all_assets():
             self.add_asset(asset_row)
-            self.project_asset_ids.append(asset_row['id'])
-        for stage_row in project.get_all_stages():
-            self.add_stage(stage_row)
-            self.project_stage_ids.append(stage_row['id'])
-
-        stage_ids = list(self.stage_ids.keys())
-        for id in stage_ids:
-            if id not in self.project_stage_ids:
-                self.remove_stage(id)
-        asset_ids = list(self.asset_ids.keys())
-        for id in asset_ids:
-            if id not in self.project_asset_ids:
-                self.remove_asset(id)
-        category_ids = list(self.category_ids.keys())
-        for id in category_ids:
-            if id not in self.project_category_ids:
-                self.remove_category(id)
-        assets_groups_ids = list(self.assets_groups_ids.keys())
-        for id in assets_groups_ids:
-            if id not in self.project_assets_groups_ids:
-                self.remove_assets_group(id)
-
-        for domain_id in self.domain_ids.keys():
-            self.sort_domain_children(domain_id)
-        for category_id in self.category_ids.keys():
-            self.sort_category_children(category_id)
-        for asset_group_id in self.assets_groups_ids.keys():
-            self.sort_asset_group_children(asset_group_id)
-        for asset_id in self.asset_ids.keys():
-            self.sort_asset_children(asset_id)
-
-        assets_progresses, categories_progresses, domains_progresses = stats.get_all_progresses()
+            project_asset_ids.add(asset_row['id'])
+        stages_rows = project.get_all_stages()
+        for stage_row in stages_rows:
+            self.stage_rows[stage_row['id']] = stage_row
+            if stage_row['asset_id'] not in self.asset_stages_ids.keys():
+                self.asset_stages_ids[stage_row['asset_id']] = []
+            self.asset_stages_ids[stage_row['asset_id']].append(
+                stage_row['id'])
+            self.add_stage_to_parents(stage_row)
+
+        for id in set(self.stage_ids.keys()) - set(self.stage_rows.keys()):
+            self.remove_stage(id)
+        for id in set(self.asset_ids.keys()) - project_asset_ids:
+            self.remove_asset(id)
+        for id in set(self.category_ids.keys()) - project_category_ids:
+            self.remove_category(id)
+        for id in set(self.assets_groups_ids.keys()) - project_assets_groups_ids:
+            self.remove_assets_group(id)
+
+        # Only the expanded assets get their stages items
+        for asset_id in list(self.loaded_asset_ids):
+            self.load_asset_stages(asset_id)
+
+        for item in self.items_to_sort.values():
+            self.sort_children(item)
+        self.items_to_sort = dict()
+
+        assets_progresses, categories_progresses, domains_progresses = stats.get_all_progresses(
+            stages_rows=stages_rows)
         for asset_id in assets_progresses.keys():
             self.asset_ids[asset_id].progress_indicator.set_progress(
                 assets_progresses[asset_id])
@@ -359,6 +367,48 @@ class tree_widget(QtWidgets.QFrame):
         self.update_color_visibility()
         self.update_refresh_time(start_time)
 
+    def item_expanded(self, item):
+        if item.instance_type != 'asset':
+            return
+        if item.instance_id in self.loaded_asset_ids:
+            return
+        self.load_asset_stages(item.instance_id)
+        self.sort_children(item)
+
+    def load_asset_stages(self, asset_id):
+        if asset_id not in self.asset_ids.keys():
+            return
+        asset_item = self.asset_ids[asset_id]
+        if asset_id not in self.loaded_asset_ids:
+            self.loaded_asset_ids.add(asset_id)
+            asset_item.setChildIndicatorPolicy(
+                QtWidgets.QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicatorWhenChildless)
+            self.add_creation_item(asset_item, 'new', 'stage_creation')
+        if asset_id not in self.asset_stages_ids.keys():
+            return
+        for stage_id in self.asset_stages_ids[asset_id]:
+            self.add_stage(self.stage_rows[stage_id])
+
+    def get_stage_item(self, stage_id):
+        if stage_id not in self.stage_ids.keys():
+            if stage_id not in self.stage_rows.keys():
+                return
+            asset_id = self.stage_rows[stage_id]['asset_id']
+            self.load_asset_stages(asset_id)
+            if asset_id in self.asset_ids.keys():
+                self.sort_children(self.asset_ids[asset_id])
+        return self.stage_ids.get(stage_id)
+
+    def sort_children(self, item):
+        if item.instance_type == 'domain' and item.instance_id in self.domain_ids.keys():
+            self.sort_domain_children(item.instance_id)
+        elif item.instance_type == 'category' and item.instance_id in self.category_ids.keys():
+            self.sort_category_children(item.instance_id)
+        elif item.instance_type == 'assets_group' and item.instance_id in self.assets_groups_ids.keys():
+            self.sort_asset_group_children(item.instance_id)
+        elif item.instance_type == 'asset' and item.instance_id in self.asset_ids.keys():
+            self.sort_asset_children(item.instance_id)
+
     def move_asset_to_assets_group(self, tuple):
         project.add_asset_to_assets_group(tuple[0], tuple[1])
         gui_server.refresh_team_ui()
@@ -474,7 +524,7 @@ class tree_widget(QtWidgets.QFrame):
         self.refresh_label.setText(f"refresh : {refresh_time}s")
 
     def refresh_datas(self):
-        text = f"{len(self.category_ids.keys())} categories, {len(self.asset_ids.keys())} assets, {len(self.stage_ids.keys())} stages"
+        text = f"{len(self.category_ids.keys())} categories, {len(self.asset_ids.keys())} assets, {len(self.stage_rows.keys())} stages"
         self.data_label.setText(text)
 
     def add_domain(self, row):
@@ -506,6 +556,7 @@ class tree_widget(QtWidgets.QFrame):
                 parent_widget.addChild(category_item)
                 category_item.add_indicators()
                 self.add_creation_item(category_item, 'new', 'asset_creation')
+                self.items_to_sort[id(parent_widget)] = parent_widget
             else:
                 self.category_ids[row['id']].state_indicator.clear_states()
                 self.category_ids[row['id']
@@ -524,6 +575,7 @@ class tree_widget(QtWidgets.QFrame):
                 self.assets_groups_ids[row['id']] = assets_group_item
                 parent_widget.addChild(assets_group_item)
                 assets_group_item.add_indicators()
+                self.items_to_sort[id(parent_widget)] = parent_widget
             else:
                 self.assets_groups_ids[row['id']
                                        ].state_indicator.clear_states()
@@ -546,10 +598,9 @@ class tree_widget(QtWidgets.QFrame):
                 self.asset_ids[row['id']] = asset_item
                 parent_widget.addChild(asset_item)
                 asset_item.add_indicators()
-                domain_id = project.get_category_data(
-                    row['category_id'], 'domain_id')
-                domain_name = project.get_domain_data(domain_id, 'name')
-                self.add_creation_item(asset_item, 'new', 'stage_creation')
+                asset_item.setChildIndicatorPolicy(
+                    QtWidgets.QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+                self.items_to_sort[id(parent_widget)] = parent_widget
             else:
                 self.asset_ids[row['id']].state_indicator.clear_states()
                 self.asset_ids[row['id']].priority_indicator.clear_priorities()
@@ -650,9 +701,7 @@ class tree_widget(QtWidgets.QFrame):
     def move_asset(self, item, new_parent):
         item.parent().takeChild(item.parent().indexOfChild(item))
         new_parent.addChild(item)
-        item.add_indicators()
-        for i in range(item.childCount()):
-            item.child(i).add_indicators()
+        self.items_to_sort[id(new_parent)] = new_parent
 
     def add_stage(self, row):
         if row['asset_id'] in self.asset_ids.keys():
@@ -669,8 +718,11 @@ class tree_widget(QtWidgets.QFrame):
 
                 parent_widget.addChild(stage_item)
                 stage_item.add_indicators()
+                if self.search_bar.text() != '':
+                    stage_item.setHidden(1)
 
                 self.remove_stage_creation_item(parent_widget)
+                self.items_to_sort[id(parent_widget)] = parent_widget
             self.stage_ids[row['id']].state_indicator.set_state(row['state'])
             self.stage_ids[row['id']].priority_indicator.set_priority(
                 row['priority'])
@@ -678,22 +730,21 @@ class tree_widget(QtWidgets.QFrame):
                 1, self.users_icons_dic[row['assignment']])
             self.stage_ids[row['id']].progress_indicator.set_progress(
                 row['progress'])
+
+    def add_stage_to_parents(self, row):
+        # Report the stage state and priority on the parents items
+        # without needing the stage item to exist
+        if row['asset_id'] not in self.asset_ids.keys():
+            return
+        asset_item = self.asset_ids[row['asset_id']]
+        parent_items = [asset_item, asset_item.parent()]
+        if asset_item.parent().instance_type == 'assets_group':
+            parent_items.append(asset_item.parent().parent())
+        for parent_item in parent_items:
             if row['state'] in ['error', 'rtk']:
-                self.stage_ids[row['id']].parent(
-                ).state_indicator.add_state(row['state'])
-                self.stage_ids[row['id']].parent().parent(
-                ).state_indicator.add_state(row['state'])
-                if self.stage_ids[row['id']].parent().parent().instance_type == 'assets_group':
-                    self.stage_ids[row['id']].parent().parent(
-                    ).parent().state_indicator.add_state(row['state'])
+                parent_item.state_indicator.add_state(row['state'])
             if row['priority'] != assets_vars._priority_normal_:
-                self.stage_ids[row['id']].parent(
-                ).priority_indicator.add_priority(row['priority'])
-                self.stage_ids[row['id']].parent().parent(
-                ).priority_indicator.add_priority(row['priority'])
-                if self.stage_ids[row['id']].parent().parent().instance_type == 'assets_group':
-                    self.stage_ids[row['id']].parent().parent().parent(
-                    ).priority_indicator.add_priority(row['priority'])
+                parent_item.priority_indicator.add_priority(row['priority'])
 
     def remove_stage_creation_item(self, parent_widget):
         child_count = parent_widget.childCount()
@@ -787,12 +838,14 @@ class tree_widget(QtWidgets.QFrame):
             if instance_id in self.asset_ids.keys():
                 self.focus_on_item(self.asset_ids[instance_id])
         if instance_type == 'stage':
-            if instance_id in self.stage_ids.keys():
-                self.focus_on_item(self.stage_ids[instance_id])
+            stage_item = self.get_stage_item(instance_id)
+            if stage_item is not None:
+                self.focus_on_item(stage_item)
         if instance_type == 'variant':
             stage_id = project.get_variant_data(instance_id, 'stage_id')
-            if stage_id in self.stage_ids.keys():
-                self.focus_on_item(self.stage_ids[stage_id])
+            stage_item = self.get_stage_item(stage_id)
+            if stage_item is not None:
+                self.focus_on_item(stage_item)
 
     def isolate_item(self, item):
         search_text = ''
@@ -1115,6 +1168,7 @@ class tree_widget(QtWidgets.QFrame):
         is_selected = item.isSelected()
         item.parent().removeChild(item)
         del self.asset_ids[id]
+        self.loaded_asset_ids.discard(id)
         if is_selected:
             self.tree.clearSelection()
 
@@ -1142,7 +1196,7 @@ class tree_widget(QtWidgets.QFrame):
         instance_type = instance_tuple[0]
         instance_id = instance_tuple[1]
         if instance_type == 'stage':
-            if instance_id in self.stage_ids.keys():
+            if self.get_stage_item(instance_id) is not None:
                 self.stage_ids[instance_id].setHidden(0)
                 self.stage_ids[instance_id].parent().setHidden(0)
                 self.stage_ids[instance_id].parent().setExpanded(1)
@@ -1190,62 +1244,38 @@ class custom_treeWidgetItem(QtWidgets.QTreeWidgetItem):
         self.instance_parent_id = parent_id
 
     def add_indicators(self):
-        self.state_indicator = state_indicator()
-        self.treeWidget().setItemWidget(self, 2, self.state_indicator)
-        self.priority_indicator = priority_indicator()
-        self.treeWidget().setItemWidget(self, 3, self.priority_indicator)
+        # The indicators are stored as item datas and painted
+        # by the tree delegate, no widget is created per item
+        self.state_indicator = state_indicator(self, 2)
+        self.priority_indicator = priority_indicator(self, 3)
         self.add_progress_indicator()
 
     def add_progress_indicator(self):
-        self.progress_indicator = progress_indicator()
-        self.treeWidget().setItemWidget(self, 4, self.progress_indicator)
+        self.progress_indicator = progress_indicator(self, 4)
 
 
-class progress_indicator(QtWidgets.QWidget):
-    def __init__(self):
-        super(progress_indicator, self).__init__()
-        self.setFixedWidth(35)
-        self.main_layout = QtWidgets.QHBoxLayout()
-        self.main_layout.setSpacing(2)
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
-        self.setLayout(self.main_layout)
-        self.progress_label = QtWidgets.QLabel()
-        self.progress_label.setObjectName('bold_label')
-        self.progress_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-        self.main_layout.addWidget(self.progress_label)
+class progress_indicator():
+    def __init__(self, item, column):
+        self.item = item
+        self.column = column
+        self.item.setTextAlignment(
+            self.column, QtCore.Qt.AlignmentFlag.AlignCenter)
+        font = self.item.font(self.column)
+        font.setBold(True)
+        self.item.setFont(self.column, font)
 
     def set_progress(self, progress):
-        self.progress_label.setText(f"{progress}%")
+        self.item.setText(self.column, f"{progress}%")
 
 
-class state_indicator(QtWidgets.QWidget):
-    def __init__(self):
-        super(state_indicator, self).__init__()
-        self.setFixedWidth(18)
-        self.main_layout = QtWidgets.QHBoxLayout()
-        self.main_layout.setSpacing(2)
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
-        self.setLayout(self.main_layout)
+class state_indicator():
+    def __init__(self, item, column):
+        self.item = item
+        self.column = column
         self.states = []
-        self.indicators = dict()
 
     def update_indicators(self):
-        for state in self.states:
-            if state in self.indicators.keys():
-                continue
-            indicator_frame = QtWidgets.QFrame()
-            indicator_frame.setFixedSize(8, 8)
-            indicator_frame.setStyleSheet(
-                f'background-color:{ressources._states_colors_[state]};border-radius:4px;')
-            self.main_layout.addWidget(indicator_frame)
-            self.indicators[state] = indicator_frame
-        current_states = list(self.indicators.keys())
-        for current_state in current_states:
-            if current_state not in self.states:
-                self.indicators[current_state].setParent(None)
-                self.indicators[current_state].setVisible(False)
-                self.indicators[current_state].deleteLater()
-                del self.indicators[current_state]
+        self.item.setData(self.column, _states_role_, list(self.states))
 
     def set_state(self, state):
         self.states = [state]
@@ -1262,33 +1292,15 @@ class state_indicator(QtWidgets.QWidget):
         self.update_indicators()
 
 
-class priority_indicator(QtWidgets.QWidget):
-    def __init__(self):
-        super(priority_indicator, self).__init__()
-        self.setFixedWidth(32)
-        self.main_layout = QtWidgets.QHBoxLayout()
-        self.main_layout.setSpacing(0)
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
-        self.setLayout(self.main_layout)
+class priority_indicator():
+    def __init__(self, item, column):
+        self.item = item
+        self.column = column
         self.priorities = []
-        self.indicators = dict()
 
     def update_indicators(self):
-        for priority in self.priorities:
-            if priority in self.indicators.keys():
-                continue
-            indicator_label = QtWidgets.QLabel()
-            indicator_label.setPixmap(QtGui.QIcon(
-                ressources._priority_icons_list_[priority]).pixmap(18))
-            self.main_layout.addWidget(indicator_label)
-            self.indicators[priority] = indicator_label
-        current_priorities = list(self.indicators.keys())
-        for current_priority in current_priorities:
-            if current_priority not in self.priorities:
-                self.indicators[current_priority].setParent(None)
-                self.indicators[current_priority].setVisible(False)
-                self.indicators[current_priority].deleteLater()
-                del self.indicators[current_priority]
+        self.item.setData(self.column, _priorities_role_,
+                          list(self.priorities))
 
     def set_priority(self, priority):
         self.priorities = [priority]
@@ -1650,58 +1662,42 @@ class search_thread(QtCore.QThread):
         self.start()
 
     def run(self):
-        all_stages = project.get_all_stages()
-        keywords_sets = self.string.split('+')
-        for keywords_set in keywords_sets:
-            keywords = keywords_set.split('&')
-            for stage_row in all_stages:
-
-                stage_row_cp = copy.deepcopy(stage_row)
-
-                del stage_row_cp['id']
-                del stage_row_cp['creation_time']
-                del stage_row_cp['creation_user']
-                del stage_row_cp['work_time']
-                del stage_row_cp['progress']
-                del stage_row_cp['estimated_time']
-                del stage_row_cp['default_variant_id']
-                del stage_row_cp['asset_id']
-                del stage_row_cp['domain_id']
-
-                values = list(stage_row_cp.values())
-                data_list = []
-                for data_block in values:
-                    data_list.append(str(data_block))
-                data = (' ').join(data_list)
-
-                if all(keyword.upper() in data.upper() for keyword in keywords):
-                    self.item_signal.emit(('stage', stage_row['id']))
-
-            all_assets_groups = project.get_all_assets_groups()
-            for assets_group_row in all_assets_groups:
-
-                assets_group_row_cp = copy.deepcopy(assets_group_row)
-
-                del assets_group_row_cp['id']
-                del assets_group_row_cp['creation_time']
-                del assets_group_row_cp['creation_user']
-                del assets_group_row_cp['color']
-                del assets_group_row_cp['category_id']
-
-                values = list(assets_group_row_cp.values())
-                data_list = []
-                for data_block in values:
-                    data_list.append(str(data_block))
-                data = (' ').join(data_list)
-
-                if all(keyword.upper() in data.upper() for keyword in keywords):
-                    self.item_signal.emit(
-                        ('assets_group', assets_group_row['id']))
+        for stage_id in sorted(search_index.search('tree_stages', self.string)):
+            self.item_signal.emit(('stage', stage_id))
+        for assets_group_id in sorted(search_index.search('tree_assets_groups', self.string)):
+            self.item_signal.emit(('assets_group', assets_group_id))
 
 
 class ColoredItemDelegate(QtWidgets.QStyledItemDelegate):
     def __init__(self, parent=None):
         super(ColoredItemDelegate, self).__init__(parent)
+        self.priorities_pixmaps = dict()
+
+    def get_priority_pixmap(self, priority):
+        if priority not in self.priorities_pixmaps.keys():
+            self.priorities_pixmaps[priority] = QtGui.QIcon(
+                ressources._priority_icons_list_[priority]).pixmap(18)
+        return self.priorities_pixmaps[priority]
+
+    def paint_indicators(self, painter, option, index):
+        states = index.data(_states_role_)
+        if states:
+            painter.setPen(QtGui.QPen(QtCore.Qt.PenStyle.NoPen))
+            x = option.rect.x() + 1
+            y = option.rect.center().y() - 4
+            for state in states:
+                painter.setBrush(QtGui.QBrush(
+                    QtGui.QColor(ressources._states_colors_[state])))
+                painter.drawEllipse(QtCore.QRectF(x, y, 8, 8))
+                x += 10
+        priorities = index.data(_priorities_role_)
+        if priorities:
+            x = option.rect.x()
+            y = option.rect.center().y() - 9
+            for priority in priorities:
+                painter.drawPixmap(x, y, 18, 18,
+                                   self.get_priority_pixmap(priority))
+                x += 18
 
     def paint(self, painter, option, index):
         color_data = index.data(QtCore.Qt.ItemDataRole.UserRole + 1)
@@ -1756,6 +1752,7 @@ class ColoredItemDelegate(QtWidgets.QStyledItemDelegate):
             path = left_path + right_path
             painter.drawPath(path)
         super(ColoredItemDelegate, self).paint(painter, option, index)
+        self.paint_indicators(painter, option, index)
 
 
 class tree(QtWidgets.QTreeWidget):
@@ -8,11 +8,11 @@ import json
 
 # Wizard gui modules
 from wizard.gui import gui_utils
+from wizard.gui import avatars
 
 # Wizard modules
 from wizard.core import environment
 from wizard.core import repository
-from wizard.core import image
 from wizard.vars import ressources
 from wizard.vars import game_vars
 
@@ -110,9 +110,8 @@ class user_widget(QtWidgets.QFrame):
         self.coins_label.setText(str(user_row['coins']))
         self.level_label.setText(str(user_row['level']))
         self.admin_badge_label.setVisible(user_row['administrator'])
-        pm = gui_utils.mask_image(image.convert_str_data_to_image_bytes(
-            user_row['profile_picture']), 'png', 28, custom_radius=14)
-        self.profile_picture.setPixmap(pm)
+        self.profile_picture.setPixmap(avatars.get_pixmap(
+            user_row['user_name'], 28, custom_radius=14))
         self.refresh_crown(user_row, user_rows)
         self.refresh_keeped_artefacts(user_row)
 
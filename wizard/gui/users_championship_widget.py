@@ -6,11 +6,10 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
 
 # Wizard gui modules
-from wizard.gui import gui_utils
+from wizard.gui import avatars
 
 # Wizard modules
 from wizard.core import repository
-from wizard.core import image
 from wizard.core import tools
 from wizard.vars import ressources
 
@@ -144,11 +143,7 @@ class custom_user_tree_item(QtWidgets.QTreeWidgetItem):
         self.setIcon(6, QtGui.QIcon(ressources._skull_item_icon_))
 
     def fill_ui(self):
-        user_icon = QtGui.QIcon()
-        pm = gui_utils.mask_image(image.convert_str_data_to_image_bytes(
-            self.user_row['profile_picture']), 'png', 30)
-        user_icon.addPixmap(pm)
-        self.setIcon(0, user_icon)
+        self.setIcon(0, avatars.get_icon(self.user_row['user_name'], 30))
         self.setText(1, self.user_row['user_name'])
         self.setIcon(2, QtGui.QIcon())
         self.setText(2, str(self.user_row['level']))
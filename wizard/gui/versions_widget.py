@@ -9,7 +9,6 @@ import os
 import time
 import logging
 import traceback
-import copy
 
 # Wizard modules
 from wizard.core import launch
@@ -19,6 +18,7 @@ from wizard.core import project
 from wizard.core import tools
 from wizard.core import path_utils
 from wizard.core import subtasks_library
+from wizard.core import search_index
 from wizard.vars import ressources
 from wizard.vars import user_vars
 from wizard.vars import assets_vars
@@ -33,6 +33,8 @@ from wizard.gui import batch_settings_widget
 from wizard.gui import video_settings_widget
 from wizard.gui import tag_label
 from wizard.gui import current_asset_viewer
+from wizard.gui import files_watcher
+from wizard.gui import thumbnails_cache
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +50,7 @@ class versions_widget(QtWidgets.QWidget):
         self.versions_rows = None
         self.version_list_ids = dict()
         self.version_icon_ids = dict()
-        self.check_existence_thread = check_existence_thread()
+        self.files_existence = files_existence(self)
         self.search_thread = search_thread()
 
         self.view_comment_widget = tag_label.view_comment_widget(self)
@@ -117,7 +119,7 @@ class versions_widget(QtWidgets.QWidget):
         gui_server.refresh_team_ui()
 
     def change_work_env(self, work_env_id):
-        self.check_existence_thread.running = False
+        self.files_existence.clear()
         self.version_list_ids = dict()
         self.version_icon_ids = dict()
         self.list_view.clear()
@@ -197,7 +199,7 @@ class versions_widget(QtWidgets.QWidget):
                 for version_id in version_list_ids:
                     if version_id not in project_versions_id:
                         self.remove_tree_version(version_id)
-                self.check_existence_thread.update_versions_rows(
+                self.files_existence.update_versions_rows(
                     self.versions_rows)
             elif self.work_env_id is None:
                 self.show_info_mode(
@@ -230,7 +232,7 @@ class versions_widget(QtWidgets.QWidget):
                 for version_id in version_icon_ids:
                     if version_id not in project_versions_id:
                         self.remove_icon_version(version_id)
-                self.check_existence_thread.update_versions_rows(
+                self.files_existence.update_versions_rows(
                     self.versions_rows)
             elif self.work_env_id is None:
                 self.show_info_mode(
@@ -240,6 +242,11 @@ class versions_widget(QtWidgets.QWidget):
                     "Select or create a stage\nin the project tree !", ressources._select_stage_info_image_)
             self.refresh_infos()
 
+    def thumbnail_ready(self, thumbnail_path):
+        for item in self.version_icon_ids.values():
+            if item.version_row['thumbnail_path'] == thumbnail_path:
+                item.fill_thumbnail()
+
     def missing_file(self, version_id):
         if self.list_mode:
             if version_id in self.version_list_ids.keys():
@@ -296,6 +303,7 @@ class versions_widget(QtWidgets.QWidget):
                 self.version_icon_ids[version_id].setHidden(True)
 
     def connect_functions(self):
+        thumbnails_cache.get_cache().thumbnail_ready.connect(self.thumbnail_ready)
         self.list_view_scrollBar.rangeChanged.connect(
             lambda: self.list_view_scrollBar.setValue(self.list_view_scrollBar.maximum()))
         self.icon_view_scrollBar.rangeChanged.connect(
@@ -326,9 +334,9 @@ class versions_widget(QtWidgets.QWidget):
         self.comment_button.clicked.connect(
             lambda: self.modify_comment(pos=None))
 
-        self.check_existence_thread.missing_file_signal.connect(
+        self.files_existence.missing_file_signal.connect(
             self.missing_file)
-        self.check_existence_thread.not_missing_file_signal.connect(
+        self.files_existence.not_missing_file_signal.connect(
             self.not_missing_file)
 
         self.search_bar.textChanged.connect(self.update_search)
@@ -948,20 +956,22 @@ class custom_version_icon_item(QtWidgets.QListWidgetItem):
         self.fill_ui()
 
     def fill_ui(self):
-        icon = QtGui.QIcon()
+        self.fill_thumbnail()
+        self.setText(
+            f"{self.version_row['name']} - {self.version_row['creation_user']}")
+        self.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
 
-        pixmap = QtGui.QPixmap(self.version_row['thumbnail_path'])
+    def fill_thumbnail(self):
+        # The thumbnail is loaded in background,
+        # the default icon is displayed meanwhile
+        pixmap = thumbnails_cache.get_pixmap(
+            self.version_row['thumbnail_path'], 200, 200)
+        if pixmap is None or pixmap.isNull():
+            pixmap = QtGui.QIcon(ressources._no_screenshot_small_).pixmap(200)
+        icon = QtGui.QIcon()
         icon.addPixmap(pixmap, QtGui.QIcon.Mode.Normal)
         icon.addPixmap(pixmap, QtGui.QIcon.Mode.Selected)
-        if not path_utils.isfile(self.version_row['thumbnail_path']):
-            default_icon = QtGui.QIcon(ressources._no_screenshot_small_)
-            icon.addPixmap(default_icon.pixmap(200), QtGui.QIcon.Mode.Normal)
-            icon.addPixmap(default_icon.pixmap(200), QtGui.QIcon.Mode.Selected)
-
         self.setIcon(icon)
-        self.setText(
-            f"{self.version_row['name']} - {self.version_row['creation_user']}")
-        self.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
 
     def set_missing(self):
         self.setForeground(QtGui.QColor('#f79360'))
@@ -974,31 +984,41 @@ class custom_version_icon_item(QtWidgets.QListWidgetItem):
         self.fill_ui()
 
 
-class check_existence_thread(QtCore.QThread):
+class files_existence(QtCore.QObject):
 
     missing_file_signal = pyqtSignal(int)
     not_missing_file_signal = pyqtSignal(int)
 
     def __init__(self, parent=None):
-        super(check_existence_thread, self).__init__(parent)
-        self.versions_rows = None
-        self.running = True
-
-    def run(self):
-        if self.versions_rows is not None:
-            for version_row in self.versions_rows:
-                if not path_utils.isfile(version_row['file_path']):
-                    self.missing_file_signal.emit(version_row['id'])
-                else:
-                    self.not_missing_file_signal.emit(version_row['id'])
-                if not self.running:
-                    break
+        super(files_existence, self).__init__(parent)
+        self.versions_rows = []
+        self.watcher = files_watcher.get_watcher()
+        self.watcher.directories_changed.connect(self.directories_changed)
 
     def update_versions_rows(self, versions_rows):
-        self.running = False
-        self.versions_rows = versions_rows
-        self.running = True
-        self.start()
+        self.versions_rows = versions_rows or []
+        self.watcher.watch(self, [path_utils.dirname(version_row['file_path'])
+                                  for version_row in self.versions_rows])
+        self.check(self.versions_rows)
+
+    def clear(self):
+        self.versions_rows = []
+        self.watcher.unwatch(self)
+
+    def directories_changed(self, changed_directories):
+        self.check([version_row for version_row in self.versions_rows
+                    if path_utils.dirname(version_row['file_path']) in changed_directories])
+
+    def check(self, versions_rows):
+        for version_row in versions_rows:
+            exists = self.watcher.file_exists(version_row['file_path'])
+            if exists is None:
+                # Checked once the directory is scanned
+                continue
+            if exists:
+                self.not_missing_file_signal.emit(version_row['id'])
+            else:
+                self.missing_file_signal.emit(version_row['id'])
 
 
 class search_thread(QtCore.QThread):
@@ -1013,32 +1033,22 @@ class search_thread(QtCore.QThread):
     def update_search(self, versions_rows, search_data):
         self.running = False
         self.search_data = search_data
-        self.versions_rows = copy.deepcopy(versions_rows)
+        # The rows are only read, no copy needed
+        self.versions_rows = list(versions_rows or [])
         self.running = True
         self.start()
 
     def run(self):
         try:
-            keywords = self.search_data.split('&')
+            skip_columns = ['id', 'creation_time', 'file_path', 'screenshot_path', 'thumbnail_path', 'work_env_id']
+            matching_ids = search_index.match_rows(self.versions_rows,
+                                                   self.search_data,
+                                                   skip_columns=skip_columns,
+                                                   or_separator=None)
             for version_row in self.versions_rows:
-
-                version_id = version_row['id']
-                del version_row['id']
-                del version_row['creation_time']
-                del version_row['file_path']
-                del version_row['screenshot_path']
-                del version_row['thumbnail_path']
-                del version_row['work_env_id']
-
-                values = list(version_row.values())
-                data_list = []
-                for data_block in values:
-                    data_list.append(str(data_block))
-                data = (' ').join(data_list)
-
-                if all(keyword.upper() in data.upper() for keyword in keywords):
-                    self.show_id_signal.emit(version_id)
+                if version_row['id'] in matching_ids:
+                    self.show_id_signal.emit(version_row['id'])
                 else:
-                    self.hide_id_signal.emit(version_id)
+                    self.hide_id_signal.emit(version_row['id'])
         except:
             logger.debug(str(traceback.format_exc()))
@@ -10,13 +10,12 @@ import logging
 # Wizard modules
 from wizard.core import tools
 from wizard.core import project
-from wizard.core import repository
 from wizard.core import assets
-from wizard.core import image
 from wizard.vars import ressources
 
 # Wizard gui modules
 from wizard.gui import gui_utils
+from wizard.gui import avatars
 from wizard.gui import gui_server
 
 logger = logging.getLogger(__name__)
@@ -213,13 +212,7 @@ class playing_infos_widget(QtWidgets.QWidget):
         self.refresh_users_images()
 
     def refresh_users_images(self):
-        for user_row in repository.get_users_list():
-            if user_row['user_name'] in self.users_images_dic.keys():
-                continue
-            user_image = user_row['profile_picture']
-            pixmap = gui_utils.mask_image(
-                image.convert_str_data_to_image_bytes(user_image), 'png', 30, 8)
-            self.users_images_dic[user_row['user_name']] = pixmap
+        avatars.fill_pixmaps(self.users_images_dic, 30, 8)
 
     def build_ui(self):
         self.main_layout = QtWidgets.QVBoxLayout()
@@ -12,12 +12,14 @@ from PyQt6.QtCore import pyqtSignal
 
 # Wizard gui modules
 from wizard.gui import gui_utils
+from wizard.gui import thumbnails_cache
 
 # Wizard core modules
-from wizard.core import path_utils
 from wizard.core import project
 from wizard.core import user
 from wizard.core import tools
+from wizard.core import path_utils
+from wizard.core import previews
 from wizard.vars import ressources
 from wizard.vars import user_vars
 
@@ -45,6 +47,7 @@ class video_browser_widget(QtWidgets.QWidget):
         self.connect_functions()
 
     def connect_functions(self):
+        thumbnails_cache.get_cache().thumbnail_ready.connect(self.thumbnail_ready)
         self.icon_view.itemDoubleClicked.connect(
             lambda: self.create_playlist(add=False))
         self.icon_view.customContextMenuRequested.connect(
@@ -95,6 +98,12 @@ class video_browser_widget(QtWidgets.QWidget):
                 self.search_threads[thread_id].terminate()
                 del self.search_threads[thread_id]
 
+    def thumbnail_ready(self, thumbnail_path):
+        for variant_dic in self.variants_ids.values():
+            video_item = variant_dic.get('video_item')
+            if video_item and video_item.video_row['thumbnail_path'] == thumbnail_path:
+                video_item.fill_thumbnail()
+
     def show_variant(self, variant_id):
         if variant_id in self.variants_ids.keys():
             self.variants_ids[variant_id]['video_item'].setHidden(False)
@@ -117,6 +126,13 @@ class video_browser_widget(QtWidgets.QWidget):
                 QtGui.QIcon(ressources._tool_add_), 'Add to playlist')
         else:
             return
+        contact_sheet_action = None
+        if len(selection) == 1:
+            contact_sheet = previews.get_contact_sheet(
+                selection[0].video_row['file_path'])
+            if contact_sheet is not None:
+                contact_sheet_action = menu.addAction(QtGui.QIcon(
+                    ressources._tool_video_), 'Show contact sheet')
 
         pos = QtGui.QCursor().pos()
         action = menu.exec(pos)
@@ -125,6 +141,8 @@ class video_browser_widget(QtWidgets.QWidget):
                 self.create_playlist()
             elif action == add_to_playlist_action:
                 self.add_to_playlist()
+            elif action == contact_sheet_action:
+                path_utils.startfile(contact_sheet)
 
     def create_playlist(self, add=False):
         items = self.icon_view.selectedItems()
@@ -243,11 +261,7 @@ class custom_video_icon_item(QtWidgets.QListWidgetItem):
         self.fill_ui()
 
     def fill_ui(self):
-        pixmap = QtGui.QPixmap(self.video_row['thumbnail_path'])
-        if not path_utils.isfile(self.video_row['thumbnail_path']):
-            pixmap = QtGui.QPixmap(ressources._no_screenshot_small_)
-
-        self.widget.image_label.setPixmap(pixmap)
+        self.fill_thumbnail()
         self.widget.stage_label.setText(f"{self.stage_row['name']}")
         self.widget.asset_name_label.setText(f"{self.asset_name}")
         self.widget.infos_label.setText(
@@ -258,6 +272,15 @@ class custom_video_icon_item(QtWidgets.QListWidgetItem):
         self.setSizeHint(self.widget.size())
         print(self.widget.size())
 
+    def fill_thumbnail(self):
+        # The thumbnail is loaded in background,
+        # the default image is displayed meanwhile
+        pixmap = thumbnails_cache.get_pixmap(
+            self.video_row['thumbnail_path'], 200, 200)
+        if pixmap is None or pixmap.isNull():
+            pixmap = QtGui.QPixmap(ressources._no_screenshot_small_)
+        self.widget.image_label.setPixmap(pixmap)
+
 
 class video_item_widget(QtWidgets.QWidget):
     def __init__(self, parent=None):
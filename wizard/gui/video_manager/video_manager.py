@@ -76,10 +76,8 @@ class video_manager(QtWidgets.QWidget):
     def add_videos(self, video_tuples):
         if len(video_tuples) == 0:
             return
-        for video_tuple in video_tuples:
-            self.video_player.add_video(
-                video_file=video_tuple[0], project_video_id=video_tuple[1])
-        self.video_player.update_concat()
+        # The videos are probed in background, then added
+        self.video_player.add_video_tuples(video_tuples)
 
     def clear_and_add_videos(self, video_tuples):
         if len(video_tuples) == 0:
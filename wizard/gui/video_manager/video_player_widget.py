@@ -3,7 +3,7 @@
 # Contact: contact@leobrunel.com
 
 # Python modules
-from PyQt6 import QtWidgets, QtGui
+from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtCore import pyqtSignal
 import uuid
 import logging
@@ -15,6 +15,8 @@ from wizard.core import project
 from wizard.core import user
 from wizard.core import assets
 from wizard.core import ffmpeg_utils
+from wizard.core import video_proxies
+from wizard.core import video_probe
 from wizard.vars import ressources
 from wizard.vars import user_vars
 
@@ -24,6 +26,7 @@ from wizard.gui import gui_server
 from wizard.gui.video_manager import mpv_widget
 from wizard.gui.video_manager import timeline_widget
 from wizard.gui.video_manager import create_playlist_widget
+from wizard.gui.video_manager import video_threads
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +36,7 @@ class video_player_widget(QtWidgets.QFrame):
     current_stage = pyqtSignal(int)
     current_variant = pyqtSignal(int)
     current_video_row = pyqtSignal(object)
+    proxy_ready = pyqtSignal(str)
 
     def __init__(self, parent=None):
         super(video_player_widget, self).__init__(parent)
@@ -45,6 +49,9 @@ class video_player_widget(QtWidgets.QFrame):
         self.temp_dir = ffmpeg_utils.get_temp_dir()
         self.videos_dic = dict()
         self.load_threads = []
+        # Incremented by clear(), the videos probed
+        # for a cleared playlist are not added
+        self.probe_generation = 0
         self.frame_range = [0, 1000]
         self.resolution = [1920, 1080]
         self.video_player = mpv_widget.mpv_widget(self)
@@ -53,6 +60,17 @@ class video_player_widget(QtWidgets.QFrame):
         self.modified = False
         self.current_playlist = None
         self.current_playlist_name = ''
+        self.playback_files = dict()
+        self.tier_probing = False
+        self.tier_probed_files = set()
+        # Waits for the end of the resizing
+        self.tier_timer = QtCore.QTimer(self)
+        self.tier_timer.setSingleShot(True)
+        self.tier_timer.setInterval(500)
+        # Called by the transcode threads
+        self.proxy_listener = lambda video_file, tier, proxy_file: self.proxy_ready.emit(
+            video_file)
+        video_proxies.get_queue().add_listener(self.proxy_listener)
         self.build_ui()
         self.connect_functions()
         self.set_fps(24)
@@ -81,6 +99,7 @@ class video_player_widget(QtWidgets.QFrame):
 
     def quit(self):
         self.video_player.quit()
+        video_proxies.get_queue().remove_listener(self.proxy_listener)
         ffmpeg_utils.clear_player_files(self.temp_dir, self.player_id)
         for thread in self.load_video_threads:
             try:
@@ -148,12 +167,74 @@ class video_player_widget(QtWidgets.QFrame):
             if self.videos_dic[video_id]['project_video_id'] not in all_project_videos_ids:
                 del self.videos_dic[video_id]
         self.timeline_widget.update_videos_dic(self.videos_dic)
+        # The proxies matching the player size are played
+        # when available, the originals otherwise
+        self.playback_files = self.get_playback_files()
+        played_videos_dic = dict()
+        for video_id, video_dic in self.videos_dic.items():
+            played_videos_dic[video_id] = dict(video_dic)
+            played_videos_dic[video_id]['original_file'] = self.playback_files[
+                path_utils.abspath(video_dic['original_file'])]
         self.video_player.load_video(ffmpeg_utils.concatenate_videos(
-            self.temp_dir, self.player_id, self.videos_dic, self.fps), self.first_load)
+            self.temp_dir, self.player_id, played_videos_dic, self.fps), self.first_load)
         if self.first_load:
             self.first_load = False
         self.set_info("Player updated")
 
+    def get_playback_files(self):
+        # The tier is picked from the cached probes, the
+        # videos not probed yet are probed in background
+        # and the tier is picked again once done
+        video_files = [path_utils.abspath(video_dic['original_file'])
+                       for video_dic in self.videos_dic.values()]
+        # Probed once, an unreadable video isn't probed again
+        unprobed_files = [video_file for video_file in video_files
+                          if video_file not in self.tier_probed_files
+                          and video_probe.get_cached_probe(video_file) is None
+                          and path_utils.isfile(video_file)]
+        if len(unprobed_files) > 0 and not self.tier_probing:
+            self.tier_probing = True
+            self.tier_probed_files |= set(unprobed_files)
+            thread = video_threads.probe_thread(unprobed_files, self)
+            thread.on_videos_ready.connect(
+                lambda video_files: self.tier_videos_probed(thread))
+            self.load_video_threads.append(thread)
+            thread.start()
+        ratio = self.video_player.devicePixelRatioF()
+        return video_proxies.get_playback_files(
+            video_files,
+            int(self.video_player.width()*ratio),
+            int(self.video_player.height()*ratio))
+
+    def tier_videos_probed(self, thread):
+        if thread in self.load_video_threads:
+            self.load_video_threads.remove(thread)
+        self.tier_probing = False
+        self.update_tier()
+
+    def proxy_transcoded(self, video_file):
+        # Reloads the player once the whole playlist
+        # is available in the new tier
+        if path_utils.abspath(video_file) not in self.playback_files.keys():
+            return
+        if self.get_playback_files() != self.playback_files:
+            self.update_concat()
+
+    def update_tier(self):
+        # The tier matching the new player size
+        if len(self.videos_dic) == 0:
+            return
+        if self.get_playback_files() != self.playback_files:
+            self.update_concat()
+
+    def resizeEvent(self, event):
+        self.tier_timer.start()
+        super().resizeEvent(event)
+
+    def showEvent(self, event):
+        self.tier_timer.start()
+        super().showEvent(event)
+
     def build_ui(self):
         self.resize(1280, 720)
         self.setObjectName('main_widget')
@@ -285,13 +366,47 @@ class video_player_widget(QtWidgets.QFrame):
         self.save_as_new_playlist_action.triggered.connect(
             self.save_as_new_playlist)
         self.export_video_file_action.triggered.connect(self.export_video_file)
+        self.proxy_ready.connect(self.proxy_transcoded)
+        self.tier_timer.timeout.connect(self.update_tier)
 
     def replace_current_video(self, project_video_id):
         self.timeline_widget.replace_current_video(project_video_id)
         self.update_concat()
         self.set_modified(True)
 
+    def probe_videos(self, video_files, callback):
+        # The uncached videos are probed in background,
+        # callback is called on the GUI thread once done
+        self.set_info("Reading videos", 2)
+        generation = self.probe_generation
+        thread = video_threads.probe_thread(video_files, self)
+
+        def videos_ready(video_files):
+            if thread in self.load_video_threads:
+                self.load_video_threads.remove(thread)
+            if generation != self.probe_generation:
+                return
+            callback()
+
+        thread.on_videos_ready.connect(videos_ready)
+        self.load_video_threads.append(thread)
+        thread.start()
+
+    def add_video_tuples(self, video_tuples):
+        self.probe_videos([video_tuple[0] for video_tuple in video_tuples],
+                          lambda: self.video_tuples_probed(video_tuples))
+
+    def video_tuples_probed(self, video_tuples):
+        for video_tuple in video_tuples:
+            self.add_video(
+                video_file=video_tuple[0], project_video_id=video_tuple[1])
+        self.update_concat()
+
     def replace_videos(self, data_tuples_list):
+        self.probe_videos([data_tuple[1] for data_tuple in data_tuples_list],
+                          lambda: self.videos_probed_for_replace(data_tuples_list))
+
+    def videos_probed_for_replace(self, data_tuples_list):
         for data_tuple in data_tuples_list:
             video_id = data_tuple[0]
             video_file = data_tuple[1]
@@ -339,6 +454,7 @@ class video_player_widget(QtWidgets.QFrame):
             self.current_playlist_label.setText(self.current_playlist_name)
 
     def clear(self):
+        self.probe_generation += 1
         self.delete_videos(list(self.videos_dic.keys()))
         self.current_playlist = None
         self.current_playlist_name = ''
@@ -390,13 +506,19 @@ class video_player_widget(QtWidgets.QFrame):
         file_name, _ = QtWidgets.QFileDialog.getSaveFileName(
             self, "Save video file", "", "Mp4 Files (*.mp4)")
         if file_name:
-            concat_file = ffmpeg_utils.get_concat_video_file(
-                self.temp_dir, self.player_id)
-            if not path_utils.isfile(concat_file):
+            # The player may play proxies, the
+            # export concatenates the originals
+            export_id = f"{self.player_id}_export"
+            self.set_info("Exporting video", 2)
+            concat_file = ffmpeg_utils.concatenate_videos(
+                self.temp_dir, export_id, self.videos_dic, self.fps)
+            if concat_file is None or not path_utils.isfile(concat_file):
+                ffmpeg_utils.clear_player_files(self.temp_dir, export_id)
                 logger.warning("Nothing to export")
                 self.set_info("Nothing to export", 2)
                 return
             path_utils.copyfile(concat_file, file_name)
+            ffmpeg_utils.clear_player_files(self.temp_dir, export_id)
             logger.info("Video exported successfully")
             self.set_info("Video exported successfully")
 
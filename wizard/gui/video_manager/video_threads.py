@@ -10,6 +10,7 @@ import logging
 
 # Wizard core modules
 from wizard.core import ffmpeg_utils
+from wizard.core import video_probe
 
 logger = logging.getLogger(__name__)
 
@@ -49,3 +50,26 @@ class concat_thread(QtCore.QThread):
             self.running = False
         except:
             logger.error(str(traceback.format_exc()))
+
+
+class probe_thread(QtCore.QThread):
+
+    # Probes the videos in background, the
+    # player reads the probes cache once ready
+    on_videos_ready = pyqtSignal(object)
+
+    def __init__(self, video_files, parent=None):
+        super(probe_thread, self).__init__(parent)
+        self.video_files = video_files
+        self.killed = False
+
+    def run(self):
+        try:
+            video_probe.probe_many(self.video_files)
+        except:
+            logger.error(str(traceback.format_exc()))
+        if not self.killed:
+            self.on_videos_ready.emit(self.video_files)
+
+    def kill(self):
+        self.killed = True
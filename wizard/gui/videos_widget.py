@@ -30,6 +30,7 @@ from wizard.gui import drop_files_widget
 from wizard.gui import comment_widget
 from wizard.gui import tag_label
 from wizard.gui import current_asset_viewer
+from wizard.gui import thumbnails_cache
 
 logger = logging.getLogger(__name__)
 
@@ -199,6 +200,11 @@ class videos_widget(QtWidgets.QWidget):
                     "Select or create a stage\nin the project tree !", ressources._select_stage_info_image_)
             self.refresh_infos()
 
+    def thumbnail_ready(self, thumbnail_path):
+        for item in self.video_icon_ids.values():
+            if item.video_row['thumbnail_path'] == thumbnail_path:
+                item.fill_thumbnail()
+
     def missing_file(self, video_id):
         if self.list_mode:
             if video_id in self.video_list_ids.keys():
@@ -255,6 +261,7 @@ class videos_widget(QtWidgets.QWidget):
                 self.video_icon_ids[video_id].setHidden(True)
 
     def connect_functions(self):
+        thumbnails_cache.get_cache().thumbnail_ready.connect(self.thumbnail_ready)
         self.list_view_scrollBar.rangeChanged.connect(
             lambda: self.list_view_scrollBar.setValue(self.list_view_scrollBar.maximum()))
         self.icon_view_scrollBar.rangeChanged.connect(
@@ -653,20 +660,22 @@ class custom_video_icon_item(QtWidgets.QListWidgetItem):
         self.fill_ui()
 
     def fill_ui(self):
-        icon = QtGui.QIcon()
+        self.fill_thumbnail()
+        self.setText(
+            f"{self.video_row['name']} - {self.video_row['creation_user']}")
+        self.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
 
-        pixmap = QtGui.QPixmap(self.video_row['thumbnail_path'])
+    def fill_thumbnail(self):
+        # The thumbnail is loaded in background,
+        # the default icon is displayed meanwhile
+        pixmap = thumbnails_cache.get_pixmap(
+            self.video_row['thumbnail_path'], 200, 200)
+        if pixmap is None or pixmap.isNull():
+            pixmap = QtGui.QIcon(ressources._no_screenshot_small_).pixmap(200)
+        icon = QtGui.QIcon()
         icon.addPixmap(pixmap, QtGui.QIcon.Mode.Normal)
         icon.addPixmap(pixmap, QtGui.QIcon.Mode.Selected)
-        if not path_utils.isfile(self.video_row['thumbnail_path']):
-            default_icon = QtGui.QIcon(ressources._no_screenshot_small_)
-            icon.addPixmap(default_icon.pixmap(200), QtGui.QIcon.Mode.Normal)
-            icon.addPixmap(default_icon.pixmap(200), QtGui.QIcon.Mode.Selected)
-
         self.setIcon(icon)
-        self.setText(
-            f"{self.video_row['name']} - {self.video_row['creation_user']}")
-        self.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
 
     def set_missing(self):
         self.setForeground(QtGui.QColor('#f79360'))
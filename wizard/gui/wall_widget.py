@@ -17,7 +17,6 @@ from wizard.core import environment
 from wizard.core import repository
 from wizard.core import user
 from wizard.core import project
-from wizard.core import image
 from wizard.core import tools
 from wizard.core import path_utils
 from wizard.vars import ressources
@@ -25,6 +24,7 @@ from wizard.vars import user_vars
 
 # Wizard gui modules
 from wizard.gui import gui_utils
+from wizard.gui import avatars
 from wizard.gui import gui_server
 from wizard.gui import tag_label
 
@@ -40,8 +40,10 @@ class wall_widget(QtWidgets.QWidget):
         super(wall_widget, self).__init__(parent)
 
         self.last_time = 0
-        self.event_rows = None
+        self.first_event_id = None
+        self.event_rows = []
         self.event_ids = dict()
+        self.tag_groups_cache = tag_groups_cache()
         self.time_widgets = []
         self.first_refresh = 1
         self.search_thread = search_thread()
@@ -52,11 +54,8 @@ class wall_widget(QtWidgets.QWidget):
 
     def init_users_images(self):
         self.users_images_dic = dict()
-        for user_row in repository.get_users_list():
-            user_image = user_row['profile_picture']
-            pixmap = gui_utils.mask_image(
-                image.convert_str_data_to_image_bytes(user_image), 'png', 30)
-            self.users_images_dic[user_row['user_name']] = pixmap
+        for user_name in avatars.get_user_names():
+            self.users_images_dic[user_name] = avatars.get_pixmap(user_name, 30)
 
     def connect_functions(self):
         self.wall_scrollBar.rangeChanged.connect(
@@ -189,12 +188,19 @@ class wall_widget(QtWidgets.QWidget):
 
     def refresh(self):
         start_time = time.perf_counter()
-        self.event_rows = project.get_all_events()
-        if self.event_rows is not None:
-
-            event_number = self.event_count_spinBox.value()
+        event_number = self.event_count_spinBox.value()
+        if self.first_event_id is None:
+            event_rows = project.get_latest_events(event_number)
+        else:
+            # Keyset query from the first displayed event, returns
+            # the displayed events ( to get the modified messages )
+            # and the new ones, never the whole table
+            event_rows = project.get_events_after(
+                self.first_event_id-1, event_number)
+        if event_rows is not None:
+            self.event_rows = event_rows
 
-            for event_row in self.event_rows[-event_number:]:
+            for event_row in self.event_rows:
                 if event_row['id'] not in self.event_ids.keys():
                     event_widget = wall_event_widget(
                         event_row, self.users_images_dic)
@@ -209,14 +215,7 @@ class wall_widget(QtWidgets.QWidget):
                         if event_row['type'] == 'tag':
                             if (environment.get_user() in event_row['title']) or ('all' in event_row['title']):
                                 self.popup.emit(event_row)
-                            all_tag_groups = project.get_all_tag_groups()
-                            for tag_group_row in all_tag_groups:
-                                if tag_group_row['name'] not in event_row['title']:
-                                    continue
-                                user_id = repository.get_user_row_by_name(
-                                    environment.get_user(), 'id')
-                                if user_id not in json.loads(tag_group_row['user_ids']):
-                                    continue
+                            elif any(tag_group in event_row['title'] for tag_group in self.tag_groups_cache.get_user_tag_groups()):
                                 self.popup.emit(event_row)
                         else:
                             self.popup.emit(event_row)
@@ -224,6 +223,9 @@ class wall_widget(QtWidgets.QWidget):
                     if event_row != self.event_ids[event_row['id']].event_row:
                         self.event_ids[event_row['id']].refresh(event_row)
 
+            if len(self.event_rows) > 0:
+                self.first_event_id = self.event_rows[0]['id']
+
             self.remove_useless_events(event_number)
 
         self.update_search()
@@ -232,6 +234,7 @@ class wall_widget(QtWidgets.QWidget):
 
     def change_events_count(self):
         self.last_time = 0
+        self.first_event_id = None
         event_ids_list = list(self.event_ids.keys())
         for event_id in event_ids_list:
             self.remove_event(event_id)
@@ -242,7 +245,8 @@ class wall_widget(QtWidgets.QWidget):
         event_ids_list_to_remove = list(self.event_ids.keys())[:-event_number]
         for event_id in event_ids_list_to_remove:
             self.remove_event(event_id)
-        self.event_ids[list(self.event_ids.keys())[0]].add_time()
+        if len(self.event_ids) > 0:
+            self.event_ids[list(self.event_ids.keys())[0]].add_time()
 
     def remove_event(self, event_id):
         if event_id in self.event_ids.keys():
@@ -255,6 +259,26 @@ class wall_widget(QtWidgets.QWidget):
         self.refresh_label.setText(f"refresh : {refresh_time}s")
 
 
+class tag_groups_cache(object):
+    # Tag groups of the current user, resolved once and
+    # cleared by the refresh bus when 'tag_groups' changes
+    def __init__(self):
+        self.user_tag_groups = None
+
+    def refresh(self):
+        self.user_tag_groups = None
+
+    def get_user_tag_groups(self):
+        if self.user_tag_groups is None:
+            user_id = repository.get_user_row_by_name(
+                environment.get_user(), 'id')
+            self.user_tag_groups = set()
+            for tag_group_row in project.get_all_tag_groups():
+                if user_id in json.loads(tag_group_row['user_ids']):
+                    self.user_tag_groups.add(tag_group_row['name'])
+        return self.user_tag_groups
+
+
 class wall_time_widget(QtWidgets.QWidget):
     def __init__(self, time_float, parent=None):
         super(wall_time_widget, self).__init__(parent)
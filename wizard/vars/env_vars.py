@@ -46,3 +46,5 @@ _communicate_server_port_ = 'wizard_communicate_server_port'
 _softwares_server_port_ = 'wizard_softwares_server_port'
 _team_dns_ = 'wizard_team_dns'
 _wizard_gui_ = 'wizard_gui'
+_startup_trace_ = 'wizard_startup_trace'
+_refresh_profiler_ = 'wizard_refresh_profiler'
@@ -49,6 +49,12 @@ _data_collect_file_ = path_utils.join(_user_path_, 'data_collect.json')
 _subtasks_logs_ = path_utils.join(_user_path_, 'subtasks_logs')
 _script_path_ = path_utils.join(_user_path_, 'script')
 _icons_path_ = path_utils.join(_user_path_, 'icons')
+_thumbnails_cache_path_ = path_utils.join(_user_path_, 'thumbnails_cache')
+_video_probe_cache_file_ = path_utils.join(_user_path_, 'video_probe_cache.db')
+_video_proxies_path_ = path_utils.join(_user_path_, 'video_proxies')
+_refresh_profiler_log_ = path_utils.join(_user_path_, 'refresh_profiler.log')
+_refresh_profiler_reports_path_ = path_utils.join(
+    _user_path_, 'refresh_profiler_reports')
 _session_file_ = path_utils.join(_script_path_, 'session.py')
 
 
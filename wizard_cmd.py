@@ -40,43 +40,49 @@ The script performs the following tasks:
 6. Executes the specified Python file within the configured environment.
 7. Ensures proper cleanup of resources upon completion or error.
 
+wizard_cmd is headless: no QApplication is created and the Qt widgets
+modules are never imported, the heavy optional modules ( video, OCIO... )
+are only loaded if the executed file uses them. The startup phases are
+logged by the startup tracer.
+
 Modules used:
 - Python standard modules: argparse, traceback, json, logging
-- Wizard core modules: application, environment, repository, user, project, assets, custom_logger, db_core, communicate, launch, hooks, launch_batch
-- Wizard GUI modules: gui_utils, app_utils
+- Wizard core modules: startup_tracer, application, environment, repository, user, project, assets, custom_logger, db_core, communicate, launch, hooks, launch_batch
 """
 
 # Python modules
-import OpenEXR
 import argparse
 import traceback
 import json
 import logging
 
 # Wizard modules
-from wizard.core import application
-from wizard.core import environment
-from wizard.core import repository
-from wizard.core import user
-from wizard.core import project
-from wizard.core import assets
-from wizard.core import custom_logger
-from wizard.core import db_core
-from wizard.core import communicate
-from wizard.core import launch
-from wizard.core import hooks
-from wizard.core import launch_batch
-from wizard.gui import gui_utils
-from wizard.gui import app_utils
+from wizard.core import startup_tracer
+startup_tracer.start()
+
+with startup_tracer.phase('Import wizard modules'):
+    from wizard.core import application
+    from wizard.core import environment
+    from wizard.core import repository
+    from wizard.core import user
+    from wizard.core import project
+    from wizard.core import assets
+    from wizard.core import custom_logger
+    from wizard.core import db_core
+    from wizard.core import communicate
+    from wizard.core import launch
+    from wizard.core import hooks
+    from wizard.core import launch_batch
 
 # Initialize the custom logger and get the logger for this module
 custom_logger.get_root_logger()
 logger = logging.getLogger(__name__)
 
-# Log application information and initialize the application
+# Log application information and initialize the headless environment
 application.log_app_infos()
-app = app_utils.get_app()
-app_utils.set_wizard_cmd()
+application.add_ffmpeg_to_path()
+print('Wizard CMD')
+environment.set_gui(0)
 
 # Parse command-line arguments
 parser = argparse.ArgumentParser()
@@ -125,35 +131,40 @@ else:
     logger.info(f"Pyfile : {args.pyfile}")
 
 # Configure the environment with the provided arguments
-environment.set_psql_dns(args.psql_dns)
-environment.set_repository(args.repository)
-db_core.db_access_singleton().set_repository(environment.get_repository())
+with startup_tracer.phase('Init environment'):
+    environment.set_psql_dns(args.psql_dns)
+    environment.set_repository(args.repository)
+    db_core.db_access_singleton().set_repository(environment.get_repository())
 
-# Set up user environment
-user_row = repository.get_user_row_by_name(args.user)
-environment.build_user_env(user_row)
+    # Set up user environment
+    user_row = repository.get_user_row_by_name(args.user)
+    environment.build_user_env(user_row)
 
-# Set up project environment
-project_row = repository.get_project_row_by_name(args.project)
-environment.build_project_env(
-    project_row['project_name'], project_row['project_path'])
+    # Set up project environment
+    project_row = repository.get_project_row_by_name(args.project)
+    environment.build_project_env(
+        project_row['project_name'], project_row['project_path'])
 
-db_core.db_access_singleton().set_project(environment.get_project_name())
+    db_core.db_access_singleton().set_project(environment.get_project_name())
 
 # Start communication and software servers
-communicate_server = communicate.communicate_server()
-communicate_server.start()
+with startup_tracer.phase('Start servers'):
+    communicate_server = communicate.communicate_server()
+    communicate_server.start()
 
-softwares_server = launch.softwares_server()
-softwares_server.start()
+    softwares_server = launch.softwares_server()
+    softwares_server.start()
 
 # Initialize Wizard hooks
-hooks.init_wizard_hooks()
+with startup_tracer.phase('Init hooks'):
+    hooks.init_wizard_hooks()
 
 # Set team DNS if provided
 if args.team_dns:
     environment.set_team_dns(args.team_dns)
 
+startup_tracer.log_timeline()
+
 # Execute the specified Python file and handle errors
 try:
     exec(open(args.pyfile).read())